@@ -0,0 +1,55 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the phase level instrumentation of the tensorflow evaluators"""
+import json
+from aimet_zoo_tensorflow.common.downloader import Downloader
+from aimet_zoo_tensorflow.common.results_store import RESULTS_STORE_ENV, ResultsStore
+from aimet_zoo_tensorflow.common.utils.instrumentation import PHASE_REPORT_ENV, count_samples, instrumented, \
+    report_phases
+
+
+class _Model(Downloader):
+    """a stand in for a TF 1.x model class, with a classmethod from_pretrained()"""
+
+    @classmethod
+    def from_pretrained(cls, quantized=False):
+        return quantized
+
+    def get_session(self, quantized=False):
+        return quantized
+
+
+@instrumented("eval")
+def _eval(num_samples):
+    count_samples(num_samples)
+    return {"acc_top1": 0.7}
+
+
+def test_model_methods_and_eval_are_reported(monkeypatch, tmp_path):
+    """classmethods of model classes keep working and are recorded, runs go to the results store"""
+    monkeypatch.setenv(PHASE_REPORT_ENV, str(tmp_path))
+    monkeypatch.setenv(RESULTS_STORE_ENV, str(tmp_path / "runs.jsonl"))
+
+    @report_phases("dummy_tf_quanteval")
+    def main():
+        assert _Model.from_pretrained(quantized=True)
+        assert not _Model().get_session()
+        return {"fp32": _eval(10), "quant": _eval(10)}
+
+    main()
+    with open(tmp_path / "dummy_tf_quanteval.json") as f_in:
+        report = json.load(f_in)
+    assert [record["name"] for record in report["phases"]] == \
+        ["_Model.from_pretrained", "_Model.get_session", "eval", "eval", "fingerprint_datasets"]
+    assert report["phases"][-2]["samples"] == 10
+    run, = ResultsStore().runs(evaluator="dummy_tf_quanteval")
+    assert run["metrics"] == {"fp32.acc_top1": 0.7, "quant.acc_top1": 0.7}
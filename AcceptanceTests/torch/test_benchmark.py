@@ -0,0 +1,36 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the synthetic input benchmark"""
+import pytest
+import torch
+from aimet_zoo_torch.common.utils.benchmark import benchmark, card_input_shape, synthetic_input
+
+
+def test_synthetic_input_follows_the_card():
+    """inputs take the card input_shape with the batch size swept, and are reproducible for a seed"""
+    input_shape = card_input_shape("resnet50_w8a8")
+    assert input_shape == (None, 3, 224, 224)
+    data = synthetic_input(input_shape, batch_size=4, seed=1)
+    assert data.shape == (4, 3, 224, 224)
+    assert torch.equal(data, synthetic_input(input_shape, batch_size=4, seed=1))
+    assert synthetic_input(input_shape, 2, channels_last=True).is_contiguous(memory_format=torch.channels_last)
+    with pytest.raises(ValueError):
+        card_input_shape("bert_w8a8_cola")
+
+
+def test_benchmark_reports_latency_and_memory():
+    """percentiles are ordered and the throughput counts the samples of each batch"""
+    model = torch.nn.Sequential(torch.nn.Conv2d(3, 8, 3), torch.nn.ReLU()).eval()
+    result = benchmark(model, synthetic_input((None, 3, 32, 32), batch_size=2), warmup=2, iterations=10)
+    assert 0 < result["p50_ms"] <= result["p95_ms"]
+    assert result["throughput"] > 0
+    assert result["peak_rss_mb"] > 0
@@ -0,0 +1,57 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the shared streaming classification metrics"""
+import pytest
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+from aimet_zoo_torch.common.utils.classification_metrics import ClassificationMetrics, evaluate
+
+
+def test_streaming_metrics_match_full_batch():
+    """metrics accumulated over batches match top-k accuracy and confusion counts computed in one go"""
+    torch.manual_seed(0)
+    logits = torch.randn(100, 10)
+    labels = torch.randint(0, 10, (100,))
+    metrics = ClassificationMetrics(topk=(1, 5))
+    for start in range(0, 100, 32):
+        metrics.update(logits[start:start + 32], labels[start:start + 32])
+    assert "confusion" not in metrics.compute()
+    result = metrics.compute(confusion=True)
+
+    top5 = logits.topk(5, 1).indices
+    assert result["samples"] == 100
+    assert abs(result["top1"] - 100 * float((top5[:, 0] == labels).float().mean())) < 1e-6
+    assert abs(result["top5"] - 100 * float((top5 == labels[:, None]).any(1).float().mean())) < 1e-6
+    for label in range(10):
+        row = [int(((labels == label) & (top5[:, 0] == prediction)).sum()) for prediction in range(10)]
+        assert result["confusion"][label].tolist() == row
+        if sum(row):
+            assert abs(result["per_class_accuracy"][label] - 100 * row[label] / sum(row)) < 1e-6
+        else:
+            assert result["per_class_accuracy"][label] is None
+
+
+def test_evaluate_stops_after_num_samples():
+    """evaluate() stops at the first batch that reaches num_samples and keeps k within the number of classes"""
+    torch.manual_seed(0)
+    dataset = TensorDataset(torch.rand(64, 8), torch.randint(0, 3, (64,)))
+    result = evaluate(torch.nn.Linear(8, 3), DataLoader(dataset, batch_size=16), num_samples=20,
+                      show_progress=False)
+    assert result["samples"] == 32
+    assert result["top5"] == 100
+
+
+def test_num_classes_below_logit_width():
+    """a num_classes smaller than the number of logits is rejected instead of corrupting the confusion counts"""
+    metrics = ClassificationMetrics(num_classes=3)
+    with pytest.raises(ValueError):
+        metrics.update(torch.randn(4, 5), torch.randint(0, 3, (4,)))
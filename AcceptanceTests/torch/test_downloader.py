@@ -0,0 +1,292 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for artifact downloading, served by a local http stand-in"""
+import hashlib
+import json
+import os
+import shutil
+import tarfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from aimet_zoo_torch.common.artifact_cache import ArtifactCache
+from aimet_zoo_torch.common.downloader import Downloader, ReleaseIndex
+from aimet_zoo_torch.common import warm_cache
+
+PAYLOAD = os.urandom(3 * 1024 * 1024 + 17)
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """serves PAYLOAD with Range support, optionally dropping the first response half way"""
+    drop_next = False
+    range_requests = []
+
+    def do_GET(self):  # pylint:disable = invalid-name
+        start = 0
+        if "Range" in self.headers:
+            start = int(self.headers["Range"].split("=")[1].split("-")[0])
+            _RangeHandler.range_requests.append(start)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(PAYLOAD) - start))
+        self.end_headers()
+        body = PAYLOAD[start:]
+        if _RangeHandler.drop_next:
+            _RangeHandler.drop_next = False
+            self.wfile.write(body[: len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint:disable = arguments-differ
+        pass
+
+
+@pytest.fixture
+def http_url():
+    """local http server returning the url of PAYLOAD"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _RangeHandler.drop_next = False
+    _RangeHandler.range_requests = []
+    yield f"http://127.0.0.1:{server.server_address[1]}/artifact.pth"
+    server.shutdown()
+
+
+@pytest.fixture
+def downloader(http_url, tmp_path, monkeypatch):
+    """Downloader for a single post optimization weights artifact with a private cache directory"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    return Downloader(url_post_opt_weights=http_url, model_dir=str(tmp_path), model_config="test")
+
+
+def _read(path):
+    with open(path, "rb") as f_in:
+        return f_in.read()
+
+
+def test_stream_download(downloader):
+    """artifact is streamed to its destination without leaving a partial file behind"""
+    downloader._download_post_opt_weights()  # pylint:disable = protected-access
+    assert _read(downloader.path_post_opt_weights) == PAYLOAD
+    assert not os.path.exists(downloader.path_post_opt_weights + ".part")
+
+
+def test_resume_partial_download(downloader):
+    """an existing .part file is resumed with a Range request"""
+    os.makedirs(os.path.dirname(downloader.path_post_opt_weights), exist_ok=True)
+    with open(downloader.path_post_opt_weights + ".part", "wb") as f_out:
+        f_out.write(PAYLOAD[:1000])
+    downloader._download_post_opt_weights()  # pylint:disable = protected-access
+    assert _RangeHandler.range_requests == [1000]
+    assert _read(downloader.path_post_opt_weights) == PAYLOAD
+
+
+def test_resume_after_dropped_connection(downloader):
+    """a connection dropped mid-transfer continues from the bytes already on disk"""
+    _RangeHandler.drop_next = True
+    downloader._download_post_opt_weights()  # pylint:disable = protected-access
+    assert len(_RangeHandler.range_requests) == 1
+    assert _RangeHandler.range_requests[0] > 0
+    assert _read(downloader.path_post_opt_weights) == PAYLOAD
+
+
+def test_cached_artifact_skips_network(downloader, http_url, tmp_path):
+    """a second download of the same url is served from the artifact cache"""
+    downloader._download_post_opt_weights()  # pylint:disable = protected-access
+    os.remove(downloader.path_post_opt_weights)
+    offline = Downloader(url_post_opt_weights=http_url, model_dir=str(tmp_path), model_config="test")
+    offline._stream_download = None  # any network access would now fail
+    offline._download_post_opt_weights()  # pylint:disable = protected-access
+    assert _read(offline.path_post_opt_weights) == PAYLOAD
+
+
+def _make_checkpoint_dir(tmp_path):
+    checkpoint_dir = tmp_path / "src" / "checkpoint"
+    checkpoint_dir.mkdir(parents=True)
+    (checkpoint_dir / "config.json").write_text("{}")
+    (checkpoint_dir / "pytorch_model.bin").write_bytes(PAYLOAD)
+    return checkpoint_dir
+
+
+def test_tar_stream_extract(tmp_path, monkeypatch):
+    """tarball is unpacked into downloaded_weights without keeping the archive around"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    checkpoint_dir = _make_checkpoint_dir(tmp_path)
+    tar_path = tmp_path / "checkpoint.tar.gz"
+    with tarfile.open(tar_path, "w:gz") as tar:
+        tar.add(checkpoint_dir, arcname="checkpoint")
+    downloader = Downloader(tar_url_post_opt_weights=str(tar_path), model_dir=str(tmp_path / "model"))
+    downloader._download_tar_post_opt_weights()  # pylint:disable = protected-access
+    weights_dir = tmp_path / "model" / "weights"
+    assert sorted(os.listdir(weights_dir)) == ["downloaded_weights"]
+    assert _read(weights_dir / "downloaded_weights" / "pytorch_model.bin") == PAYLOAD
+    # second call is served from the unpacked copy in the cache
+    os.remove(tar_path)
+    downloader._download_tar_post_opt_weights()  # pylint:disable = protected-access
+    assert _read(weights_dir / "downloaded_weights" / "pytorch_model.bin") == PAYLOAD
+
+
+def test_zipped_checkpoint_extract(tmp_path, monkeypatch):
+    """zip archives are unpacked into extract_dir and the archive is removed afterwards"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    checkpoint_dir = _make_checkpoint_dir(tmp_path)
+    zip_path = shutil.make_archive(str(tmp_path / "checkpoint"), "zip", root_dir=checkpoint_dir)
+    downloader = Downloader(url_zipped_checkpoint=zip_path, model_dir=str(tmp_path / "model"))
+    downloader._download_compressed_checkpoint()  # pylint:disable = protected-access
+    assert not os.path.exists(downloader.path_zipped_checkpoint)
+    assert _read(os.path.join(downloader.extract_dir, "pytorch_model.bin")) == PAYLOAD
+
+
+def test_cache_prune_evicts_least_recently_used(tmp_path):
+    """prune() drops the least recently used blobs first and leaves links to them dangling"""
+    cache = ArtifactCache(tmp_path / "cache")
+    links = {}
+    for name in ("a", "b", "c"):
+        links[name] = str(tmp_path / name)
+        with open(links[name], "wb") as f_out:
+            f_out.write(os.urandom(4096))
+        cache.store(f"http://zoo/{name}", links[name])
+        time.sleep(0.01)
+    cache.lookup("http://zoo/a")
+    assert cache.prune(max_size=2 * 4096) == 4096
+    assert cache.lookup("http://zoo/b") is None
+    assert cache.lookup("http://zoo/a") is not None and cache.lookup("http://zoo/c") is not None
+    assert os.path.islink(links["b"]) and not os.path.exists(links["b"])
+    assert cache.size() == 2 * 4096
+
+
+class _ReleaseHandler(BaseHTTPRequestHandler):
+    """stand-in for the GitHub releases API, listing two pages of releases and serving their assets"""
+    listing_requests = 0
+
+    def do_GET(self):  # pylint:disable = invalid-name
+        host = f"http://127.0.0.1:{self.server.server_address[1]}"
+        if self.path.startswith("/releases"):
+            _ReleaseHandler.listing_requests += 1
+            page = 2 if "page=2" in self.path else 1
+            releases = [{"tag_name": f"tag{page}", "assets": [
+                {"name": name, "url": f"{host}/assets/{name}"} for name in ("weights.pth", "model.encodings")
+            ]}]
+            body = json.dumps(releases).encode()
+            self.send_response(200)
+            if page == 1:
+                self.send_header("Link", f'<{host}/releases?page=2>; rel="next"')
+        else:
+            body = self.path.encode()
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint:disable = arguments-differ
+        pass
+
+
+def test_release_index_single_listing(tmp_path, monkeypatch):
+    """all internal artifacts of a model resolve through one paginated release listing, reused across processes"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ReleaseHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("GITHUB_TOKEN", "token")
+    monkeypatch.setenv("INTERNAL_REPO_URL", f"{host}/releases")
+    _ReleaseHandler.listing_requests = 0
+    ReleaseIndex._memory.clear()  # pylint:disable = protected-access
+    try:
+        downloader = Downloader(
+            url_post_opt_weights=f"{host}/qualcomm/download/tag1/weights.pth",
+            url_aimet_encodings=f"{host}/qualcomm/download/tag2/model.encodings",
+            model_dir=str(tmp_path),
+        )
+        downloader._download_artifacts()  # pylint:disable = protected-access
+        assert _read(downloader.path_post_opt_weights) == b"/assets/weights.pth"
+        assert _read(downloader.path_aimet_encodings) == b"/assets/model.encodings"
+        assert _ReleaseHandler.listing_requests == 2  # both pages, once
+        ReleaseIndex._memory.clear()  # pylint:disable = protected-access
+        assert downloader._convert_src_to_asset_url(  # pylint:disable = protected-access
+            f"{host}/qualcomm/download/tag2/weights.pth") == f"{host}/assets/weights.pth"
+        assert _ReleaseHandler.listing_requests == 2  # served from release_index.json
+    finally:
+        server.shutdown()
+
+
+def test_warm_cache_dedupes_and_is_idempotent(http_url, tmp_path, monkeypatch):
+    """a url shared by two model cards is fetched once, and a second run is served entirely from the cache"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    host = http_url.rsplit("/", 1)[0]
+    cards = {
+        "model_a": {"artifacts": {"url_post_opt_weights": f"{host}/a.pth", "url_aimet_config": f"{host}/config.json"}},
+        "model_b": {"artifacts": {"url_post_opt_weights": f"{host}/b.pth", "url_aimet_config": f"{host}/config.json"}},
+    }
+    monkeypatch.setattr(warm_cache, "get_card", cards.__getitem__)
+    summary = warm_cache.warm_cache(["model_a", "model_b"])
+    assert (summary["urls"], summary["shared_urls"], summary["fetched"], summary["failed"]) == (3, 1, 3, 0)
+    assert summary["fetched_bytes"] == 3 * len(PAYLOAD)
+    assert summary["artifacts"][f"{host}/config.json"]["model_configs"] == ["model_a", "model_b"]
+    monkeypatch.setattr(Downloader, "_fetch", None)  # any network access would now fail
+    summary = warm_cache.warm_cache(["model_a", "model_b"])
+    assert (summary["fetched"], summary["cached"], summary["fetched_bytes"]) == (0, 3, 0)
+
+
+def test_record_checksums(http_url, tmp_path, monkeypatch):
+    """digests of cached artifacts are added to the cards, and then verify every later download"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    host = http_url.rsplit("/", 1)[0]
+    cards = {"model_a": {"name": "A", "artifacts": {"url_post_opt_weights": f"{host}/a.pth",
+                                                      "url_aimet_config": f"{host}/config.json",
+                                                      "checksums": {"url_aimet_config": "0" * 64}}}}
+    monkeypatch.setattr(warm_cache, "get_card", lambda name: json.loads(json.dumps(cards[name])))
+    monkeypatch.setattr(warm_cache, "card_file", lambda name: tmp_path / f"{name}.json")
+    # laid out like the cards of the package, the checksums are spliced in without reformatting the rest
+    card_text = (
+        '{\n    "name": "A",\n    "input_shape": [null, 3, 224, 224],\n    "artifacts": {\n'
+        f'        "url_post_opt_weights": "{host}/a.pth", \n        "url_aimet_config": "{host}/config.json"    \n'
+        '    }\n}'
+    )
+    (tmp_path / "model_a.json").write_text(card_text)
+    warm_cache.warm_cache(["model_a"])
+    digest = hashlib.sha256(PAYLOAD).hexdigest()
+    assert warm_cache.record_checksums(["model_a"]) == {"model_a": {"url_post_opt_weights": digest}}
+    assert (tmp_path / "model_a.json").read_text() == card_text.replace(
+        '/config.json"', f'/config.json",\n        "checksums": {{\n            "url_aimet_config": "{"0" * 64}",\n'
+                         f'            "url_post_opt_weights": "{digest}"\n        }}')
+    with open(tmp_path / "model_a.json") as f_in:
+        card = json.load(f_in)
+    assert card["artifacts"]["checksums"] == {"url_aimet_config": "0" * 64, "url_post_opt_weights": digest}
+    cards["model_a"] = card
+    assert not warm_cache.record_checksums(["model_a"])
+
+
+def test_warm_cache_collects_torchvision_weights():
+    """the ImageNet weights the ResNet and RegNet configs start from are artifacts of their cards, fetched once per arch"""
+    artifacts = warm_cache.collect_artifacts(["resnet50_w8a8", "resnet50_w4a8", "regnet_x_3_2gf_w8a8"])
+    torchvision_urls = {url: entry for url, entry in artifacts.items() if url.startswith("https://download.pytorch.org/")}
+    assert [(entry[0], entry[2]) for entry in torchvision_urls.values()] == [
+        ("url_pre_opt_weights", ["resnet50_w8a8", "resnet50_w4a8"]),
+        ("url_pre_opt_weights", ["regnet_x_3_2gf_w8a8"]),
+    ]
+
+
+def test_warm_cache_collects_resnext_and_mobilenetv2_weights():
+    """the fp32 weights of ResNeXt and MobileNetV2 are artifacts of their cards instead of torch hub downloads"""
+    artifacts = warm_cache.collect_artifacts(["resnext101_w8a8", "mobilenetv2_w8a8"])
+    pre_opt = [(url, entry[2]) for url, entry in artifacts.items() if entry[0] == "url_pre_opt_weights"]
+    assert pre_opt == [
+        ("https://download.pytorch.org/models/resnext101_32x8d-8ba56ff5.pth", ["resnext101_w8a8"]),
+        ("https://www.dropbox.com/s/47tyzpofuuyyv1b/mobilenetv2_1.0-f2a8633.pth.tar?dl=1", ["mobilenetv2_w8a8"]),
+    ]
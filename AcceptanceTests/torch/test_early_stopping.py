@@ -0,0 +1,81 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for early stopping evaluation"""
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+from aimet_zoo_torch.common.utils.classification_metrics import evaluate
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping, MeanIoUInterval, bootstrap_miou_interval, \
+    mean_iou, wilson_interval
+
+
+def test_wilson_interval():
+    """matches the textbook interval and stays within [0, 1] at the extremes"""
+    low, high = wilson_interval(50, 100)
+    assert abs(low - 0.4038) < 1e-4 and abs(high - 0.5962) < 1e-4
+    assert wilson_interval(0, 10)[0] == 0.0
+    assert wilson_interval(10, 10)[1] == 1.0
+
+
+def test_bootstrap_interval_contains_estimate():
+    """the mIoU of all batches lies within its bootstrap interval, which is reproducible for a seed"""
+    rng = np.random.default_rng(0)
+    intervals = MeanIoUInterval(seed=1)
+    for _ in range(30):
+        intervals.update(np.diag(rng.integers(50, 100, 5)) + rng.integers(0, 10, (5, 5)))
+    low, high = intervals.interval()
+    assert low <= intervals.estimate() <= high
+    assert intervals.interval() == (low, high)
+
+
+def test_streaming_interval_matches_bootstrap():
+    """the running Poisson resamples give about the interval of resampling all batches, for any mIoU metric"""
+    rng = np.random.default_rng(0)
+    confusions = [np.diag(rng.integers(50, 100, 5)) + rng.integers(0, 10, (5, 5)) for _ in range(200)]
+    streaming = MeanIoUInterval(num_resamples=500, seed=1)
+    # a wrapped mean_iou takes the per matrix path instead of the vectorized one
+    per_class = MeanIoUInterval(num_resamples=500, seed=1, metric=lambda confusion: mean_iou(confusion))  # pylint: disable=unnecessary-lambda
+    for confusion in confusions:
+        streaming.update(confusion)
+        per_class.update(confusion)
+    low, high = bootstrap_miou_interval(confusions, num_resamples=500, seed=1)
+    assert np.allclose(streaming.interval(), (low, high), atol=(high - low) / 4)
+    assert np.allclose(streaming.interval(), per_class.interval())
+
+
+def test_classification_stops_once_interval_is_tight():
+    """a model that is always right is evaluated on a fraction of the samples, the summary reports the savings"""
+    labels = torch.arange(2000) % 4
+    dataset = TensorDataset(torch.nn.functional.one_hot(labels, 4).float(), labels)
+    early_stopping = EarlyStopping(tolerance=1.0, min_samples=100, seed=0)
+    result = evaluate(torch.nn.Identity(), DataLoader(dataset, batch_size=50), early_stopping=early_stopping,
+                      show_progress=False)
+    summary = result["early_stopping"]
+    assert result["top1"] == 100
+    assert summary["stopped_early"] and summary["samples"] < 2000
+    assert summary["total_samples"] == 2000
+    assert summary["ci_low"] <= 100 <= summary["ci_high"]
+
+
+def test_report_prints_every_summary(capsys):
+    """report names the summaries of all evaluations in the order they ran and prints one line each"""
+    labels = torch.arange(1000) % 4
+    dataset = TensorDataset(torch.nn.functional.one_hot(labels, 4).float(), labels)
+    early_stopping = EarlyStopping(tolerance=1.0, min_samples=100, seed=0)
+    for _ in range(2):
+        evaluate(torch.nn.Identity(), DataLoader(dataset, batch_size=50), early_stopping=early_stopping,
+                 show_progress=False)
+    summaries = early_stopping.report(("fp32", "quant"))
+    assert list(summaries) == ["fp32", "quant"]
+    assert summaries["quant"] is early_stopping.summary
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2 and lines[0].startswith("fp32: Evaluated ") and "of 1000 samples" in lines[0]
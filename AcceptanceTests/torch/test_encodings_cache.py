@@ -0,0 +1,61 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the calibrated encodings cache"""
+import json
+import os
+import torch
+from aimet_torch.quantsim import QuantizationSimModel
+from aimet_zoo_torch.common import encodings_cache
+
+
+def _sim():
+    torch.manual_seed(0)
+    model = torch.nn.Sequential(torch.nn.Conv2d(3, 8, 3), torch.nn.ReLU(), torch.nn.Conv2d(8, 4, 3)).eval()
+    return QuantizationSimModel(model, dummy_input=torch.rand(1, 3, 16, 16))
+
+
+def test_dataset_fingerprint_tracks_files(tmp_path):
+    """adding or touching a calibration file changes the fingerprint"""
+    files = [tmp_path / f"{index}.jpg" for index in range(3)]
+    for path in files:
+        path.write_bytes(b"image")
+    fingerprint = encodings_cache.dataset_fingerprint(files)
+    assert encodings_cache.dataset_fingerprint(files) == fingerprint
+    assert encodings_cache.dataset_fingerprint(files[:2]) != fingerprint
+    os.utime(files[0], ns=(0, 0))
+    assert encodings_cache.dataset_fingerprint(files) != fingerprint
+
+
+def test_calibration_runs_once(tmp_path, monkeypatch):
+    """a second sim calibrated on the same data loads the encodings of the first instead of running the model"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    calibration_file = tmp_path / "calibration.pt"
+    torch.save(torch.rand(4, 3, 16, 16), calibration_file)
+    forward_passes = []
+
+    def forward_pass(model, path):
+        forward_passes.append(path)
+        with torch.no_grad():
+            model(torch.load(path))
+
+    def calibrate():
+        sim = _sim()
+        encodings_cache.cached_compute_encodings(sim, "test_w8a8", [calibration_file], forward_pass,
+                                                 str(calibration_file), dummy_input=torch.rand(1, 3, 16, 16))
+        sim.export(str(tmp_path), "sim", torch.rand(1, 3, 16, 16))
+        with open(tmp_path / "sim_torch.encodings") as f_in:
+            return json.load(f_in)
+
+    calibrated = calibrate()
+    assert calibrate() == calibrated
+    assert len(forward_passes) == 1
+    assert encodings_cache.invalidate("test_w8a8") == 1
@@ -0,0 +1,111 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance tests for the ImageNet data loader"""
+import os
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+from aimet_zoo_torch.common.utils import decode_parity, image_net_data_loader, packed_files
+from aimet_zoo_torch.common.utils.image_net_data_loader import ImageNetDataLoader
+
+
+@pytest.fixture
+def images_dir(tmp_path):
+    """tiny ImageNet style folder, two classes of random JPEGs of different sizes"""
+    rng = np.random.default_rng(0)
+    for class_name in ("n01440764", "n01443537"):
+        (tmp_path / "val" / class_name).mkdir(parents=True)
+        for index in range(3):
+            pixels = rng.integers(0, 256, size=(300 + 40 * index, 400, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(tmp_path / "val" / class_name / f"{index}.JPEG")
+    return str(tmp_path / "val")
+
+
+def _batches(data_loader):
+    return [(data.clone(), label.clone()) for data, label in data_loader]
+
+
+def test_tensor_cache_matches_decoding(images_dir, tmp_path, monkeypatch):
+    """cached crops give bit identical batches, and a second loader does not decode any image"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    decoded = _batches(ImageNetDataLoader(images_dir, image_size=64, batch_size=4, num_workers=0).data_loader)
+    cached = _batches(ImageNetDataLoader(images_dir, image_size=64, batch_size=4, num_workers=0,
+                                         use_tensor_cache=True).data_loader)
+    monkeypatch.setattr(image_net_data_loader, "_DecodedImages", None)  # building the cache again would now fail
+    reused = _batches(ImageNetDataLoader(images_dir, image_size=64, batch_size=4, num_workers=0,
+                                         use_tensor_cache=True).data_loader)
+    for (data, label), (cached_data, cached_label), (reused_data, _) in zip(decoded, cached, reused):
+        assert torch.equal(data, cached_data) and torch.equal(label, cached_label)
+        assert torch.equal(cached_data, reused_data)
+
+
+def test_manifest_rescans_changed_classes_only(images_dir, tmp_path, monkeypatch):
+    """a second dataset is built from the manifest, adding an image lists only its class directory again"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    dataset = image_net_data_loader.ImageFolder(images_dir, num_samples_per_class=2)
+    assert [path.rsplit("/", 2)[1:] for path, _ in dataset.samples] == [
+        ["n01440764", "0.JPEG"], ["n01440764", "1.JPEG"], ["n01443537", "0.JPEG"], ["n01443537", "1.JPEG"]]
+
+    scanned = []
+    scan_class = image_net_data_loader.scan_class
+    monkeypatch.setattr(image_net_data_loader, "scan_class",
+                        lambda class_path, extensions: scanned.append(class_path) or scan_class(class_path, extensions))
+    assert image_net_data_loader.ImageFolder(images_dir).samples == \
+        image_net_data_loader.ImageFolder(images_dir).samples
+    assert not scanned
+    Image.new("RGB", (32, 32)).save(f"{images_dir}/n01443537/3.JPEG")
+    assert len(image_net_data_loader.ImageFolder(images_dir)) == 7
+    assert [path.rsplit("/", 1)[1] for path in scanned] == ["n01443537"]
+
+
+def test_tensor_cache_sees_replaced_images(images_dir, tmp_path, monkeypatch):
+    """an image overwritten in place keeps its directory mtime, but still changes the tensor cache key"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    first = ImageNetDataLoader(images_dir, image_size=64, batch_size=4, num_workers=0, use_tensor_cache=True)
+    class_dir = os.path.join(images_dir, "n01440764")
+    class_mtime = os.stat(class_dir).st_mtime_ns
+    Image.new("RGB", (320, 300), color=(255, 0, 0)).save(os.path.join(class_dir, "0.JPEG"))
+    os.utime(class_dir, ns=(class_mtime, class_mtime))
+    second = ImageNetDataLoader(images_dir, image_size=64, batch_size=4, num_workers=0, use_tensor_cache=True)
+    assert first.data_loader.dataset.cache_path != second.data_loader.dataset.cache_path
+    assert not torch.equal(_batches(first.data_loader)[0][0], _batches(second.data_loader)[0][0])
+
+
+def test_draft_decode_parity(tmp_path, monkeypatch):
+    """large JPEGs are decoded at reduced resolution, and the preprocessed inputs stay close to full decoding"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    # smooth images, like photos, survive DCT domain downscaling with little error, unlike noise
+    y_grid, x_grid = np.mgrid[0:768, 0:1024]
+    for class_index, class_name in enumerate(("n01440764", "n01443537")):
+        (tmp_path / "val" / class_name).mkdir(parents=True)
+        pixels = np.stack([x_grid / 4, y_grid / 3, (x_grid + y_grid + 200 * class_index) / 8], axis=-1) % 256
+        Image.fromarray(pixels.astype(np.uint8)).save(tmp_path / "val" / class_name / "0.JPEG", quality=95)
+    image_path = str(tmp_path / "val" / "n01440764" / "0.JPEG")
+    assert min(image_net_data_loader.DraftLoader(88)(image_path).size) >= 88
+    assert image_net_data_loader.DraftLoader(88)(image_path).size == (128, 96)
+
+    result = decode_parity.compare_pipelines(str(tmp_path / "val"), image_size=64, batch_size=2, num_workers=0)
+    assert result["samples"] == 2
+    assert result["mean_abs_diff"] < 0.05
+
+
+def test_packed_images_dir(images_dir, tmp_path, monkeypatch):
+    """a packed copy of the data directory gives the same batches"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    packed_dir = str(tmp_path / "val_packed")
+    packed_files.pack_directory(images_dir, packed_dir)
+    decoded = _batches(ImageNetDataLoader(images_dir, image_size=64, batch_size=4, num_workers=0).data_loader)
+    packed = _batches(ImageNetDataLoader(packed_dir, image_size=64, batch_size=4, num_workers=0).data_loader)
+    assert len(decoded) == len(packed)
+    for (data, label), (packed_data, packed_label) in zip(decoded, packed):
+        assert torch.equal(data, packed_data) and torch.equal(label, packed_label)
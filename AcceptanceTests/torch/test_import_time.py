@@ -0,0 +1,76 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" import time benchmark, importing one model package must not pull in the dependencies of any model"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import aimet_zoo_torch
+
+PACKAGE_ROOT = Path(aimet_zoo_torch.__file__).parent
+# cumulative import time budget of each model package, in milliseconds
+DEFAULT_BUDGET_MS = 50
+BUDGETS_MS = {
+    "common": 100,
+}
+# mmaction2 imports its loop and metric on purpose, importing them registers both with mmengine
+EAGER_PACKAGES = {"mmaction2"}
+HEAVY_MODULES = ("torch", "torchvision", "aimet_torch", "aimet_common", "transformers", "tensorflow")
+MODEL_PACKAGES = sorted(
+    path.parent.name for path in PACKAGE_ROOT.glob("*/__init__.py") if path.parent.name not in EAGER_PACKAGES
+)
+
+
+def _import_in_subprocess(module_name: str):
+    """imports module_name in a fresh interpreter, returns its cumulative import time in ms and the modules loaded"""
+    code = f"import sys, {module_name}; print('\\n'.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split(":", 1)[1].split("|")
+        if name.strip() == module_name:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, set(result.stdout.split())
+
+
+def test_top_level_import_is_lazy():
+    """importing the top level package loads none of the model packages"""
+    elapsed_ms, modules = _import_in_subprocess("aimet_zoo_torch")
+    assert not [name for name in modules if name.startswith("aimet_zoo_torch.") and name != "aimet_zoo_torch.common"
+                and not name.startswith("aimet_zoo_torch.common.")]
+    assert elapsed_ms < DEFAULT_BUDGET_MS
+
+
+@pytest.mark.parametrize("model_package", MODEL_PACKAGES)
+def test_model_package_import_budget(model_package):
+    """a model package resolves its classes on first use, so importing it stays within budget"""
+    elapsed_ms, modules = _import_in_subprocess(f"aimet_zoo_torch.{model_package}")
+    heavy = sorted(name for name in modules if name.split(".")[0] in HEAVY_MODULES)
+    assert not heavy, f"aimet_zoo_torch.{model_package} imports {heavy[:5]}"
+    budget_ms = BUDGETS_MS.get(model_package, DEFAULT_BUDGET_MS)
+    assert elapsed_ms < budget_ms, f"aimet_zoo_torch.{model_package} took {elapsed_ms:.1f}ms to import"
+
+
+def test_lazy_attribute_resolution():
+    """public classes stay listed and unknown names fail like a regular attribute lookup"""
+    from aimet_zoo_torch import resnet  # pylint:disable = import-outside-toplevel
+    assert "ResNet" in dir(resnet) and resnet.__all__ == ["ResNet"]
+    with pytest.raises(AttributeError):
+        resnet.NotAModel  # pylint:disable = pointless-statement
+    assert aimet_zoo_torch.resnet is resnet
@@ -0,0 +1,59 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the phase level instrumentation of the evaluators"""
+import json
+import time
+from aimet_zoo_torch.common.results_store import RESULTS_STORE_ENV
+from aimet_zoo_torch.common.utils import instrumentation
+from aimet_zoo_torch.common.utils.instrumentation import PHASE_REPORT_ENV, instrumented, phase, report_phases
+
+
+@instrumented("eval")
+def _eval():
+    with phase("forward"):
+        time.sleep(0.02)
+    return {"acc": 1.0}
+
+
+def test_phases_nest_and_are_reported(monkeypatch, tmp_path):
+    """nested phases are recorded in order with their depth, and the report is written to the directory"""
+    monkeypatch.setenv(PHASE_REPORT_ENV, str(tmp_path))
+    monkeypatch.setenv(RESULTS_STORE_ENV, "0")
+
+    @report_phases("dummy_quanteval")
+    def main():
+        with phase("from_pretrained"):
+            pass
+        return _eval()
+
+    assert main() == {"acc": 1.0}
+    with open(tmp_path / "dummy_quanteval.json") as f_in:
+        report = json.load(f_in)
+    assert report["evaluator"] == "dummy_quanteval"
+    assert [(record["name"], record["depth"]) for record in report["phases"]] == \
+        [("from_pretrained", 0), ("eval", 0), ("forward", 1)]
+    eval_phase, forward_phase = report["phases"][1:]
+    assert eval_phase["wall_seconds"] >= forward_phase["wall_seconds"] >= 0.02
+    assert eval_phase["peak_rss_mb"] >= forward_phase["peak_rss_mb"] > 0
+    assert report["wall_seconds"] >= report["unattributed_seconds"] >= 0
+
+
+def test_phases_outside_a_report_are_no_ops(monkeypatch, capsys):
+    """without report_phases() nothing is recorded, without a report path the report goes to stderr"""
+    monkeypatch.delenv(PHASE_REPORT_ENV, raising=False)
+    monkeypatch.setenv(RESULTS_STORE_ENV, "0")
+    assert _eval() == {"acc": 1.0}
+    assert instrumentation._recorder is None  # pylint: disable=protected-access
+    with report_phases("dummy_quanteval"):
+        _eval()
+    report = json.loads(capsys.readouterr().err.strip().splitlines()[-1])
+    assert [record["name"] for record in report["phases"]] == ["eval", "forward"]
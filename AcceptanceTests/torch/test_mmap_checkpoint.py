@@ -0,0 +1,53 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for memory mapped checkpoint loading"""
+import os
+import pickle
+import pytest
+import torch
+from aimet_zoo_torch.common import mmap_checkpoint
+
+
+@pytest.fixture
+def model():
+    """small model standing in for a pickled transformer"""
+    torch.manual_seed(0)
+    return torch.nn.Sequential(torch.nn.Linear(64, 64), torch.nn.ReLU(), torch.nn.Linear(64, 8))
+
+
+def _assert_same_weights(loaded, model):
+    for (name, expected), (_, actual) in zip(model.state_dict().items(), loaded.state_dict().items()):
+        assert torch.equal(expected, actual), name
+
+
+def test_zip_checkpoint_is_loaded_in_place(model, tmp_path, monkeypatch):
+    """torch.save output is already memory mappable and is not converted"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "pre_opt_weights")
+    torch.save(model, path)
+    assert mmap_checkpoint.mmap_compatible_path(path) == path
+    _assert_same_weights(mmap_checkpoint.load_checkpoint(path), model)
+    assert not os.path.exists(tmp_path / "cache" / "mmap")
+
+
+def test_pickled_checkpoint_is_converted_once(model, tmp_path, monkeypatch):
+    """a plain pickle, as written by aimet_torch's save_checkpoint, is converted on first load and reused after"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    path = str(tmp_path / "post_opt_weights")
+    with open(path, "wb") as f_out:
+        pickle.dump(model, f_out)
+    _assert_same_weights(mmap_checkpoint.load_checkpoint(path), model)
+    if mmap_checkpoint.mmap_supported():
+        converted = mmap_checkpoint.mmap_compatible_path(path)
+        assert converted != path and os.path.isfile(converted)
+        monkeypatch.setattr(mmap_checkpoint, "convert_checkpoint", None)  # any second conversion would now fail
+        _assert_same_weights(mmap_checkpoint.load_checkpoint(path), model)
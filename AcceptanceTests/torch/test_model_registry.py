@@ -0,0 +1,55 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the model card registry"""
+import os
+import pytest
+from aimet_zoo_torch.common import model_registry
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """registry with an empty in-memory index and a private cache directory"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(model_registry, "_index", None)
+    return model_registry
+
+
+def test_list_and_get_card(registry):
+    """every card is listed, filterable and loadable by name"""
+    assert "resnet50_w8a8" in registry.list_models()
+    assert registry.list_models(model="resnet") == sorted(registry.list_models(model="resnet"))
+    assert all(registry.get_summary(name)["model"] == "resnet" for name in registry.list_models(model="resnet"))
+    card = registry.get_card("resnet50_w8a8")
+    assert card["artifacts"]["url_post_opt_weights"] == registry.get_summary("resnet50_w8a8")["artifacts"]["url_post_opt_weights"]
+    card["artifacts"] = None  # callers get their own copy
+    assert registry.get_card("resnet50_w8a8")["artifacts"] is not None
+    assert not registry.has_card("resnet50_w3a3")
+    with pytest.raises(ValueError):
+        registry.get_card("resnet50_w3a3")
+
+
+def test_index_is_compiled_once(registry, tmp_path, monkeypatch):
+    """a second process loads the compiled index instead of parsing the model cards again"""
+    names = registry.list_models()
+    assert len(os.listdir(tmp_path / "model_registry")) == 1
+    monkeypatch.setattr(registry, "_index", None)
+    monkeypatch.setattr(registry, "_compile", None)  # any recompilation would now fail
+    assert registry.list_models() == names
+
+
+def test_invalidate_drops_the_index(registry, tmp_path):
+    """after invalidate() the cards are parsed again, an installed package would otherwise keep its stale index"""
+    names = registry.list_models()
+    registry.invalidate()
+    assert registry._index is None  # pylint: disable=protected-access
+    assert not os.listdir(tmp_path / "model_registry")
+    assert registry.list_models() == names
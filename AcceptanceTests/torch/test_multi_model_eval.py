@@ -0,0 +1,44 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for single pass evaluation of several models"""
+import torch
+from torch.utils.data import DataLoader, Dataset
+from aimet_zoo_torch.common.utils.multi_model_eval import evaluate_models
+
+
+class CountingDataset(Dataset):
+    """random classification samples that count how often they are loaded"""
+
+    def __init__(self):
+        torch.manual_seed(0)
+        self.data = torch.rand(64, 8)
+        self.labels = torch.randint(0, 4, (64,))
+        self.loads = 0
+
+    def __getitem__(self, index):
+        self.loads += 1
+        return self.data[index], self.labels[index]
+
+    def __len__(self):
+        return len(self.data)
+
+
+def test_every_sample_is_loaded_once():
+    """all models see every sample while the dataset is read a single time, accuracies match separate passes"""
+    dataset = CountingDataset()
+    models = {f"model_{index}": torch.nn.Linear(8, 4) for index in range(3)}
+    accuracies = evaluate_models(models, DataLoader(dataset, batch_size=16), show_progress=False)
+    assert dataset.loads == len(dataset)
+    for name, model in models.items():
+        with torch.no_grad():
+            expected = 100 * float((model(dataset.data).argmax(1) == dataset.labels).float().mean())
+        assert abs(accuracies[name] - expected) < 1e-4
@@ -0,0 +1,63 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the packed shard format of image datasets"""
+import os
+import pickle
+import pytest
+from aimet_zoo_torch.common.utils import packed_files
+
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    """small dataset directory with files of varying size in nested directories"""
+    contents = {}
+    for class_index in range(3):
+        for file_index in range(5):
+            name = f"class_{class_index}/img_{file_index}.jpg"
+            contents[name] = os.urandom(100 + 37 * file_index)
+            (tmp_path / "data" / f"class_{class_index}").mkdir(parents=True, exist_ok=True)
+            (tmp_path / "data" / name).write_bytes(contents[name])
+    (tmp_path / "data" / "README.txt").write_text("not an image")
+    return tmp_path / "data", contents
+
+
+def test_pack_and_read_back(dataset_dir, tmp_path):
+    """every file reads back unchanged by its original path, across several shards"""
+    src_dir, contents = dataset_dir
+    dst_dir = str(tmp_path / "packed")
+    assert packed_files.pack_directory(str(src_dir), dst_dir, shard_size=1000, extensions=(".jpg",)) == len(contents)
+    assert packed_files.is_packed(dst_dir) and not packed_files.is_packed(str(src_dir))
+    files = packed_files.PackedFiles(dst_dir)
+    assert len(files.shards) > 1
+    assert files.listdir() == ["class_0", "class_1", "class_2"]
+    assert files.listdir(os.path.join(dst_dir, "class_1")) == [f"img_{index}.jpg" for index in range(5)]
+    assert not files.isfile(os.path.join(dst_dir, "README.txt"))
+    for name, data in contents.items():
+        assert files.read(os.path.join(dst_dir, name)) == data
+        assert files.open(os.path.join(dst_dir, name)).read() == data
+
+
+def test_sequential_reads_are_batched(dataset_dir, tmp_path, monkeypatch):
+    """files read in order are served from the read ahead buffer, and workers get a fresh buffer"""
+    src_dir, contents = dataset_dir
+    dst_dir = str(tmp_path / "packed")
+    packed_files.pack_directory(str(src_dir), dst_dir)
+    files = packed_files.PackedFiles(dst_dir)
+    reads = []
+    pread = os.pread
+    monkeypatch.setattr(os, "pread", lambda fd, size, offset: reads.append(size) or pread(fd, size, offset))
+    for name in sorted(contents):
+        assert files.read(os.path.join(dst_dir, name)) == contents[name]
+    assert len(reads) == 1
+    clone = pickle.loads(pickle.dumps(files))
+    assert clone.read(os.path.join(dst_dir, "class_2/img_4.jpg")) == contents["class_2/img_4.jpg"]
+    assert len(reads) == 2
@@ -0,0 +1,74 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the pipelined evaluation loop"""
+import random
+import time
+import pytest
+import torch
+from aimet_zoo_torch.common.utils.pipelined_eval import Pipeline
+
+
+def _load(item):
+    time.sleep(random.random() * 0.005)
+    return item, torch.is_grad_enabled()
+
+
+def _forward(loaded):
+    return loaded[0] * 10, torch.is_grad_enabled()
+
+
+def _postprocess(loaded, output):
+    time.sleep(random.random() * 0.005)
+    return loaded[0], output[0], output[1]
+
+
+def test_results_keep_input_order():
+    """results arrive in input order although loading and postprocessing finish out of order"""
+    pipeline = Pipeline(_load, _forward, _postprocess, num_loaders=3, num_postprocessors=3)
+    results = list(pipeline.run(range(40)))
+    assert [(item, output) for item, output, _ in results] == [(item, item * 10) for item in range(40)]
+    # the forward pass runs without autograd
+    assert not any(grad_enabled for _, _, grad_enabled in results)
+    for stage in ("load", "forward", "postprocess"):
+        assert pipeline.stats[stage]["items"] == 40
+        assert 0 <= pipeline.stats[stage]["utilization"] <= 1
+
+
+def test_stage_errors_reach_the_caller():
+    """an exception in a stage stops the pipeline and is raised by run()"""
+    def failing_postprocess(loaded, output):
+        if loaded[0] == 5:
+            raise ValueError("bad sample")
+        return output
+
+    pipeline = Pipeline(_load, _forward, failing_postprocess)
+    with pytest.raises(ValueError, match="bad sample"):
+        list(pipeline.run(range(20)))
+
+
+def test_slow_iterator_does_not_block_stage_statistics():
+    """the loaders wait on the item iterator without holding the lock the other stages record under"""
+    pipeline = Pipeline(_load, _forward, _postprocess, num_loaders=2, num_postprocessors=2)
+    stats_lock_free = []
+
+    def slow_items():
+        for item in range(10):
+            time.sleep(0.002)
+            # with the iterator under the statistics lock, this would time out in the loader holding it
+            acquired = pipeline._lock.acquire(timeout=1)  # pylint: disable=protected-access
+            if acquired:
+                pipeline._lock.release()  # pylint: disable=protected-access
+            stats_lock_free.append(acquired)
+            yield item
+
+    assert [item for item, _, _ in pipeline.run(slow_items())] == list(range(10))
+    assert all(stats_lock_free)
@@ -0,0 +1,42 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the quantsim snapshot cache"""
+import torch
+from aimet_zoo_torch.common import quantsim_cache
+
+
+def test_snapshot_reused_until_artifacts_change(tmp_path, monkeypatch):
+    """an identical sim is built once, changed weights or invalidate() force a rebuild"""
+    monkeypatch.setenv("AIMET_ZOO_CACHE_DIR", str(tmp_path / "cache"))
+    weights = tmp_path / "post_opt_weights"
+    weights.write_bytes(b"weights v1")
+    card = {"name": "test", "optimization_config": {"quantization_configuration": {"param_bw": 8}}}
+    builds = []
+
+    def build():
+        builds.append(1)
+        return torch.nn.Linear(4, 4)
+
+    def get_sim():
+        return quantsim_cache.cached_quantsim("test_w8a8", card, [str(weights), None], build, quantized=True)
+
+    first = get_sim()
+    assert len(list((tmp_path / "cache" / "quantsim" / "test_w8a8").glob("*.pt"))) == 1
+    second = get_sim()
+    assert len(builds) == 1
+    assert torch.equal(first.weight, second.weight)
+    weights.write_bytes(b"weights v2")
+    get_sim()
+    assert len(builds) == 2
+    assert quantsim_cache.invalidate("test_w8a8") == 2
+    get_sim()
+    assert len(builds) == 3
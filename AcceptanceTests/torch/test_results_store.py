@@ -0,0 +1,110 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for the evaluation results store"""
+import argparse
+import os
+import time
+import pytest
+from aimet_zoo_torch.common import results_store
+from aimet_zoo_torch.common.results_store import RESULTS_STORE_ENV, ResultsStore, compare_runs, directory_fingerprint, \
+    flatten_metrics
+from aimet_zoo_torch.common.utils.instrumentation import PHASE_REPORT_ENV, count_samples, phase, record_arguments, \
+    report_phases
+
+
+def _quanteval(raw_args, accuracy, seconds_per_sample):
+    """a stand in for the main() of an evaluator"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model-config", type=str)
+    parser.add_argument("--dataset-path", type=str)
+    record_arguments(parser.parse_args(raw_args))
+    # a parse the evaluator does not hand over is not recorded
+    argparse.ArgumentParser().parse_known_args(["--dataset-path", "elsewhere"])
+    with phase("eval"):
+        time.sleep(10 * seconds_per_sample)
+        count_samples(10)
+    return {"fp32_acc": 76.0, "quant_acc": accuracy, "summary": "not a metric"}
+
+
+@pytest.fixture(name="store")
+def fixture_store(monkeypatch, tmp_path):
+    """a results store in a temporary directory, phase reports written there too"""
+    monkeypatch.setenv(RESULTS_STORE_ENV, str(tmp_path / "runs.jsonl"))
+    monkeypatch.setenv(PHASE_REPORT_ENV, str(tmp_path))
+    return ResultsStore()
+
+
+def test_runs_are_recorded_and_compared(store, tmp_path):
+    """every run is appended with its setup, metrics and throughput, and drops are flagged against the baseline"""
+    (tmp_path / "val").mkdir()
+    (tmp_path / "val" / "image.jpg").write_bytes(b"jpeg")
+    main = report_phases("dummy_quanteval")(_quanteval)
+    raw_args = ["--model-config", "resnet50_w8a8", "--dataset-path", str(tmp_path / "val")]
+    assert main(raw_args, 75.8, 0.001)["quant_acc"] == 75.8
+    main(raw_args, 75.0, 0.01)
+    baseline, run = store.runs(evaluator="dummy_quanteval", model_config="resnet50_w8a8")
+    assert run["metrics"] == {"fp32_acc": 76.0, "quant_acc": 75.0}
+    assert run["arguments"]["dataset_path"] == str(tmp_path / "val")
+    assert run["datasets"]["dataset_path"]["fingerprint"] == baseline["datasets"]["dataset_path"]["fingerprint"]
+    assert "python" in run["versions"]
+    assert 0 < run["throughput"]["eval"] < baseline["throughput"]["eval"]
+    assert [record["name"] for record in run["report"]["phases"]] == ["eval", "fingerprint_datasets"]
+
+    comparison = store.compare(run)
+    assert comparison["baseline"] == baseline["run_id"]
+    assert comparison["metrics"]["quant_acc"]["change"] == pytest.approx(-0.8 / 75.8)
+    assert len(comparison["regressions"]) == 2
+    assert not compare_runs(baseline, baseline)["regressions"]
+    assert store.get(run["run_id"][:12]) == run
+    assert results_store.main(["compare", run["run_id"][:12]]) == 1
+    assert results_store.main(["compare", "--baseline", run["run_id"], run["run_id"]]) == 0
+
+
+def test_lower_is_better_and_failed_runs(store):
+    """a higher loss is a regression, a run that raised is not recorded"""
+    baseline = {"run_id": "a", "metrics": {"loss": 1.0, "top1": 70.0}, "throughput": {}, "report": {"phases": []}}
+    run = dict(baseline, run_id="b", metrics={"loss": 1.2, "top1": 71.0})
+    assert [regression.split()[0] for regression in compare_runs(run, baseline)["regressions"]] == ["loss"]
+
+    @report_phases("failing_quanteval")
+    def main():
+        raise RuntimeError("dataset missing")
+
+    with pytest.raises(RuntimeError):
+        main()
+    assert not store.runs(evaluator="failing_quanteval")
+
+
+def test_flatten_metrics():
+    """nested metric dicts and lists become dotted names, non numeric values are left out"""
+    metrics = {"mIoU": 0.7, "per_class": [0.5, 0.9], "nested": {"ap": 1}, "passed": True, "name": "x"}
+    assert flatten_metrics(metrics) == {"mIoU": 0.7, "per_class.0": 0.5, "per_class.1": 0.9, "nested.ap": 1.0}
+    assert not flatten_metrics(None)
+
+
+def test_directory_fingerprint(tmp_path):
+    """entries added to a class directory change the fingerprint, files modified in place only the full one"""
+    (tmp_path / "n01440764").mkdir()
+    image = tmp_path / "n01440764" / "image.jpg"
+    image.write_bytes(b"jpeg")
+    fingerprint, full_fingerprint = directory_fingerprint(str(tmp_path)), directory_fingerprint(str(tmp_path), True)
+    assert directory_fingerprint(str(tmp_path)) == fingerprint
+
+    image.write_bytes(b"jpeg, retouched")
+    os.utime(image, ns=(0, 10 ** 18))
+    assert directory_fingerprint(str(tmp_path)) == fingerprint
+    assert directory_fingerprint(str(tmp_path), full=True) != full_fingerprint
+
+    stat = os.stat(tmp_path / "n01440764")
+    (tmp_path / "n01440764" / "other.jpg").write_bytes(b"jpeg")
+    os.utime(tmp_path / "n01440764", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert directory_fingerprint(str(tmp_path)) != fingerprint
@@ -0,0 +1,78 @@
+# /usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+# @@-COPYRIGHT-START-@@
+#
+# Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+# Changes from QuIC are licensed under the terms and conditions at
+# https://github.com/quic/aimet-model-zoo/blob/develop/LICENSE.pdf
+#
+# @@-COPYRIGHT-END-@@
+# =============================================================================
+""" acceptance test for multi-process sharded evaluation"""
+import functools
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+from aimet_zoo_torch.common.utils.classification_metrics import evaluate, evaluate_sharded
+from aimet_zoo_torch.common.utils.sharded_eval import build_replica, merge_states, shard_indices
+
+
+class _Classifier:
+    """a stand in for a model class of the zoo, its post optimization weights are the original ones doubled"""
+
+    def __init__(self, model_config=None, device=None):
+        self.model_config = model_config
+        self.model = torch.nn.Linear(8, 6).to(device)
+
+    def from_pretrained(self, quantized=False):
+        torch.manual_seed(0)
+        self.model.load_state_dict(torch.nn.Linear(8, 6).state_dict())
+        if quantized:
+            self.model.weight.data *= 2
+
+
+def test_shards_cover_the_dataset_once():
+    """shards are disjoint, contiguous and together cover every sample"""
+    shards = shard_indices(10, 3)
+    assert [list(shard) for shard in shards] == [[0, 1, 2], [3, 4, 5], [6, 7, 8, 9]]
+
+
+def test_merge_states():
+    """counts and confusion matrices are summed, detection lists concatenated in shard order"""
+    merged = merge_states([
+        {"correct": 3, "confusion": np.eye(2), "detections": [{"image_id": 1}]},
+        {"correct": 4, "confusion": np.ones((2, 2)), "detections": [{"image_id": 2}]},
+    ])
+    assert merged["correct"] == 7
+    assert (merged["confusion"] == np.eye(2) + 1).all()
+    assert [detection["image_id"] for detection in merged["detections"]] == [1, 2]
+
+
+def test_sharded_classification_matches_single_process():
+    """metrics merged over two worker processes equal those of a single pass"""
+    torch.manual_seed(0)
+    dataset = TensorDataset(torch.rand(90, 8), torch.randint(0, 6, (90,)))
+    model = torch.nn.Linear(8, 6)
+    dataloader = DataLoader(dataset, batch_size=16)
+    sharded = evaluate_sharded(model, dataloader, num_shards=2, threads_per_shard=1, confusion=True)
+    single = evaluate(model, dataloader, show_progress=False, confusion=True)
+    assert sharded["samples"] == single["samples"] == 90
+    assert torch.equal(sharded["confusion"], single["confusion"])
+    assert sharded["top5"] == single["top5"]
+
+
+def test_replicas_are_built_in_the_workers():
+    """a factory of a model class builds the replica of each shard, a single shard keeps the caller's threads"""
+    torch.manual_seed(0)
+    dataset = TensorDataset(torch.rand(40, 8), torch.randint(0, 6, (40,)))
+    dataloader = DataLoader(dataset, batch_size=16)
+    reference = _Classifier(device=torch.device("cpu"))
+    reference.from_pretrained(quantized=True)
+    single = evaluate(reference.model, dataloader, show_progress=False)
+
+    replica = functools.partial(build_replica, _Classifier, "dummy_w8a8", quantized=True)
+    assert evaluate_sharded(replica, dataloader, num_shards=2, threads_per_shard=1)["top1"] == single["top1"]
+    threads = torch.get_num_threads()
+    assert evaluate_sharded(replica, dataloader, num_shards=1, threads_per_shard=threads + 1)["top1"] == single["top1"]
+    assert torch.get_num_threads() == threads
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Content-addressed local cache for downloaded model zoo artifacts, shared by aimet_zoo_torch and aimet_zoo_tensorflow"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # non POSIX platforms only get the in-process lock
+    fcntl = None
+
+CACHE_DIR_ENV = "AIMET_ZOO_CACHE_DIR"
+CACHE_SIZE_LIMIT_ENV = "AIMET_ZOO_CACHE_SIZE_LIMIT"
+_HASH_CHUNK_SIZE = 1 << 20
+# entries used this recently are never evicted automatically, another process may be about to load them
+_EVICTION_GRACE_SECONDS = 600
+_SIZE_SUFFIXES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+# serializes index read-modify-write between downloader threads of one process
+_INDEX_LOCK = threading.Lock()
+
+
+def default_cache_dir() -> Path:
+    """Returns the artifact cache root, $AIMET_ZOO_CACHE_DIR if set, otherwise ~/.cache/aimet_zoo"""
+    cache_dir = os.getenv(CACHE_DIR_ENV)
+    if cache_dir:
+        return Path(cache_dir).expanduser()
+    xdg_cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(xdg_cache_home) / "aimet_zoo"
+
+
+def parse_size(size) -> int:
+    """Converts a size such as 2048, "500M" or "20GB" to bytes"""
+    if size is None or isinstance(size, int):
+        return size
+    size = str(size).strip().upper().rstrip("B")
+    if size and size[-1] in _SIZE_SUFFIXES:
+        return int(float(size[:-1]) * _SIZE_SUFFIXES[size[-1]])
+    return int(size)
+
+
+def default_size_limit():
+    """Returns the cache size cap in bytes from $AIMET_ZOO_CACHE_SIZE_LIMIT, None when the cache is unbounded"""
+    return parse_size(os.getenv(CACHE_SIZE_LIMIT_ENV) or None)
+
+
+def _link_or_copy(src, dst):
+    """hard links src to dst, falling back to a copy across filesystems"""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _remove(path: str):
+    """removes a file, a link or a directory tree at path"""
+    if os.path.islink(path) or os.path.isfile(path):
+        os.remove(path)
+    elif os.path.isdir(path):
+        shutil.rmtree(path)
+
+
+def _tree_size(path) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+        if not os.path.islink(os.path.join(root, name))
+    )
+
+
+def sha256sum(path) -> str:
+    """Returns the hex SHA-256 digest of the file at path, read in fixed size chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f_in:
+        for chunk in iter(lambda: f_in.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ArtifactCache:
+    """
+    Content-addressed store for downloaded artifacts. Every file is kept once under
+    blobs/sha256/<digest> and index.json maps each source URL to the digest of the file it served,
+    so an artifact that is already cached can be handed out without touching the network.
+    Archives are kept unpacked under trees/<sha256 of the URL> instead of as blobs.
+
+    The cache lives outside the installed packages, so every virtualenv and both zoo packages share it;
+    model weights directories only hold symbolic links into it. The index records when each entry was
+    last used, and once the cache grows beyond its size limit the least recently used entries are evicted.
+    Index updates and evictions hold a file lock, so concurrent processes can share one cache directory.
+    """
+
+    def __init__(self, cache_dir=None, size_limit=None):
+        """
+        :param cache_dir:     root directory of the cache, defaults to default_cache_dir()
+        :param size_limit:    cap on the cache size, in bytes or as a string like "20G". Defaults to
+                              $AIMET_ZOO_CACHE_SIZE_LIMIT, or no cap when that is unset
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.size_limit = parse_size(size_limit) if size_limit is not None else default_size_limit()
+        self._blob_dir = self.cache_dir / "blobs" / "sha256"
+        self._tree_dir = self.cache_dir / "trees"
+        self._index_path = self.cache_dir / "index.json"
+        self._lock_path = self.cache_dir / ".lock"
+
+    def blob_path(self, digest: str) -> Path:
+        """path where the blob with the given SHA-256 digest is stored"""
+        return self._blob_dir / digest
+
+    def lookup(self, url: str, sha256: str = None):
+        """
+        Returns the path of an intact cached copy of url, or None on a cache miss
+        :param url:       source URL of the artifact
+        :param sha256:    expected digest from the model card. When given it takes precedence over the
+                          digest recorded for url, so a republished artifact is not served stale
+        """
+        index = self._load_index()
+        digest = sha256 or index["urls"].get(url)
+        if digest is None:
+            return None
+        blob = self.blob_path(digest)
+        if not blob.is_file():
+            return None
+        if not self._is_intact(blob, digest, index["blobs"].get(digest)):
+            os.remove(blob)
+            return None
+        self._record(url, blob, digest)
+        return blob
+
+    def store(self, url: str, path: str, sha256: str = None) -> Path:
+        """
+        Verifies the freshly downloaded file at path and moves it into the cache under its digest,
+        leaving a link to the cached blob at path
+        :param url:       source URL the file was downloaded from
+        :param path:      downloaded file
+        :param sha256:    expected digest from the model card, if known
+        :return:          path of the cached blob
+        """
+        digest = sha256sum(path)
+        if sha256 and digest != sha256.lower():
+            os.remove(path)
+            raise ValueError(
+                f"Checksum mismatch for {url}: expected sha256 {sha256}, downloaded file has {digest}"
+            )
+        blob = self.blob_path(digest)
+        if not blob.is_file():
+            self._blob_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self._blob_dir, prefix=".tmp_")
+            os.close(fd)
+            shutil.move(path, tmp_path)
+            os.replace(tmp_path, blob)
+        self._record(url, blob, digest)
+        self.materialize(blob, path)
+        self._evict_to_size_limit(keep={digest})
+        return blob
+
+    @staticmethod
+    def materialize(blob: Path, dst: str):
+        """Places the cached blob at dst as a symbolic link, or a hard link or copy where symlinks are unavailable"""
+        if os.path.lexists(dst):
+            if os.path.exists(dst) and os.path.samefile(blob, dst):
+                return
+            os.remove(dst)
+        try:
+            os.symlink(os.path.abspath(blob), dst)
+        except OSError:
+            _link_or_copy(blob, dst)
+
+    def tree_path(self, url: str) -> Path:
+        """path where the unpacked contents of the archive at url are stored"""
+        return self._tree_dir / self._tree_key(url)
+
+    def lookup_tree(self, url: str):
+        """Returns the cached unpacked tree of the archive at url, or None on a cache miss"""
+        tree = self.tree_path(url)
+        if not tree.is_dir():
+            return None
+        self._record_tree(url, tree)
+        return tree
+
+    def store_tree(self, url: str, unpack_fn) -> Path:
+        """
+        Unpacks the archive at url into the cache. The tree only becomes visible once unpacking has
+        finished, so an interrupted run never leaves a half extracted tree behind
+        :param url:          source URL of the archive
+        :param unpack_fn:    callable receiving a scratch directory to unpack into, returning the directory
+                             inside it whose contents make up the tree
+        :return:             path of the cached tree
+        """
+        self._tree_dir.mkdir(parents=True, exist_ok=True)
+        scratch_dir = tempfile.mkdtemp(dir=self._tree_dir, prefix=".tmp_")
+        try:
+            root = unpack_fn(scratch_dir)
+            tree = self.tree_path(url)
+            if tree.is_dir():
+                shutil.rmtree(tree)
+            os.replace(root, tree)
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+        self._record_tree(url, tree, size=_tree_size(tree))
+        self._evict_to_size_limit(keep={self._tree_key(url)})
+        return tree
+
+    @staticmethod
+    def materialize_tree(tree: Path, dst: str):
+        """Places the cached tree at dst as a symbolic link, or as hard linked files where symlinks are unavailable"""
+        if os.path.lexists(dst):
+            if os.path.islink(dst) and os.path.realpath(dst) == os.path.realpath(tree):
+                return
+            _remove(dst)
+        try:
+            os.symlink(os.path.abspath(tree), dst, target_is_directory=True)
+        except OSError:
+            shutil.copytree(tree, dst, symlinks=True, copy_function=_link_or_copy)
+
+    def size(self) -> int:
+        """total size in bytes of the blobs and trees recorded in the index"""
+        index = self._load_index()
+        return sum(entry["size"] for group in ("blobs", "trees") for entry in index[group].values())
+
+    def prune(self, max_size=None, max_age: float = None) -> int:
+        """
+        Evicts least recently used entries until the cache fits in max_size, and every entry not used
+        for max_age seconds. Links to evicted entries in model weights directories are left dangling and
+        get refreshed by the next download.
+        :param max_size:    size to shrink the cache to, in bytes or as a string like "20G"
+        :param max_age:     age in seconds after which unused entries are evicted
+        :return:            number of bytes freed
+        """
+        return self._evict(max_size=parse_size(max_size), max_age=max_age)
+
+    def clear(self) -> int:
+        """Evicts every entry, returns the number of bytes freed"""
+        return self._evict(max_size=0)
+
+    def _evict_to_size_limit(self, keep: set):
+        if self.size_limit is not None:
+            self._evict(
+                max_size=self.size_limit,
+                keep=keep,
+                protect_since=time.time() - _EVICTION_GRACE_SECONDS,
+            )
+
+    def _evict(self, max_size: int = None, max_age: float = None, keep: set = (), protect_since: float = None) -> int:
+        """removes entries, least recently used first, under the cache lock"""
+        freed = 0
+        now = time.time()
+        with self._locked_index() as index:
+            entries = sorted(
+                (entry.get("last_access", 0), group, key, entry["size"])
+                for group in ("blobs", "trees")
+                for key, entry in index[group].items()
+            )
+            total_size = sum(entry[3] for entry in entries)
+            for last_access, group, key, size in entries:
+                too_big = max_size is not None and total_size > max_size
+                too_old = max_age is not None and now - last_access > max_age
+                if not (too_big or too_old) or key in keep:
+                    continue
+                if protect_since is not None and last_access >= protect_since:
+                    continue
+                _remove(str(self.blob_path(key) if group == "blobs" else self._tree_dir / key))
+                del index[group][key]
+                total_size -= size
+                freed += size
+            index["urls"] = {url: digest for url, digest in index["urls"].items() if digest in index["blobs"]}
+        return freed
+
+    def _is_intact(self, blob: Path, digest: str, record: dict) -> bool:
+        """cheap stat check against the recorded size and mtime, rehashing only when they changed"""
+        stat = blob.stat()
+        if record and record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        return sha256sum(blob) == digest
+
+    def _record(self, url: str, blob: Path, digest: str):
+        """adds url -> digest and the blob's stat to the index, marking the blob as just used"""
+        stat = blob.stat()
+        with self._locked_index() as index:
+            index["urls"][url] = digest
+            index["blobs"][digest] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "last_access": time.time(),
+            }
+
+    def _record_tree(self, url: str, tree: Path, size: int = None):
+        """adds the tree of url to the index, marking it as just used"""
+        with self._locked_index() as index:
+            entry = index["trees"].get(tree.name) or {"url": url}
+            if size is not None or "size" not in entry:
+                entry["size"] = size if size is not None else _tree_size(tree)
+            entry["last_access"] = time.time()
+            index["trees"][tree.name] = entry
+
+    @staticmethod
+    def _tree_key(url: str) -> str:
+        return hashlib.sha256(url.encode("UTF-8")).hexdigest()
+
+    @contextlib.contextmanager
+    def _locked_index(self):
+        """yields the index for modification while holding the thread and file locks, then saves it"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with _INDEX_LOCK, open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                index = self._load_index()
+                yield index
+                self._save_index(index)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self) -> dict:
+        index = {}
+        if self._index_path.is_file():
+            try:
+                with open(self._index_path, encoding="UTF-8") as f_in:
+                    index = json.load(f_in)
+            except ValueError:
+                pass
+        for group in ("urls", "blobs", "trees"):
+            index.setdefault(group, {})
+        return index
+
+    def _save_index(self, index: dict):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=".index_")
+        with os.fdopen(fd, "w", encoding="UTF-8") as f_out:
+            json.dump(index, f_out, indent=1)
+        os.replace(tmp_path, self._index_path)
+
+
+def prune(max_size=None, max_age: float = None, cache_dir=None) -> int:
+    """
+    Shrinks the shared artifact cache, see ArtifactCache.prune
+    :param max_size:     size to shrink the cache to, in bytes or as a string like "20G".
+                         Defaults to $AIMET_ZOO_CACHE_SIZE_LIMIT
+    :param max_age:      age in seconds after which unused entries are evicted
+    :param cache_dir:    cache root, defaults to default_cache_dir()
+    :return:             number of bytes freed
+    """
+    cache = ArtifactCache(cache_dir)
+    return cache.prune(max_size=max_size if max_size is not None else cache.size_limit, max_age=max_age)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Phase level timing and memory instrumentation of the evaluators
+
+When an evaluation gets slow, report_phases() tells where the time went. It wraps the main() of an evaluator and
+records the wall time, CPU time (of all threads) and peak resident memory of every named phase entered meanwhile:
+artifact downloads, from_pretrained(), get_session() and get_quantsim() of every model class, calibration
+(sim.compute_encodings() of session and keras quantsims) and the evaluations the evaluators mark with phase().
+Phases nest, time outside any phase is reported as unattributed. The report is written as JSON to the file or
+directory named by AIMET_ZOO_PHASE_REPORT, or printed as a single JSON line to stderr. Outside of report_phases()
+the phases cost nothing.
+
+Evaluations that count the samples they evaluate with count_samples() report their throughput. The arguments the
+evaluator hands to record_arguments(), the metrics main() returned and the report are appended to the results store,
+see results_store.
+It is the store the aimet_zoo_torch evaluators write to, so runs of both can be listed and compared together.
+"""
+
+import contextlib
+import functools
+import importlib
+import json
+import os
+import resource
+import sys
+import time
+from aimet_zoo_tensorflow.common.results_store import dataset_fingerprints, record_run, recording_enabled
+
+PHASE_REPORT_ENV = "AIMET_ZOO_PHASE_REPORT"
+_MB = 1 << 20
+_recorder = None
+
+
+def peak_rss_bytes() -> int:
+    """peak resident set size of this process since it started or since the last reset_peak_rss(), in bytes"""
+    try:
+        with open("/proc/self/status") as f_in:
+            for line in f_in:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def reset_peak_rss() -> bool:
+    """resets the peak resident set size to the current one where the OS supports it (linux), returns if it did"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f_out:
+            f_out.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class PhaseRecorder:
+    """Wall time, CPU time and peak resident memory of named, possibly nested, phases"""
+
+    def __init__(self):
+        self.phases = []
+        self.arguments = {}
+        self._open = []
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        reset_peak_rss()
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """records the phase run in the with block"""
+        # the peak is reset for each phase, open phases keep the peak reached before
+        peak = peak_rss_bytes()
+        for record in self._open:
+            record["_peak"] = max(record["_peak"], peak)
+        reset_peak_rss()
+        record = {"name": name, "depth": len(self._open), "_peak": 0}
+        self.phases.append(record)
+        self._open.append(record)
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall_start
+            record["cpu_seconds"] = time.process_time() - cpu_start
+            record["_peak"] = max(record["_peak"], peak_rss_bytes())
+            self._open.pop()
+            if self._open:
+                self._open[-1]["_peak"] = max(self._open[-1]["_peak"], record["_peak"])
+            record["peak_rss_mb"] = record.pop("_peak") / _MB
+
+    def add_samples(self, count: int):
+        """counts samples evaluated in the innermost open phase"""
+        if self._open:
+            self._open[-1]["samples"] = self._open[-1].get("samples", 0) + count
+
+    def report(self) -> dict:
+        """the phases in the order they started, with totals over the whole recording"""
+        wall_seconds = time.perf_counter() - self._wall_start
+        phases = [phase for phase in self.phases if "wall_seconds" in phase]
+        peak = max([peak_rss_bytes() / _MB] + [phase["peak_rss_mb"] for phase in phases])
+        return {
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": time.process_time() - self._cpu_start,
+            "peak_rss_mb": peak,
+            "unattributed_seconds": wall_seconds - sum(phase["wall_seconds"] for phase in phases
+                                                       if phase["depth"] == 0),
+            "arguments": self.arguments,
+            "phases": phases,
+        }
+
+
+def phase(name: str):
+    """context manager recording a phase while report_phases() is active, a no-op otherwise"""
+    if _recorder is None:
+        return contextlib.nullcontext()
+    return _recorder.phase(name)
+
+
+def count_samples(count: int):
+    """counts samples evaluated in the current phase while report_phases() is active, a no-op otherwise"""
+    if _recorder is not None:
+        _recorder.add_samples(int(count))
+
+
+def record_arguments(args):
+    """
+    records the parsed arguments of the evaluator while report_phases() is active, a no-op otherwise
+    :param args:    argparse namespace or dict of the arguments, recorded with the run and fingerprinted datasets
+    """
+    if _recorder is not None:
+        _recorder.arguments.update(args if isinstance(args, dict) else vars(args))
+
+
+def instrumented(name: str):
+    """decorator recording each call of the function as a phase"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def _instrument_compute_encodings():
+    """records sim.compute_encodings() calls of session and keras quantsims as calibration phases while active"""
+    classes = []
+    for module_name in ("aimet_tensorflow.quantsim", "aimet_tensorflow.keras.quantsim"):
+        try:
+            classes.append(importlib.import_module(module_name).QuantizationSimModel)
+        except ImportError:
+            pass
+    originals = [(cls, cls.compute_encodings) for cls in classes]
+    for cls, compute_encodings in originals:
+        cls.compute_encodings = instrumented("compute_encodings")(compute_encodings)
+    try:
+        yield
+    finally:
+        for cls, compute_encodings in originals:
+            cls.compute_encodings = compute_encodings
+
+
+def _emit(name: str, report: dict):
+    target = os.getenv(PHASE_REPORT_ENV)
+    if not target:
+        print(json.dumps(report, default=str), file=sys.stderr)
+        return
+    path = os.path.join(target, f"{name}.json") if os.path.isdir(target) else target
+    with open(path, "w") as f_out:
+        json.dump(report, f_out, indent=2, default=str)
+
+
+class _PhaseReport:
+    """report_phases() of one evaluation run"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.recorder = None
+        self.metrics = None
+        self._previous = None
+        self._patches = None
+
+    def __enter__(self):
+        global _recorder  # pylint: disable=global-statement
+        self.recorder = PhaseRecorder()
+        self._previous, _recorder = _recorder, self.recorder
+        self._patches = contextlib.ExitStack()
+        self._patches.enter_context(_instrument_compute_encodings())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _recorder  # pylint: disable=global-statement
+        datasets = None
+        if exc_type is None and recording_enabled():
+            # part of the report, listing the datasets is not free on network filesystems
+            with self.recorder.phase("fingerprint_datasets"):
+                datasets = dataset_fingerprints(self.recorder.arguments)
+        self._patches.close()
+        _recorder = self._previous
+        report = self.recorder.report()
+        report["evaluator"] = self.name
+        _emit(self.name, report)
+        if exc_type is None:
+            record_run(report, self.metrics, datasets)
+        return False
+
+    def __call__(self, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            # a fresh report per call, so that the decorated function may be called again or recursively
+            with _PhaseReport(self.name) as run:
+                run.metrics = function(*args, **kwargs)
+                return run.metrics
+        return wrapper
+
+
+def report_phases(name: str) -> _PhaseReport:
+    """
+    Records the phases of an evaluation run, emits the report when it ends and records the run in the results store.
+    Used as a decorator of main(), whose return value is recorded as the metrics of the run, or as a context
+    manager, whose metrics attribute can be set to the metrics of the run
+    :param name:    name of the evaluator, e.g. "resnet50_tf2_quanteval", the report file in a report directory
+    """
+    return _PhaseReport(name)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Pre-populates the artifact cache with every artifact of a set of model configs, e.g. for air-gapped evaluation nodes
+
+    python -m aimet_zoo_tensorflow.common.warm_cache resnet50_w8a8 mobilebert_w8a8_squad quicksrnet_large_4x_w4a8
+
+With --record-checksums the SHA-256 digests of the cached artifacts are written into the model cards, after which
+every download of them is verified. Only the checksums of a card file are rewritten, the rest keeps its formatting.
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from aimet_zoo_tensorflow.common.artifact_cache import CACHE_DIR_ENV, ArtifactCache, _tree_size
+from aimet_zoo_tensorflow.common.downloader import Downloader
+from aimet_zoo_tensorflow.common import model_registry
+from aimet_zoo_tensorflow.common.model_registry import card_file, get_card, list_models
+
+logger = logging.getLogger("Downloader")
+
+# artifact keys of a model card, in the order they are listed in the summary
+_ARTIFACT_KEYS = (
+    "url_pre_opt_weights",
+    "url_post_opt_weights",
+    "url_adaround_encodings",
+    "url_aimet_encodings",
+    "url_aimet_config",
+    "tar_url_pre_opt_weights",
+    "tar_url_post_opt_weights",
+    "url_zipped_checkpoint",
+)
+
+
+def collect_artifacts(model_configs: list) -> dict:
+    """
+    Gathers the artifact urls of the given model cards, each url once however many cards share it
+    :param model_configs:    names of model cards
+    :return:                 url -> (artifact key, Downloader of the first card listing the url, names of all cards listing it)
+    """
+    artifacts = {}
+    for model_config in model_configs:
+        card_artifacts = get_card(model_config)["artifacts"]
+        urls = {key: card_artifacts.get(key) for key in _ARTIFACT_KEYS if card_artifacts.get(key)}
+        downloader = Downloader(**urls, checksums=card_artifacts.get("checksums"))
+        for key, url in urls.items():
+            if url in artifacts:
+                artifacts[url][2].append(model_config)
+            else:
+                artifacts[url] = (key, downloader, [model_config])
+    return artifacts
+
+
+def _warm(url: str, key: str, downloader: Downloader) -> tuple:
+    """caches one artifact, returns whether it was already cached and its size in bytes"""
+    if key.startswith("tar_url"):
+        cached = downloader._artifact_cache.lookup_tree(url)  # pylint: disable=protected-access
+        tree = cached or downloader._cache_tarball(url)  # pylint: disable=protected-access
+        return cached is not None, _tree_size(tree)
+    if key == "url_zipped_checkpoint":
+        cached = downloader._artifact_cache.lookup_tree(url)  # pylint: disable=protected-access
+        tree = cached or downloader._cache_compressed_checkpoint()  # pylint: disable=protected-access
+        return cached is not None, _tree_size(tree)
+    checksum = downloader._checksums.get(url)  # pylint: disable=protected-access
+    cached = downloader._artifact_cache.lookup(url, checksum)  # pylint: disable=protected-access
+    blob = cached or downloader._cache_artifact(url)  # pylint: disable=protected-access
+    return cached is not None, os.path.getsize(blob)
+
+
+def warm_cache(model_configs: list, max_workers: int = 8) -> dict:
+    """
+    Downloads every artifact of the given model cards into the artifact cache in parallel. Artifacts
+    that are already cached are not downloaded again, so running it twice only costs the lookups.
+    :param model_configs:    names of model cards, see model_registry.list_models()
+    :param max_workers:      maximum number of artifacts fetched at the same time
+    :return:                 summary with per url status, byte counts, elapsed time and throughput
+    """
+    start = time.perf_counter()
+    artifacts = collect_artifacts(model_configs)
+    # system paths are read in place by the model definitions, there is nothing to cache for them
+    remote = {url: entry for url, entry in artifacts.items() if url.startswith("http")}
+    internal_uncached = [
+        url for url, (key, downloader, _) in remote.items()
+        if 'qualcomm' in url and not key.startswith("tar_url") and key != "url_zipped_checkpoint"
+        and downloader._artifact_cache.lookup(url) is None  # pylint: disable=protected-access
+    ]
+    if internal_uncached:
+        # one release listing up front instead of one per worker thread
+        remote[internal_uncached[0]][1]._resolve_asset_urls(internal_uncached)  # pylint: disable=protected-access
+
+    results = {}
+    if remote:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(remote))) as pool:
+            futures = {pool.submit(_warm, url, key, downloader): url for url, (key, downloader, _) in remote.items()}
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    was_cached, size = future.result()
+                    results[url] = {"status": "cached" if was_cached else "fetched", "bytes": size}
+                except Exception as error:  # pylint: disable=broad-except
+                    logger.error("Could not cache %s: %s", url, error)
+                    results[url] = {"status": "failed", "bytes": 0, "error": str(error)}
+                results[url]["model_configs"] = artifacts[url][2]
+    elapsed = time.perf_counter() - start
+
+    fetched_bytes = sum(entry["bytes"] for entry in results.values() if entry["status"] == "fetched")
+    return {
+        "model_configs": len(model_configs),
+        "urls": len(artifacts),
+        "shared_urls": sum(len(entry[2]) > 1 for entry in artifacts.values()),
+        "fetched": sum(entry["status"] == "fetched" for entry in results.values()),
+        "cached": sum(entry["status"] == "cached" for entry in results.values()),
+        "failed": sum(entry["status"] == "failed" for entry in results.values()),
+        "skipped": len(artifacts) - len(remote),
+        "fetched_bytes": fetched_bytes,
+        "total_bytes": sum(entry["bytes"] for entry in results.values()),
+        "seconds": elapsed,
+        "throughput_bytes_per_second": fetched_bytes / elapsed if elapsed else 0.0,
+        "artifacts": results,
+    }
+
+
+def record_checksums(model_configs: list) -> dict:
+    """
+    Writes the SHA-256 digests of the cached file artifacts of the given model cards under "checksums" in their
+    artifacts, keeping digests already recorded. Archives are cached unpacked and get no digest. Run it on a
+    trusted network after warm_cache(), the digests are those of the files that were downloaded.
+    :param model_configs:    names of model cards
+    :return:                 model config -> {artifact key: digest} of the digests added to its card
+    """
+    cache = ArtifactCache()
+    recorded = {}
+    for model_config in model_configs:
+        card = get_card(model_config)
+        checksums = card["artifacts"].get("checksums") or {}
+        added = {}
+        for key in _ARTIFACT_KEYS:
+            url = card["artifacts"].get(key)
+            if key.startswith("tar_url") or key == "url_zipped_checkpoint" or key in checksums:
+                continue
+            if url and url.startswith("http"):
+                blob = cache.lookup(url)
+                if blob is not None:
+                    added[key] = blob.name
+        if added:
+            _write_checksums(card_file(model_config), {**checksums, **added})
+            recorded[model_config] = added
+    if recorded:
+        model_registry.invalidate()
+    return recorded
+
+
+def _write_checksums(path, checksums: dict):
+    """
+    Sets "checksums" in the artifacts of the model card file at path, editing only those lines so that the rest of
+    the card keeps its formatting
+    """
+    with open(path, encoding="UTF-8", newline="") as f_in:
+        text = f_in.read()
+    expected = json.loads(text)
+    expected["artifacts"]["checksums"] = checksums
+    newline = "\r\n" if "\r\n" in text else "\n"
+    existing = re.search(r'"checksums"\s*:\s*(\{[^{}]*\}|null)', text)
+    artifacts = re.search(r'^([ \t]*)"artifacts"\s*:\s*\{', text, re.MULTILINE)
+    if artifacts is None:
+        raise ValueError(f"{path} has no artifacts to record checksums in")
+    key_indent = re.match(r"\s*?([ \t]*)\S", text[artifacts.end():]).group(1)
+    step = key_indent[len(artifacts.group(1)):] or "    "
+    lines = [f'{key_indent}{step}"{key}": "{digest}"' for key, digest in checksums.items()]
+    rendered = "{" + newline + ("," + newline).join(lines) + newline + key_indent + "}"
+    if existing is not None:
+        text = text[:existing.start(1)] + rendered + text[existing.end(1):]
+    else:
+        # after the last member of the artifacts object, which has no nested objects of its own
+        closing = text.index("}", artifacts.end())
+        last_member = len(text[:closing].rstrip())
+        text = (text[:last_member] + "," + newline + f'{key_indent}"checksums": ' + rendered
+                + text[last_member:])
+    if json.loads(text) != expected:
+        raise ValueError(f"Could not record the checksums in {path}")
+    with open(path, "w", encoding="UTF-8", newline="") as f_out:
+        f_out.write(text)
+
+
+def _format_size(num_bytes: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GiB"
+
+
+def print_summary(summary: dict):
+    """prints the outcome of warm_cache(), one line per artifact followed by the totals"""
+    for url, entry in sorted(summary["artifacts"].items(), key=lambda item: (item[1]["status"], item[0])):
+        print(f'{entry["status"]:>8}  {_format_size(entry["bytes"]):>10}  {url}')
+    print(
+        f'{summary["model_configs"]} model configs, {summary["urls"]} unique urls '
+        f'({summary["shared_urls"]} shared between configs): {summary["fetched"]} fetched, '
+        f'{summary["cached"]} already cached, {summary["failed"]} failed, {summary["skipped"]} local paths skipped'
+    )
+    print(
+        f'Downloaded {_format_size(summary["fetched_bytes"])} in {summary["seconds"]:.1f}s '
+        f'({_format_size(summary["throughput_bytes_per_second"])}/s), '
+        f'{_format_size(summary["total_bytes"])} of artifacts now cached'
+    )
+
+
+def arguments(raw_args):
+    """ Parse input arguments """
+    parser = argparse.ArgumentParser(description="Download the artifacts of model configs into the artifact cache")
+    parser.add_argument("model_configs", nargs="*", help="model configurations to cache, e.g. resnet50_w8a8")
+    parser.add_argument("--all", action="store_true", help="cache the artifacts of every model configuration")
+    parser.add_argument("--max-workers", help="maximum number of parallel downloads", default=8, type=int)
+    parser.add_argument("--cache-dir", help=f"artifact cache directory, overrides ${CACHE_DIR_ENV}", default=None, type=str)
+    parser.add_argument("--record-checksums", action="store_true",
+                        help="write the sha256 of every cached file artifact into the model cards")
+    args = parser.parse_args(raw_args)
+    if not args.model_configs and not args.all:
+        parser.error("name at least one model configuration, or pass --all")
+    return args
+
+
+def main(raw_args=None):
+    """ Warm the artifact cache, exits non zero if any artifact could not be cached """
+    args = arguments(raw_args)
+    if args.cache_dir:
+        os.environ[CACHE_DIR_ENV] = args.cache_dir
+    logging.basicConfig(level=logging.WARNING)
+    model_configs = list_models() if args.all else args.model_configs
+    summary = warm_cache(model_configs, max_workers=args.max_workers)
+    print_summary(summary)
+    if args.record_checksums:
+        for model_config, added in record_checksums(model_configs).items():
+            print(f"Recorded {len(added)} checksums in {card_file(model_config)}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
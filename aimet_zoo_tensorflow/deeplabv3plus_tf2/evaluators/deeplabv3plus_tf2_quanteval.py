@@ -10,6 +10,7 @@
 ''' do TF2 deeplabv3plus quantization and evaluation'''
 import argparse
 import tensorflow as tf
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_tensorflow.deeplabv3plus_tf2.model.model_definition import Deeplabv3Plus
 from aimet_zoo_tensorflow.deeplabv3plus_tf2.evaluators.eval_func import get_eval_func
 
@@ -27,9 +28,11 @@ def arguments(raw_args):
     args = parser.parse_args(raw_args)
     return args
 
+@report_phases("deeplabv3plus_tf2_quanteval")
 def main(raw_args=None):
     """ Run evaluation """
     args = arguments(raw_args)
+    record_arguments(args)
 
     gpu_devices = tf.config.experimental.list_physical_devices("GPU")
     for device in gpu_devices:
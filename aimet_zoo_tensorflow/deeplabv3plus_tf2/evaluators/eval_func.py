@@ -38,6 +38,7 @@ import os
 import numpy as np
 from tqdm import tqdm
 import tensorflow as tf
+from aimet_zoo_tensorflow.common.utils.instrumentation import count_samples, instrumented
 from aimet_zoo_tensorflow.deeplabv3plus_tf2.dataloader.dataloader import DeeplabDataset
 from aimet_zoo_tensorflow.deeplabv3plus_tf2.evaluators.utils_metrics import fast_hist, per_class_iu
 
@@ -48,6 +49,7 @@ def get_eval_func(dataset_dir, batch_size, num_iterations=5000):
     :param num_iterations: number of images used
     :return evaluation function
     '''
+    @instrumented("eval")
     def func_wrapper(model, iterations=num_iterations):
         '''
         :param model: FP32 model or sim.model
@@ -71,6 +73,7 @@ def get_eval_func(dataset_dir, batch_size, num_iterations=5000):
             prediction = prediction.argmax(-1)
             hist += fast_hist(labels.flatten(), prediction.flatten(), num_classes)
             total += batch_size
+            count_samples(len(images))
             if total >= iterations:
                 break
         IoUs = per_class_iu(hist)
@@ -34,12 +34,12 @@
 # =============================================================================
 ''' Define Deeplabv3plus_xception model and do Quantsim'''
 import os
-import json
 from aimet_tensorflow.keras.quantsim import QuantizationSimModel # pylint:disable = import-error
 from aimet_tensorflow.keras.model_preparer import prepare_model # pylint:disable = import-error
 from aimet_tensorflow.keras.batch_norm_fold import fold_all_batch_norms # pylint:disable = import-error
 from aimet_zoo_tensorflow.deeplabv3plus_tf2.model.nets.deeplab import Deeplabv3
 from aimet_zoo_tensorflow.common.downloader import Downloader
+from aimet_zoo_tensorflow.common.model_registry import get_card, has_card
 
 class Deeplabv3Plus(Downloader):
     """Deeplabv3Plus_xception parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
@@ -52,10 +52,8 @@ class Deeplabv3Plus(Downloader):
         parent_dir = '/'.join(os.path.realpath(__file__).split('/')[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + '/model_cards/' + model_config + '.json'
-            if os.path.exists(config_filepath):
-                with open(config_filepath, encoding='UTF-8') as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(self,
                                 url_pre_opt_weights = self.cfg['artifacts']['url_pre_opt_weights'],
@@ -63,6 +61,7 @@ class Deeplabv3Plus(Downloader):
                                 url_adaround_encodings = self.cfg['artifacts']['url_adaround_encodings'],
                                 url_aimet_encodings = self.cfg['artifacts']['url_aimet_encodings'],
                                 url_aimet_config = self.cfg['artifacts']['url_aimet_config'],
+                                checksums = self.cfg['artifacts'].get('checksums'),
                                 model_dir = parent_dir,
                                 model_config = model_config)
             self.input_shape = tuple(x if x is not None else 1 for x in self.cfg['input_shape'])
@@ -83,11 +82,7 @@ class Deeplabv3Plus(Downloader):
         """download config file and encodings from model cards"""
         if not self.cfg:
             raise NotImplementedError('There are no pretrained weights available for the model_config passed')
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         # load model weights
         if self.path_pre_opt_weights:
             self.model.load_weights(self.path_pre_opt_weights, by_name=True, skip_mismatch=True)
@@ -19,6 +19,7 @@ import numpy as np
 import aimet_common.defs
 from aimet_tensorflow.batch_norm_fold import fold_all_batch_norms
 from aimet_tensorflow.quantsim import QuantizationSimModel
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 import eval_ckpt_main
 import model_builder_factory
 
@@ -239,9 +240,11 @@ def parse_args():
     return args
 
 
+@report_phases("efficientnet_quanteval")
 def main():
     """evaluation main function"""
     args = parse_args()
+    record_arguments(args)
     print(args)
     # adding hardcoded values into args
     download_weights()
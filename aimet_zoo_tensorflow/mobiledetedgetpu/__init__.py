@@ -1,2 +1,9 @@
 """ MobileDet Edge TPU """
-from .model.model_definition import MobileDet
+from typing import TYPE_CHECKING
+from aimet_zoo_tensorflow.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import MobileDet
+
+__all__ = ["MobileDet"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"MobileDet": ".model.model_definition"})
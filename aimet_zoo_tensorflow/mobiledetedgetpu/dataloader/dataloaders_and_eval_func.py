@@ -36,6 +36,7 @@ tf.disable_v2_behavior()
 from pycocotools.coco import COCO
 from pycocotools.cocoeval import COCOeval
 from tf_slim import tfexample_decoder as slim_example_decoder
+from aimet_zoo_tensorflow.common.utils.instrumentation import count_samples, instrumented
 
 from ...common.object_detection import standard_fields as fields 
 from ...common.object_detection.tf_example_decoder import TfExampleDecoder 
@@ -300,6 +301,7 @@ class Dataloader:
                            'IoU[0.75]': cocoEval.stats[2]}
         return dict_map_result
 
+    @instrumented("eval")
     def run_graph(self, session, iterations, compute_miou=True): 
         """
         Evaluates the graph's performance by running data through the network
@@ -325,6 +327,7 @@ class Dataloader:
                 try:
                     output_data = session.run(eval_outputs, feed_dict=feed_dict)
                     counters['success'] += 1
+                    count_samples(len(input_dict[fields.InputDataFields.image]))
                     export_dict = {
                         fields.InputDataFields.source_id:
                             input_dict[fields.InputDataFields.source_id],
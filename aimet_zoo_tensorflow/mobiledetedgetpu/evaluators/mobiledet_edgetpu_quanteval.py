@@ -17,6 +17,7 @@ import os
 import tensorflow.compat.v1 as tf
 from tensorflow.compat.v1 import ConfigProto
 from tensorflow.compat.v1 import InteractiveSession
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_tensorflow.mobiledetedgetpu.model.model_definition import MobileDet
 from aimet_zoo_tensorflow.mobiledetedgetpu.dataloader.dataloaders_and_eval_func import (
     get_dataloader,
@@ -71,9 +72,11 @@ class ModelConfig:
             setattr(self, arg, getattr(args, arg))
 
 
+@report_phases("mobiledet_edgetpu_quanteval")
 def main(raw_args=None):
     """Evaluation main function"""
     args = arguments(raw_args)
+    record_arguments(args)
     config = ModelConfig(args)
 
     dataloader = get_dataloader(
@@ -86,7 +89,7 @@ def main(raw_args=None):
     model = MobileDet(model_config=config.model_config)
     float_sess = model.get_session(quantized=False)
     iterations = int(config.eval_num_examples / config.batch_size)
-    dataloader.run_graph(session=float_sess, iterations=iterations, compute_miou=True)
+    fp32_results = dataloader.run_graph(session=float_sess, iterations=iterations, compute_miou=True)
 
     # Compute activation encodings (only adaround param encodings are preloaded)
     sim = model.get_quantsim(quantized=True)
@@ -96,9 +99,10 @@ def main(raw_args=None):
     )
 
     # Evaluate simulated quantization performance
-    dataloader.run_graph(session=sim.session, iterations=iterations, compute_miou=True)
+    quant_results = dataloader.run_graph(session=sim.session, iterations=iterations, compute_miou=True)
 
     float_sess.close()
+    return {"fp32": fp32_results, "quant": quant_results}
 
 
 if __name__ == "__main__":
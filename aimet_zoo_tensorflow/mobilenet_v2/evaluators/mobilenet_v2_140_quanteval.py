@@ -25,6 +25,7 @@ import tensorflow as tf
 
 from aimet_tensorflow.quantsim import QuantizationSimModel
 from aimet_tensorflow.batch_norm_fold import fold_all_batch_norms
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 
 from nets import nets_factory
 from preprocessing import preprocessing_factory
@@ -255,9 +256,11 @@ def parse_args(args):
     return parser.parse_args(args)
 
 
+@report_phases("mobilenet_v2_140_quanteval")
 def main(args=None):
     """evaluation main function"""
     args = parse_args(args)
+    record_arguments(args)
     download_weights()
     config = ModelConfig(args)
     run_evaluation(config)
@@ -1,4 +1,11 @@
 '''
 import mobilenetv2 model from tensorflow built-in API
 '''
-from tensorflow.keras.applications.mobilenet_v2 import MobileNetV2
+from typing import TYPE_CHECKING
+from aimet_zoo_tensorflow.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from tensorflow.keras.applications.mobilenet_v2 import MobileNetV2
+
+__all__ = ["MobileNetV2"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"MobileNetV2": "tensorflow.keras.applications.mobilenet_v2"})
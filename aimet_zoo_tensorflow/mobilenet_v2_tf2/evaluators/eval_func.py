@@ -14,6 +14,7 @@ import numpy as np
 from tqdm import tqdm
 import tensorflow as tf
 from tensorflow.keras.applications.mobilenet_v2 import preprocess_input
+from aimet_zoo_tensorflow.common.utils.instrumentation import count_samples, instrumented
 from aimet_zoo_tensorflow.mobilenet_v2_tf2.evaluators.preprocess import image_dataset_from_directory
 
 def get_eval_func(dataset_dir, batch_size, num_iterations=50000):
@@ -23,6 +24,7 @@ def get_eval_func(dataset_dir, batch_size, num_iterations=50000):
     :param num_iterations: number of images used
     :return evaluation function
     '''
+    @instrumented("eval")
     def func_wrapper(model, iterations=num_iterations):
         '''
         :param model: FP32 model or sim.model
@@ -77,6 +79,7 @@ def get_eval_func(dataset_dir, batch_size, num_iterations=50000):
             cnt = tf.reduce_sum(tf.cast(label==indices, tf.float32)).numpy()
             top1 += cnt
             total += len(label)
+            count_samples(len(label))
             if total >= iterations:
                 break
 
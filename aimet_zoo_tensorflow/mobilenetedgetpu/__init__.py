@@ -1,2 +1,9 @@
 """ MobileNet Edge TPU """
-from .model.model_definition import MobileNet
+from typing import TYPE_CHECKING
+from aimet_zoo_tensorflow.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import MobileNet
+
+__all__ = ["MobileNet"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"MobileNet": ".model.model_definition"})
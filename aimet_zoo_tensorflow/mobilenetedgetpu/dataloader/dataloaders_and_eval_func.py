@@ -35,6 +35,7 @@ os.environ["TF_CPP_MIN_LOG_LEVEL"] = "2"
 import logging
 
 import tensorflow.compat.v1 as tf
+from aimet_zoo_tensorflow.common.utils.instrumentation import count_samples, instrumented
 tf.disable_v2_behavior()
 
 assert tf.__version__ >= "2"
@@ -249,6 +250,7 @@ class Dataloader:
     def __init__(self, generator):
         self._generator = generator
 
+    @instrumented("eval")
     def run_graph(self, session, iterations): 
         """
         Evaluates the graph's performance by running data through the network
@@ -279,6 +281,7 @@ class Dataloader:
                     
                     cnt += np.sum(indices==labels)
                     count += len(indices)
+                    count_samples(len(indices))
                     counters['success'] += 1
                     bar.set_description(f'total count of samples: {count}, correctly predicted samples: {cnt}')
                 except tf.errors.InvalidArgumentError:
@@ -17,6 +17,7 @@ import os
 import tensorflow.compat.v1 as tf
 from tensorflow.compat.v1 import ConfigProto
 from tensorflow.compat.v1 import InteractiveSession
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_tensorflow.mobilenetedgetpu.model.model_definition import MobileNet
 from aimet_zoo_tensorflow.mobilenetedgetpu.dataloader.dataloaders_and_eval_func import get_dataloader
 
@@ -63,9 +64,11 @@ class ModelConfig:
             setattr(self, arg, getattr(args, arg))
 
 
+@report_phases("mobilenet_edgetpu_quanteval")
 def main(raw_args=None):
     """Evaluation main function"""
     args = arguments(raw_args)
+    record_arguments(args)
     config = ModelConfig(args)
 
     dataloader = get_dataloader(
@@ -91,6 +94,7 @@ def main(raw_args=None):
     print(f'Quantized top1 accuracy: {int8_results_dict["acc_top1"]:0.3f}')
 
     float_sess.close()
+    return {"fp32_acc": fp32_results_dict["acc_top1"], "quant_acc": int8_results_dict["acc_top1"]}
 
 
 if __name__ == "__main__":
@@ -24,6 +24,7 @@ from pycocotools.cocoeval import COCOeval
 from pycocotools.coco import COCO
 from aimet_tensorflow.utils import graph_saver
 from aimet_tensorflow import quantsim
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 
 # import tensorflow as tf
 import tensorflow.compat.v1 as tf
@@ -602,8 +603,10 @@ class ModelConfig:
             setattr(self, arg, getattr(args, arg))
 
 
+@report_phases("pose_estimation_quanteval")
 def pose_estimation_quanteval(args):
     """main evaluation script"""
+    record_arguments(args)
     # automatic download of weights and config for quantizaton
     download_weights()
     # add on hardcoded values to args
@@ -26,6 +26,7 @@ from aimet_tensorflow.bias_correction import (
     QuantParams,
 )
 from aimet_tensorflow.cross_layer_equalization import equalize_model
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 import tensorflow as tf
 from preprocessing import preprocessing_factory
 from nets import nets_factory
@@ -294,9 +295,11 @@ class ModelConfig:
         self.eval_quantized = ast.literal_eval(self.eval_quantized)
 
 
+@report_phases("resnet50_v1_quanteval")
 def main(args=None):
     """main evaluation script"""
     args = parse_args(args)
+    record_arguments(args)
     download_weights()
     config = ModelConfig(args)
     run_evaluation(config)
@@ -1,4 +1,11 @@
 '''
 import resnet50 model from tensorflow built-in API
 '''
-from tensorflow.keras.applications.resnet import ResNet50
+from typing import TYPE_CHECKING
+from aimet_zoo_tensorflow.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from tensorflow.keras.applications.resnet import ResNet50
+
+__all__ = ["ResNet50"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"ResNet50": "tensorflow.keras.applications.resnet"})
@@ -10,6 +10,7 @@
 ''' do TF2 resnet50 quantization and evaluation'''
 import argparse
 import tensorflow as tf
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_tensorflow.resnet50_tf2.model.model_definition import Resnet50
 from aimet_zoo_tensorflow.resnet50_tf2.evaluators.eval_func import get_eval_func
 
@@ -27,9 +28,11 @@ def arguments(raw_args):
     args = parser.parse_args(raw_args)
     return args
 
+@report_phases("resnet50_tf2_quanteval")
 def main(raw_args=None):
     """ Run evaluation """
     args = arguments(raw_args)
+    record_arguments(args)
 
     gpu_devices = tf.config.experimental.list_physical_devices("GPU")
     for device in gpu_devices:
@@ -54,6 +57,7 @@ def main(raw_args=None):
     print("start evaluating quantized accuracy")
     quant_acc = eval_func(sim.model)
     print(f'Quantized top1 accuracy: {quant_acc:0.3f}')
+    return {'fp32_acc':fp32_acc, 'quant_acc':quant_acc}
 
 if __name__ == '__main__':
     main()
@@ -22,6 +22,7 @@ import tensorflow as tf
 from aimet_tensorflow.quantsim import save_checkpoint, load_checkpoint
 from aimet_tensorflow.batch_norm_fold import fold_all_batch_norms
 from aimet_tensorflow import quantsim
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 from keras_retinanet import models
 from keras_retinanet.utils.coco_eval import evaluate_coco
 from keras_retinanet.utils.image import read_image_bgr, preprocess_image, resize_image
@@ -291,9 +292,11 @@ class ModelConfig:
             setattr(self, arg, getattr(args, arg))
 
 
+@report_phases("retinanet_quanteval")
 def main(args=None):
     """evaluation main script"""
     args = parse_args(args)
+    record_arguments(args)
     config = ModelConfig(args)
     download_weights()
     backbone = models.backbone("resnet50")
@@ -29,6 +29,7 @@ from aimet_tensorflow.bias_correction import (
 )
 from aimet_tensorflow.cross_layer_equalization import equalize_model
 from aimet_tensorflow import quantsim
+from aimet_zoo_tensorflow.common.utils.instrumentation import record_arguments, report_phases
 from skimage.metrics import structural_similarity as ssim
 from skimage.metrics import peak_signal_noise_ratio as psnr
 
@@ -191,8 +192,10 @@ def parse_args():
     return parser.parse_args()
 
 
+@report_phases("srgan_quanteval")
 def main(args):
     """main evaluation script"""
+    record_arguments(args)
     # configuration for efficient use of gpu
     config = tf.ConfigProto()
     config.gpu_options.allow_growth = True
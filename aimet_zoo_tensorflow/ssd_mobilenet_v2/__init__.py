@@ -1,2 +1,9 @@
 """ SSD-MobileNetV2 """
-from .model.model_definition import SSDMobileNetV2
+from typing import TYPE_CHECKING
+from aimet_zoo_tensorflow.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import SSDMobileNetV2
+
+__all__ = ["SSDMobileNetV2"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"SSDMobileNetV2": ".model.model_definition"})
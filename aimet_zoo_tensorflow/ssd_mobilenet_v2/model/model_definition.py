@@ -9,13 +9,13 @@
 # =============================================================================
 """Class for downloading and setting up of optmized and original ssd-mobilenetv2 model for AIMET model zoo"""
 import os
-import json
 import pathlib
 import tensorflow.compat.v1 as tf
 
 from aimet_tensorflow.quantsim import QuantizationSimModel # pylint: disable=import-error
 from aimet_tensorflow.batch_norm_fold import fold_all_batch_norms # pylint: disable=import-error
 from aimet_zoo_tensorflow.common.downloader import Downloader
+from aimet_zoo_tensorflow.common.model_registry import get_card
 tf.disable_v2_behavior()
 
 
@@ -26,9 +26,7 @@ class SSDMobileNetV2(Downloader):
         parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            with open(config_filepath) as f_in:
-                self.cfg = json.load(f_in)
+            self.cfg = get_card(model_config)
         if model_config:
             Downloader.__init__(
                 self,
@@ -37,6 +35,7 @@ class SSDMobileNetV2(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 url_zipped_checkpoint=self.cfg["artifacts"]["url_zipped_checkpoint"],
                 model_dir=parent_dir,
                 model_config=model_config,
@@ -84,11 +83,7 @@ class SSDMobileNetV2(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         self._download_compressed_checkpoint()
         meta_graph = None
         # pylint:disable = unused-variable
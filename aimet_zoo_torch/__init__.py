@@ -0,0 +1,4 @@
+""" AIMET Model Zoo for PyTorch, model subpackages are only imported once they are used"""
+from aimet_zoo_torch.common.lazy_import import lazy_subpackages
+
+__getattr__ = lazy_subpackages(__name__)
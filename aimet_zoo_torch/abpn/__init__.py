@@ -1,2 +1,9 @@
 """ loading ABPN downloader class """
-from .model.model_definition import ABPN
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import ABPN
+
+__all__ = ["ABPN"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"ABPN": ".model.model_definition"})
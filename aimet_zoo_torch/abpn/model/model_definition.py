@@ -11,30 +11,30 @@
 #pylint:disable = import-error
 #ignoring this due to aimet not setup in environment
 import os
-import json
 import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.common.super_resolution.models import ABPNRelease
 
 
 class ABPN(ABPNRelease, Downloader):
     """ABPN parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
 
-    def __init__(self, model_config=None, num_channels=28, scaling_factor=2, **kwargs):
+    def __init__(self, model_config=None, num_channels=28, scaling_factor=2, device=None, **kwargs):
         """
         :param model_config:             named model config from which to obtain model artifacts and arguments.
                                          If provided, overwrites the other arguments passed to this object
         :param scaling_factor:           scaling factor for LR-to-HR upscaling (2x, 3x, 4x... or 1.5x)
         :param num_channels:             number of feature channels for convolutional layers
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
+        self.device = device or torch.device("cuda")
         parent_dir = "/".join(os.path.realpath(__file__).split("/")[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         self.scaling_factor = (
             self.cfg["model_args"]["scaling_factor"] if self.cfg else scaling_factor
         )
@@ -49,6 +49,7 @@ class ABPN(ABPNRelease, Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -72,19 +73,15 @@ class ABPN(ABPNRelease, Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
-            state_dict = torch.load(self.path_post_opt_weights)["state_dict"]
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)["state_dict"]
             self.load_state_dict(state_dict)
-            self.cuda()
+            self.to(self.device)
         else:
-            state_dict = torch.load(self.path_pre_opt_weights)["state_dict"]
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)["state_dict"]
             self.load_state_dict(state_dict)
-            self.cuda()
+            self.to(self.device)
         self.eval()
 
     def get_quantsim(self, quantized=False):
@@ -97,8 +94,7 @@ class ABPN(ABPNRelease, Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -1,2 +1,9 @@
 """ package for getting bert original model and quantized model"""
-from .model.model_definition import Bert
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import Bert
+
+__all__ = ["Bert"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"Bert": ".model.model_definition"})
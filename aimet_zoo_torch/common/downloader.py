@@ -10,16 +10,32 @@
 """ Downloader and downlowder progress bar class for downloading and loading weights and encodings"""
 
 import os
+import contextlib
+import hashlib
+import json
+import logging
 import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import shutil
 from shutil import copy2
-from urllib.request import urlretrieve
-import urllib.request
 import progressbar
 import requests
 import gdown# pylint: disable=import-error
+from aimet_zoo_torch.common.artifact_cache import ArtifactCache, default_cache_dir
+from aimet_zoo_torch.common.utils.instrumentation import instrumented
 
+logger = logging.getLogger("Downloader")
+
+_STREAM_CHUNK_SIZE = 1 << 20
+_STREAM_MAX_RETRIES = 3
+RELEASE_INDEX_TTL_ENV = "AIMET_ZOO_RELEASE_INDEX_TTL"
+_DEFAULT_RELEASE_INDEX_TTL = 3600
+# methods of the model classes recorded as phases by utils.instrumentation.report_phases()
+_INSTRUMENTED_METHODS = ("from_pretrained", "get_quantsim")
 
 
 class Downloader:
@@ -28,6 +44,12 @@ class Downloader:
     """
     # pylint: disable=too-many-instance-attributes
     # 16 is reasonable in this case.
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in _INSTRUMENTED_METHODS:
+            if name in cls.__dict__:
+                setattr(cls, name, instrumented(f"{cls.__name__}.{name}")(cls.__dict__[name]))
+
     def __init__(
             self,
             url_pre_opt_weights: str = None,
@@ -40,6 +62,7 @@ class Downloader:
             url_zipped_checkpoint: str = None,
             model_dir: str = "",
             model_config: str = "",
+            checksums: dict = None,
     ):# pylint: disable=too-many-arguments
         """
         :param url_pre_opt_weights:       url hosting pre optimization weights as a state dict
@@ -49,6 +72,8 @@ class Downloader:
         :param url_aimet_config:          url with aimet config to be used by the Quantization Simulation
         :param model_dir:                 path to model's directory within AIMET Model Zoo
         :param model_config:              configuration name for pre-trained model, used to specify the directory for saving weights and encodings
+        :param checksums:                 expected sha256 digests keyed by artifact name (e.g. "url_post_opt_weights"),
+                                          as recorded under "checksums" in the model card's artifacts
         """
 
         self.url_pre_opt_weights = url_pre_opt_weights
@@ -59,6 +84,7 @@ class Downloader:
         self.tar_url_pre_opt_weights = tar_url_pre_opt_weights
         self.tar_url_post_opt_weights = tar_url_post_opt_weights
         self.url_zipped_checkpoint = url_zipped_checkpoint
+        self.model_config = model_config
         self._download_storage_path = (
             Path(model_dir + "/weights/" + model_config + "/")
             if model_config
@@ -99,6 +125,12 @@ class Downloader:
             if self.path_zipped_checkpoint
             else None
         )
+        self._checksums = {
+            getattr(self, name): digest
+            for name, digest in (checksums or {}).items()
+            if getattr(self, name, None)
+        }
+        self._artifact_cache = ArtifactCache()
         # GITHUB TOKEN for internal use cases
         self.GITHUB_TOKEN = None
         self.INTERNAL_REPO_URL = None
@@ -107,52 +139,58 @@ class Downloader:
         """Receives a source URL or path and a storage destination path, evaluates the source, fetches the file, and stores at the destination"""
         # import pdb
         # pdb.set_trace()
-        if not os.path.exists(self._download_storage_path):
-            os.makedirs(self._download_storage_path)
+        os.makedirs(self._download_storage_path, exist_ok=True)
         if src is None:
             return "Skipping download, URL not provided on model definition"
+        if src.startswith("http"):
+            cached = self._artifact_cache.lookup(src, self._checksums.get(src))
+            if cached is not None:
+                self._artifact_cache.materialize(cached, dst)
+                return None
+        if os.path.islink(dst):
+            # link to an evicted cache entry, writing through it would land inside the cache
+            os.remove(dst)
+        self._fetch(src, dst, show_progress=show_progress)
+        if src.startswith("http"):
+            self._artifact_cache.store(src, dst, self._checksums.get(src))
+        return None
+
+    def _fetch(self, src: str, dst: str, show_progress=False):
+        """fetches src, a Google Drive link, http(s) URL or system path, to dst bypassing the artifact cache"""
         if src.startswith("https://drive.google.com"):
             gdown.download(url=src, output=dst, quiet=True, verify=False)
         elif src.startswith("http"):
             if 'qualcomm' in src:
                 self._download_from_internal(src,dst)
             else:
-                if show_progress:
-                    urlretrieve(src, dst, DownloadProgressBar())
-                else:
-                    urlretrieve(src, dst)
+                self._stream_download(src, dst, show_progress=show_progress)
         else:
             assert os.path.exists(
                 src
             ), "URL passed is not an http, assumed it to be a system path, but such path does not exist"
             copy2(src, dst)
-        return None
 
     def _convert_src_to_asset_url(self, src: str):
         """convert src url to asset url 
         """
-        # 0. get release_tag and file_name from url
         release_tag, file_name = self._find_tag(src)
-        # 1. read all release in to all_releases
-        headers = {
-                    'Authorization': 'token ' + self.GITHUB_TOKEN ,    
-                    'Accept': 'application/json',
-                }
+        return self._release_index().resolve(release_tag, file_name)
 
-        resp = requests.get(self.INTERNAL_REPO_URL,headers = headers,timeout=(4, 30))
-
-        all_releases = resp.json()
-        # 2. check if release_tag in all_releases else report artifacts not uploade
-        content_with_tag_name = [s for s in all_releases if s['tag_name']== release_tag ]
-        if content_with_tag_name is None:
-            raise NameError('this release tag is not uploaded, check if release tag or if this release is uploaded yet')
-        # 3. check if file_name in all_releases['release_tag'], else report file not uploaded or file name is wrong
-        assets_with_tag_name = content_with_tag_name[0]['assets']
-        asset_with_file_name = [s for s in assets_with_tag_name if s['name']== file_name ]
-        if asset_with_file_name is None:
-            raise NameError('this artifact is not uploaded or naming has mismatch with release')
-        # 4. return asset_url
-        return asset_with_file_name[0]['url']
+    def _resolve_asset_urls(self, srcs: list) -> dict:
+        """convert several internal src urls, e.g. all artifacts of a model card, to asset urls with one release listing"""
+        srcs = [src for src in srcs if src]
+        asset_urls = self._release_index().resolve_many([self._find_tag(src) for src in srcs])
+        return dict(zip(srcs, asset_urls))
+
+    def _release_index(self):
+        """release index of INTERNAL_REPO_URL, authenticated with GITHUB_TOKEN"""
+        self.GITHUB_TOKEN= os.getenv("GITHUB_TOKEN")
+        self.INTERNAL_REPO_URL= os.getenv("INTERNAL_REPO_URL")
+        if self.GITHUB_TOKEN is None:
+            raise NameError("GITHUB_TOKEN not setup, not able to download from internal github url, exit program!")
+        if self.INTERNAL_REPO_URL is None:
+            raise NameError("variable INTERNAL_REPO_URL not setup, use export INTERNAL_REPO_URL=<INTERNAL_REPO_URL> to setup before continuing")
+        return ReleaseIndex(self.INTERNAL_REPO_URL, self.GITHUB_TOKEN, self._artifact_cache.cache_dir)
 
     def _find_tag(self, src: str):
         """find out release tag and file name 
@@ -167,21 +205,107 @@ class Downloader:
         """Use GITHUB_TOKEN evironment variable to download from internal github repo link 
 
         """
-        self.GITHUB_TOKEN= os.getenv("GITHUB_TOKEN")
-        self.INTERNAL_REPO_URL= os.getenv("INTERNAL_REPO_URL")
-        if self.GITHUB_TOKEN is None:
-            raise NameError("GITHUB_TOKEN not setup, not able to download from internal github url, exit program!")
-        if self.INTERNAL_REPO_URL is None:
-            raise NameError("variable INTERNAL_REPO_URL not setup, use export INTERNAL_REPO_URL=<INTERNAL_REPO_URL> to setup before continuing")
+        asset_url, headers = self._internal_asset_request(src)
+        self._stream_download(asset_url, dst, headers=headers)
+
+    def _internal_asset_request(self, src: str):
+        """resolves an internal github link to its asset url and the headers needed to download it"""
         asset_url = self._convert_src_to_asset_url(src)
         headers = {
                     'Authorization': 'token ' + self.GITHUB_TOKEN ,    
                     'Accept': 'application/octet-stream',
                 }
-        resp = requests.get(asset_url,headers = headers, timeout=(4, 30) )
-        with open(dst, 'wb') as file:
-            file.write(resp.content)
+        return asset_url, headers
 
+    @staticmethod
+    def _stream_download(url: str, dst: str, headers: dict = None, show_progress=False):
+        """
+        Streams url to disk in fixed size chunks so memory use does not depend on the artifact size.
+        Data is written to <dst>.part, which is renamed to dst only once complete. A .part file left
+        behind by a dropped connection is resumed with an HTTP Range request instead of starting over.
+        """
+        part_path = dst + ".part"
+        progress_bar = DownloadProgressBar() if show_progress else None
+        for attempt in range(_STREAM_MAX_RETRIES + 1):
+            request_headers = dict(headers or {})
+            offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+            if offset:
+                request_headers["Range"] = f"bytes={offset}-"
+            try:
+                with requests.get(url, headers=request_headers, stream=True, timeout=(4, 30)) as resp:
+                    if resp.status_code == 416:
+                        if resp.headers.get("Content-Range", "").endswith(f"/{offset}"):
+                            # the partial file already holds every byte
+                            os.replace(part_path, dst)
+                            return
+                        # the partial file does not match what the server holds anymore
+                        os.remove(part_path)
+                        continue
+                    resp.raise_for_status()
+                    if offset and resp.status_code != 206:
+                        # server ignored the Range header and sent the whole file
+                        offset = 0
+                    total_size = offset + int(resp.headers.get("Content-Length", 0))
+                    with open(part_path, "ab" if offset else "wb") as f_out:
+                        for chunk in resp.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+                            f_out.write(chunk)
+                            offset += len(chunk)
+                            if progress_bar and total_size:
+                                progress_bar(1, offset, total_size)
+                os.replace(part_path, dst)
+                return
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError,
+                    requests.exceptions.Timeout):
+                if attempt == _STREAM_MAX_RETRIES:
+                    raise
+                logger.info("Connection to %s dropped, resuming from byte %d", url, offset)
+        raise IOError(f"Could not download {url} after {_STREAM_MAX_RETRIES + 1} attempts")
+
+
+    @instrumented("download_artifacts")
+    def _download_artifacts(self, max_workers: int = 4):
+        """
+        Downloads pre and post optimization weights, aimet config, aimet encodings and adaround encodings
+        concurrently on a bounded thread pool, and waits until the whole set is on disk
+        :param max_workers:     maximum number of artifacts fetched at the same time
+        :return:                download time in seconds per artifact, also kept as self.download_timings
+        """
+        artifacts = {
+            "pre_opt_weights": (self.url_pre_opt_weights, self.path_pre_opt_weights),
+            "post_opt_weights": (self.url_post_opt_weights, self.path_post_opt_weights),
+            "aimet_config": (self.url_aimet_config, self.path_aimet_config),
+            "aimet_encodings": (self.url_aimet_encodings, self.path_aimet_encodings),
+            "adaround_encodings": (self.url_adaround_encodings, self.path_adaround_encodings),
+        }
+        artifacts = {name: (src, dst) for name, (src, dst) in artifacts.items() if src}
+
+        def _timed_download(src, dst):
+            start = time.perf_counter()
+            self._download_from_url(src=src, dst=dst)
+            return time.perf_counter() - start
+
+        self.download_timings = {}
+        if not artifacts:
+            return self.download_timings
+        os.makedirs(self._download_storage_path, exist_ok=True)
+        internal_srcs = [
+            src for src, dst in artifacts.values()
+            if 'qualcomm' in src and self._artifact_cache.lookup(src, self._checksums.get(src)) is None
+        ]
+        if internal_srcs:
+            # one release listing up front instead of one per worker thread
+            self._resolve_asset_urls(internal_srcs)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(artifacts))) as pool:
+            futures = {
+                pool.submit(_timed_download, src, dst): name
+                for name, (src, dst) in artifacts.items()
+            }
+            for future in as_completed(futures):
+                self.download_timings[futures[future]] = future.result()
+        for name, seconds in self.download_timings.items():
+            logger.info("Fetched %s in %.2fs", name, seconds)
+        return self.download_timings
 
     def _download_pre_opt_weights(self, show_progress=False):
         """downloads pre optimization weights"""
@@ -223,34 +347,206 @@ class Downloader:
 
     def _download_compressed_checkpoint(self):
         """download a zipped checkpoint file and unzip it"""
-        self._download_from_url(
-            src=self.url_zipped_checkpoint, dst=self.path_zipped_checkpoint
-        )
-        file_format = "".join(self.url_zipped_checkpoint.split("/")[-1].split(".")[1:][::-1])
-        if not os.path.exists(self.extract_dir):
-            os.makedirs(self.extract_dir)
-        shutil.unpack_archive(
-            filename=self.path_zipped_checkpoint,
-            extract_dir=self.extract_dir,
-            format=file_format,
-        )
+        tree = self._cache_compressed_checkpoint()
+        os.makedirs(self._download_storage_path, exist_ok=True)
+        self._artifact_cache.materialize_tree(tree, self.extract_dir)
 
     def _download_tar_decompress(self, tar_url):
         """ "download tarball and decompress into downloaded_weights folder"""
-        if not os.path.exists(self._download_storage_path):
-            os.mkdir(self._download_storage_path)
-        download_tar_name = (
-            str(self._download_storage_path) + "/downloaded_weights.tar.gz"
-        )
-        urllib.request.urlretrieve(tar_url, download_tar_name, DownloadProgressBar())
-        with tarfile.open(download_tar_name) as pth_weights:
-            pth_weights.extractall(self._download_storage_path)
-            folder_name = pth_weights.getnames()[0]
-            download_path = str(self._download_storage_path) + "/" + str(folder_name)
-            new_download_path = str(self._download_storage_path) + "/downloaded_weights"
-            if os.path.exists(new_download_path):
-                shutil.rmtree(new_download_path)
-            os.rename(download_path, new_download_path)
+        tree = self._cache_tarball(tar_url, show_progress=True)
+        os.makedirs(self._download_storage_path, exist_ok=True)
+        new_download_path = str(self._download_storage_path) + "/downloaded_weights"
+        self._artifact_cache.materialize_tree(tree, new_download_path)
+
+    def _cache_artifact(self, src: str) -> Path:
+        """cached copy of the http(s) artifact src, fetched into the artifact cache on a miss"""
+        cached = self._artifact_cache.lookup(src, self._checksums.get(src))
+        if cached is not None:
+            return cached
+        self._artifact_cache.cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=self._artifact_cache.cache_dir, prefix=".tmp_") as scratch_dir:
+            scratch_path = os.path.join(scratch_dir, "artifact")
+            self._fetch(src, scratch_path)
+            return self._artifact_cache.store(src, scratch_path, self._checksums.get(src))
+
+    def _cache_compressed_checkpoint(self) -> Path:
+        """unpacked zipped checkpoint from the artifact cache, fetched and unpacked into it on a miss"""
+        url = self.url_zipped_checkpoint
+        file_format = "".join(url.split("/")[-1].split(".")[1:][::-1])
+
+        def _unpack(scratch_dir):
+            if file_format != "zip":
+                self._stream_extract_tar(url, scratch_dir)
+                return scratch_dir
+            # zip keeps its member index at the end of the archive, so it has to be on disk before unpacking
+            archive_path = os.path.join(scratch_dir, "zipped_checkpoint.zip")
+            extract_dir = os.path.join(scratch_dir, "extracted")
+            self._fetch(url, archive_path)
+            shutil.unpack_archive(filename=archive_path, extract_dir=extract_dir, format=file_format)
+            os.remove(archive_path)
+            return extract_dir
+
+        return self._artifact_cache.lookup_tree(url) or self._artifact_cache.store_tree(url, _unpack)
+
+    def _cache_tarball(self, tar_url: str, show_progress=False) -> Path:
+        """unpacked tarball from the artifact cache, fetched and unpacked into it on a miss"""
+
+        def _unpack(scratch_dir):
+            folder_name = self._stream_extract_tar(tar_url, scratch_dir, show_progress=show_progress)
+            return os.path.join(scratch_dir, folder_name)
+
+        return self._artifact_cache.lookup_tree(tar_url) or self._artifact_cache.store_tree(tar_url, _unpack)
+
+    def _stream_extract_tar(self, src: str, extract_dir: str, show_progress=False):
+        """
+        Unpacks the tarball at src, an http(s) URL or system path, into extract_dir member by member while
+        it is being read, so the archive itself never touches the disk
+        :return: name of the first member of the archive
+        """
+        headers = None
+        url = src
+        if src.startswith("http") and 'qualcomm' in src:
+            url, headers = self._internal_asset_request(src)
+        # the "data" filter rejects absolute paths and links escaping extract_dir, where python supports it
+        extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+        first_member = None
+        with contextlib.ExitStack() as stack:
+            if url.startswith("http"):
+                resp = stack.enter_context(requests.get(url, headers=headers, stream=True, timeout=(4, 30)))
+                resp.raise_for_status()
+                resp.raw.decode_content = True
+                stream, total_size = resp.raw, int(resp.headers.get("Content-Length", 0))
+            else:
+                stream, total_size = stack.enter_context(open(url, "rb")), os.path.getsize(url)
+            reader = _HashingReader(stream, total_size, DownloadProgressBar() if show_progress else None)
+            with tarfile.open(fileobj=reader, mode="r|*") as tar:
+                for member in tar:
+                    first_member = first_member or member.name
+                    tar.extract(member, extract_dir, **extract_kwargs)
+            # consume trailing padding so the digest covers the whole archive
+            while reader.read(_STREAM_CHUNK_SIZE):
+                pass
+        expected_sha256 = self._checksums.get(src)
+        if expected_sha256 and reader.hexdigest() != expected_sha256.lower():
+            raise ValueError(
+                f"Checksum mismatch for {src}: expected sha256 {expected_sha256}, downloaded archive has {reader.hexdigest()}"
+            )
+        return first_member
+
+
+class ReleaseIndex:
+    """
+    (release tag, file name) -> asset url lookup over the releases of a GitHub repository. The release
+    listing is fetched once per process and persisted as release_index.json in the artifact cache directory.
+    It is fetched again only when older than the TTL ($AIMET_ZOO_RELEASE_INDEX_TTL seconds, default one
+    hour) or when an asset is missing from it.
+    """
+    _memory = {}
+    _lock = threading.Lock()
+
+    def __init__(self, repo_url: str, token: str, cache_dir=None, ttl: float = None):
+        """
+        :param repo_url:     GitHub API url listing the repository's releases
+        :param token:        GitHub token used to authenticate the listing
+        :param cache_dir:    directory holding release_index.json, defaults to the artifact cache root
+        :param ttl:          seconds a listing stays valid
+        """
+        self.repo_url = repo_url
+        self._token = token
+        self._index_path = Path(cache_dir or default_cache_dir()) / "release_index.json"
+        self._ttl = ttl if ttl is not None else float(os.getenv(RELEASE_INDEX_TTL_ENV, _DEFAULT_RELEASE_INDEX_TTL))
+
+    def resolve(self, release_tag: str, file_name: str) -> str:
+        """asset url of file_name in the release tagged release_tag"""
+        return self.resolve_many([(release_tag, file_name)])[0]
+
+    def resolve_many(self, tags_and_names: list) -> list:
+        """asset urls for a list of (release tag, file name) pairs, costing at most one release listing"""
+        with self._lock:
+            entry = self._entry()
+            if any(f"{tag}/{name}" not in entry["assets"] for tag, name in tags_and_names):
+                # a stale listing may predate the upload, check once against a fresh one
+                entry = self._entry(refresh=True)
+        asset_urls = []
+        for tag, name in tags_and_names:
+            asset_url = entry["assets"].get(f"{tag}/{name}")
+            if asset_url is None:
+                if tag not in entry["tags"]:
+                    raise NameError('this release tag is not uploaded, check if release tag or if this release is uploaded yet')
+                raise NameError('this artifact is not uploaded or naming has mismatch with release')
+            asset_urls.append(asset_url)
+        return asset_urls
+
+    def _entry(self, refresh=False) -> dict:
+        """listing of repo_url from memory, then disk, then the GitHub API"""
+        entry = None if refresh else self._memory.get(self.repo_url)
+        if entry is None and not refresh:
+            entry = self._load().get(self.repo_url)
+        if entry is None or time.time() - entry["fetched_at"] > self._ttl:
+            entry = self._fetch()
+            persisted = self._load()
+            persisted[self.repo_url] = entry
+            self._save(persisted)
+        self._memory[self.repo_url] = entry
+        return entry
+
+    def _fetch(self) -> dict:
+        """reads every page of the release listing into a flat "tag/file name" -> asset url map"""
+        headers = {
+                    'Authorization': 'token ' + self._token ,    
+                    'Accept': 'application/json',
+                }
+        tags, assets = [], {}
+        url = self.repo_url
+        while url:
+            resp = requests.get(url, headers=headers, timeout=(4, 30))
+            resp.raise_for_status()
+            for release in resp.json():
+                tags.append(release['tag_name'])
+                for asset in release['assets']:
+                    assets[f"{release['tag_name']}/{asset['name']}"] = asset['url']
+            url = resp.links.get("next", {}).get("url")
+        return {"fetched_at": time.time(), "tags": tags, "assets": assets}
+
+    def _load(self) -> dict:
+        if self._index_path.is_file():
+            try:
+                with open(self._index_path, encoding="UTF-8") as f_in:
+                    return json.load(f_in)
+            except ValueError:
+                pass
+        return {}
+
+    def _save(self, persisted: dict):
+        self._index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._index_path.parent, prefix=".release_index_")
+        with os.fdopen(fd, "w", encoding="UTF-8") as f_out:
+            json.dump(persisted, f_out)
+        os.replace(tmp_path, self._index_path)
+
+
+class _HashingReader:
+    """Read-only file wrapper that hashes the bytes passing through it and reports progress"""
+
+    def __init__(self, stream, total_size: int, progress_bar=None):
+        self._stream = stream
+        self._total_size = total_size
+        self._progress_bar = progress_bar
+        self._digest = hashlib.sha256()
+        self._bytes_read = 0
+
+    def read(self, size=-1):
+        """reads up to size bytes from the wrapped stream"""
+        chunk = self._stream.read(size)
+        self._digest.update(chunk)
+        self._bytes_read += len(chunk)
+        if self._progress_bar and self._total_size:
+            self._progress_bar(1, self._bytes_read, self._total_size)
+        return chunk
+
+    def hexdigest(self) -> str:
+        """SHA-256 of everything read so far"""
+        return self._digest.hexdigest()
 
 
 class DownloadProgressBar:
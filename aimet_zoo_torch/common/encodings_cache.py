@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Persistent cache of calibrated encodings
+
+sim.compute_encodings() runs the model over the calibration set, which the evaluators repeat on every run even when
+the sim and the calibration data are unchanged. The encodings a calibration produced are exported once and stored
+under <artifact cache>/encodings/<model config>/, keyed by a fingerprint of the calibration files (paths, sizes and
+modification times, or their contents), of the sim (weights and quantizer settings) and of the forward pass
+settings. On a hit they are applied with load_encodings_to_sim instead of calibrating again.
+Set AIMET_ZOO_ENCODINGS_CACHE=0 to always calibrate.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+import torch
+from aimet_torch.quantsim import load_encodings_to_sim
+from aimet_zoo_torch.common.artifact_cache import default_cache_dir, sha256sum
+from aimet_zoo_torch.common.utils.instrumentation import instrumented
+
+logger = logging.getLogger("Downloader")
+
+ENCODINGS_CACHE_ENV = "AIMET_ZOO_ENCODINGS_CACHE"
+_FINGERPRINT_FORMAT = 1
+_EXPORT_PREFIX = "calibrated"
+_QUANTIZER_SETTINGS = ("enabled", "bitwidth", "use_symmetric_encodings", "round_mode", "quant_scheme")
+_ENCODING_FIELDS = ("bw", "min", "max", "delta", "offset")
+
+
+def dataset_fingerprint(paths, hash_contents: bool = False) -> str:
+    """
+    Returns a fingerprint of the calibration files, which changes when a file is added, removed or modified
+    :param paths:            calibration files, in the order they are fed to the model
+    :param hash_contents:    hash the file contents instead of relying on sizes and modification times
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        path = os.path.abspath(path)
+        if hash_contents:
+            entry = [path, sha256sum(path)]
+        else:
+            stat = os.stat(path)
+            entry = [path, stat.st_size, stat.st_mtime_ns]
+        digest.update(json.dumps(entry).encode("UTF-8"))
+    return digest.hexdigest()
+
+
+def _encoding_values(encoding):
+    """bitwidth and range of a per tensor or per channel encoding"""
+    encodings = encoding if isinstance(encoding, (list, tuple)) else [encoding]
+    return [[getattr(enc, field, None) for field in _ENCODING_FIELDS] for enc in encodings]
+
+
+def _quantizers(quantizers):
+    """quantizers of a wrapper are kept in lists or in dicts keyed by name"""
+    return sorted(quantizers.items()) if isinstance(quantizers, dict) else list(enumerate(quantizers))
+
+
+def quantsim_fingerprint(sim) -> str:
+    """
+    Returns a fingerprint of everything about sim that calibration depends on: the weights, which quantizers are
+    enabled and how they are configured, and frozen parameter encodings, e.g. from AdaRound
+    """
+    digest = hashlib.sha256()
+    for name, tensor in sim.model.state_dict().items():
+        tensor = tensor.detach().cpu().contiguous()
+        digest.update(f"{name}:{tensor.dtype}:{tuple(tensor.shape)}".encode("UTF-8"))
+        digest.update(tensor.numpy().tobytes())
+    for name, wrapper in sim.quant_wrappers():
+        for kind in ("input_quantizers", "output_quantizers", "param_quantizers"):
+            for quantizer_name, quantizer in _quantizers(getattr(wrapper, kind, [])):
+                settings = {setting: str(getattr(quantizer, setting, None)) for setting in _QUANTIZER_SETTINGS}
+                if getattr(quantizer, "_is_encoding_frozen", False):
+                    settings["frozen"] = _encoding_values(quantizer.encoding)
+                digest.update(json.dumps([name, kind, str(quantizer_name), settings], default=str).encode("UTF-8"))
+    return digest.hexdigest()
+
+
+def export_encodings(sim, path, dummy_input):
+    """
+    Exports the encodings of the calibrated sim to path, in the format load_encodings_to_sim reads
+    :param dummy_input:    model input on the cpu, sim.export() traces the model with it
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=path.parent, prefix=".tmp_") as export_dir:
+        sim.export(export_dir, _EXPORT_PREFIX, dummy_input)
+        # the torch encodings are keyed by module name, which is what load_encodings_to_sim reads
+        os.replace(os.path.join(export_dir, f"{_EXPORT_PREFIX}_torch.encodings"), path)
+    return path
+
+
+class EncodingsCache:
+    """Exported encodings of calibrated sims, one directory per model config"""
+
+    def __init__(self, cache_dir=None):
+        """
+        :param cache_dir:    root directory of the artifact cache, defaults to default_cache_dir()
+        """
+        self.root = (Path(cache_dir) if cache_dir else default_cache_dir()) / "encodings"
+
+    @staticmethod
+    def key(sim, calibration_fingerprint: str, **settings) -> str:
+        """
+        Returns the key of the encodings of sim calibrated on the given calibration set
+        :param sim:                        QuantizationSimModel to be calibrated
+        :param calibration_fingerprint:    dataset_fingerprint() of the calibration files
+        :param settings:                   anything else calibration depends on, e.g. preprocessing or batch size
+        """
+        fingerprint = {
+            "format": _FINGERPRINT_FORMAT,
+            "calibration": calibration_fingerprint,
+            "sim": quantsim_fingerprint(sim),
+            "torch": torch.__version__,
+            "settings": settings,
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode("UTF-8")).hexdigest()
+
+    def encodings_path(self, model_config: str, key: str) -> Path:
+        """path of the encodings of model_config with the given key"""
+        return self.root / model_config / f"{key}.encodings"
+
+    def load(self, sim, model_config: str, key: str) -> bool:
+        """Applies the cached encodings to sim, returns False on a miss or when they cannot be applied anymore"""
+        path = self.encodings_path(model_config, key)
+        if not path.is_file():
+            return False
+        try:
+            load_encodings_to_sim(sim, str(path))
+        except Exception as error:  # pylint: disable=broad-except
+            logger.warning("Discarding unusable cached encodings %s: %s", path, error)
+            os.remove(path)
+            return False
+        return True
+
+    def save(self, sim, model_config: str, key: str, dummy_input):
+        """
+        Exports the encodings of the calibrated sim, best effort since a failed export only costs calibrating again
+        :param dummy_input:    model input on the cpu, sim.export() traces the model with it
+        """
+        try:
+            export_encodings(sim, self.encodings_path(model_config, key), dummy_input)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.warning("Could not cache the encodings of %s: %s", model_config, error)
+
+    def invalidate(self, model_config: str = None) -> int:
+        """
+        Removes the cached encodings of model_config, or all of them when model_config is None
+        :return: number of encodings files removed
+        """
+        target = self.root / model_config if model_config else self.root
+        if not target.is_dir():
+            return 0
+        removed = sum(1 for _ in target.rglob("*.encodings"))
+        shutil.rmtree(target)
+        return removed
+
+
+@instrumented("calibration")
+def cached_compute_encodings(sim, model_config: str, calibration_files, forward_pass_callback,
+                             forward_pass_callback_args, dummy_input, hash_contents: bool = False, **settings):
+    """
+    Calibrates sim like sim.compute_encodings(forward_pass_callback, forward_pass_callback_args), loading the
+    encodings of an identical earlier calibration instead when there is one
+    :param sim:                           QuantizationSimModel to calibrate
+    :param model_config:                  name of the model card, or of the model for evaluators without cards
+    :param calibration_files:             files the forward pass reads the calibration data from
+    :param forward_pass_callback:         forward pass passed on to sim.compute_encodings()
+    :param forward_pass_callback_args:    arguments passed on to forward_pass_callback
+    :param dummy_input:                   model input on the cpu, used to export the encodings after calibration
+    :param hash_contents:                 fingerprint the calibration files by content instead of size and mtime
+    :param settings:                      anything else calibration depends on, e.g. preprocessing or batch size
+    """
+    if os.getenv(ENCODINGS_CACHE_ENV, "1") == "0":
+        sim.compute_encodings(forward_pass_callback, forward_pass_callback_args=forward_pass_callback_args)
+        return
+    cache = EncodingsCache()
+    key = cache.key(sim, dataset_fingerprint(calibration_files, hash_contents), **settings)
+    if cache.load(sim, model_config, key):
+        logger.info("Loaded the encodings of %s from %s", model_config, cache.encodings_path(model_config, key))
+        return
+    sim.compute_encodings(forward_pass_callback, forward_pass_callback_args=forward_pass_callback_args)
+    cache.save(sim, model_config, key, dummy_input)
+
+
+def invalidate(model_config: str = None, cache_dir=None) -> int:
+    """Removes the cached encodings of model_config, or all of them, returns the number removed"""
+    return EncodingsCache(cache_dir).invalidate(model_config)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Module level __getattr__ (PEP 562) helpers, so importing a package does not import every model's dependencies"""
+
+import importlib
+import importlib.util
+import sys
+
+
+def lazy_attributes(module_name: str, attributes: dict):
+    """
+    Returns __getattr__ and __dir__ functions for a package that import the module defining a public
+    attribute only when the attribute is first accessed, e.g. by "from aimet_zoo_torch.resnet import ResNet"
+    :param module_name:    __name__ of the package
+    :param attributes:     attribute name -> module defining it, relative to the package or absolute
+    """
+    module = sys.modules[module_name]
+
+    def __getattr__(name):
+        if name not in attributes:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(attributes[name], module_name), name)
+        # later lookups find the attribute directly and do not come through here again
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(module)) | set(attributes))
+
+    return __getattr__, __dir__
+
+
+def lazy_subpackages(module_name: str):
+    """
+    Returns a __getattr__ function for a top level package that imports a subpackage on first attribute
+    access, so "import aimet_zoo_torch" stays cheap while aimet_zoo_torch.resnet keeps working
+    :param module_name:    __name__ of the package
+    """
+
+    def __getattr__(name):
+        if not name.startswith("_") and importlib.util.find_spec(f"{module_name}.{name}") is not None:
+            return importlib.import_module(f"{module_name}.{name}")
+        raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+
+    return __getattr__
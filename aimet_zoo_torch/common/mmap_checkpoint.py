@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Memory mapped loading of pickled model and QuantizationSimModel checkpoints
+
+With torch >= 2.1, checkpoints in torch's zip serialization format are loaded with mmap=True. Tensors are then
+backed by the file and only read from disk when they are touched. Checkpoints in another format are converted
+to the zip format once: a plain pickle, e.g. written by aimet_torch.quantsim.save_checkpoint, or a legacy torch
+file. The converted copy is kept in the artifact cache, keyed by the digest of the original, so it is never stale.
+The conversion can be done ahead of time:
+
+    python -m aimet_zoo_torch.common.mmap_checkpoint <checkpoint> [<checkpoint> ...]
+"""
+
+import argparse
+import logging
+import os
+import pickle
+import tempfile
+import zipfile
+from pathlib import Path
+import torch
+from aimet_zoo_torch.common.artifact_cache import default_cache_dir, sha256sum
+
+logger = logging.getLogger("Downloader")
+
+_MMAP_MIN_TORCH_VERSION = (2, 1)
+# legacy torch files open with the pickled magic number 0x1950a86a20f9469cfc6c, written with pickle protocol 2
+_LEGACY_TORCH_HEADER = b"\x80\x02\x8a\x0a" + (0x1950A86A20F9469CFC6C).to_bytes(10, "little")
+
+
+def mmap_supported() -> bool:
+    """True if the installed torch can memory map checkpoints, torch.load(mmap=True) needs torch 2.1"""
+    version = tuple(int(part) for part in torch.__version__.split("+")[0].split(".")[:2])
+    return version >= _MMAP_MIN_TORCH_VERSION
+
+
+def load_checkpoint(path: str, map_location=None):
+    """
+    Loads a pickled model, state dict or QuantizationSimModel checkpoint, memory mapping its tensors when the
+    installed torch supports it, and falls back to reading the whole file otherwise
+    :param path:            checkpoint file, in torch's zip or legacy format or as a plain pickle
+    :param map_location:    device to load the tensors onto, by default the device they were saved from
+    """
+    if not mmap_supported():
+        return _load_eagerly(path, map_location)
+    try:
+        mmap_path = mmap_compatible_path(path)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.warning("Could not convert %s to a memory mappable checkpoint, loading it eagerly: %s", path, error)
+        return _load_eagerly(path, map_location)
+    return torch.load(mmap_path, map_location=map_location, mmap=True, weights_only=False)
+
+
+def mmap_compatible_path(path: str) -> str:
+    """Returns path itself if the checkpoint is in torch's zip format, otherwise its converted copy, converting on first use"""
+    if zipfile.is_zipfile(path):
+        return path
+    converted = _converted_path(path)
+    if not converted.is_file():
+        convert_checkpoint(path, str(converted))
+    return str(converted)
+
+
+def convert_checkpoint(src: str, dst: str):
+    """
+    Rewrites the checkpoint at src in torch's zip serialization format, which torch.load can memory map
+    :param src:    checkpoint in torch's legacy format or a plain pickle
+    :param dst:    path of the converted checkpoint, written atomically
+    """
+    start_size = os.path.getsize(src)
+    checkpoint = _load_eagerly(src, map_location=None)
+    Path(dst).parent.mkdir(parents=True, exist_ok=True)
+    # torch.save rejects file names without an extension on some versions
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dst)), prefix=".tmp_", suffix=".pt")
+    os.close(fd)
+    try:
+        torch.save(checkpoint, tmp_path)
+        os.replace(tmp_path, dst)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    logger.info("Converted %s (%d bytes) to %s (%d bytes)", src, start_size, dst, os.path.getsize(dst))
+
+
+def _load_eagerly(path: str, map_location=None):
+    """reads the whole checkpoint into memory, plain pickles are what aimet_torch's save_checkpoint writes"""
+    with open(path, "rb") as f_in:
+        header = f_in.read(len(_LEGACY_TORCH_HEADER))
+    if zipfile.is_zipfile(path) or header == _LEGACY_TORCH_HEADER:
+        # fully pickled models, e.g. of the BERT family, are not loadable with the weights_only default of torch 2.6
+        return torch.load(path, map_location=map_location, weights_only=False)
+    with open(path, "rb") as f_in:
+        return pickle.load(f_in)
+
+
+def _converted_path(path: str) -> Path:
+    """converted copies are keyed by the digest of the original, which is the blob name for cached artifacts"""
+    real_path = Path(os.path.realpath(path))
+    if real_path.parent.name == "sha256" and real_path.parent.parent.name == "blobs":
+        digest = real_path.name
+    else:
+        digest = sha256sum(real_path)
+    return default_cache_dir() / "mmap" / f"{digest}.pt"
+
+
+def arguments(raw_args):
+    """ Parse input arguments """
+    parser = argparse.ArgumentParser(description="Convert checkpoints so that they can be loaded memory mapped")
+    parser.add_argument("checkpoints", nargs="+", help="checkpoint files, e.g. downloaded pre_opt_weights")
+    parser.add_argument("--output", help="write the converted checkpoint here instead of the artifact cache, "
+                        "only with a single checkpoint", default=None, type=str)
+    args = parser.parse_args(raw_args)
+    if args.output and len(args.checkpoints) > 1:
+        parser.error("--output takes a single checkpoint")
+    return args
+
+
+def main(raw_args=None):
+    """ Convert checkpoints """
+    args = arguments(raw_args)
+    for checkpoint in args.checkpoints:
+        if args.output:
+            convert_checkpoint(checkpoint, args.output)
+            print(f"{checkpoint} -> {args.output}")
+        else:
+            print(f"{checkpoint} -> {mmap_compatible_path(checkpoint)}")
+
+
+if __name__ == "__main__":
+    main()
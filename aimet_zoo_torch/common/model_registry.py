@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Registry of every model card in the package, backed by an index that is compiled once per package version"""
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from importlib import metadata
+from pathlib import Path
+from aimet_zoo_torch.common.artifact_cache import default_cache_dir
+
+PACKAGE_NAME = "aimet_zoo_torch"
+_PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+_INDEX_FORMAT = 1
+_index = None
+_index_lock = threading.Lock()
+
+
+def list_models(framework: str = None, task: str = None, model: str = None) -> list:
+    """
+    Returns the sorted names of all model configs, optionally filtered
+    :param framework:    framework named in the model card, e.g. "pytorch"
+    :param task:         task named in the model card, e.g. "image classification"
+    :param model:        model subpackage the card belongs to, e.g. "resnet"
+    """
+    entries = _get_index()["models"]
+    return sorted(
+        name for name, entry in entries.items()
+        if (framework is None or entry["framework"] == framework)
+        and (task is None or entry["task"] == task)
+        and (model is None or entry["model"] == model)
+    )
+
+
+def has_card(model_config: str) -> bool:
+    """True if a model card named model_config exists"""
+    return model_config in _get_index()["models"]
+
+
+def get_card(model_config: str) -> dict:
+    """Returns a copy of the full model card named model_config"""
+    cards = _get_index()["cards"]
+    if model_config not in cards:
+        raise ValueError(f"{model_config} is not a model card of {PACKAGE_NAME}, see list_models()")
+    return copy.deepcopy(cards[model_config])
+
+
+def get_summary(model_config: str) -> dict:
+    """
+    Returns the compact index entry of model_config: model, card_path, name, framework, task,
+    input_shape, param_bw, output_bw and the non-empty artifact urls
+    """
+    entries = _get_index()["models"]
+    if model_config not in entries:
+        raise ValueError(f"{model_config} is not a model card of {PACKAGE_NAME}, see list_models()")
+    return copy.deepcopy(entries[model_config])
+
+
+def card_file(model_config: str) -> Path:
+    """Returns the path of the JSON file of the model card named model_config"""
+    return _PACKAGE_ROOT / get_summary(model_config)["card_path"]
+
+
+def invalidate():
+    """Drops the compiled index, in memory and on disk, so that edits of the model card files are picked up"""
+    global _index  # pylint: disable=global-statement
+    with _index_lock:
+        _index = None
+        try:
+            # an installed package keys its index by version only, edited cards would not change the key
+            _index_path().unlink()
+        except OSError:
+            pass
+
+
+def _get_index() -> dict:
+    """index from memory, then from the on-disk copy for this package version, compiling it on a miss"""
+    global _index  # pylint: disable=global-statement
+    with _index_lock:
+        if _index is None:
+            index_path = _index_path()
+            _index = _load(index_path)
+            if _index is None:
+                _index = _compile()
+                _save(index_path, _index)
+        return _index
+
+
+def _index_path() -> Path:
+    return default_cache_dir() / "model_registry" / f"{PACKAGE_NAME}-{_index_key()}.json"
+
+
+def _card_paths() -> list:
+    return sorted(_PACKAGE_ROOT.glob("*/*/model_cards/*.json"))
+
+
+def _index_key() -> str:
+    """installed package version, or a fingerprint of the model cards when running from a source tree"""
+    try:
+        version = metadata.version(PACKAGE_NAME)
+        if Path(metadata.distribution(PACKAGE_NAME).locate_file(PACKAGE_NAME)).resolve() == _PACKAGE_ROOT:
+            return f"{version}-{_INDEX_FORMAT}"
+    except metadata.PackageNotFoundError:
+        pass
+    fingerprint = hashlib.sha256()
+    for card_path in _card_paths():
+        stat = card_path.stat()
+        fingerprint.update(f"{card_path}:{stat.st_size}:{stat.st_mtime_ns};".encode("UTF-8"))
+    return f"src-{fingerprint.hexdigest()[:16]}-{_INDEX_FORMAT}"
+
+
+def _compile() -> dict:
+    """parses every model card of the package into the index"""
+    models, cards = {}, {}
+    for card_path in _card_paths():
+        with open(card_path, encoding="UTF-8") as f_in:
+            card = json.load(f_in)
+        relative_path = card_path.relative_to(_PACKAGE_ROOT)
+        quantization_config = card.get("optimization_config", {}).get("quantization_configuration", {})
+        models[card_path.stem] = {
+            "model": relative_path.parts[0],
+            "card_path": relative_path.as_posix(),
+            "name": card.get("name"),
+            "framework": card.get("framework"),
+            "task": card.get("task"),
+            "input_shape": card.get("input_shape"),
+            "param_bw": quantization_config.get("param_bw"),
+            "output_bw": quantization_config.get("output_bw"),
+            "artifacts": {
+                key: value for key, value in card.get("artifacts", {}).items()
+                if value and key != "checksums"
+            },
+        }
+        cards[card_path.stem] = card
+    return {"models": models, "cards": cards}
+
+
+def _load(index_path: Path):
+    if not index_path.is_file():
+        return None
+    try:
+        with open(index_path, encoding="UTF-8") as f_in:
+            return json.load(f_in)
+    except ValueError:
+        return None
+
+
+def _save(index_path: Path, index: dict):
+    """best effort, a read-only cache directory only costs recompiling the index next time"""
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, prefix=".registry_")
+        with os.fdopen(fd, "w", encoding="UTF-8") as f_out:
+            json.dump(index, f_out)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Persistent cache of prepared QuantizationSimModel objects
+
+Building a QuantizationSimModel traces the model with a dummy input, inserts quantizers and loads encodings,
+which takes tens of seconds for the larger models and is repeated by every process that evaluates the model.
+A snapshot of the prepared sim is stored under <artifact cache>/quantsim/<model config>/, keyed by the model
+card, the digests of the artifacts the sim was built from and the installed AIMET and torch versions, and is
+reloaded (memory mapped where torch supports it) instead of being rebuilt. Set AIMET_ZOO_QUANTSIM_CACHE=0 to
+always rebuild.
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import tempfile
+from importlib import metadata
+from pathlib import Path
+import torch
+from aimet_zoo_torch.common.artifact_cache import default_cache_dir, sha256sum
+from aimet_zoo_torch.common.mmap_checkpoint import load_checkpoint
+
+logger = logging.getLogger("Downloader")
+
+QUANTSIM_CACHE_ENV = "AIMET_ZOO_QUANTSIM_CACHE"
+_SNAPSHOT_FORMAT = 1
+_AIMET_DISTRIBUTIONS = ("aimet-torch", "aimet_torch", "AimetTorch")
+
+
+def artifact_digest(path: str) -> str:
+    """SHA-256 of the file at path, read off the blob name for artifacts linked from the artifact cache"""
+    real_path = Path(os.path.realpath(path))
+    if real_path.parent.name == "sha256" and real_path.parent.parent.name == "blobs":
+        return real_path.name
+    return sha256sum(real_path)
+
+
+def aimet_version() -> str:
+    """version of the installed aimet_torch, or a fingerprint of its install location when no metadata is available"""
+    for distribution in _AIMET_DISTRIBUTIONS:
+        try:
+            return metadata.version(distribution)
+        except metadata.PackageNotFoundError:
+            continue
+    spec = importlib.util.find_spec("aimet_torch")
+    if spec is None or spec.origin is None:
+        return "none"
+    return f"{spec.origin}:{os.stat(spec.origin).st_mtime_ns}"
+
+
+class QuantSimCache:
+    """Snapshots of prepared QuantizationSimModel objects, one directory per model config"""
+
+    def __init__(self, cache_dir=None):
+        """
+        :param cache_dir:    root directory of the artifact cache, defaults to default_cache_dir()
+        """
+        self.root = (Path(cache_dir) if cache_dir else default_cache_dir()) / "quantsim"
+
+    @staticmethod
+    def key(card: dict, artifact_paths: list, **settings) -> str:
+        """
+        Returns the snapshot key for a sim built from the given model card and artifacts
+        :param card:              model card the sim is configured from
+        :param artifact_paths:    weights, encodings and config files the sim is built from, None entries are skipped
+        :param settings:          anything else the sim depends on, e.g. quantized=True
+        """
+        fingerprint = {
+            "format": _SNAPSHOT_FORMAT,
+            "card": card,
+            "artifacts": [artifact_digest(path) for path in artifact_paths if path],
+            "aimet": aimet_version(),
+            "torch": torch.__version__,
+            "settings": settings,
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode("UTF-8")).hexdigest()
+
+    def snapshot_path(self, model_config: str, key: str) -> Path:
+        """path of the snapshot of model_config with the given key"""
+        return self.root / model_config / f"{key}.pt"
+
+    def load(self, model_config: str, key: str, map_location=None):
+        """Returns the cached sim, or None on a miss or when the snapshot cannot be read anymore"""
+        path = self.snapshot_path(model_config, key)
+        if not path.is_file():
+            return None
+        try:
+            return load_checkpoint(str(path), map_location=map_location)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.warning("Discarding unreadable quantsim snapshot %s: %s", path, error)
+            os.remove(path)
+            return None
+
+    def save(self, model_config: str, key: str, sim):
+        """Stores a snapshot of sim, best effort since a failed snapshot only costs rebuilding the sim next time"""
+        path = self.snapshot_path(model_config, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # torch.save rejects file names without an extension on some versions
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_", suffix=".pt")
+            os.close(fd)
+            try:
+                torch.save(sim, tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+        except Exception as error:  # pylint: disable=broad-except
+            logger.warning("Could not snapshot the quantsim of %s: %s", model_config, error)
+
+    def invalidate(self, model_config: str = None) -> int:
+        """
+        Removes the snapshots of model_config, or every snapshot when model_config is None
+        :return: number of snapshots removed
+        """
+        target = self.root / model_config if model_config else self.root
+        if not target.is_dir():
+            return 0
+        removed = sum(1 for _ in target.rglob("*.pt"))
+        shutil.rmtree(target)
+        return removed
+
+
+def cached_quantsim(model_config: str, card: dict, artifact_paths: list, build_fn, device=None, **settings):
+    """
+    Returns the sim build_fn() would build, from the snapshot cache when an identical sim was built before
+    :param model_config:      name of the model card
+    :param card:              model card the sim is configured from
+    :param artifact_paths:    weights, encodings and config files the sim is built from
+    :param build_fn:          callable building the prepared sim on a cache miss
+    :param device:            device to load a cached sim onto
+    :param settings:          anything else the sim depends on, e.g. quantized=True
+    """
+    if os.getenv(QUANTSIM_CACHE_ENV, "1") == "0":
+        return build_fn()
+    cache = QuantSimCache()
+    key = cache.key(card, artifact_paths, **settings)
+    sim = cache.load(model_config, key, map_location=device)
+    if sim is not None:
+        logger.info("Loaded the quantsim of %s from %s", model_config, cache.snapshot_path(model_config, key))
+        return sim
+    sim = build_fn()
+    cache.save(model_config, key, sim)
+    return sim
+
+
+def invalidate(model_config: str = None, cache_dir=None) -> int:
+    """Removes the quantsim snapshots of model_config, or all of them, returns the number removed"""
+    return QuantSimCache(cache_dir).invalidate(model_config)
@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Local store of evaluation results, for tracking accuracy and performance regressions across runs
+
+Every evaluator run under utils.instrumentation.report_phases() is appended as one JSON line to
+<artifact cache>/results/runs.jsonl. Each line holds:
+- the evaluator and its arguments, including the model config
+- the git revision and package versions
+- a fingerprint of the dataset directories, see directory_fingerprint()
+- the metrics main() returned
+- the phase report with the throughput of the evaluation loops
+
+Set AIMET_ZOO_RESULTS_STORE to the path of another store, or to 0 to stop recording. Runs can be listed and
+compared, a comparison flags accuracy and throughput regressions against a baseline run:
+
+    python -m aimet_zoo_torch.common.results_store list --evaluator resnet_quanteval
+    python -m aimet_zoo_torch.common.results_store compare [run] [--baseline run]
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import numbers
+import os
+import platform
+import subprocess
+import sys
+import threading
+import uuid
+from importlib import metadata
+from pathlib import Path
+from aimet_zoo_torch.common.artifact_cache import default_cache_dir
+
+try:
+    import fcntl
+except ImportError:  # non POSIX platforms only get the in-process lock
+    fcntl = None
+
+logger = logging.getLogger("Eval")
+
+RESULTS_STORE_ENV = "AIMET_ZOO_RESULTS_STORE"
+FULL_FINGERPRINT_ENV = "AIMET_ZOO_RESULTS_FULL_FINGERPRINT"
+_RUN_FORMAT = 1
+_DISTRIBUTIONS = ("aimet_zoo_torch", "aimet-torch", "torch", "torchvision", "transformers", "numpy")
+# metrics whose names contain one of these improve when they decrease
+LOWER_IS_BETTER = ("loss", "perplexity", "wer", "cer", "error")
+# recorded with the metrics but not compared, e.g. the samples and seconds of early stopping evaluations
+_UNCOMPARED_METRICS = ("early_stopping.",)
+# phases without a sample count are compared by duration, shorter ones are too noisy to flag
+_MIN_PHASE_SECONDS = 1.0
+_GIT_TIMEOUT_SECONDS = 10
+_APPEND_LOCK = threading.Lock()
+
+
+def default_store_path() -> Path:
+    """Returns the store path, $AIMET_ZOO_RESULTS_STORE if set, otherwise <artifact cache>/results/runs.jsonl"""
+    path = os.getenv(RESULTS_STORE_ENV)
+    if path and path != "0":
+        return Path(path).expanduser()
+    return default_cache_dir() / "results" / "runs.jsonl"
+
+
+def git_revision(path=None):
+    """commit of the git checkout at path, this package by default, suffixed -dirty with local changes, or None"""
+    path = path or os.path.dirname(os.path.abspath(__file__))
+    try:
+        head = subprocess.run(["git", "-C", str(path), "rev-parse", "HEAD"], capture_output=True, text=True,
+                              timeout=_GIT_TIMEOUT_SECONDS, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "-C", str(path), "diff-index", "--quiet", "HEAD", "--"],
+                               capture_output=True, timeout=_GIT_TIMEOUT_SECONDS, check=False).returncode != 0
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return f"{head}-dirty" if dirty else head
+
+
+def package_versions() -> dict:
+    """versions of python, the installed packages results depend on and the git revision of this package"""
+    versions = {"python": platform.python_version(), "git": git_revision()}
+    for distribution in _DISTRIBUTIONS:
+        try:
+            versions[distribution] = metadata.version(distribution)
+        except metadata.PackageNotFoundError:
+            continue
+    return versions
+
+
+def recording_enabled() -> bool:
+    """whether runs are recorded, i.e. $AIMET_ZOO_RESULTS_STORE is not 0"""
+    return os.getenv(RESULTS_STORE_ENV) != "0"
+
+
+def directory_fingerprint(path: str, full: bool = None) -> str:
+    """
+    Returns a fingerprint of path. A file or packed directory is fingerprinted by the size and modification time
+    of the file or its index. A directory is fingerprinted by the modification times of itself and of its
+    immediate subdirectories, e.g. the class directories of ImageNet, which change whenever an entry is added,
+    removed or renamed in them. That costs one listing and one stat per subdirectory, like the file manifest of
+    image_net_data_loader. Files modified in place, or changed further down, are only seen by the full walk.
+    :param path:    file or directory
+    :param full:    stat every file below path instead, slow on network filesystems. Defaults to whether
+                    $AIMET_ZOO_RESULTS_FULL_FINGERPRINT is 1
+    """
+    if full is None:
+        full = os.getenv(FULL_FINGERPRINT_ENV) == "1"
+    digest = hashlib.sha256()
+    path = os.path.abspath(path)
+    index_path = os.path.join(path, "index.json")
+    if os.path.isfile(path) or os.path.isfile(index_path):
+        stat = os.stat(index_path if os.path.isdir(path) else path)
+        digest.update(json.dumps([stat.st_size, stat.st_mtime_ns]).encode("UTF-8"))
+        return digest.hexdigest()
+    if not full:
+        with os.scandir(path) as entries:
+            dir_names = sorted(entry.name for entry in entries if entry.is_dir())
+        digest.update(json.dumps([".", os.stat(path).st_mtime_ns]).encode("UTF-8"))
+        for dir_name in dir_names:
+            digest.update(json.dumps([dir_name, os.stat(os.path.join(path, dir_name)).st_mtime_ns]).encode("UTF-8"))
+        return digest.hexdigest()
+    for dir_path, dir_names, file_names in os.walk(path):
+        dir_names.sort()
+        for file_name in sorted(file_names):
+            file_path = os.path.join(dir_path, file_name)
+            stat = os.stat(file_path)
+            entry = [os.path.relpath(file_path, path), stat.st_size, stat.st_mtime_ns]
+            digest.update(json.dumps(entry).encode("UTF-8"))
+    return digest.hexdigest()
+
+
+def dataset_fingerprints(evaluator_args: dict) -> dict:
+    """fingerprints of the existing paths among the evaluator arguments naming data, e.g. --dataset-path"""
+    datasets = {}
+    for name, value in sorted(evaluator_args.items()):
+        if "data" in name and isinstance(value, str) and value and os.path.exists(value):
+            try:
+                fingerprint = directory_fingerprint(value)
+            except OSError as error:
+                logger.warning("Could not fingerprint %s: %s", value, error)
+                fingerprint = None
+            datasets[name] = {"path": os.path.abspath(value), "fingerprint": fingerprint}
+    return datasets
+
+
+def flatten_metrics(metrics, prefix: str = "") -> dict:
+    """numeric values of a metric dict, nested dicts and lists flattened into dotted names"""
+    flat = {}
+    if isinstance(metrics, dict):
+        items = metrics.items()
+    elif isinstance(metrics, (list, tuple)):
+        items = enumerate(metrics)
+    else:
+        return flat
+    for key, value in items:
+        name = f"{prefix}{key}"
+        if hasattr(value, "item"):
+            try:
+                # numpy and torch scalars
+                value = value.item()
+            except (ValueError, RuntimeError):
+                pass
+        if isinstance(value, numbers.Real) and not isinstance(value, bool):
+            flat[name] = float(value)
+        else:
+            flat.update(flatten_metrics(value, f"{name}."))
+    return flat
+
+
+def phase_throughput(phases: list) -> dict:
+    """samples per second of the phases that counted samples, phases of the same name summed"""
+    samples, seconds = {}, {}
+    for record in phases:
+        if record.get("samples") and record.get("wall_seconds"):
+            samples[record["name"]] = samples.get(record["name"], 0) + record["samples"]
+            seconds[record["name"]] = seconds.get(record["name"], 0.0) + record["wall_seconds"]
+    return {name: samples[name] / seconds[name] for name in samples}
+
+
+def _phase_seconds(phases: list) -> dict:
+    seconds = {}
+    for record in phases:
+        if record["depth"] == 0 and "wall_seconds" in record:
+            seconds[record["name"]] = seconds.get(record["name"], 0.0) + record["wall_seconds"]
+    return seconds
+
+
+def make_run(report: dict, metrics=None, datasets: dict = None) -> dict:
+    """
+    Builds the stored record of an evaluation run
+    :param report:     phase report of utils.instrumentation.report_phases(), with the evaluator name and arguments
+    :param metrics:    what the evaluator returned, numbers in (nested) dicts and lists are kept
+    :param datasets:   dataset_fingerprints() of the arguments, taken when not given
+    """
+    evaluator_args = report.get("arguments", {})
+    return {
+        "format": _RUN_FORMAT,
+        "run_id": uuid.uuid4().hex,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "evaluator": report.get("evaluator"),
+        "model_config": evaluator_args.get("model_config"),
+        "arguments": evaluator_args,
+        "versions": package_versions(),
+        "datasets": dataset_fingerprints(evaluator_args) if datasets is None else datasets,
+        "metrics": flatten_metrics(metrics),
+        "throughput": phase_throughput(report.get("phases", [])),
+        "report": report,
+    }
+
+
+class ResultsStore:
+    """Append-only JSON lines file of evaluation runs"""
+
+    def __init__(self, path=None):
+        """
+        :param path:    store file, defaults to default_store_path()
+        """
+        self.path = Path(path) if path else default_store_path()
+
+    def append(self, run: dict):
+        """Appends a run, safe against concurrent evaluators appending to the same store"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(run, default=str) + "\n"
+        with _APPEND_LOCK, open(self.path, "a", encoding="UTF-8") as f_out:
+            if fcntl is not None:
+                fcntl.flock(f_out, fcntl.LOCK_EX)
+            try:
+                f_out.write(line)
+                f_out.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f_out, fcntl.LOCK_UN)
+
+    def runs(self, evaluator: str = None, model_config: str = None) -> list:
+        """runs in the order they were recorded, optionally only those of an evaluator and model config"""
+        if not self.path.is_file():
+            return []
+        runs = []
+        with open(self.path, encoding="UTF-8") as f_in:
+            for line in f_in:
+                try:
+                    run = json.loads(line)
+                except ValueError:
+                    # a run cut short while it was being appended
+                    continue
+                if evaluator is not None and run.get("evaluator") != evaluator:
+                    continue
+                if model_config is not None and run.get("model_config") != model_config:
+                    continue
+                runs.append(run)
+        return runs
+
+    def get(self, run_id: str) -> dict:
+        """Returns the run with the given id or unique id prefix, raises KeyError otherwise"""
+        matches = [run for run in self.runs() if run["run_id"].startswith(run_id)]
+        if len(matches) != 1:
+            raise KeyError(f"{len(matches)} runs in {self.path} match the run id {run_id}")
+        return matches[0]
+
+    def latest(self, evaluator: str = None, model_config: str = None):
+        """the most recent run, optionally of an evaluator and model config, or None"""
+        runs = self.runs(evaluator, model_config)
+        return runs[-1] if runs else None
+
+    def baseline(self, run: dict):
+        """the run recorded before run with the same evaluator and model config, or None"""
+        previous = None
+        for candidate in self.runs(run["evaluator"], run["model_config"]):
+            if candidate["run_id"] == run["run_id"]:
+                return previous
+            previous = candidate
+        return previous
+
+    def compare(self, run: dict, baseline: dict = None, **tolerances) -> dict:
+        """compare_runs() of run against baseline, the preceding run of the same evaluator by default"""
+        baseline = baseline or self.baseline(run)
+        if baseline is None:
+            raise KeyError(f"No baseline run of {run['evaluator']} {run['model_config']} in {self.path}")
+        return compare_runs(run, baseline, **tolerances)
+
+
+def _relative_change(current: float, baseline: float) -> float:
+    if baseline == 0:
+        return 0.0 if current == 0 else float("inf")
+    return (current - baseline) / abs(baseline)
+
+
+def compare_runs(run: dict, baseline: dict, accuracy_tolerance: float = 0.001, throughput_tolerance: float = 0.05,
+                 lower_is_better: tuple = LOWER_IS_BETTER) -> dict:
+    """
+    Compares the metrics and throughput of run against a baseline run
+    :param run:                     run to check
+    :param baseline:                run to compare against
+    :param accuracy_tolerance:      largest acceptable relative metric drop, 0.001 lets 76.00% drop to 75.93%
+    :param throughput_tolerance:    largest acceptable relative throughput drop, or phase slow down without one
+    :param lower_is_better:         metrics whose names contain one of these improve when they decrease
+    :return: dict with the relative change of each metric, throughput and phase duration present in both runs,
+             what differs in the setup of the runs, e.g. datasets or versions, and the list of regressions
+    """
+    metrics, throughput, seconds, regressions = {}, {}, {}, []
+    for name in sorted(set(run["metrics"]) & set(baseline["metrics"])):
+        if name.startswith(_UNCOMPARED_METRICS):
+            continue
+        current, previous = run["metrics"][name], baseline["metrics"][name]
+        change = _relative_change(current, previous)
+        metrics[name] = {"baseline": previous, "current": current, "change": change}
+        worse = change if any(word in name.lower() for word in lower_is_better) else -change
+        if worse > accuracy_tolerance:
+            regressions.append(f"{name} {previous:.6g} -> {current:.6g} ({change:+.2%})")
+    for name in sorted(set(run["throughput"]) & set(baseline["throughput"])):
+        current, previous = run["throughput"][name], baseline["throughput"][name]
+        change = _relative_change(current, previous)
+        throughput[name] = {"baseline": previous, "current": current, "change": change}
+        if -change > throughput_tolerance:
+            regressions.append(f"{name} throughput {previous:.4g} -> {current:.4g} samples/s ({change:+.2%})")
+    current_seconds = _phase_seconds(run["report"].get("phases", []))
+    previous_seconds = _phase_seconds(baseline["report"].get("phases", []))
+    for name in sorted(set(current_seconds) & set(previous_seconds)):
+        current, previous = current_seconds[name], previous_seconds[name]
+        change = _relative_change(current, previous)
+        seconds[name] = {"baseline": previous, "current": current, "change": change}
+        if name not in throughput and max(current, previous) >= _MIN_PHASE_SECONDS and change > throughput_tolerance:
+            regressions.append(f"{name} {previous:.1f}s -> {current:.1f}s ({change:+.2%})")
+    differences = {
+        field: [baseline.get(field), run.get(field)]
+        for field in ("evaluator", "model_config", "arguments", "datasets", "versions")
+        if baseline.get(field) != run.get(field)
+    }
+    return {
+        "run": run["run_id"],
+        "baseline": baseline["run_id"],
+        "metrics": metrics,
+        "throughput": throughput,
+        "phase_seconds": seconds,
+        "differences": differences,
+        "regressions": regressions,
+    }
+
+
+def record_run(report: dict, metrics=None, datasets: dict = None):
+    """
+    Appends an evaluation run to the default store unless $AIMET_ZOO_RESULTS_STORE is 0, best effort since a run
+    that is not recorded only costs its comparison later
+    :param datasets:   dataset_fingerprints() of the arguments, taken when not given
+    :return: the recorded run, or None
+    """
+    if not recording_enabled():
+        return None
+    try:
+        run = make_run(report, metrics, datasets)
+        ResultsStore().append(run)
+    except Exception as error:  # pylint: disable=broad-except
+        logger.warning("Could not record the results of %s: %s", report.get("evaluator"), error)
+        return None
+    return run
+
+
+def _summary(run: dict) -> str:
+    metrics = ", ".join(f"{name} {value:.4g}" for name, value in run["metrics"].items())
+    throughput = ", ".join(f"{name} {value:.4g}/s" for name, value in run["throughput"].items())
+    return (f'{run["run_id"][:12]}  {run["timestamp"]}  {run["evaluator"]}  {run["model_config"] or "-"}  '
+            f'{metrics or "no metrics"}  {throughput}')
+
+
+def arguments(raw_args):
+    """ Parse input arguments """
+    parser = argparse.ArgumentParser(description="List and compare recorded evaluation runs")
+    parser.add_argument("--store", help=f"store file, overrides ${RESULTS_STORE_ENV}", default=None, type=str)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    list_parser = subparsers.add_parser("list", help="list recorded runs")
+    list_parser.add_argument("--last", help="only the last runs", default=None, type=int)
+    compare_parser = subparsers.add_parser("compare", help="compare a run against a baseline run, exits non zero "
+                                           "on regressions")
+    compare_parser.add_argument("run", nargs="?", help="run id or prefix, the latest run by default", default=None)
+    compare_parser.add_argument("--baseline", help="run id or prefix, the preceding run of the same evaluator "
+                                "and model config by default", default=None, type=str)
+    compare_parser.add_argument("--accuracy-tolerance", help="largest acceptable relative metric drop",
+                                default=0.001, type=float)
+    compare_parser.add_argument("--throughput-tolerance", help="largest acceptable relative throughput drop",
+                                default=0.05, type=float)
+    for subparser in (list_parser, compare_parser):
+        subparser.add_argument("--evaluator", help="only runs of this evaluator, e.g. resnet_quanteval",
+                               default=None, type=str)
+        subparser.add_argument("--model-config", help="only runs of this model config", default=None, type=str)
+    return parser.parse_args(raw_args)
+
+
+def main(raw_args=None):
+    """ List or compare runs, returns 1 when compare finds regressions """
+    args = arguments(raw_args)
+    store = ResultsStore(args.store)
+    if args.command == "list":
+        runs = store.runs(args.evaluator, args.model_config)
+        for run in runs[-args.last:] if args.last else runs:
+            print(_summary(run))
+        return 0
+    run = store.get(args.run) if args.run else store.latest(args.evaluator, args.model_config)
+    if run is None:
+        print(f"No runs recorded in {store.path}")
+        return 1
+    baseline = store.get(args.baseline) if args.baseline else None
+    comparison = store.compare(run, baseline, accuracy_tolerance=args.accuracy_tolerance,
+                               throughput_tolerance=args.throughput_tolerance)
+    print(f'{run["evaluator"]} {run["model_config"] or ""}: run {comparison["run"][:12]} against baseline '
+          f'{comparison["baseline"][:12]}')
+    for group in ("metrics", "throughput", "phase_seconds"):
+        for name, values in comparison[group].items():
+            print(f'  {group} {name}: {values["baseline"]:.6g} -> {values["current"]:.6g} ({values["change"]:+.2%})')
+    for field in comparison["differences"]:
+        print(f"  {field} differ from the baseline")
+    for regression in comparison["regressions"]:
+        print(f"  REGRESSION {regression}")
+    return 1 if comparison["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Latency and throughput benchmark on synthetic inputs
+
+Builds any registered model from its model card, as the FP32 model and as the quantsim model, and times it on
+seeded random inputs of the input_shape declared in the card, so no dataset is needed. Runs on the cpu and reports
+p50 and p95 latency without the warm-up iterations, throughput and the peak resident memory, for every combination
+of batch size, intra-op thread count and memory format asked for:
+
+    python -m aimet_zoo_torch.common.utils.benchmark --model-config resnet50_w8a8 --batch-sizes 1 8 --threads 1 4
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import sys
+import time
+import numpy as np
+import torch
+from aimet_zoo_torch.common.model_registry import get_summary, list_models
+from aimet_zoo_torch.common.utils.instrumentation import peak_rss_bytes, reset_peak_rss
+
+VARIANTS = ("fp32", "quantsim")
+
+
+def card_input_shape(model_config: str) -> tuple:
+    """input shape declared in the model card, with None for the batch dimension"""
+    shape = get_summary(model_config)["input_shape"]
+    if not shape:
+        raise ValueError(f"The model card of {model_config} declares no input_shape")
+    return tuple(shape)
+
+
+def synthetic_input(input_shape, batch_size: int, seed: int = 0, channels_last: bool = False) -> torch.Tensor:
+    """seeded standard normal input of input_shape with the batch dimension set to batch_size"""
+    shape = (batch_size,) + tuple(dim if dim is not None else 1 for dim in input_shape[1:])
+    generator = torch.Generator().manual_seed(seed)
+    data = torch.randn(shape, generator=generator)
+    if channels_last and data.dim() == 4:
+        data = data.contiguous(memory_format=torch.channels_last)
+    return data
+
+
+def model_class(model_config: str):
+    """model class of the subpackage the model card belongs to, e.g. ResNet for resnet50_w8a8"""
+    package = importlib.import_module(f"aimet_zoo_torch.{get_summary(model_config)['model']}")
+    for name in getattr(package, "__all__", []):
+        candidate = getattr(package, name)
+        if inspect.isclass(candidate) and hasattr(candidate, "from_pretrained"):
+            return candidate
+    raise ValueError(f"No model class with from_pretrained() found for {model_config}")
+
+
+def build_model(model_config: str, variant: str = "fp32") -> torch.nn.Module:
+    """
+    Builds the pretrained FP32 model or the quantsim model of a model card on the cpu
+    :param model_config:    name of the model card
+    :param variant:         "fp32" or "quantsim", the quantsim of the optimized model with its encodings
+    """
+    cls = model_class(model_config)
+    kwargs = {"model_config": model_config}
+    if "device" in inspect.signature(cls.__init__).parameters:
+        kwargs["device"] = torch.device("cpu")
+    model = cls(**kwargs)
+    if variant == "quantsim":
+        module = model.get_quantsim(quantized=True).model
+    elif variant == "fp32":
+        model.from_pretrained(quantized=False)
+        module = model.model
+    else:
+        raise ValueError(f"Unknown variant {variant}, expected one of {VARIANTS}")
+    return module.cpu().eval()
+
+
+def benchmark(model: torch.nn.Module, data: torch.Tensor, warmup: int = 10, iterations: int = 50) -> dict:
+    """
+    Times model on data
+    :param model:         model on the cpu
+    :param data:          input batch
+    :param warmup:        untimed iterations before timing
+    :param iterations:    timed iterations
+    :return: dict with the p50 and p95 latency of a batch in milliseconds, the throughput in samples per second
+             and the peak resident memory in megabytes while running
+    """
+    reset_peak_rss()
+    latencies = []
+    with torch.no_grad():
+        for iteration in range(warmup + iterations):
+            start = time.perf_counter()
+            model(data)
+            if iteration >= warmup:
+                latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies)
+    return {
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p95_ms": float(np.percentile(latencies, 95) * 1000),
+        "throughput": float(len(data) * len(latencies) / latencies.sum()),
+        "peak_rss_mb": peak_rss_bytes() / (1 << 20),
+    }
+
+
+def sweep(model_config: str, variants=VARIANTS, batch_sizes=(1,), threads=(None,), channels_last=(False,),
+          warmup: int = 10, iterations: int = 50, seed: int = 0) -> list:
+    """
+    Benchmarks every combination of variant, batch size, thread count and memory format of a model card
+    :return: one dict per combination with its settings and the benchmark() results, or the error when the variant
+             could not be built, e.g. because its quantsim needs a GPU
+    """
+    input_shape = card_input_shape(model_config)
+    default_threads = torch.get_num_threads()
+    rows = []
+    for variant in variants:
+        try:
+            model = build_model(model_config, variant)
+        except Exception as error:  # pylint: disable=broad-except
+            rows.append({"model_config": model_config, "variant": variant, "error": repr(error)})
+            continue
+        for batch_size, num_threads, use_channels_last in itertools.product(batch_sizes, threads, channels_last):
+            if use_channels_last and len(input_shape) != 4:
+                continue
+            torch.set_num_threads(num_threads or default_threads)
+            model = model.to(memory_format=torch.channels_last if use_channels_last else torch.contiguous_format)
+            data = synthetic_input(input_shape, batch_size, seed, use_channels_last)
+            row = {"model_config": model_config, "variant": variant, "batch_size": batch_size,
+                   "threads": torch.get_num_threads(), "channels_last": use_channels_last}
+            row.update(benchmark(model, data, warmup, iterations))
+            rows.append(row)
+        del model
+    torch.set_num_threads(default_threads)
+    return rows
+
+
+def arguments(raw_args):
+    """ Parse input arguments """
+    parser = argparse.ArgumentParser(description="Latency and throughput of model zoo models on synthetic inputs")
+    parser.add_argument("--model-config", help="model cards to benchmark, all with an input_shape by default",
+                        nargs="*", default=None)
+    parser.add_argument("--variants", help="model variants", nargs="*", default=list(VARIANTS), choices=VARIANTS)
+    parser.add_argument("--batch-sizes", help="batch sizes to sweep", nargs="*", default=[1], type=int)
+    parser.add_argument("--threads", help="intra-op thread counts to sweep, the torch default by default",
+                        nargs="*", default=[None], type=int)
+    parser.add_argument("--channels-last", help="memory formats to sweep", default="no",
+                        choices=["no", "yes", "both"])
+    parser.add_argument("--warmup", help="untimed iterations", default=10, type=int)
+    parser.add_argument("--iterations", help="timed iterations", default=50, type=int)
+    parser.add_argument("--seed", help="seed of the synthetic inputs", default=0, type=int)
+    parser.add_argument("--output", help="write the results as JSON to this file", default=None, type=str)
+    return parser.parse_args(raw_args)
+
+
+def main(raw_args=None):
+    """ Run the benchmark sweep, returns 1 if a model could not be benchmarked """
+    args = arguments(raw_args)
+    model_configs = args.model_config or [name for name in list_models() if get_summary(name)["input_shape"]]
+    channels_last = {"no": (False,), "yes": (True,), "both": (False, True)}[args.channels_last]
+    rows = []
+    for model_config in model_configs:
+        rows += sweep(model_config, args.variants, args.batch_sizes, args.threads, channels_last, args.warmup,
+                      args.iterations, args.seed)
+    for row in rows:
+        if "error" in row:
+            print(f"{row['model_config']:40s} {row['variant']:9s} failed: {row['error']}")
+        else:
+            print(f"{row['model_config']:40s} {row['variant']:9s} batch {row['batch_size']:3d} "
+                  f"threads {row['threads']:3d} {'NHWC' if row['channels_last'] else 'NCHW'}  "
+                  f"p50 {row['p50_ms']:9.2f}ms  p95 {row['p95_ms']:9.2f}ms  "
+                  f"{row['throughput']:9.1f} samples/s  peak {row['peak_rss_mb']:8.0f}MB")
+    if args.output:
+        with open(args.output, "w") as f_out:
+            json.dump(rows, f_out, indent=2)
+    return 1 if any("error" in row for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
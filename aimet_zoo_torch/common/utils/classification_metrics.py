@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Streaming classification metrics shared by the image classification evaluators
+
+Each classification model used to carry its own copy of the evaluation loop, which summed the correct predictions
+of every batch on the host (an implicit device synchronization per batch) and only reported top-1 accuracy.
+ClassificationMetrics keeps top-k hit counts and a confusion matrix as tensors on the device the model runs on and
+copies them to the host once, in compute(), which only returns the confusion matrix when asked to. evaluate() and
+forward_pass() are the evaluation and calibration loops of the evaluators, moving batches to the device of the model
+with non-blocking copies.
+"""
+
+import functools
+import torch
+from tqdm import tqdm
+from aimet_zoo_torch.common.utils.early_stopping import wilson_interval
+from aimet_zoo_torch.common.utils.instrumentation import count_samples, instrumented
+from aimet_zoo_torch.common.utils.multi_model_eval import to_device, _model_device
+from aimet_zoo_torch.common.utils.sharded_eval import evaluate_sharded as _evaluate_sharded
+
+
+class ClassificationMetrics:
+    """
+    Streaming top-k accuracy, per class accuracy and confusion counts. update() only queues work on the device of
+    the outputs, nothing is copied to the host until compute()
+    """
+
+    def __init__(self, num_classes: int = None, topk: tuple = (1, 5)):
+        """
+        :param num_classes:    number of classes, taken from the width of the first output by default
+        :param topk:           k of each top-k accuracy to report
+        """
+        self.num_classes = num_classes
+        self.topk = tuple(sorted(set(topk)))
+        self.samples = 0
+        self._hits = None
+        self._confusion = None
+
+    def _allocate(self, output):
+        if self.num_classes is None:
+            self.num_classes = output.shape[1]
+        elif self.num_classes < output.shape[1]:
+            # top-1 predictions beyond num_classes would land in the confusion cells of the next label
+            raise ValueError(f"num_classes is {self.num_classes}, but the outputs have {output.shape[1]} logits")
+        self._hits = torch.zeros(len(self.topk), dtype=torch.int64, device=output.device)
+        self._confusion = torch.zeros(self.num_classes * self.num_classes, dtype=torch.int64, device=output.device)
+
+    def update(self, output, target):
+        """
+        accumulates the predictions of one batch
+        :param output:    logits of shape (batch, classes)
+        :param target:    class indices of shape (batch,), on any device
+        """
+        if self._hits is None:
+            self._allocate(output)
+        target = target.to(output.device, non_blocking=True).long()
+        maxk = min(self.topk[-1], output.shape[1])
+        predictions = output.topk(maxk, 1).indices
+        hits = (predictions == target[:, None]).cumsum(1).clamp_(max=1).sum(0)
+        self._hits += hits[[min(k, maxk) - 1 for k in self.topk]]
+        # scatter_add_ rather than bincount, which reads the largest index back to the host on cuda
+        cells = target * self.num_classes + predictions[:, 0]
+        self._confusion.scatter_add_(0, cells, torch.ones_like(cells))
+        self.samples += len(target)
+
+    def counts(self) -> tuple:
+        """
+        the raw counts, on the device they were accumulated on
+        :return: top-k hit counts and the flattened confusion matrix, (None, None) before the first batch
+        """
+        return self._hits, self._confusion
+
+    def merge(self, other: "ClassificationMetrics") -> "ClassificationMetrics":
+        """adds the counts of other, e.g. of another shard of the evaluation set, returns self"""
+        hits, confusion = other.counts()
+        if hits is None:
+            return self
+        if self._hits is None:
+            self.num_classes = other.num_classes
+            self._hits = hits.clone()
+            self._confusion = confusion.clone()
+        else:
+            self._hits += hits.to(self._hits.device)
+            self._confusion += confusion.to(self._confusion.device)
+        self.samples += other.samples
+        return self
+
+    def top1_interval(self, confidence: float = 0.95) -> tuple:
+        """Wilson interval of the top-1 accuracy so far, in percent, reads the hit count off the device"""
+        low, high = wilson_interval(int(self._hits[0]), self.samples, confidence)
+        return 100 * low, 100 * high
+
+    def compute(self, confusion: bool = False) -> dict:
+        """
+        metrics over all batches seen so far, with a single copy to the host
+        :param confusion:    also return the confusion matrix, num_classes squared counts
+        :return: dict with the top-k accuracies in percent ("top1", "top5", ...), the number of samples and the
+                 accuracy in percent of each class, None for classes without samples. With confusion, also the
+                 confusion matrix as an int64 cpu tensor (rows are labels, columns are top-1 predictions)
+        """
+        if self._hits is None:
+            raise ValueError("No batches have been evaluated")
+        matrix = self._confusion.view(self.num_classes, self.num_classes)
+        # only the per class counts are copied unless the whole matrix is asked for
+        counts = torch.cat([self._hits, matrix.sum(1), matrix.diagonal()]).cpu().tolist()
+        hits = counts[:len(self.topk)]
+        per_class_total = counts[len(self.topk):len(self.topk) + self.num_classes]
+        per_class_correct = counts[len(self.topk) + self.num_classes:]
+        result = {f"top{k}": 100 * hit / self.samples for k, hit in zip(self.topk, hits)}
+        result.update({
+            "samples": self.samples,
+            "per_class_accuracy": [100 * correct / total if total else None
+                                   for correct, total in zip(per_class_correct, per_class_total)],
+        })
+        if confusion:
+            result["confusion"] = matrix.cpu()
+        return result
+
+
+@instrumented("eval")
+def evaluate(model, dataloader, num_samples: int = None, topk: tuple = (1, 5), num_classes: int = None,
+             device=None, early_stopping=None, show_progress: bool = True, confusion: bool = False) -> dict:
+    """
+    Evaluates a classifier on (data, label) batches, on the device it is on
+    :param model:            classifier returning logits
+    :param dataloader:       iterable of (data, label) batches
+    :param num_samples:      stop once this many samples are evaluated, all of them by default
+    :param topk:             k of each top-k accuracy to report
+    :param num_classes:      number of classes, taken from the model output by default
+    :param device:           device to move the batches to, the device of the model by default
+    :param early_stopping:   EarlyStopping, to evaluate in a seeded random order until the top-1 interval is tight
+    :param show_progress:    show a progress bar
+    :param confusion:        also return the confusion matrix, see ClassificationMetrics.compute()
+    :return: ClassificationMetrics.compute() over the evaluated samples, with early stopping also the
+             EarlyStopping.summary of the top-1 accuracy under "early_stopping"
+    """
+    device = device if device is not None else _model_device(model)
+    metrics = ClassificationMetrics(num_classes, topk)
+    if early_stopping is not None:
+        dataloader = early_stopping.order(dataloader)
+        early_stopping.start(len(dataloader.dataset))
+
+        def interval_fn():
+            return metrics.top1_interval(early_stopping.confidence)
+
+    model.eval()
+    with torch.no_grad():
+        for data, label in tqdm(dataloader, disable=not show_progress):
+            data, label = to_device((data, label), device)
+            metrics.update(model(data), label)
+            if num_samples is not None and metrics.samples >= num_samples:
+                break
+            if early_stopping is not None and early_stopping.should_stop(interval_fn, metrics.samples):
+                break
+    count_samples(metrics.samples)
+    result = metrics.compute(confusion)
+    if early_stopping is not None:
+        result["early_stopping"] = early_stopping.finish(result["top1"], interval_fn(), metrics.samples)
+    return result
+
+
+def _shard_metrics(num_classes, topk, model, dataloader) -> ClassificationMetrics:
+    """metrics of one shard, in a worker of evaluate_sharded()"""
+    metrics = ClassificationMetrics(num_classes, topk)
+    model.eval()
+    for data, label in dataloader:
+        metrics.update(model(data), label)
+    return metrics
+
+
+def evaluate_sharded(model, dataloader, num_shards: int, threads_per_shard: int = None, topk: tuple = (1, 5),
+                     num_classes: int = None, confusion: bool = False) -> dict:
+    """
+    Evaluates a classifier on the cpu in num_shards processes, each over a disjoint shard of the evaluation set
+    :param model:                classifier, or a picklable callable building it, see sharded_eval.evaluate_sharded()
+    :param dataloader:           dataloader of (data, label) batches
+    :param num_shards:           number of worker processes
+    :param threads_per_shard:    intra-op threads of each worker, the cores of the host split evenly by default
+    :param topk:                 k of each top-k accuracy to report
+    :param num_classes:          number of classes, taken from the model output by default
+    :param confusion:            also return the confusion matrix, see ClassificationMetrics.compute()
+    :return: ClassificationMetrics.compute() over the whole evaluation set
+    """
+    shard_fn = functools.partial(_shard_metrics, num_classes, topk)
+    return _evaluate_sharded(model, shard_fn, dataloader, num_shards, threads_per_shard).compute(confusion)
+
+
+def forward_pass(model, dataloader, max_batches: int = None, device=None, show_progress: bool = False):
+    """
+    Runs the data of (data, label) batches, or of batches that are a single tensor, through model, e.g. to calibrate
+    :param model:            model, on the device it is on
+    :param dataloader:       iterable of batches
+    :param max_batches:      stop after this many batches, all of them by default
+    :param device:           device to move the batches to, the device of the model by default
+    :param show_progress:    show a progress bar
+    """
+    device = device if device is not None else _model_device(model)
+    model.eval()
+    with torch.no_grad():
+        for step, batch in enumerate(tqdm(dataloader, disable=not show_progress)):
+            if max_batches is not None and step >= max_batches:
+                break
+            data = batch[0] if isinstance(batch, (list, tuple)) else batch
+            model(to_device(data, device))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Accuracy parity check of reduced resolution JPEG decoding against full resolution decoding
+
+Runs the ImageNet validation pipeline of ImageNetDataLoader twice over the same images, once decoding at full
+resolution and once with draft_decode, and reports how much the preprocessed inputs differ and, given a
+classifier, its top-1 accuracy with each. Exits with an error when the accuracy drops by more than allowed:
+
+    python -m aimet_zoo_torch.common.utils.decode_parity --dataset-path <imagenet val> --model resnet50
+"""
+
+import argparse
+import sys
+import time
+import torch
+import torchvision
+from aimet_zoo_torch.common.utils.image_net_data_loader import ImageNetDataLoader
+from aimet_zoo_torch.common.utils.utils import load_torchvision_pretrained_state_dict
+
+
+def compare_pipelines(images_dir: str, image_size: int = 224, num_samples_per_class: int = None, model=None,
+                      batch_size: int = 64, num_workers: int = 8) -> dict:
+    """
+    Compares full and reduced resolution decoding of the same validation images
+    :param images_dir:               The path to the data directory
+    :param image_size:               The length of the image
+    :param num_samples_per_class:    Number of samples to use per class, all of them by default
+    :param model:                    classifier to compare top-1 accuracy with, on the device it is on
+    :param batch_size:               batch size of both pipelines
+    :param num_workers:              number of sub-processes loading data in each pipeline
+    :return: dict with the number of samples, the mean and max absolute difference of the normalized inputs,
+             the loading time of each pipeline and, given a model, the top-1 accuracy in percent of each pipeline
+             and the share of samples on which both predictions agree
+    """
+    loaders = {
+        name: ImageNetDataLoader(images_dir, image_size, batch_size=batch_size, num_workers=num_workers,
+                                 num_samples_per_class=num_samples_per_class, use_tensor_cache=False,
+                                 draft_decode=draft_decode).data_loader
+        for name, draft_decode in (("full", False), ("draft", True))
+    }
+    device = next(model.parameters()).device if model is not None else None
+    if model is not None:
+        model.eval()
+    seconds = {"full": 0.0, "draft": 0.0}
+    iterators = {name: iter(loader) for name, loader in loaders.items()}
+    samples, abs_diff_sum, max_abs_diff = 0, 0.0, 0.0
+    correct = {"full": 0, "draft": 0}
+    agree = 0
+    with torch.no_grad():
+        while True:
+            batches = {}
+            for name, iterator in iterators.items():
+                start = time.perf_counter()
+                batches[name] = next(iterator, None)
+                seconds[name] += time.perf_counter() - start
+            if batches["full"] is None:
+                break
+            (full, label), (draft, _) = batches["full"], batches["draft"]
+            diff = (full - draft).abs()
+            abs_diff_sum += float(diff.mean(dim=(1, 2, 3)).sum())
+            max_abs_diff = max(max_abs_diff, float(diff.max()))
+            samples += len(full)
+            if model is not None:
+                predictions = {}
+                for name, data in (("full", full), ("draft", draft)):
+                    predictions[name] = model(data.to(device)).argmax(1).cpu()
+                    correct[name] += int((predictions[name] == label).sum())
+                agree += int((predictions["full"] == predictions["draft"]).sum())
+    result = {
+        "samples": samples,
+        "mean_abs_diff": abs_diff_sum / samples,
+        "max_abs_diff": max_abs_diff,
+        "full_seconds": seconds["full"],
+        "draft_seconds": seconds["draft"],
+    }
+    if model is not None:
+        result.update({
+            "full_top1": 100 * correct["full"] / samples,
+            "draft_top1": 100 * correct["draft"] / samples,
+            "agreement": 100 * agree / samples,
+        })
+    return result
+
+
+def arguments(raw_args):
+    """ Parse input arguments """
+    parser = argparse.ArgumentParser(description="Accuracy parity of reduced resolution JPEG decoding")
+    parser.add_argument("--dataset-path", help="path to the ImageNet validation set", type=str, required=True)
+    parser.add_argument("--image-size", help="input size of the classifier", default=224, type=int)
+    parser.add_argument("--num-samples-per-class", help="images per class to compare, all by default",
+                        default=None, type=int)
+    parser.add_argument("--model", help="torchvision classifier to compare accuracy with, none to only compare "
+                        "inputs", default="resnet50", type=str)
+    parser.add_argument("--max-top1-drop", help="largest acceptable top-1 drop, in percentage points",
+                        default=0.1, type=float)
+    parser.add_argument("--batch-size", help="batch size", default=64, type=int)
+    parser.add_argument("--num-workers", help="data loading sub-processes per pipeline", default=8, type=int)
+    parser.add_argument("--use-cuda", help="Use cuda", default=False, type=bool)
+    return parser.parse_args(raw_args)
+
+
+def main(raw_args=None):
+    """ Run the parity check, returns 1 when the accuracy drop exceeds --max-top1-drop """
+    args = arguments(raw_args)
+    model = None
+    if args.model != "none":
+        device = torch.device("cuda" if args.use_cuda else "cpu")
+        model = getattr(torchvision.models, args.model)(pretrained=False)
+        model.load_state_dict(load_torchvision_pretrained_state_dict(args.model, map_location=device))
+        model.to(device)
+    result = compare_pipelines(args.dataset_path, args.image_size, args.num_samples_per_class, model,
+                               args.batch_size, args.num_workers)
+    print(f"{result['samples']} images, mean |full - draft| {result['mean_abs_diff']:.4f}, "
+          f"max {result['max_abs_diff']:.4f} (normalized inputs)")
+    print(f"loading: full {result['full_seconds']:.1f}s, draft {result['draft_seconds']:.1f}s")
+    if model is None:
+        return 0
+    print(f"top-1: full {result['full_top1']:.3f}%, draft {result['draft_top1']:.3f}%, "
+          f"predictions agree on {result['agreement']:.2f}%")
+    return 1 if result["full_top1"] - result["draft_top1"] > args.max_top1_drop else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Early stopping evaluation with confidence intervals
+
+A quantization regression check only needs to know whether an accuracy is within some tolerance, which a random
+sample of the evaluation set usually settles long before the full set is evaluated. With an EarlyStopping passed
+to an eval function, the evaluation data is visited in a fixed, seeded random order and a confidence interval of the
+metric is updated as samples come in: a Wilson score interval for accuracy, a bootstrap interval over the evaluated
+batches for mIoU. Evaluation stops once half the width of the interval is within the tolerance, and
+EarlyStopping.summary reports the samples evaluated and the time saved compared to the full set. The evaluators
+print the summaries of their evaluations with EarlyStopping.report() and return them with their metrics.
+"""
+
+import logging
+import math
+import statistics
+import time
+import numpy as np
+import torch
+
+logger = logging.getLogger("Eval")
+
+
+def wilson_interval(correct: int, total: int, confidence: float = 0.95) -> tuple:
+    """
+    Wilson score interval of a proportion
+    :param correct:       number of successes, e.g. correct predictions
+    :param total:         number of trials
+    :param confidence:    confidence level of the interval
+    :return: (low, high) as fractions
+    """
+    if total == 0:
+        return 0.0, 1.0
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    proportion = correct / total
+    denominator = 1 + z * z / total
+    center = (proportion + z * z / (2 * total)) / denominator
+    half_width = z * math.sqrt(proportion * (1 - proportion) / total + z * z / (4 * total * total)) / denominator
+    # the bounds at 0 and total are exact, the formula leaves rounding noise there
+    low = 0.0 if correct == 0 else max(0.0, center - half_width)
+    high = 1.0 if correct == total else min(1.0, center + half_width)
+    return low, high
+
+
+def mean_iou(confusion) -> float:
+    """mean IoU over the classes present in the labels or predictions of a confusion matrix, labels are rows"""
+    confusion = np.asarray(confusion, dtype=np.float64)
+    true_positives = np.diag(confusion)
+    union = confusion.sum(0) + confusion.sum(1) - true_positives
+    present = union > 0
+    return float((true_positives[present] / union[present]).mean()) if present.any() else 0.0
+
+
+def _mean_ious(confusions) -> np.ndarray:
+    """mean_iou() of each confusion matrix of a stack of shape (n, classes, classes)"""
+    true_positives = np.einsum("nii->ni", confusions)
+    union = confusions.sum(1) + confusions.sum(2) - true_positives
+    present = union > 0
+    ious = np.divide(true_positives, union, out=np.zeros_like(true_positives), where=present)
+    counts = present.sum(1)
+    return np.divide(ious.sum(1), counts, out=np.zeros(len(confusions)), where=counts > 0)
+
+
+def _metric_of_each(metric, confusions) -> np.ndarray:
+    """metric of each confusion matrix of a stack, vectorized for mean_iou"""
+    if metric is mean_iou:
+        return _mean_ious(confusions)
+    return np.array([metric(confusion) for confusion in confusions])
+
+
+def bootstrap_miou_interval(confusions, confidence: float = 0.95, num_resamples: int = 200, seed: int = 0,
+                            metric=mean_iou) -> tuple:
+    """
+    Percentile bootstrap interval of mIoU, resampling the units the confusion matrices were computed over
+    :param confusions:       confusion matrices of single images or batches, shape (units, classes, classes)
+    :param confidence:       confidence level of the interval
+    :param num_resamples:    number of bootstrap resamples
+    :param seed:             seed of the resampling
+    :param metric:           mIoU of a confusion matrix, for evaluators that average over the classes differently
+    :return: (low, high)
+    """
+    confusions = np.asarray(confusions, dtype=np.float64)
+    units, num_classes = confusions.shape[0], confusions.shape[1]
+    rng = np.random.default_rng(seed)
+    # how often each unit is drawn in each resample, the resampled confusion matrices are then a single product
+    counts = rng.multinomial(units, np.full(units, 1.0 / units), size=num_resamples)
+    resampled = (counts @ confusions.reshape(units, -1)).reshape(num_resamples, num_classes, num_classes)
+    estimates = _metric_of_each(metric, resampled)
+    tail = 100 * (1 - confidence) / 2
+    return float(np.percentile(estimates, tail)), float(np.percentile(estimates, 100 - tail))
+
+
+class MeanIoUInterval:
+    """
+    Running mIoU and its bootstrap interval over the batches evaluated so far. The resampled confusion matrices are
+    kept as running sums, each batch enters each resample a Poisson(1) number of times, the streaming equivalent of
+    drawing the batches with replacement, so that an update and an interval cost the same however many batches
+    were seen
+    """
+
+    def __init__(self, confidence: float = 0.95, num_resamples: int = 200, seed: int = 0, metric=mean_iou):
+        self.confidence = confidence
+        self.num_resamples = num_resamples
+        self.seed = seed
+        self.metric = metric
+        self.batches = 0
+        self._rng = np.random.default_rng(seed)
+        self._total = None
+        self._resampled = None
+
+    def update(self, confusion):
+        """adds the confusion matrix of one batch"""
+        confusion = np.asarray(confusion, dtype=np.float64)
+        if self._total is None:
+            self._total = np.zeros_like(confusion)
+            self._resampled = np.zeros((self.num_resamples,) + confusion.shape)
+        self._total += confusion
+        weights = self._rng.poisson(1.0, self.num_resamples).astype(np.float64)
+        self._resampled += weights[:, None, None] * confusion
+        self.batches += 1
+
+    def estimate(self) -> float:
+        """mIoU over all batches so far"""
+        return self.metric(self._total) if self._total is not None else 0.0
+
+    def interval(self) -> tuple:
+        """bootstrap interval of the mIoU, the whole [0, 1] range until two batches are seen"""
+        if self.batches < 2:
+            return 0.0, 1.0
+        estimates = _metric_of_each(self.metric, self._resampled)
+        tail = 100 * (1 - self.confidence) / 2
+        return float(np.percentile(estimates, tail)), float(np.percentile(estimates, 100 - tail))
+
+
+class EarlyStopping:
+    """
+    Stopping rule and bookkeeping of an early stopping evaluation. One instance can be used for several evaluations,
+    summary describes the last one and summaries all of them, in the order they ran
+    """
+
+    def __init__(self, tolerance: float, confidence: float = 0.95, min_samples: int = 500, seed: int = 0,
+                 check_every: int = 1):
+        """
+        :param tolerance:      stop once half the width of the interval is at most this, in the unit of the metric
+                               (percentage points for accuracy, mIoU as a fraction)
+        :param confidence:     confidence level of the interval
+        :param min_samples:    never stop before this many samples, intervals on few samples are unreliable
+        :param seed:           seed of the evaluation order and of the bootstrap
+        :param check_every:    check the interval every this many batches, each check reads the metric off the device
+        """
+        self.tolerance = tolerance
+        self.confidence = confidence
+        self.min_samples = min_samples
+        self.seed = seed
+        self.check_every = check_every
+        self.summary = None
+        self.summaries = []
+        self._start = None
+        self._total_samples = None
+        self._batches = 0
+
+    def order(self, dataloader):
+        """
+        Returns a dataloader over the same dataset with the same settings, in a seeded random order. The order only
+        depends on the seed and the dataset size, so evaluations of different models see the same samples
+        """
+        permutation = torch.randperm(len(dataloader.dataset), generator=torch.Generator().manual_seed(self.seed))
+        return torch.utils.data.DataLoader(
+            dataloader.dataset,
+            batch_size=dataloader.batch_size,
+            sampler=permutation.tolist(),
+            num_workers=dataloader.num_workers,
+            collate_fn=dataloader.collate_fn,
+            pin_memory=dataloader.pin_memory,
+            drop_last=dataloader.drop_last,
+            worker_init_fn=dataloader.worker_init_fn,
+        )
+
+    def start(self, total_samples: int):
+        """starts timing an evaluation over a set of total_samples samples"""
+        self.summary = None
+        self._start = time.perf_counter()
+        self._total_samples = total_samples
+        self._batches = 0
+
+    def should_stop(self, interval_fn, samples: int) -> bool:
+        """
+        Called after each batch, True once the interval is tight enough
+        :param interval_fn:    returns the current (low, high) interval, only called on the batches that are checked
+        :param samples:        samples evaluated so far
+        """
+        self._batches += 1
+        if samples < self.min_samples or self._batches % self.check_every:
+            return False
+        low, high = interval_fn()
+        return (high - low) / 2 <= self.tolerance
+
+    def finish(self, estimate: float, interval: tuple, samples: int) -> dict:
+        """
+        Records the summary of the evaluation that just ended
+        :return: dict with the estimate, its interval, the samples evaluated out of the total, the seconds spent and
+                 the seconds saved, extrapolated from the time per sample
+        """
+        seconds = time.perf_counter() - self._start
+        remaining = max(0, self._total_samples - samples)
+        self.summary = {
+            "estimate": estimate,
+            "ci_low": interval[0],
+            "ci_high": interval[1],
+            "confidence": self.confidence,
+            "samples": samples,
+            "total_samples": self._total_samples,
+            "stopped_early": remaining > 0,
+            "seconds": seconds,
+            "seconds_saved": seconds / samples * remaining if samples else 0.0,
+        }
+        self.summaries.append(self.summary)
+        logger.info(format_summary(self.summary))
+        return self.summary
+
+    def report(self, names: tuple) -> dict:
+        """
+        Prints the summaries of the evaluations run with this instance, one line each
+        :param names:    names of the evaluations in the order they ran, e.g. ("fp32", "quant")
+        :return: name -> summary, to be returned with the metrics of an evaluator
+        """
+        summaries = dict(zip(names, self.summaries))
+        for name, summary in summaries.items():
+            print(f"{name}: {format_summary(summary)}")
+        return summaries
+
+
+def format_summary(summary: dict) -> str:
+    """one line description of an EarlyStopping.summary: samples evaluated, estimate, interval and time saved"""
+    return (f'Evaluated {summary["samples"]} of {summary["total_samples"]} samples: {summary["estimate"]:.4f}, '
+            f'{round(100 * summary["confidence"])}% interval [{summary["ci_low"]:.4f}, {summary["ci_high"]:.4f}], '
+            f'saved about {summary["seconds_saved"]:.0f}s')
@@ -11,22 +11,177 @@
 """
 Creates data-loader for Image-Net dataset
 """
+import hashlib
+import json
 import logging
 import os
+import shutil
+import tempfile
 
+import numpy as np
+import PIL
+from PIL import Image
+import torch
+import torchvision
 from torchvision import transforms
 from torchvision.datasets.folder import default_loader, has_file_allowed_extension
 from torch.utils.data import Dataset
 import torch.utils.data as torch_data
 
+from aimet_zoo_torch.common.artifact_cache import default_cache_dir
+from aimet_zoo_torch.common.utils.packed_files import PackedFiles, is_packed
+
 
 logger = logging.getLogger("Dataloader")
 
 IMG_EXTENSIONS = ".jpg", ".jpeg", ".png", ".ppm", ".bmp", ".pgm", ".tif"
+TENSOR_CACHE_ENV = "AIMET_ZOO_IMAGENET_TENSOR_CACHE"
+DRAFT_DECODE_ENV = "AIMET_ZOO_IMAGENET_DRAFT_DECODE"
+_TENSOR_CACHE_FORMAT = 1
+_MANIFEST_FORMAT = 1
+
+
+class DraftLoader:
+    """
+    Loads images as RGB like default_loader, but lets the JPEG decoder downscale in the DCT domain by 1/2, 1/4
+    or 1/8 to the smallest size whose width and height are both at least min_size. Decoding a full size ImageNet
+    JPEG only to shrink it to ~250 px right after dominates the CPU time of evaluation. The reduced image is
+    then resized as usual, so results differ slightly from full resolution decoding, see decode_parity.
+    Formats other than JPEG are decoded at full resolution.
+    """
+
+    def __init__(self, min_size: int):
+        """
+        :param min_size: Smallest width and height to decode to, e.g. the size the transform resizes to.
+        """
+        self.min_size = min_size
+
+    def __call__(self, path):
+        """
+        :param path: image path, or a file object such as PackedFiles.open() returns
+        """
+        if not isinstance(path, str):
+            return self._decode(path)
+        with open(path, "rb") as f_in:
+            return self._decode(f_in)
+
+    def _decode(self, f_in):
+        img = Image.open(f_in)
+        img.draft("RGB", (self.min_size, self.min_size))
+        return img.convert("RGB")
+
+    def __repr__(self):
+        return f"DraftLoader(min_size={self.min_size})"
+
+
+def file_loader(f_in):
+    """loads an image from a file object as RGB, the default loader of packed datasets"""
+    return Image.open(f_in).convert("RGB")
+
+
+def _loader_name(loader) -> str:
+    """stable name of a loader, repr of a function would include its address"""
+    return getattr(loader, "__name__", None) or repr(loader)
+
+
+def scan_class(class_path: str, extensions: tuple) -> list:
+    """
+    Lists the images of one class directory
+    :param class_path: The string path to the class directory.
+    :param extensions: List of valid extensions to load data
+    :return: [file name, size, mtime in ns] of every image, sorted by file name
+    """
+    files = []
+    with os.scandir(class_path) as entries:
+        for entry in entries:
+            if has_file_allowed_extension(entry.name, extensions):
+                stat = entry.stat()
+                files.append([entry.name, stat.st_size, stat.st_mtime_ns])
+    return sorted(files)
+
+
+def load_manifest(directory: str, extensions: tuple, cache_dir: str = None) -> dict:
+    """
+    Returns the manifest of an image folder: its class directories and the images in each. The manifest is
+    kept under <artifact cache>/imagenet_manifests and validated against directory mtimes, which change whenever
+    an entry is added, removed or renamed, so only class directories changed since the last scan are listed
+    again. On network filesystems this replaces minutes of listing with one stat per directory.
+    :param directory: The string path to the data directory.
+    :param extensions: list of valid extensions to load data
+    :param cache_dir: directory to keep manifests in, defaults to <artifact cache>/imagenet_manifests
+    :return: {"classes": {class name: {"mtime_ns": ..., "files": [[file name, size, mtime_ns], ...]}}, ...}
+    """
+    root = os.path.realpath(os.path.expanduser(directory))
+    manifest_dir = cache_dir or os.path.join(default_cache_dir(), "imagenet_manifests")
+    manifest_path = os.path.join(manifest_dir, hashlib.sha256(root.encode("UTF-8")).hexdigest() + ".json")
+    manifest = None
+    if os.path.isfile(manifest_path):
+        try:
+            with open(manifest_path) as f_in:
+                manifest = json.load(f_in)
+        except ValueError:
+            manifest = None
+    if manifest and (manifest.get("format") != _MANIFEST_FORMAT or manifest.get("root") != root
+                     or manifest.get("extensions") != list(extensions)):
+        manifest = None
+    known_classes = manifest["classes"] if manifest else {}
+
+    root_mtime = os.stat(root).st_mtime_ns
+    changed = manifest is None or manifest["mtime_ns"] != root_mtime
+    if changed:
+        with os.scandir(root) as entries:
+            class_names = sorted(entry.name for entry in entries if entry.is_dir())
+    else:
+        class_names = sorted(known_classes)
+    classes = {}
+    for class_name in class_names:
+        class_path = os.path.join(root, class_name)
+        class_mtime = os.stat(class_path).st_mtime_ns
+        known = known_classes.get(class_name)
+        if known is None or known["mtime_ns"] != class_mtime:
+            known = {"mtime_ns": class_mtime, "files": scan_class(class_path, extensions)}
+            changed = True
+        classes[class_name] = known
+
+    manifest = {
+        "format": _MANIFEST_FORMAT,
+        "root": root,
+        "extensions": list(extensions),
+        "mtime_ns": root_mtime,
+        "classes": classes,
+    }
+    if changed:
+        try:
+            os.makedirs(manifest_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=manifest_dir, prefix=".tmp_")
+            with os.fdopen(fd, "w") as f_out:
+                json.dump(manifest, f_out)
+            os.replace(tmp_path, manifest_path)
+        except OSError as error:
+            logger.warning("Could not save the file manifest of %s: %s", root, error)
+    return manifest
+
+
+def packed_manifest(files: PackedFiles, extensions: tuple) -> dict:
+    """
+    Returns the manifest of a packed image folder, in the format of load_manifest(), read from its index
+    :param files: The packed data directory.
+    :param extensions: list of valid extensions to load data
+    """
+    classes = {}
+    for name, (_, _, size) in files.files.items():
+        class_name, _, file_name = name.partition("/")
+        if file_name and "/" not in file_name and has_file_allowed_extension(file_name, extensions):
+            classes.setdefault(class_name, {"mtime_ns": files.mtime_ns, "files": []})["files"].append(
+                [file_name, size, files.mtime_ns]
+            )
+    for entry in classes.values():
+        entry["files"].sort()
+    return {"classes": classes}
 
 
 def make_dataset(
-        directory: str, class_to_idx: dict, extensions: tuple, num_samples_per_class: int
+        directory: str, class_to_idx: dict, extensions: tuple, num_samples_per_class: int, manifest: dict = None
 ) -> list:
     """
     Creates a dataset of images with num_samples_per_class images in each class
@@ -34,17 +189,20 @@ def make_dataset(
     :param class_to_idx: A dictionary mapping the name of the class to the index (label)
     :param extensions: list of valid extensions to load data
     :param num_samples_per_class: Number of samples to use per class.
+    :param manifest: manifest of directory from load_manifest(), loaded if not given
     :return: list of images containing the entire dataset.
     """
     images = []
     num_classes = 0
     directory = os.path.expanduser(directory)
+    if manifest is None:
+        manifest = load_manifest(directory, extensions)
     for class_name in sorted(class_to_idx.keys()):
-        class_path = os.path.join(directory, class_name)
-        if os.path.isdir(class_path):
+        if class_name in manifest["classes"]:
+            class_path = os.path.join(directory, class_name)
             class_idx = class_to_idx[class_name]
             class_images = add_images_for_class(
-                class_path, extensions, num_samples_per_class, class_idx
+                class_path, manifest["classes"][class_name]["files"], num_samples_per_class, class_idx
             )
             images.extend(class_images)
             num_classes += 1
@@ -54,28 +212,20 @@ def make_dataset(
 
 
 def add_images_for_class(
-        class_path: str, extensions: tuple, num_samples_per_class: int, class_idx: int
+        class_path: str, class_files: list, num_samples_per_class: int, class_idx: int
 ) -> list:
     """
-    For a given class, adds num_samples_per_class images to a list.
+    For a given class, adds num_samples_per_class images to a list. The first images by file name are
+    selected, so the selection is the same on every filesystem.
     :param class_path: The string path to the class directory.
-    :param extensions: List of valid extensions to load data
+    :param class_files: [file name, size, mtime in ns] of the images of the class, sorted by file name
     :param num_samples_per_class: Number of samples to use per class.
     :param class_idx: numerical index of class.
     :return: list of images for given class.
     """
-    class_images = []
-    count = 0
-    for file_name in os.listdir(class_path):
-        if num_samples_per_class and count >= num_samples_per_class:
-            break
-        if has_file_allowed_extension(file_name, extensions):
-            image_path = os.path.join(class_path, file_name)
-            item = (image_path, class_idx)
-            class_images.append(item)
-            count += 1
-
-    return class_images
+    if num_samples_per_class:
+        class_files = class_files[:num_samples_per_class]
+    return [(os.path.join(class_path, file_name), class_idx) for file_name, _, _ in class_files]
 
 
 class ImageFolder(Dataset):
@@ -90,17 +240,26 @@ class ImageFolder(Dataset):
             transform=None,
             target_transform=None,
             num_samples_per_class: int = None,
+            loader=None,
     ):
         """
         :param root: The path to the data directory.
         :param transform: The required processing to be applied on the sample.
         :param target_transform:  The required processing to be applied on the target.
         :param num_samples_per_class: Number of samples to use per class.
+        :param loader: Loads an image from its path, default_loader by default. Packed data directories pass
+            it a file object instead, and default to file_loader.
         """
         Dataset.__init__(self)
-        classes, class_to_idx = self._find_classes(root)
+        if is_packed(root):
+            self.files = PackedFiles(root)
+            manifest = packed_manifest(self.files, IMG_EXTENSIONS)
+        else:
+            self.files = None
+            manifest = load_manifest(root, IMG_EXTENSIONS)
+        classes, class_to_idx = self._find_classes(manifest)
         self.samples = make_dataset(
-            root, class_to_idx, IMG_EXTENSIONS, num_samples_per_class
+            root, class_to_idx, IMG_EXTENSIONS, num_samples_per_class, manifest
         )
         if not self.samples:
             raise (
@@ -112,32 +271,58 @@ class ImageFolder(Dataset):
             )
 
         self.root = root
-        self.loader = default_loader
+        self.loader = loader or (file_loader if self.files else default_loader)
         self.extensions = IMG_EXTENSIONS
 
         self.classes = classes
         self.class_to_idx = class_to_idx
         self.targets = [s[1] for s in self.samples]
+        # (size, mtime in ns) of every sample, as recorded in the manifest. The manifest is validated by
+        # directory mtimes only, current_sample_stats() stats the files themselves
+        file_stats = {
+            (class_name, file_name): (size, mtime)
+            for class_name, entry in manifest["classes"].items()
+            for file_name, size, mtime in entry["files"]
+        }
+        self.sample_stats = [
+            file_stats[(os.path.basename(os.path.dirname(path)), os.path.basename(path))]
+            for path, _ in self.samples
+        ]
 
         self.transform = transform
         self.target_transform = target_transform
 
         self.imgs = self.samples
 
+    def current_sample_stats(self) -> list:
+        """
+        Returns (size, mtime in ns) of every sample as it is on disk now. An image replaced in place leaves its
+        directory mtime unchanged, so the manifest may still hold its old stats. Packed data directories are
+        read only, their stats come from the index.
+        """
+        if self.files is not None:
+            return list(self.sample_stats)
+        stats = []
+        for path, _ in self.samples:
+            stat = os.stat(path)
+            stats.append((stat.st_size, stat.st_mtime_ns))
+        return stats
+
     @staticmethod
-    def _find_classes(directory: str):
-        classes = [
-            d
-            for d in os.listdir(directory)
-            if os.path.isdir(os.path.join(directory, d))
-        ]
-        classes.sort()
+    def _find_classes(manifest: dict):
+        classes = sorted(manifest["classes"])
         class_to_idx = {classes[i]: i for i in range(len(classes))}
         return classes, class_to_idx
 
+    def load_image(self, path: str):
+        """loads the image of a sample, from the packed data directory if the root is one"""
+        if self.files is not None:
+            return self.loader(self.files.open(path))
+        return self.loader(path)
+
     def __getitem__(self, index: int):
         path, target = self.samples[index]
-        sample = self.loader(path)
+        sample = self.load_image(path)
         if self.transform is not None:
             sample = self.transform(sample)
         if self.target_transform is not None:
@@ -149,6 +334,128 @@ class ImageFolder(Dataset):
         return len(self.samples)
 
 
+class _DecodedImages(Dataset):
+    """decodes and preprocesses samples to uint8 tensors, used to fill the tensor cache in parallel"""
+
+    def __init__(self, image_folder: ImageFolder, preprocess):
+        Dataset.__init__(self)
+        self.image_folder = image_folder
+        self.preprocess = preprocess
+
+    def __getitem__(self, index: int):
+        return self.preprocess(self.image_folder.load_image(self.image_folder.samples[index][0]))
+
+    def __len__(self):
+        return len(self.image_folder)
+
+
+class PreprocessedImageFolder(Dataset):
+    """
+    Serves the samples of an ImageFolder from an on-disk cache of their preprocessed uint8 tensors. The cache is
+    a single memory mapped array with a label index, keyed by the sample list and the preprocessing, so repeated
+    evaluations read crops instead of decoding JPEGs. It is built on first use.
+    """
+
+    def __init__(
+            self,
+            image_folder: ImageFolder,
+            preprocess,
+            normalize,
+            cache_dir: str = None,
+            num_workers: int = 8,
+    ):
+        """
+        :param image_folder: The dataset whose samples are cached.
+        :param preprocess: Deterministic processing from a PIL image to a uint8 CHW tensor of fixed size.
+        :param normalize: The processing applied to the cached uint8 tensor when a sample is read.
+        :param cache_dir: Root directory of the cache, defaults to <artifact cache>/imagenet_tensors.
+        :param num_workers: Number of sub-processes decoding images while the cache is built.
+        """
+        Dataset.__init__(self)
+        self.samples = image_folder.samples
+        # stat every file once, so that the cache key sees images replaced since the manifest was written
+        self.sample_stats = image_folder.current_sample_stats()
+        self.targets = image_folder.targets
+        self.classes = image_folder.classes
+        self.class_to_idx = image_folder.class_to_idx
+        self.loader = image_folder.loader
+        self.preprocess = preprocess
+        self.transform = normalize
+        root = cache_dir or os.path.join(default_cache_dir(), "imagenet_tensors")
+        self.cache_path = os.path.join(root, self._key())
+        if not os.path.isfile(os.path.join(self.cache_path, "meta.json")):
+            self._build(image_folder, num_workers)
+        with open(os.path.join(self.cache_path, "meta.json")) as f_in:
+            self.shape = tuple(json.load(f_in)["shape"])
+        self.labels = np.load(os.path.join(self.cache_path, "labels.npy"))
+        # opened lazily, so that data loader workers each map the file instead of receiving a pickled copy
+        self._images = None
+
+    def _key(self) -> str:
+        """changes with the sample list, a modified image or different preprocessing"""
+        digest = hashlib.sha256()
+        for (path, target), (size, mtime) in zip(self.samples, self.sample_stats):
+            digest.update(json.dumps([path, target, size, mtime]).encode("UTF-8"))
+        digest.update(json.dumps({
+            "format": _TENSOR_CACHE_FORMAT,
+            "loader": _loader_name(self.loader),
+            "preprocess": repr(self.preprocess),
+            "torchvision": torchvision.__version__,
+            "PIL": PIL.__version__,
+        }).encode("UTF-8"))
+        return digest.hexdigest()
+
+    def _build(self, image_folder: ImageFolder, num_workers: int):
+        """decodes every sample once into a new cache directory, which is moved into place when complete"""
+        root = os.path.dirname(self.cache_path)
+        os.makedirs(root, exist_ok=True)
+        logger.info("Caching %d preprocessed images in %s", len(self.samples), self.cache_path)
+        tmp_dir = tempfile.mkdtemp(dir=root, prefix=".tmp_")
+        try:
+            shape = tuple(self.preprocess(image_folder.load_image(self.samples[0][0])).shape)
+            images = np.lib.format.open_memmap(
+                os.path.join(tmp_dir, "images.npy"), mode="w+", dtype=np.uint8, shape=(len(self.samples),) + shape
+            )
+            decoder = torch_data.DataLoader(
+                _DecodedImages(image_folder, self.preprocess), batch_size=64, num_workers=num_workers
+            )
+            start = 0
+            for batch in decoder:
+                images[start:start + len(batch)] = batch.numpy()
+                start += len(batch)
+            images.flush()
+            del images
+            np.save(os.path.join(tmp_dir, "labels.npy"), np.asarray(self.targets, dtype=np.int64))
+            # written last, its presence marks a complete cache
+            with open(os.path.join(tmp_dir, "meta.json"), "w") as f_out:
+                json.dump({"shape": list(shape), "num_samples": len(self.samples)}, f_out)
+            try:
+                os.rename(tmp_dir, self.cache_path)
+            except OSError:
+                # another process completed the same cache first
+                if not os.path.isfile(os.path.join(self.cache_path, "meta.json")):
+                    raise
+        finally:
+            if os.path.isdir(tmp_dir):
+                shutil.rmtree(tmp_dir)
+
+    def __getitem__(self, index: int):
+        if self._images is None:
+            self._images = np.load(os.path.join(self.cache_path, "images.npy"), mmap_mode="r")
+        sample = torch.from_numpy(np.array(self._images[index]))
+        if self.transform is not None:
+            sample = self.transform(sample)
+        return sample, int(self.labels[index])
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_images"] = None
+        return state
+
+    def __len__(self):
+        return len(self.samples)
+
+
 class ImageNetDataLoader:
     """
     For loading Validation data from the ImageNet dataset.
@@ -162,6 +469,8 @@ class ImageNetDataLoader:
             is_training: bool = False,
             num_workers: int = 8,
             num_samples_per_class: int = None,
+            use_tensor_cache: bool = None,
+            draft_decode: bool = None,
     ):
         """
         :param images_dir: The path to the data directory
@@ -170,7 +479,16 @@ class ImageNetDataLoader:
         :param is_training: Indicates whether to load the training or validation data
         :param num_workers: Indiicates to the data loader how many sub-processes to use for data loading.
         :param num_samples_per_class: Number of samples to use per class.
+        :param use_tensor_cache: Serve validation data from the on-disk cache of preprocessed uint8 crops,
+            see PreprocessedImageFolder. Defaults to $AIMET_ZOO_IMAGENET_TENSOR_CACHE == "1".
+        :param draft_decode: Decode validation JPEGs at reduced resolution, just above the size they are resized
+            to, see DraftLoader. Defaults to $AIMET_ZOO_IMAGENET_DRAFT_DECODE == "1".
         """
+        if use_tensor_cache is None:
+            use_tensor_cache = os.getenv(TENSOR_CACHE_ENV, "0") == "1"
+        if draft_decode is None:
+            draft_decode = os.getenv(DRAFT_DECODE_ENV, "0") == "1"
+        val_loader = DraftLoader(image_size + 24) if draft_decode else None
 
         # For normalization, mean and std dev values are calculated per channel
         # and can be found on the web.
@@ -202,11 +520,28 @@ class ImageNetDataLoader:
                 transform=self.train_transforms,
                 num_samples_per_class=num_samples_per_class,
             )
+        elif use_tensor_cache:
+            # the same validation transform, split at the uint8 crop that is cached
+            self.data_set = PreprocessedImageFolder(
+                ImageFolder(root=images_dir, num_samples_per_class=num_samples_per_class, loader=val_loader),
+                preprocess=transforms.Compose(
+                    [
+                        transforms.Resize(image_size + 24),
+                        transforms.CenterCrop(image_size),
+                        transforms.PILToTensor(),
+                    ]
+                ),
+                normalize=transforms.Compose(
+                    [transforms.ConvertImageDtype(torch.float), normalize]
+                ),
+                num_workers=num_workers,
+            )
         else:
             self.data_set = ImageFolder(
                 root=images_dir,
                 transform=self.val_transforms,
                 num_samples_per_class=num_samples_per_class,
+                loader=val_loader,
             )
 
         self._data_loader = torch_data.DataLoader(
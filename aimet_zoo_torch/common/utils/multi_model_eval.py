@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Evaluation of several models in a single pass over a dataloader
+
+Comparing FP32 and quantized variants used to mean one full pass over the evaluation data per variant, decoding
+and preprocessing every sample again each time. evaluate_models() loads each batch once, moves it to each device
+at most once and runs it through every model, accumulating one metric per model.
+"""
+
+import torch
+from tqdm import tqdm
+from aimet_zoo_torch.common.utils.instrumentation import count_samples, instrumented
+
+
+class Accuracy:
+    """Streaming top-1 classification accuracy, in percent, for (data, label) batches"""
+
+    def __init__(self):
+        self.correct = 0
+        self.total = 0
+
+    def update(self, output, batch):
+        """accumulates the predictions of one batch"""
+        _, prediction = torch.max(output, 1)
+        # kept on the device until compute(), so that no batch waits for the host
+        self.correct += (prediction == batch[1]).sum()
+        self.total += len(output)
+
+    def compute(self) -> float:
+        """accuracy over all batches seen so far"""
+        return float(100 * self.correct / self.total)
+
+
+def default_forward(model, batch):
+    """runs the data of a (data, label) batch, or a batch that is a single tensor, through model"""
+    if isinstance(batch, (list, tuple)):
+        return model(batch[0])
+    return model(batch)
+
+
+def to_device(batch, device):
+    """moves the tensors of a batch, nested in lists, tuples or dicts, to device"""
+    if isinstance(batch, torch.Tensor):
+        return batch.to(device, non_blocking=True)
+    if isinstance(batch, dict):
+        return {key: to_device(value, device) for key, value in batch.items()}
+    if isinstance(batch, (list, tuple)):
+        return type(batch)(to_device(value, device) for value in batch)
+    return batch
+
+
+def batch_size(batch) -> int:
+    """number of samples in a batch, the length of its first tensor"""
+    if isinstance(batch, torch.Tensor):
+        return len(batch)
+    values = batch.values() if isinstance(batch, dict) else batch if isinstance(batch, (list, tuple)) else ()
+    for value in values:
+        size = batch_size(value)
+        if size:
+            return size
+    return 0
+
+
+def _model_device(model) -> torch.device:
+    parameter = next(model.parameters(), None)
+    return parameter.device if parameter is not None else torch.device("cpu")
+
+
+@instrumented("eval")
+def evaluate_models(models: dict, dataloader, metric_factory=Accuracy, forward_fn=default_forward,
+                    max_batches: int = None, show_progress: bool = True) -> dict:
+    """
+    Evaluates all models in a single pass over dataloader
+    :param models:            name -> model, models stay on the device they are on
+    :param dataloader:        any iterable of batches, e.g. a torch DataLoader
+    :param metric_factory:    callable returning a fresh metric with update(output, batch) and compute(), one per model
+    :param forward_fn:        forward_fn(model, batch) returns the model output for a batch
+    :param max_batches:       stop after this many batches, all of them by default
+    :param show_progress:     show a progress bar
+    :return: name -> metric.compute() of that model
+    """
+    metrics = {name: metric_factory() for name in models}
+    devices = {name: _model_device(model) for name, model in models.items()}
+    for model in models.values():
+        model.eval()
+    samples = 0
+    with torch.no_grad():
+        for step, batch in enumerate(tqdm(dataloader, disable=not show_progress)):
+            if max_batches is not None and step >= max_batches:
+                break
+            samples += batch_size(batch)
+            # each batch is loaded once and copied to every device in use at most once
+            on_device = {}
+            for name, model in models.items():
+                device = devices[name]
+                if device not in on_device:
+                    on_device[device] = to_device(batch, device)
+                metrics[name].update(forward_fn(model, on_device[device]), on_device[device])
+    count_samples(samples)
+    return {name: metric.compute() for name, metric in metrics.items()}
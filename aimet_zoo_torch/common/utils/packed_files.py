@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Packed shard format for image datasets
+
+Reading tens of thousands of small files is slow on network filesystems and object store mounts. pack_directory()
+concatenates the files of a dataset directory into a few large shards, in sorted path order, and writes an index
+of (shard, offset, size) per relative path. A packed directory can be passed wherever the original directory was
+expected: ImageNetDataLoader, the YOLOX COCODataset and the FFNet Cityscapes loader read from PackedFiles when the
+directory holds an index. Evaluation data is read in order, so the read ahead of PackedFiles turns it into a
+handful of large sequential reads per data loader worker.
+
+    python -m aimet_zoo_torch.common.utils.packed_files <dataset dir> <packed dir> [--shard-size 1G]
+"""
+
+import argparse
+import io
+import json
+import os
+import tempfile
+from aimet_zoo_torch.common.artifact_cache import parse_size
+
+INDEX_FILE = "index.json"
+DEFAULT_SHARD_SIZE = 1 << 30
+DEFAULT_READAHEAD = 8 << 20
+_PACK_FORMAT = 1
+_COPY_CHUNK_SIZE = 1 << 20
+
+
+def is_packed(directory: str) -> bool:
+    """True if directory was written by pack_directory()"""
+    return os.path.isfile(os.path.join(directory, INDEX_FILE))
+
+
+def pack_directory(src_dir: str, dst_dir: str, shard_size=DEFAULT_SHARD_SIZE, extensions: tuple = None) -> int:
+    """
+    Packs every file below src_dir into shards of about shard_size bytes in dst_dir
+    :param src_dir:       dataset directory
+    :param dst_dir:       packed directory to create, holding the shards and their index
+    :param shard_size:    shard size in bytes or as a string such as "1G", a larger file gets a shard of its own
+    :param extensions:    only pack files with these extensions, e.g. (".jpg", ".png"), all files by default
+    :return: number of files packed
+    """
+    shard_size = parse_size(shard_size)
+    extensions = tuple(ext.lower() for ext in extensions) if extensions else None
+    os.makedirs(dst_dir, exist_ok=True)
+    files, shards = {}, []
+    shard, shard_offset = None, 0
+    try:
+        for dir_path, dir_names, file_names in os.walk(src_dir):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if extensions and not file_name.lower().endswith(extensions):
+                    continue
+                src_path = os.path.join(dir_path, file_name)
+                size = os.path.getsize(src_path)
+                if shard is None or (shard_offset and shard_offset + size > shard_size):
+                    if shard is not None:
+                        shard.close()
+                    shards.append(f"shard-{len(shards):05d}.bin")
+                    shard = open(os.path.join(dst_dir, shards[-1]), "wb")
+                    shard_offset = 0
+                with open(src_path, "rb") as f_in:
+                    while True:
+                        chunk = f_in.read(_COPY_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        shard.write(chunk)
+                relative_path = os.path.relpath(src_path, src_dir).replace(os.sep, "/")
+                files[relative_path] = [len(shards) - 1, shard_offset, size]
+                shard_offset += size
+    finally:
+        if shard is not None:
+            shard.close()
+    # written last, a directory without an index is not a packed directory
+    fd, tmp_path = tempfile.mkstemp(dir=dst_dir, prefix=".tmp_")
+    with os.fdopen(fd, "w") as f_out:
+        json.dump({"format": _PACK_FORMAT, "shards": shards, "files": files}, f_out)
+    os.replace(tmp_path, os.path.join(dst_dir, INDEX_FILE))
+    return len(files)
+
+
+class PackedFiles:
+    """
+    Read access to the files of a packed directory by their original path. Can be handed to data loader
+    workers, each worker opens the shards and keeps a read ahead buffer of its own.
+    """
+
+    def __init__(self, directory: str, readahead: int = DEFAULT_READAHEAD):
+        """
+        :param directory:    packed directory written by pack_directory()
+        :param readahead:    bytes read at once, consecutive files within this range are served from memory
+        """
+        self.root = directory
+        self.readahead = readahead
+        with open(os.path.join(directory, INDEX_FILE)) as f_in:
+            index = json.load(f_in)
+        if index.get("format") != _PACK_FORMAT:
+            raise ValueError(f"{directory} was packed in an unsupported format {index.get('format')}")
+        self.shards = index["shards"]
+        self.files = index["files"]
+        self.mtime_ns = os.stat(os.path.join(directory, INDEX_FILE)).st_mtime_ns
+        self._fds = {}
+        self._buffer = (None, 0, b"")
+
+    def _name(self, path: str) -> str:
+        """path relative to the packed directory, as stored in the index"""
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def __contains__(self, path: str) -> bool:
+        return self._name(path) in self.files
+
+    def isfile(self, path: str) -> bool:
+        """like os.path.isfile for the original path of a packed file"""
+        return path in self
+
+    def size(self, path: str) -> int:
+        """size in bytes of a packed file"""
+        return self.files[self._name(path)][2]
+
+    def listdir(self, path: str = None) -> list:
+        """like os.listdir for a directory of the original dataset, sorted"""
+        prefix = "" if path is None or self._name(path) == "." else self._name(path) + "/"
+        return sorted({name[len(prefix):].split("/", 1)[0] for name in self.files if name.startswith(prefix)})
+
+    def read(self, path: str) -> bytes:
+        """contents of the packed file at the original path"""
+        shard, offset, size = self.files[self._name(path)]
+        buffer_shard, buffer_offset, buffer = self._buffer
+        if buffer_shard == shard and buffer_offset <= offset and offset + size <= buffer_offset + len(buffer):
+            start = offset - buffer_offset
+            return buffer[start:start + size]
+        if shard not in self._fds:
+            self._fds[shard] = os.open(os.path.join(self.root, self.shards[shard]), os.O_RDONLY)
+        if size >= self.readahead:
+            return os.pread(self._fds[shard], size, offset)
+        buffer = os.pread(self._fds[shard], self.readahead, offset)
+        self._buffer = (shard, offset, buffer)
+        return buffer[:size]
+
+    def open(self, path: str) -> io.BytesIO:
+        """file object with the contents of the packed file at the original path"""
+        return io.BytesIO(self.read(path))
+
+    def close(self):
+        """closes the shards, they are reopened on the next read"""
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds = {}
+        self._buffer = (None, 0, b"")
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_fds"] = {}
+        state["_buffer"] = (None, 0, b"")
+        return state
+
+    def __del__(self):
+        self.close()
+
+
+def arguments(raw_args):
+    """ Parse input arguments """
+    parser = argparse.ArgumentParser(description="Pack a dataset directory into large shards with an index")
+    parser.add_argument("src_dir", help="dataset directory, e.g. ImageNet val or COCO val2017", type=str)
+    parser.add_argument("dst_dir", help="packed directory to create", type=str)
+    parser.add_argument("--shard-size", help="shard size, e.g. 512M or 1G", default="1G", type=str)
+    parser.add_argument("--extensions", help="only pack files with these extensions", nargs="*", default=None)
+    return parser.parse_args(raw_args)
+
+
+def main(raw_args=None):
+    """ Pack a dataset directory """
+    args = arguments(raw_args)
+    count = pack_directory(args.src_dir, args.dst_dir, args.shard_size, args.extensions)
+    print(f"Packed {count} files from {args.src_dir} into {args.dst_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Pipelined evaluation loop overlapping loading, inference and postprocessing
+
+Detection and pose evaluators decode an image, run the model, then run NMS or keypoint grouping and convert the
+result, one after another on one thread, so the model sits idle during pre- and postprocessing. Pipeline runs the
+three stages concurrently in threads connected by bounded queues (image decoding, torch and numpy release the GIL
+for most of their work) and yields the results in input order. Pipeline.stats tells how busy each stage was, i.e.
+where the time goes.
+"""
+
+import queue
+import threading
+import time
+import torch
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+
+
+class _Failure:
+    """an exception raised in a stage, handed to the consumer to re-raise"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+class Pipeline:
+    """
+    Three stage pipeline: load_fn(item) on num_loaders threads, forward_fn(loaded) on one thread and
+    postprocess_fn(loaded, output) on num_postprocessors threads
+    """
+
+    def __init__(self, load_fn, forward_fn, postprocess_fn, num_loaders: int = 2, num_postprocessors: int = 2,
+                 queue_size: int = 4):
+        """
+        :param load_fn:               loads and preprocesses one item, e.g. reads and resizes an image
+        :param forward_fn:            runs the model on a loaded item, under torch.no_grad()
+        :param postprocess_fn:        turns the loaded item and the model output into a result, e.g. NMS
+        :param num_loaders:           threads running load_fn
+        :param num_postprocessors:    threads running postprocess_fn
+        :param queue_size:            capacity of the queues between the stages, bounds the items in flight
+        """
+        self.stages = (("load", load_fn, num_loaders), ("forward", forward_fn, 1),
+                       ("postprocess", postprocess_fn, num_postprocessors))
+        self.queue_size = queue_size
+        self.stats = {}
+        self._busy = {}
+        self._items = {}
+        self._lock = threading.Lock()
+        # serializes the loaders on the shared item iterator, which may be slow (e.g. a dataloader iterator)
+        # and must not hold up the stage statistics of the other threads
+        self._items_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _put(self, target: queue.Queue, message) -> bool:
+        """blocks until message is queued, returns False if the pipeline is stopped meanwhile"""
+        while not self._stop.is_set():
+            try:
+                target.put(message, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue):
+        """blocks until a message arrives, returns _DONE if the pipeline is stopped meanwhile"""
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _record(self, stage: str, start: float):
+        with self._lock:
+            self._busy[stage] += time.perf_counter() - start
+            self._items[stage] += 1
+
+    def _load(self, items, output: queue.Queue, results: queue.Queue):
+        load_fn = self.stages[0][1]
+        try:
+            while not self._stop.is_set():
+                with self._items_lock:
+                    index, item = next(items, (None, _DONE))
+                if item is _DONE:
+                    break
+                start = time.perf_counter()
+                loaded = load_fn(item)
+                self._record("load", start)
+                if not self._put(output, (index, loaded)):
+                    break
+        except BaseException as error:  # pylint: disable=broad-except
+            results.put(_Failure(error))
+        finally:
+            self._put(output, _DONE)
+
+    def _forward(self, source: queue.Queue, output: queue.Queue, results: queue.Queue):
+        forward_fn, num_loaders, num_postprocessors = self.stages[1][1], self.stages[0][2], self.stages[2][2]
+        finished = 0
+        try:
+            # grad mode is thread local, the no_grad() of the caller does not reach this thread
+            with torch.no_grad():
+                while finished < num_loaders:
+                    message = self._get(source)
+                    if message is _DONE:
+                        finished += 1
+                        continue
+                    index, loaded = message
+                    start = time.perf_counter()
+                    model_output = forward_fn(loaded)
+                    self._record("forward", start)
+                    if not self._put(output, (index, loaded, model_output)):
+                        break
+        except BaseException as error:  # pylint: disable=broad-except
+            results.put(_Failure(error))
+        finally:
+            for _ in range(num_postprocessors):
+                self._put(output, _DONE)
+
+    def _postprocess(self, source: queue.Queue, results: queue.Queue):
+        postprocess_fn = self.stages[2][1]
+        try:
+            while True:
+                message = self._get(source)
+                if message is _DONE:
+                    break
+                index, loaded, model_output = message
+                start = time.perf_counter()
+                result = postprocess_fn(loaded, model_output)
+                self._record("postprocess", start)
+                results.put((index, result))
+        except BaseException as error:  # pylint: disable=broad-except
+            results.put(_Failure(error))
+        finally:
+            results.put(_DONE)
+
+    def run(self, items):
+        """
+        Runs every item through the three stages, yields the results in the order of items
+        Stats are available in self.stats once the generator is exhausted or closed
+        """
+        self._stop.clear()
+        self._busy = {name: 0.0 for name, _, _ in self.stages}
+        self._items = {name: 0 for name, _, _ in self.stages}
+        loaded, model_outputs = queue.Queue(self.queue_size), queue.Queue(self.queue_size)
+        # unbounded, the consumer reorders results and must never block the postprocessing threads
+        results = queue.Queue()
+        items = enumerate(iter(items))
+        num_postprocessors = self.stages[2][2]
+        threads = [threading.Thread(target=self._load, args=(items, loaded, results), daemon=True)
+                   for _ in range(self.stages[0][2])]
+        threads.append(threading.Thread(target=self._forward, args=(loaded, model_outputs, results), daemon=True))
+        threads += [threading.Thread(target=self._postprocess, args=(model_outputs, results), daemon=True)
+                    for _ in range(num_postprocessors)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        pending, next_index, finished = {}, 0, 0
+        try:
+            while finished < num_postprocessors:
+                message = results.get()
+                if message is _DONE:
+                    finished += 1
+                    continue
+                if isinstance(message, _Failure):
+                    raise message.error
+                index, result = message
+                pending[index] = result
+                while next_index in pending:
+                    yield pending.pop(next_index)
+                    next_index += 1
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            self._update_stats(time.perf_counter() - start)
+
+    def _update_stats(self, seconds: float):
+        self.stats = {"seconds": seconds}
+        for name, _, workers in self.stages:
+            self.stats[name] = {
+                "threads": workers,
+                "items": self._items[name],
+                "busy_seconds": self._busy[name],
+                "utilization": self._busy[name] / (seconds * workers) if seconds else 0.0,
+            }
+
+    def format_stats(self) -> str:
+        """one line summary of self.stats"""
+        stages = ", ".join(f"{name} {self.stats[name]['utilization']:.0%} busy "
+                           f"({self.stats[name]['busy_seconds']:.1f}s on {self.stats[name]['threads']} threads)"
+                           for name, _, _ in self.stages)
+        return f"{self.stats['seconds']:.1f}s: {stages}"
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2023 of Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Multi-process sharded evaluation for CPU-only hosts
+
+A single evaluation process with one model replica leaves most cores of a large CPU host idle, since intra-op
+parallelism of small batches scales poorly. evaluate_sharded() splits the evaluation set into disjoint contiguous
+shards and evaluates each in a worker process of its own, with its own model or sim replica and intra-op thread
+budget. Each worker returns a mergeable metric state (a confusion matrix, correct counts, a list of COCO
+detections, or an object with a merge() method), and the parent reduces the states of all shards with
+merge_states(). build_replica() builds the model or sim of a model class of the zoo inside a worker, so that only
+the model config and the encodings calibrated in the parent are sent to the workers.
+"""
+
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+import torch
+import torch.multiprocessing
+from torch.utils.data import DataLoader, Subset
+from aimet_zoo_torch.common.utils.instrumentation import count_samples, instrumented
+
+
+def shard_indices(num_samples: int, num_shards: int) -> list:
+    """Splits range(num_samples) into num_shards disjoint contiguous ranges, differing in size by at most one"""
+    bounds = [num_samples * shard // num_shards for shard in range(num_shards + 1)]
+    return [range(bounds[shard], bounds[shard + 1]) for shard in range(num_shards)]
+
+
+def merge_states(states: list):
+    """
+    Reduces the metric states of all shards, in shard order
+    objects with merge(other) are merged with it, dicts key by key, lists are concatenated (e.g. COCO detections)
+    and anything else, e.g. counts, numpy confusion matrices or tensors, is summed
+    """
+    first = states[0]
+    if hasattr(first, "merge"):
+        return functools.reduce(lambda merged, state: merged.merge(state), states)
+    if isinstance(first, dict):
+        return {key: merge_states([state[key] for state in states]) for key in first}
+    if isinstance(first, list):
+        return [item for state in states for item in state]
+    return functools.reduce(lambda merged, state: merged + state, states)
+
+
+def build_replica(model_cls, model_config: str, quantized: bool = False, use_sim: bool = False,
+                  encodings_path: str = None, **model_kwargs):
+    """
+    Builds a replica of a model of the zoo on the cpu, in a worker of evaluate_sharded(). Passed to it as e.g.
+    functools.partial(build_replica, ResNet, "resnet50_w8a8", quantized=True, use_sim=True, encodings_path=path),
+    which pickles the model class by reference. Artifacts and quantsim snapshots come from their caches.
+    :param model_cls:         model class of the zoo, constructed with model_config and device
+    :param model_config:      name of the model card
+    :param quantized:         load the post optimization weights instead of the original ones
+    :param use_sim:           return the model of get_quantsim(quantized) instead of that of from_pretrained(quantized)
+    :param encodings_path:    encodings to load into the sim, e.g. exported by encodings_cache.export_encodings()
+                              after calibrating in the parent process
+    :param model_kwargs:      further arguments of the model class, e.g. num_classes
+    """
+    model = model_cls(model_config=model_config, device=torch.device("cpu"), **model_kwargs)
+    if not use_sim:
+        model.from_pretrained(quantized=quantized)
+        return model.model.eval()
+    sim = model.get_quantsim(quantized=quantized)
+    if encodings_path:
+        # only the workers need aimet, the sharded evaluation of plain models runs without it
+        from aimet_torch.quantsim import load_encodings_to_sim  # pylint: disable=import-outside-toplevel
+        load_encodings_to_sim(sim, encodings_path)
+    return sim.model.eval()
+
+
+def _evaluate_shard(model, shard_fn, dataset, indices, loader_kwargs: dict, num_threads: int):
+    """
+    runs in a worker process, or in the caller for a single shard: builds the replica and the loader of one shard
+    and returns its metric state. The intra-op thread count is restored afterwards
+    """
+    previous_threads = torch.get_num_threads()
+    torch.set_num_threads(num_threads)
+    try:
+        if not isinstance(model, torch.nn.Module):
+            model = model()
+        loader = DataLoader(Subset(dataset, indices), **loader_kwargs)
+        with torch.no_grad():
+            return shard_fn(model, loader)
+    finally:
+        torch.set_num_threads(previous_threads)
+
+
+@instrumented("eval")
+def evaluate_sharded(model, shard_fn, dataloader, num_shards: int, threads_per_shard: int = None,
+                     loader_workers: int = 0):
+    """
+    Evaluates disjoint shards of the dataset of dataloader in num_shards worker processes and merges their states
+    :param model:                model or sim model, copied into each worker, or a picklable callable building the
+                                 replica in the worker, e.g. a functools.partial of a module level function
+    :param shard_fn:             picklable shard_fn(model, shard_loader) returning the mergeable metric state of a
+                                 shard, e.g. a module level function
+    :param dataloader:           dataloader of the evaluation set, its dataset, batch size and collate_fn are reused
+    :param num_shards:           number of worker processes
+    :param threads_per_shard:    intra-op threads of each worker, the cores of the host split evenly by default
+    :param loader_workers:       data loading sub-processes of each worker
+    :return: merge_states() of the states of all shards
+    """
+    if threads_per_shard is None:
+        threads_per_shard = max(1, (os.cpu_count() or 1) // num_shards)
+    loader_kwargs = {
+        "batch_size": dataloader.batch_size,
+        "collate_fn": dataloader.collate_fn,
+        "num_workers": loader_workers,
+        "worker_init_fn": dataloader.worker_init_fn,
+    }
+    shards = [indices for indices in shard_indices(len(dataloader.dataset), num_shards) if len(indices)]
+    count_samples(sum(len(indices) for indices in shards))
+    if len(shards) == 1:
+        return merge_states([_evaluate_shard(model, shard_fn, dataloader.dataset, shards[0], loader_kwargs,
+                                             threads_per_shard)])
+    # spawned rather than forked, a forked child inherits the thread pools of the parent in an unusable state
+    context = torch.multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(len(shards), mp_context=context) as pool:
+        futures = [pool.submit(_evaluate_shard, model, shard_fn, dataloader.dataset, list(indices), loader_kwargs,
+                               threads_per_shard) for indices in shards]
+        return merge_states([future.result() for future in futures])
@@ -7,7 +7,8 @@
 #
 #  @@-COPYRIGHT-END-@@
 # =============================================================================
-""" util functions to get available device"""
+""" util functions to get available device and pretrained torchvision weights"""
+import importlib
 import torch
 
 
@@ -20,3 +21,23 @@ def get_device(args):
     if args.use_cuda and not torch.cuda.is_available():
         raise Exception("use-cuda set to True, but cuda is not available")
     return torch.device("cuda" if args.use_cuda else "cpu")
+
+
+def load_torchvision_pretrained_state_dict(arch: str, map_location=None) -> dict:
+    """
+    Returns the ImageNet state dict that torchvision.models.<arch>(pretrained=True) would load, without building
+    a model around it, so the weights can be loaded exactly once into a model constructed with pretrained=False.
+    Downloads go through the same torch hub checkpoint cache torchvision uses.
+    :param arch:            torchvision model builder name, e.g. "resnet50"
+    :param map_location:    device to load the tensors onto
+    """
+    #pylint:disable = import-outside-toplevel
+    import torchvision
+    builder = getattr(torchvision.models, arch)
+    model_urls = getattr(importlib.import_module(builder.__module__), "model_urls", None)
+    if model_urls is not None:
+        url = model_urls[arch]
+    else:
+        # torchvision >= 0.13 replaced the url tables with weight enums, pretrained=True maps to IMAGENET1K_V1
+        url = torchvision.models.get_model_weights(arch)["IMAGENET1K_V1"].url
+    return torch.hub.load_state_dict_from_url(url, map_location=map_location, progress=True)
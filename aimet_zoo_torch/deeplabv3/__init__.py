@@ -1,2 +1,9 @@
 """ loading deeplabv3 downloader class """
-from .model.model_definition import DeepLabV3_Plus
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import DeepLabV3_Plus
+
+__all__ = ["DeepLabV3_Plus"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"DeepLabV3_Plus": ".model.model_definition"})
@@ -1,2 +1,2 @@
 """loading dataloader and evaluation function"""
-from .dataloaders_and_eval_func import get_dataloaders_and_eval_func
+from .dataloaders_and_eval_func import get_dataloaders_and_eval_func, eval_func_sharded
@@ -15,6 +15,9 @@ from tqdm import tqdm
 import torch
 from aimet_zoo_torch.deeplabv3.model.dataloaders import make_data_loader
 from aimet_zoo_torch.deeplabv3.model.utils.metrics import Evaluator
+from aimet_zoo_torch.common.utils.early_stopping import MeanIoUInterval
+from aimet_zoo_torch.common.utils.instrumentation import count_samples, instrumented
+from aimet_zoo_torch.common.utils.sharded_eval import evaluate_sharded
 
 
 class DataloaderConfig:
@@ -52,26 +55,41 @@ def get_dataloaders_and_eval_func(pascal_path):
         config, **kwargs
     )
 
+    @instrumented("eval")
     def eval_func(model, args):
         """
         evaluation function for deeplabv3
         parameters: model, args
+            args: [iterations, device] or [iterations, device, early_stopping], with an EarlyStopping the
+            validation set is visited in a seeded random order until the mIoU interval is tight enough
         return: mIoU
         """
         iterations = args[0]
         device = args[1]
+        early_stopping = args[2] if len(args) > 2 else None
         evaluator = Evaluator(21)  # 21 for Pascal, 150 for ADE20k
         evaluator.reset()
         model.eval()
         model.to(device)
         total_samples = 0
-        for sample in tqdm(val_loader):
+        loader = val_loader
+        if early_stopping is not None:
+            loader = early_stopping.order(val_loader)
+            early_stopping.start(len(val_loader.dataset))
+            intervals = MeanIoUInterval(early_stopping.confidence, seed=early_stopping.seed)
+        for sample in tqdm(loader):
             images, label = sample
             images, label = images.to(device), label.cpu().numpy()
             output = model(images)
             pred = torch.argmax(output, 1).data.cpu().numpy()
-            evaluator.add_batch(label, pred)
+            # pylint:disable = protected-access
+            confusion = evaluator._generate_matrix(label, pred)
+            evaluator.confusion_matrix += confusion
             total_samples += images.size()[0]
+            if early_stopping is not None:
+                intervals.update(confusion)
+                if early_stopping.should_stop(intervals.interval, total_samples):
+                    break
             # pylint:disable = chained-comparison
             if (
                     isinstance(iterations, int)
@@ -79,12 +97,38 @@ def get_dataloaders_and_eval_func(pascal_path):
                     and total_samples >= iterations
             ):
                 break
+        count_samples(total_samples)
         mIoU = evaluator.Mean_Intersection_over_Union()
+        if early_stopping is not None:
+            early_stopping.finish(mIoU, intervals.interval(), total_samples)
         return mIoU
 
     return train_loader, val_loader, eval_func
 
 
+def confusion_matrix_of_shard(model, dataloader):
+    """confusion matrix of one shard of the validation set, in a worker of evaluate_sharded()"""
+    evaluator = Evaluator(21)
+    model.eval()
+    for images, label in dataloader:
+        pred = torch.argmax(model(images), 1).numpy()
+        evaluator.add_batch(label.numpy(), pred)
+    return evaluator.confusion_matrix
+
+
+def eval_func_sharded(model, val_loader, num_shards, threads_per_shard=None):
+    """
+    evaluates the mIoU on the cpu in num_shards processes, each over a disjoint shard of the validation set
+    parameters: model or a picklable callable building it, validation loader, number of processes, intra-op
+        threads of each process
+    return: mIoU
+    """
+    evaluator = Evaluator(21)
+    evaluator.confusion_matrix = evaluate_sharded(model, confusion_matrix_of_shard, val_loader, num_shards,
+                                                  threads_per_shard)
+    return evaluator.Mean_Intersection_over_Union()
+
+
 def unlabeled_dataset(val_loader):
     """return unlabeled_dataset for dataloader"""
     for X, _ in val_loader:
@@ -12,11 +12,18 @@
 
 # General Python related imports
 import argparse
+import functools
+import os
+import tempfile
 # Torch related imports
 import torch
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.encodings_cache import export_encodings
+from aimet_zoo_torch.common.utils.sharded_eval import build_replica
 from aimet_zoo_torch.deeplabv3 import DeepLabV3_Plus
 from aimet_zoo_torch.common.utils.utils import get_device
-from aimet_zoo_torch.deeplabv3.dataloader import get_dataloaders_and_eval_func
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping
+from aimet_zoo_torch.deeplabv3.dataloader import get_dataloaders_and_eval_func, eval_func_sharded
 
 
 
@@ -53,7 +60,14 @@ def arguments(raw_args=None):
     parser.add_argument(
         "--use-cuda", help="Run evaluation on GPU.", type=bool, default=True
     )
+    parser.add_argument("--early-stop-tolerance", help="stop evaluating once the 95%% confidence interval of the "
+                        "mIoU is within this tolerance (mIoU as a fraction), the full validation set by default",
+                        default=None, type=float)
+    parser.add_argument("--num-shards", help="evaluate on the cpu in this many worker processes, each with its own "
+                        "replica of the models over a disjoint shard of the validation set", default=None, type=int)
     args = parser.parse_args(raw_args)
+    if args.num_shards and args.early_stop_tolerance:
+        parser.error("--num-shards cannot be combined with --early-stop-tolerance")
     return args
 
 
@@ -77,11 +91,15 @@ def get_num_classes(val_loader, device):
     return num_classes
 
 #pylint:disable = too-many-locals
+@report_phases("deeplabv3_quanteval")
 def main(raw_args=None):
     """ main evaluation function"""
     seed(0)
     args = arguments(raw_args)
-    device = get_device(args)
+    record_arguments(args)
+    # the sharded evaluation is meant for cpu-only hosts, the models are calibrated on the cpu too
+    device = torch.device("cpu") if args.num_shards else get_device(args)
+    early_stopping = EarlyStopping(args.early_stop_tolerance) if args.early_stop_tolerance else None
     iterations = -1
     print(f"device: {device}")
     # pylint: disable = unused-variable
@@ -92,40 +110,64 @@ def main(raw_args=None):
     num_classes = get_num_classes(val_loader, device)
 
     # Load original model
-    model_orig = DeepLabV3_Plus(model_config=args.model_config, num_classes=num_classes)
+    model_orig = DeepLabV3_Plus(model_config=args.model_config, num_classes=num_classes, device=device)
     model_orig.from_pretrained(quantized=False)
     model_orig.model.to(device)
     model_orig.model.eval()
 
     # Load optimized model
     model_optim = DeepLabV3_Plus(
-        model_config=args.model_config, num_classes=num_classes
+        model_config=args.model_config, num_classes=num_classes, device=device
     )
     model_optim.from_pretrained(quantized=True)
     model_optim.model.to(device)
     model_optim.model.eval()
 
-    print("Evaluating Original Model")
-    sim_orig = model_orig.get_quantsim(quantized=False)
-    sim_orig.compute_encodings(
-        eval_func, [iterations, device]
-    )  # dont use AdaRound encodings for the original model
-    mIoU_orig_fp32 = eval_func(model_orig.model, [iterations, device])
-    del model_orig
-    torch.cuda.empty_cache()
-    mIoU_orig_int8 = eval_func(sim_orig.model, [iterations, device])
-    del sim_orig
-    torch.cuda.empty_cache()
-
-    print("Evaluating Optimized Model")
-    sim_optim = model_optim.get_quantsim(quantized=True)
-    sim_optim.compute_encodings(eval_func, [iterations, device])
-    mIoU_optim_fp32 = eval_func(model_optim.model, [iterations, device])
-    del model_optim
-    torch.cuda.empty_cache()
-    mIoU_optim_int8 = eval_func(sim_optim.model, [iterations, device])
-    del sim_optim
-    torch.cuda.empty_cache()
+    if args.num_shards:
+        sim_orig = model_orig.get_quantsim(quantized=False)
+        sim_orig.compute_encodings(eval_func, [iterations, device])
+        sim_optim = model_optim.get_quantsim(quantized=True)
+        sim_optim.compute_encodings(eval_func, [iterations, device])
+        # each worker builds its own replicas from the artifact cache, only the encodings calibrated here are
+        # handed over
+        with tempfile.TemporaryDirectory() as export_dir:
+            dummy_input = torch.rand(model_orig.input_shape)
+            orig_encodings = export_encodings(sim_orig, os.path.join(export_dir, "orig.encodings"), dummy_input)
+            optim_encodings = export_encodings(sim_optim, os.path.join(export_dir, "optim.encodings"), dummy_input)
+            replica = functools.partial(build_replica, DeepLabV3_Plus, args.model_config, num_classes=num_classes)
+            print("Evaluating Original Model")
+            mIoU_orig_fp32 = eval_func_sharded(replica, val_loader, args.num_shards)
+            mIoU_orig_int8 = eval_func_sharded(
+                functools.partial(replica, use_sim=True, encodings_path=str(orig_encodings)), val_loader,
+                args.num_shards)
+            print("Evaluating Optimized Model")
+            mIoU_optim_fp32 = eval_func_sharded(functools.partial(replica, quantized=True), val_loader,
+                                                args.num_shards)
+            mIoU_optim_int8 = eval_func_sharded(
+                functools.partial(replica, quantized=True, use_sim=True, encodings_path=str(optim_encodings)),
+                val_loader, args.num_shards)
+    else:
+        print("Evaluating Original Model")
+        sim_orig = model_orig.get_quantsim(quantized=False)
+        sim_orig.compute_encodings(
+            eval_func, [iterations, device]
+        )  # dont use AdaRound encodings for the original model
+        mIoU_orig_fp32 = eval_func(model_orig.model, [iterations, device, early_stopping])
+        del model_orig
+        torch.cuda.empty_cache()
+        mIoU_orig_int8 = eval_func(sim_orig.model, [iterations, device, early_stopping])
+        del sim_orig
+        torch.cuda.empty_cache()
+
+        print("Evaluating Optimized Model")
+        sim_optim = model_optim.get_quantsim(quantized=True)
+        sim_optim.compute_encodings(eval_func, [iterations, device])
+        mIoU_optim_fp32 = eval_func(model_optim.model, [iterations, device, early_stopping])
+        del model_optim
+        torch.cuda.empty_cache()
+        mIoU_optim_int8 = eval_func(sim_optim.model, [iterations, device, early_stopping])
+        del sim_optim
+        torch.cuda.empty_cache()
 
     print(f"Original Model | 32-bit Environment | mIoU: {mIoU_orig_fp32:.4f}")
     print(
@@ -136,10 +178,13 @@ def main(raw_args=None):
         f"Optimized Model | {args.default_param_bw}-bit Environment | mIoU: {mIoU_optim_int8:.4f}"
     )
 
-    return {'mIoU_orig_fp32': mIoU_orig_fp32,
-            'mIoU_orig_int8': mIoU_orig_int8,
-            'mIoU_optim_fp32': mIoU_optim_fp32,
-            'mIoU_optim_int8': mIoU_optim_int8}
+    results = {'mIoU_orig_fp32': mIoU_orig_fp32,
+               'mIoU_orig_int8': mIoU_orig_int8,
+               'mIoU_optim_fp32': mIoU_optim_fp32,
+               'mIoU_optim_int8': mIoU_optim_int8}
+    if early_stopping is not None:
+        results['early_stopping'] = early_stopping.report(('orig_fp32', 'orig_int8', 'optim_fp32', 'optim_int8'))
+    return results
 
 
 if __name__ == "__main__":
@@ -9,24 +9,23 @@
 # =============================================================================
 """Class for downloading and setting up of optmized and original deeplabv3plus model for AIMET model zoo"""
 # pylint:disable = import-error
-import json
 import os
 import torch
 from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 from .modeling.deeplab import DeepLab
 
 
 class DeepLabV3_Plus(Downloader):
     """Deeplabv3 objection detection parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
-    def __init__(self, model_config=None, num_classes=21):
+    def __init__(self, model_config=None, num_classes=21, device=None):
+        self.device = device or torch.device("cuda")
         parent_dir = "/".join(os.path.realpath(__file__).split("/")[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            with open(config_filepath) as f_in:
-                self.cfg = json.load(f_in)
+            self.cfg = get_card(model_config)
         if model_config:
             Downloader.__init__(
                 self,
@@ -35,6 +34,7 @@ class DeepLabV3_Plus(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -57,24 +57,20 @@ class DeepLabV3_Plus(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
             if self.model_config == "dlv3_w4a8":
-                self.model = torch.load(self.path_post_opt_weights)
+                self.model = torch.load(self.path_post_opt_weights, map_location=self.device)
             else:
                 equalize_model(self.model, self.input_shape)
-                state_dict = torch.load(self.path_post_opt_weights)
+                state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
                 self.model.load_state_dict(state_dict)
                 del state_dict
         else:
-            checkpoint = torch.load(self.path_pre_opt_weights)
+            checkpoint = torch.load(self.path_pre_opt_weights, map_location=self.device)
             self.model.load_state_dict(checkpoint["state_dict"])
             del checkpoint
-        self.model.cuda()
+        self.model.to(self.device)
 
     def get_quantsim(self, quantized=False):
         """" to get quantsim object for model from loading/computing proper encodings"""
@@ -82,8 +78,7 @@ class DeepLabV3_Plus(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -97,7 +92,7 @@ class DeepLabV3_Plus(Downloader):
             "config_file": self.path_aimet_config,
             "dummy_input": dummy_input,
         }
-        sim = QuantizationSimModel(self.model.cuda(), **kwargs)
+        sim = QuantizationSimModel(self.model.to(self.device), **kwargs)
         if self.path_aimet_encodings and quantized:
             load_encodings_to_sim(sim, self.path_aimet_encodings)
         if self.path_adaround_encodings and quantized:
@@ -16,6 +16,7 @@ from the SeanNaren repo with manual configuration of quantization ops.
 
 import os
 import argparse
+import csv
 import urllib.request
 
 import torch
@@ -23,6 +24,8 @@ import torch
 from aimet_common.defs import QuantScheme
 import aimet_torch
 from aimet_torch.quantsim import QuantizationSimModel
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.encodings_cache import cached_compute_encodings
 from aimet_zoo_torch.common.utils.utils import get_device
 
 import deepspeech_pytorch.model
@@ -33,6 +36,15 @@ from deepspeech_pytorch.utils import load_model, load_decoder
 from deepspeech_pytorch.testing import run_evaluation
 
 
+def calibration_files(manifest_path, iterations=None):
+    """the manifest and the audio and transcript files of the samples calibration reads from it"""
+    with open(manifest_path, newline="") as f_in:
+        rows = list(csv.reader(f_in))
+    if iterations is not None:
+        rows = rows[:iterations]
+    return [manifest_path] + [path for row in rows for path in row if os.path.isfile(path)]
+
+
 def run_quantsim_evaluation(args):
     """function to run quantization evaluation"""
     device = get_device(args)
@@ -83,6 +95,7 @@ def run_quantsim_evaluation(args):
         return wer, cer, output_data
 
     quant_scheme = QuantScheme.post_training_tf_enhanced
+    encodings_files = calibration_files(args.test_manifest, args.encodings_iterations)
 
     # Test original model on GPU
     # pylint: disable=W0612
@@ -100,8 +113,14 @@ def run_quantsim_evaluation(args):
     )
 
     sim.model.to(device)
-    sim.compute_encodings(
-        eval_func, forward_pass_callback_args=args.encodings_iterations
+    cached_compute_encodings(
+        sim,
+        "deepspeech2",
+        encodings_files,
+        eval_func,
+        args.encodings_iterations,
+        dummy_input=torch.randn(tuple([1, 1, 161, 500])),
+        batch_size=args.batch_size,
     )
 
     wer, cer, output_data = eval_func(sim.model, None)
@@ -122,8 +141,14 @@ def run_quantsim_evaluation(args):
     manually_configure_quant_ops(sim)
 
     sim.model.to(device)
-    sim.compute_encodings(
-        eval_func, forward_pass_callback_args=args.encodings_iterations
+    cached_compute_encodings(
+        sim,
+        "deepspeech2",
+        encodings_files,
+        eval_func,
+        args.encodings_iterations,
+        dummy_input=torch.randn(tuple([1, 1, 161, 500])),
+        batch_size=args.batch_size,
     )
 
     # Test optimized model on device
@@ -363,9 +388,11 @@ class ModelConfig:
             setattr(self, arg, getattr(args, arg))
 
 
+@report_phases("deepspeech2_quanteval")
 def main():
     """Main function"""
     args = arguments()
+    record_arguments(args)
     config = ModelConfig(args)
     run_quantsim_evaluation(config)
 
@@ -1,2 +1,9 @@
 """ package for getting distilbert original model and quantized model"""
-from .model.model_definition import DistilBert
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import DistilBert
+
+__all__ = ["DistilBert"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"DistilBert": ".model.model_definition"})
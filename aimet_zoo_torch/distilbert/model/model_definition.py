@@ -11,15 +11,13 @@
 """Class for downloading and setting up of optimized and original distilbert model for AIMET model zoo"""
 # pylint:disable = import-error, wrong-import-order
 # adding this due to docker image not setup yet
-import json
 import os
 import sys
 import pathlib
 from collections import defaultdict
-import torch
 
-# AIMET imports
-from aimet_torch.quantsim import load_checkpoint
+# pickled models and quantsim checkpoints are memory mapped where torch supports it
+from aimet_zoo_torch.common.mmap_checkpoint import load_checkpoint
 
 from transformers import HfArgumentParser
 from transformers import AutoConfig, AutoTokenizer, TrainingArguments
@@ -27,6 +25,7 @@ from transformers import AutoConfig, AutoTokenizer, TrainingArguments
 # transformers import
 from aimet_zoo_torch.distilbert.model import baseline_models
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 
 sys.modules["baseline_models"] = baseline_models
 
@@ -49,16 +48,13 @@ class DistilBert(Downloader):
         self.parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = defaultdict(lambda: None)
         if model_config:
-            config_filepath = os.path.join(
-                self.parent_dir, "model_cards", model_config + ".json"
-            )
-            with open(config_filepath) as f_in:
-                self.cfg = json.load(f_in)
+            self.cfg = get_card(model_config)
         Downloader.__init__(
             self,
             url_post_opt_weights=self.cfg["artifacts"]["url_post_opt_weights"],
             url_pre_opt_weights=self.cfg["artifacts"]["url_pre_opt_weights"],
             url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+            checksums=self.cfg["artifacts"].get("checksums"),
             model_dir=self.parent_dir,
         )
         # Parse arguments
@@ -124,7 +120,7 @@ class DistilBert(Downloader):
                 use_auth_token=True if self.model_args.use_auth_token else None,
             )
 
-            self.model = torch.load(self.aux_args.fmodel_path)
+            self.model = load_checkpoint(self.aux_args.fmodel_path)
             return self.model, tokenizer
         # case2. model for glue dataset
         num_labels = 2
@@ -159,7 +155,7 @@ class DistilBert(Downloader):
             use_auth_token=True if self.model_args.use_auth_token else None,
         )
 
-        self.model = torch.load(self.aux_args.fmodel_path)
+        self.model = load_checkpoint(self.aux_args.fmodel_path)
         return self.model, tokenizer
 
     def get_quantsim(self):
@@ -1,2 +1,9 @@
 """loading efficientnetlite0 downloader class"""
-from .model.model_definition import EfficientNetLite0
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import EfficientNetLite0
+
+__all__ = ["EfficientNetLite0"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"EfficientNetLite0": ".model.model_definition"})
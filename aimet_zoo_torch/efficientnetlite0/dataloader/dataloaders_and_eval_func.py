@@ -11,9 +11,8 @@
 
 import torchvision
 from torchvision import transforms as T
-import torch
 from torch.utils.data import DataLoader
-from tqdm import tqdm
+from aimet_zoo_torch.common.utils import classification_metrics
 
 
 def get_imagenet_dataloader(image_dir, BATCH_SIZE=64):
@@ -50,25 +49,14 @@ def get_imagenet_dataloader(image_dir, BATCH_SIZE=64):
     return dataloader
 
 
-def eval_func(model, DATA_DIR, BATCH_SIZE=16):
-    """Evaluates the model on validation dataset and returns the classification accuracy"""
+def eval_func(model, DATA_DIR, BATCH_SIZE=16, early_stopping=None):
+    """
+    Evaluates the model on validation dataset and returns the classification accuracy, with an EarlyStopping
+    only until its interval is tight enough
+    """
     # Get Dataloader
     dataloader_eval = get_imagenet_dataloader(DATA_DIR, BATCH_SIZE)
-
-    correct = 0
-    total_samples = 0
-    on_cuda = next(model.parameters()).is_cuda
-
-    with torch.no_grad():
-        for data, label in tqdm(dataloader_eval):
-            if on_cuda:
-                data, label = data.cuda(), label.cuda()
-            output = model(data)
-            _, prediction = torch.max(output, 1)
-            correct += (prediction == label).sum()
-            total_samples += len(output)
-
-    return float(100 * correct / total_samples)
+    return classification_metrics.evaluate(model, dataloader_eval, early_stopping=early_stopping)["top1"]
 
 
 def pass_calibration_data(model, args):
@@ -76,31 +64,12 @@ def pass_calibration_data(model, args):
     # Get Dataloader
 
     dataloader_encoding = get_imagenet_dataloader(args["evaluation_dataset"])
-    on_cuda = next(model.parameters()).is_cuda
-    model.eval()
-    batch_counter = 0
     samples = 100  # number of samples for validation
-    #pylint: disable = unused-variable
-    with torch.no_grad():
-        for input_data, target_data in dataloader_encoding:
-            if on_cuda:
-                input_data = input_data.cuda()
-
-            output_data = model(input_data)
-            batch_counter += 1
-            if (batch_counter * args["batch_size"]) > samples:
-                break
+    # stops after the first batch that takes the count of samples past 100
+    classification_metrics.forward_pass(model, dataloader_encoding,
+                                        max_batches=samples // args["batch_size"] + 1)
 
 
 def forward_pass(model, dataloader):
     """forward pass through the calibration dataset"""
-    #pylint:disable = unused-variable
-    model.eval()
-    on_cuda = next(model.parameters()).is_cuda
-    with torch.no_grad():
-        for data, label in tqdm(dataloader):
-            if on_cuda:
-                data, label = data.cuda(), label.cuda()
-            output = model(data)
-
-    del dataloader
+    classification_metrics.forward_pass(model, dataloader, show_progress=True)
@@ -15,6 +15,8 @@ import argparse
 import torch
 
 # aimet model zoo imports
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping
 from aimet_zoo_torch.common.utils.image_net_data_loader import ImageNetDataLoader
 from aimet_zoo_torch.efficientnetlite0.dataloader import eval_func, forward_pass
 from aimet_zoo_torch.efficientnetlite0 import EfficientNetLite0
@@ -49,6 +51,9 @@ def arguments(raw_args):
     parser.add_argument(
         "--use-cuda", help="Run evaluation on GPU", type=bool, default=True
     )
+    parser.add_argument("--early-stop-tolerance", help="stop evaluating once the 95%% confidence interval of the "
+                        "accuracy is within this many percentage points, the full validation set by default",
+                        default=None, type=float)
     args = parser.parse_args(raw_args)
     return args
 
@@ -88,18 +93,21 @@ class ModelConfig:
             setattr(self, arg, getattr(args, arg))
 
 
+@report_phases("efficientnetlite0_quanteval")
 def main(raw_args=None):
     """ main evaluation function"""
     #pylint:disable = no-member
     args = arguments(raw_args)
+    record_arguments(args)
     config = ModelConfig(args)
     seed(seednum=23, use_cuda=args.use_cuda)
+    early_stopping = EarlyStopping(args.early_stop_tolerance) if args.early_stop_tolerance else None
 
     # ===================================fp32 model ==================================
     fp32_model = EfficientNetLite0(model_config=config.model_config)
     fp32_model.from_pretrained(quantized=False)
     fp32_model.model.eval()
-    fp32_acc = eval_func(fp32_model.model, config.dataset_path, config.batch_size)
+    fp32_acc = eval_func(fp32_model.model, config.dataset_path, config.batch_size, early_stopping)
     print(f"=========FP32 Model Accuracy : {fp32_acc:0.2f}% ")
 
     # ===================================Quantized model ==================================
@@ -111,8 +119,12 @@ def main(raw_args=None):
     sim.compute_encodings(
         forward_pass, forward_pass_callback_args=encoding_dataloader.data_loader
     )
-    quant_acc = eval_func(sim.model, config.dataset_path, config.batch_size)
+    quant_acc = eval_func(sim.model, config.dataset_path, config.batch_size, early_stopping)
     print(f"=========Quantized model Accuracy: {quant_acc:0.2f}% ")
+    results = {"fp32_acc": fp32_acc, "quant_acc": quant_acc}
+    if early_stopping is not None:
+        results["early_stopping"] = early_stopping.report(("fp32", "quant"))
+    return results
 
 
 if __name__ == "__main__":
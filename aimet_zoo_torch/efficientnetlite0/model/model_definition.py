@@ -10,24 +10,23 @@
 """Class for downloading and setting up of optmized and original effiecientlite0 model for AIMET model zoo"""
 # pylint:disable = import-error, wrong-import-order
 # adding this due to docker image not setup yet
-import json
 import os
 import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 import geffnet # pylint:disable = import-error
 
 
 class EfficientNetLite0(Downloader):
     """efficientnetlite0 parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
-    def __init__(self, model_config: str = None):
+    def __init__(self, model_config: str = None, device=None):
+        self.device = device or torch.device("cuda")
         parent_dir = "/".join(os.path.realpath(__file__).split("/")[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -36,6 +35,7 @@ class EfficientNetLite0(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -51,16 +51,12 @@ class EfficientNetLite0(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
-            self.model = torch.load(self.path_post_opt_weights)
+            self.model = torch.load(self.path_post_opt_weights, map_location=self.device)
         else:
             self.model = getattr(geffnet, "efficientnet_lite0")(pretrained=True)
-            self.model.cuda()
+            self.model.to(self.device)
         self.model.eval()
 
     def get_quantsim(self, quantized=False):
@@ -73,8 +69,7 @@ class EfficientNetLite0(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -88,7 +83,7 @@ class EfficientNetLite0(Downloader):
             "config_file": self.path_aimet_config,
             "dummy_input": dummy_input,
         }
-        sim = QuantizationSimModel(self.model.cuda(), **kwargs)
+        sim = QuantizationSimModel(self.model.to(self.device), **kwargs)
         if self.path_aimet_encodings and quantized:
             load_encodings_to_sim(sim, self.path_aimet_encodings)
             print("load_encodings_to_sim finished!")
@@ -1,2 +1,9 @@
 """ loading ffnet model downloader class"""
-from .model.model_definition import FFNet
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import FFNet
+
+__all__ = ["FFNet"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"FFNet": ".model.model_definition"})
@@ -33,6 +33,7 @@ import torch
 from PIL import Image
 from torch.utils import data
 from aimet_zoo_torch.ffnet.model.config import CITYSCAPES_IGNORE_LABEL, CITYSCAPES_NUM_CLASSES#, cityscapes_base_path
+from aimet_zoo_torch.common.utils.packed_files import PackedFiles, is_packed
 from ..utils.misc import tensor_to_pil
 from ..cityscapes import find_directories
 from .. import cityscapes_labels
@@ -51,6 +52,20 @@ class BaseLoader(data.Dataset):
         self.train = mode == "train"
         self.id_to_trainid = {}
         self.all_imgs = None
+        # set to PackedFiles when the dataset root is a packed directory
+        self.files = None
+
+    def _open(self, file_path):
+        """
+        Path or file object to open an image or mask with, read from the packed dataset if there is one
+        """
+        return self.files.open(file_path) if self.files is not None else file_path
+
+    def _listdir(self, dir_path):
+        return self.files.listdir(dir_path) if self.files is not None else os.listdir(dir_path)
+
+    def _isfile(self, file_path):
+        return self.files.isfile(file_path) if self.files is not None else os.path.isfile(file_path)
 
     @staticmethod
     def find_images(img_root, mask_root, img_ext, mask_ext):
@@ -116,12 +131,12 @@ class BaseLoader(data.Dataset):
         return img, mask, scale_float
 
     def read_images(self, img_path, mask_path, mask_out=False):
-        img = Image.open(img_path).convert("RGB")
+        img = Image.open(self._open(img_path)).convert("RGB")
         if mask_path is None or mask_path == "":
             w, h = img.size
             mask = np.zeros((h, w))
         else:
-            mask = Image.open(mask_path)
+            mask = Image.open(self._open(mask_path))
 
         drop_out_mask = None
         # This code is specific to cityscapes
@@ -222,7 +237,11 @@ class Cityscapes(BaseLoader):
         img_root = path.join(self.root, "leftImg8bit")
         mask_root = path.join(self.root, "gtFine")
 
-        self.fine_cities = find_directories(self.root)
+        if is_packed(self.root):
+            self.files = PackedFiles(self.root)
+            self.fine_cities = ["val/" + c for c in self.files.listdir(path.join(img_root, "val"))]
+        else:
+            self.fine_cities = find_directories(self.root)
         self.all_imgs = self.find_cityscapes_images(
             self.fine_cities, img_root, mask_root, img_ext, mask_ext
         )
@@ -243,14 +262,14 @@ class Cityscapes(BaseLoader):
         items = []
         for city in cities:
             img_dir = "{root}/{city}".format(root=img_root, city=city)
-            for file_name in os.listdir(img_dir):
+            for file_name in self._listdir(img_dir):
                 basename, ext = os.path.splitext(file_name)
                 assert ext == "." + img_ext, "{} {}".format(ext, img_ext)
                 full_img_fn = os.path.join(img_dir, file_name)
                 basename, ext = file_name.split("_leftImg8bit")
                 mask_fn = f"{basename}_gtFine_labelIds{ext}"
                 full_mask_fn = os.path.join(mask_root, city, mask_fn)
-                if os.path.isfile(full_mask_fn):
+                if self._isfile(full_mask_fn):
                     items.append((full_img_fn, full_mask_fn))
 
         print("Running Inference on {} samples".format(len(items)))
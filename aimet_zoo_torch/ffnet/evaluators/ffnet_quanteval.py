@@ -28,6 +28,7 @@ import torch
 from aimet_torch.model_validator.model_validator import ModelValidator
 
 # Dataloader and Model Evaluation imports
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.common.utils.utils import get_device
 from aimet_zoo_torch.ffnet.dataloader.cityscapes.utils.misc import eval_metrics
 from aimet_zoo_torch.ffnet.dataloader.cityscapes.utils.trnval_utils import (
@@ -137,24 +138,26 @@ class ModelConfig:
             setattr(self, arg, getattr(args, arg))
 
 
+@report_phases("ffnet_quanteval")
 def main(raw_args=None):
     """ main evaluation function"""
     # pylint: disable=redefined-outer-name, too-many-locals, no-member
     seed(1234)
     args = arguments(raw_args)
+    record_arguments(args)
     config = ModelConfig(args)
     device = get_device(args)
     print(f"device: {device}")
 
     # Load original model
-    model_orig = FFNet(model_config=config.model_config)
+    model_orig = FFNet(model_config=config.model_config, device=device)
     model_orig.from_pretrained(quantized=False)
     # model_orig = torch.load(config.prepared_checkpoint_path)
     model_orig.model = model_orig.model.to(device)
     model_orig.model.eval()
 
     # Load optimized model
-    model_optim = FFNet(model_config=config.model_config)
+    model_optim = FFNet(model_config=config.model_config, device=device)
     model_optim.from_pretrained(quantized=True)
     # model_optim = torch.load(config.optimized_checkpoint_path)
     model_optim.model = model_optim.model.to(device)
@@ -8,24 +8,24 @@
 #  @@-COPYRIGHT-END-@@
 # =============================================================================
 """Class for downloading and setting up of optmized and original ffnet model for AIMET model zoo"""
-import json
 import os
 import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim #pylint:disable = import-error
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
+from aimet_zoo_torch.common.quantsim_cache import cached_quantsim
 from aimet_zoo_torch.ffnet.model.model_registry import model_entrypoint
 
 
 class FFNet(Downloader):
     """model FFNet configuration class"""
-    def __init__(self, model_config: str = None):
+    def __init__(self, model_config: str = None, device=None):
+        self.device = device or torch.device("cuda")
         parent_dir = "/".join(os.path.realpath(__file__).split("/")[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -34,6 +34,7 @@ class FFNet(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -54,15 +55,11 @@ class FFNet(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
-            self.model = torch.load(self.path_post_opt_weights)
+            self.model = torch.load(self.path_post_opt_weights, map_location=self.device)
         else:
-            self.model = torch.load(self.path_pre_opt_weights)
+            self.model = torch.load(self.path_pre_opt_weights, map_location=self.device)
 
     def get_quantsim(self, quantized=False):
         """get quantsim object"""
@@ -74,8 +71,19 @@ class FFNet(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        artifacts = [self.path_aimet_config]
+        if quantized:
+            artifacts += [self.path_post_opt_weights, self.path_aimet_encodings, self.path_adaround_encodings]
+        else:
+            artifacts += [self.path_pre_opt_weights]
+        sim = cached_quantsim(
+            self.model_config, self.cfg, artifacts, lambda: self._build_quantsim(quantized), quantized=quantized
+        )
+        return sim
+
+    def _build_quantsim(self, quantized):
+        """builds the quantsim around the loaded weights, called on a quantsim snapshot cache miss"""
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -89,7 +97,7 @@ class FFNet(Downloader):
             "config_file": self.path_aimet_config,
             "dummy_input": dummy_input,
         }
-        sim = QuantizationSimModel(self.model.cuda(), **kwargs)
+        sim = QuantizationSimModel(self.model.to(self.device), **kwargs)
         if self.path_aimet_encodings and quantized:
             load_encodings_to_sim(sim, self.path_aimet_encodings)
             print("load_encodings_to_sim finished!")
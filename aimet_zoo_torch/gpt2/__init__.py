@@ -1,2 +1,9 @@
 """ package for getting gpt2 original model and quantized model"""
-from .model.model_definition import gpt2
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import gpt2
+
+__all__ = ["gpt2"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"gpt2": ".model.model_definition"})
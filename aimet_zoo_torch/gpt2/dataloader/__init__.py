@@ -1,2 +1,2 @@
 """ datasets and eval function are defined and loaded"""
-from .dataloaders import get_dataloaders
+from .dataloaders import get_dataloaders, Perplexity
@@ -45,6 +45,24 @@ class DataConfig:
 
 
 
+class Perplexity:
+    """streaming perplexity of a causal language model, whose first output is the mean loss of a batch"""
+
+    def __init__(self):
+        self.losses = []
+
+    def update(self, outputs, batch):
+        """adds the loss of one batch"""
+        self.losses.append(outputs[0].item())
+
+    def compute(self):
+        """perplexity over all batches seen so far"""
+        try:
+            return math.exp(np.mean(self.losses))
+        except OverflowError:
+            return float('inf')
+
+
 def get_dataloaders(args):
     """Get the dataloaders"""
     # Get the datasets: you can either provide your own CSV/JSON/TXT training and evaluation files (see below)
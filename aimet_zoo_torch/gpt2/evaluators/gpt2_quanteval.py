@@ -12,8 +12,11 @@
 """ Quatization evaluation script for GPT-2 model"""
 
 import argparse
+import copy
 import logging
-from aimet_zoo_torch.gpt2.dataloader import get_dataloaders
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.utils.multi_model_eval import evaluate_models
+from aimet_zoo_torch.gpt2.dataloader import get_dataloaders, Perplexity
 from aimet_zoo_torch.gpt2 import gpt2
 from accelerate import Accelerator
 from accelerate.logging import get_logger
@@ -43,9 +46,11 @@ def parse_args(raw_args):
     return args
 
 
+@report_phases("gpt2_quanteval")
 def main(raw_args=None):
     """main evaluation script"""
     args = parse_args(raw_args)
+    record_arguments(args)
 
     logging.basicConfig(
         format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
@@ -55,7 +60,6 @@ def main(raw_args=None):
     accelerator = Accelerator(log_with="all")
 
     iterations = 1e5
-    metric = "perplexity"
 
     # loading finetuned original model
     model = gpt2(model_config=args.model_config, quantized=False)
@@ -67,34 +71,36 @@ def main(raw_args=None):
     model_orig, train_dataloader, eval_dataloader = accelerator.prepare(
         model_orig, train_dataloader, eval_dataloader
     )
-    original_model_performance_fp32 = eval_function(
-        model_orig, [iterations, eval_dataloader, metric]
-    )
+    # the quantsim wraps the model in place, keep a copy for the 32-bit evaluation
+    model_orig_fp32 = copy.deepcopy(model_orig)
     # quantsim original model
     sim_orig = model.get_quantsim(eval_dataloader, eval_function)
-    # load modularized eval_function
-    original_model_performance_int8 = eval_function(
-        sim_orig.model, [iterations, eval_dataloader, metric]
-    )
-    # loading qat model
     del model
 
     # loading optimized model
     model = gpt2(model_config=args.model_config, quantized=True)
-    model_w8a8 = model.get_model_from_pretrained()
-
-    # Prepare everything with our `accelerator`.
-    model_w8a8, train_dataloader, eval_dataloader = accelerator.prepare(
-        model_w8a8, train_dataloader, eval_dataloader
-    )
-    quantized_model_performance_fp32 = eval_function(
-        model_w8a8, [iterations, eval_dataloader, metric]
-    )
+    model_w8a8 = accelerator.prepare(model.get_model_from_pretrained())
+    model_w8a8_fp32 = copy.deepcopy(model_w8a8)
     # quantsim
     sim_w8a8 = model.get_quantsim(eval_dataloader, eval_function)
-    quantized_model_performance_int8 = eval_function(
-        sim_w8a8.model, [iterations, eval_dataloader, metric]
+
+    # evaluate all four variants in a single pass over the evaluation data
+    performances = evaluate_models(
+        {
+            "original_fp32": model_orig_fp32,
+            "original_int8": sim_orig.model,
+            "quantized_fp32": model_w8a8_fp32,
+            "quantized_int8": sim_w8a8.model,
+        },
+        eval_dataloader,
+        metric_factory=Perplexity,
+        forward_fn=lambda model, batch: model(**batch),
+        max_batches=iterations,
     )
+    original_model_performance_fp32 = performances["original_fp32"]
+    original_model_performance_int8 = performances["original_int8"]
+    quantized_model_performance_fp32 = performances["quantized_fp32"]
+    quantized_model_performance_int8 = performances["quantized_int8"]
 
     logger.info(f"Original model performances")
     logger.info(f"===========================")
@@ -13,7 +13,6 @@
 # pylint:disable = import-error, wrong-import-order
 # adding this due to docker image not setup yet
 
-import json
 import os
 import csv
 import pathlib
@@ -27,6 +26,7 @@ from transformers import (
     AutoTokenizer,
 )
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 from aimet_zoo_torch.gpt2.model.huggingface.baseline_models.gpt2.modeling_gpt2 import (
     GPT2LMHeadModel as SC,
 )
@@ -45,17 +45,14 @@ class gpt2(Downloader):
         self.parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = defaultdict(lambda: None)
         if model_config:
-            config_filepath = os.path.join(
-                self.parent_dir, "model_cards", model_config + ".json"
-            )
-            with open(config_filepath) as f_in:
-                self.cfg = json.load(f_in)
+            self.cfg = get_card(model_config)
         Downloader.__init__(
             self,
             tar_url_pre_opt_weights=self.cfg["artifacts"]["tar_url_pre_opt_weights"],
             tar_url_post_opt_weights=self.cfg["artifacts"]["tar_url_post_opt_weights"],
             url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
             url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+            checksums=self.cfg["artifacts"].get("checksums"),
             model_dir=self.parent_dir,
         )
         self.model = None
@@ -1,2 +1,9 @@
 """GPUNet-0"""
-from .model.model_definition import GPUNet0
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import GPUNet0
+
+__all__ = ["GPUNet0"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"GPUNet0": ".model.model_definition"})
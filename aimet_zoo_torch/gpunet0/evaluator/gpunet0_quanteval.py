@@ -17,6 +17,7 @@ import argparse
 import torch
 
 # Model Stucture and Model Evaluation imports
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.gpunet0 import GPUNet0
 from aimet_zoo_torch.gpunet0.model.src.evaluate_model import evaluate
 
@@ -59,10 +60,12 @@ def arguments(raw_args):
     return args
 
 
+@report_phases("gpunet0_quanteval")
 def main(raw_args=None):
     """ " main function for quantization evaluation"""
     # pylint: disable = redefined-outer-name
     args = arguments(raw_args)
+    record_arguments(args)
     seed(1234)
     evaluator = evaluate(
         testBatch=args.batch_size,
@@ -22,24 +22,25 @@ from aimet_torch.model_preparer import prepare_model
 from aimet_torch.model_validator.model_validator import ModelValidator
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.gpunet0.model.src.models.gpunet_builder import GPUNet_Builder
 
 
 class GPUNet0(Downloader):
     """GPUNet-0 Image Classification parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
 
-    def __init__(self, model_config="gpunet0_w8a8"):
+    def __init__(self, model_config="gpunet0_w8a8", device=None):
         """
         :param model_config:             named model config from which to obtain model artifacts and arguments.
                                          If provided, overwrites the other arguments passed to this object
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
+        self.device = device or torch.device("cuda")
         self.parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = False
         if model_config:
-            config_filepath = self.parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -48,13 +49,14 @@ class GPUNet0(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=self.parent_dir,
                 model_config=model_config,
             )
             self.input_shape = tuple(
                 x if x is not None else 1 for x in self.cfg["input_shape"]
             )
-            self.dummy_input = torch.rand(self.input_shape, device=torch.device("cuda"))
+            self.dummy_input = torch.rand(self.input_shape, device=self.device)
         self.model = None
 
     def from_pretrained(self, quantized=False):
@@ -69,7 +71,7 @@ class GPUNet0(Downloader):
             ):
                 self._download_post_opt_weights()
             self.from_pretrained(quantized=False)
-            state_dict = torch.load(self.path_post_opt_weights)
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
         else:
             if self.url_pre_opt_weights and not os.path.exists(
@@ -85,8 +87,8 @@ class GPUNet0(Downloader):
             self.model = builder.get_model(modelJSON)
             load_checkpoint(self.model, cpkPath, use_ema=True)
             self.model = prepare_model(self.model)
-            ModelValidator.validate_model(self.model.cuda(), self.dummy_input)
-        self.model.cuda()
+            ModelValidator.validate_model(self.model.to(self.device), self.dummy_input)
+        self.model.to(self.device)
         self.model.eval()
 
     def get_quantsim(self, quantized=False):
@@ -107,7 +109,7 @@ class GPUNet0(Downloader):
             ):
                 self._download_adaround_encodings()
         self.from_pretrained(quantized)
-        dummy_input = torch.rand(self.input_shape, device=torch.device("cuda"))
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -129,6 +131,6 @@ class GPUNet0(Downloader):
         if self.path_adaround_encodings and quantized:
             sim.set_and_freeze_param_encodings(self.path_adaround_encodings)
             print("set_and_freeze_param_encodings finished!")
-        sim.model.cuda()
+        sim.model.to(self.device)
         sim.model.eval()
         return sim
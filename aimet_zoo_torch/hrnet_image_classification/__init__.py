@@ -1,2 +1,9 @@
 """ package for getting bert original model and quantized model"""
-from .model.model_definition import HRNetImageClassification
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import HRNetImageClassification
+
+__all__ = ["HRNetImageClassification"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"HRNetImageClassification": ".model.model_definition"})
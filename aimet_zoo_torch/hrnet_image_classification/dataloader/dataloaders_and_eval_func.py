@@ -10,33 +10,25 @@
 
 """ module for getting evaluation function """
 import torch
-from tqdm import tqdm
+from aimet_zoo_torch.common.utils import classification_metrics
 
 
-def eval_func(model, dataloader, device=torch.device("cuda")):
-    """Evaluates the model on validation dataset and returns the classification accuracy"""
-    # Get Dataloader
-    model.eval()
-    correct = 0
-    total_samples = 0
-    with torch.no_grad():
-        for data, label in tqdm(dataloader):
-            data, label = data.to(device), label.to(device)
-            output = model(data)
-            _, prediction = torch.max(output, 1)
-            correct += (prediction == label).sum()
-            total_samples += len(output)
-    del dataloader
-    return float(100 * correct / total_samples)
+def eval_func(model, dataloader, device=torch.device("cuda"), early_stopping=None):
+    """
+    Evaluates the model on validation dataset and returns the classification accuracy, with an EarlyStopping
+    only until its interval is tight enough
+    """
+    return classification_metrics.evaluate(model, dataloader, device=device, early_stopping=early_stopping)["top1"]
+
+
+def eval_func_sharded(model, dataloader, num_shards):
+    """
+    Evaluates the model on the cpu in num_shards processes, each over a disjoint shard of the validation dataset,
+    and returns the classification accuracy. model may be a picklable callable building it in each process
+    """
+    return classification_metrics.evaluate_sharded(model, dataloader, num_shards)["top1"]
 
 
 def forward_pass(model, dataloader, device=torch.device("cuda")):
     """forward pass through the calibration dataset"""
-    #pylint:disable = unused-variable
-    model.eval()
-    on_cuda = next(model.parameters()).is_cuda
-    with torch.no_grad():
-        for data, label in tqdm(dataloader):
-            data, label = data.to(device), label.to(device)
-            output = model(data)
-    del dataloader
+    classification_metrics.forward_pass(model, dataloader, device=device, show_progress=True)
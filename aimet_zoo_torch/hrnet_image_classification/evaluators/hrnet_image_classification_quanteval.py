@@ -12,13 +12,18 @@
 
 
 import argparse
+import functools
 import logging
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.utils.sharded_eval import build_replica
 from aimet_zoo_torch.hrnet_image_classification.dataloader.dataloaders_and_eval_func import (
     eval_func,
+    eval_func_sharded,
 )
 from aimet_zoo_torch.hrnet_image_classification import HRNetImageClassification
 from aimet_zoo_torch.common.utils.utils import get_device
 from aimet_zoo_torch.common.utils.image_net_data_loader import ImageNetDataLoader
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping
 
 
 def arguments(raw_args):
@@ -39,33 +44,54 @@ def arguments(raw_args):
     parser.add_argument(
         "--use-cuda", help="Use GPU for evaluation", default=True, type=bool
     )
+    parser.add_argument("--early-stop-tolerance", help="stop evaluating once the 95%% confidence interval of the "
+                        "accuracy is within this many percentage points, the full validation set by default",
+                        default=None, type=float)
+    parser.add_argument("--num-shards", help="evaluate on the cpu in this many worker processes, each with its own "
+                        "replica of the models over a disjoint shard of the validation set", default=None, type=int)
     args = parser.parse_args(raw_args)
+    if args.num_shards and args.early_stop_tolerance:
+        parser.error("--num-shards cannot be combined with --early-stop-tolerance")
     return args
 
 
+@report_phases("hrnet_image_classification_quanteval")
 def main(raw_args=None):
     """run evaluator"""
     #pylint:disable = undefined-variable, logging-fstring-interpolation
     args = arguments(raw_args)
+    record_arguments(args)
     logging.basicConfig(level=logging.DEBUG)
     logger = logging.getLogger(__name__)
-    device = get_device(args)
+    early_stopping = EarlyStopping(args.early_stop_tolerance) if args.early_stop_tolerance else None
     # get imagenet validation dataloader
     eval_dataloader = ImageNetDataLoader(
         args.dataset_path, image_size=224, batch_size=args.batch_size
     ).data_loader
 
-    # Load quantized model, compute encodings and evaluate
-    fp32_model = HRNetImageClassification(model_config=args.model_config, device=device)
-    fp32_model.from_pretrained(quantized=False)
-    fp32_acc = eval_func(fp32_model.model, eval_dataloader, device=device)
+    if args.num_shards:
+        # the sim comes with its encodings, each worker builds its own replicas on the cpu
+        replica = functools.partial(build_replica, HRNetImageClassification, args.model_config)
+        fp32_acc = eval_func_sharded(replica, eval_dataloader, args.num_shards)
+        int8_acc = eval_func_sharded(functools.partial(replica, quantized=True, use_sim=True), eval_dataloader,
+                                     args.num_shards)
+    else:
+        device = get_device(args)
+        # Load quantized model, compute encodings and evaluate
+        fp32_model = HRNetImageClassification(model_config=args.model_config, device=device)
+        fp32_model.from_pretrained(quantized=False)
+        fp32_acc = eval_func(fp32_model.model, eval_dataloader, device=device, early_stopping=early_stopping)
 
-    int8_model = HRNetImageClassification(model_config=args.model_config, device=device)
-    sim = int8_model.get_quantsim(quantized=True)
-    int8_acc = eval_func(sim.model, eval_dataloader, device=device)
+        int8_model = HRNetImageClassification(model_config=args.model_config, device=device)
+        sim = int8_model.get_quantsim(quantized=True)
+        int8_acc = eval_func(sim.model, eval_dataloader, device=device, early_stopping=early_stopping)
 
     logger.info(f"=========FP32 Model Accuracy : {fp32_acc:0.2f}% ")
     logger.info(f"=========W8A8 Model | Accuracy: {int8_acc:0.2f}%")
+    results = {"fp32_acc": fp32_acc, "int8_acc": int8_acc}
+    if early_stopping is not None:
+        results["early_stopping"] = early_stopping.report(("fp32", "int8"))
+    return results
 
 
 if __name__ == "__main__":
@@ -13,7 +13,6 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-import json
 import os
 import pathlib
 import torch
@@ -21,6 +20,7 @@ from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_torch.model_preparer import prepare_model
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.hrnet_image_classification.model.lib import models #pylint:disable = unused-import
 from aimet_zoo_torch.hrnet_image_classification.model.lib.config import config
 
@@ -37,10 +37,8 @@ class HRNetImageClassification(Downloader):
         self.device = device
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         else:
             raise ValueError("model card missing in model card path!")
         Downloader.__init__(
@@ -50,6 +48,7 @@ class HRNetImageClassification(Downloader):
             url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
             url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
             url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+            checksums=self.cfg["artifacts"].get("checksums"),
             model_dir=parent_dir,
             model_config=model_config,
         )
@@ -68,11 +67,7 @@ class HRNetImageClassification(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
             equalize_model(self.model, self.input_shape)
             prepare_model(self.model)
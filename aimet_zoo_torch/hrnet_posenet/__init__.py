@@ -1,2 +1,9 @@
 """ HRNet PoseNet """
-from .models.model_definition import PoseHRNet
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .models.model_definition import PoseHRNet
+
+__all__ = ["PoseHRNet"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"PoseHRNet": ".models.model_definition"})
@@ -19,6 +19,7 @@
 
 import argparse
 import torch
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.hrnet_posenet import PoseHRNet
 from aimet_zoo_torch.hrnet_posenet.dataloader.dataloader_and_eval_func import (
     get_dataloaders_and_eval_func,
@@ -67,10 +68,12 @@ def parse_args(raw_args):
     return args
 
 
+@report_phases("hrnet_posenet_quanteval")
 def main(raw_args=None):
     """execute evaluation"""
     # Load parameters from arguments
     args = parse_args(raw_args)
+    record_arguments(args)
 
     # Set dir args to default
     args.modelDir = "./"
@@ -11,13 +11,13 @@
 
 """ HRNet PoseNet """
 
-import json
 import os
 import pathlib
 import torch
 from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 from .pose_hrnet import get_pose_net
 from .config import models, default
 
@@ -25,13 +25,12 @@ from .config import models, default
 class PoseHRNet(Downloader):
     """Pose High-Resolution Network"""
 
-    def __init__(self, model_config=None):
+    def __init__(self, model_config=None, device=None):
+        self.device = device or torch.device("cuda")
         parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            with open(config_filepath) as f_in:
-                self.cfg = json.load(f_in)
+            self.cfg = get_card(model_config)
         if model_config:
             Downloader.__init__(
                 self,
@@ -40,6 +39,7 @@ class PoseHRNet(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -48,7 +48,7 @@ class PoseHRNet(Downloader):
             )
         default._C.MODEL.EXTRA = models.POSE_HIGH_RESOLUTION_NET
         self.model = get_pose_net(default._C, is_train=False)
-        self.model.cuda()
+        self.model.to(self.device)
         self.model.eval()
 
     def from_pretrained(self, quantized=False):
@@ -57,21 +57,17 @@ class PoseHRNet(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
             equalize_model(self.model, self.input_shape)
-            state_dict = torch.load(self.path_post_opt_weights)
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
             del state_dict
         else:
-            state_dict = torch.load(self.path_pre_opt_weights)
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
             del state_dict
-        self.model.cuda()
+        self.model.to(self.device)
         self.model.eval()
 
     def get_quantsim(self, quantized=False):
@@ -80,8 +76,7 @@ class PoseHRNet(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -95,7 +90,7 @@ class PoseHRNet(Downloader):
             "config_file": self.path_aimet_config,
             "dummy_input": dummy_input,
         }
-        sim = QuantizationSimModel(self.model.cuda(), **kwargs)
+        sim = QuantizationSimModel(self.model.to(self.device), **kwargs)
         if self.path_aimet_encodings and quantized:
             load_encodings_to_sim(sim, self.path_aimet_encodings)
         if self.path_adaround_encodings and quantized:
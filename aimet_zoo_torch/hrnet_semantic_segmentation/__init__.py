@@ -1,2 +1,9 @@
 """ HRNet Semantic Segmentation """
-from .model.model_definition import HRNetSemSeg
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import HRNetSemSeg
+
+__all__ = ["HRNetSemSeg"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"HRNetSemSeg": ".model.model_definition"})
@@ -22,6 +22,7 @@ from aimet_zoo_torch.hrnet_semantic_segmentation.model.utils.utils import (
     get_confusion_matrix,
 )
 from aimet_zoo_torch.hrnet_semantic_segmentation.model.datasets import cityscapes
+from aimet_zoo_torch.common.utils.early_stopping import MeanIoUInterval
 
 
 def get_cityscapes_test_dataloader(args):
@@ -50,20 +51,35 @@ def get_cityscapes_test_dataloader(args):
     return dataloader
 
 
-def model_eval(args, num_samples=None):
+def mean_iou(confusion_matrix):
+    """mean IoU over all classes, classes without samples count as 0"""
+    pos = confusion_matrix.sum(1)
+    res = confusion_matrix.sum(0)
+    tp = np.diag(confusion_matrix)
+    IoU_array = tp / np.maximum(1.0, pos + res - tp)
+    return IoU_array.mean()
+
+
+def model_eval(args, num_samples=None, early_stopping=None):
     """
     Get evaluation func to evaluate the model
     :param args
     :param  num_samples number of images for computing encoding
+    :param  early_stopping EarlyStopping, to evaluate in a seeded random order until the mIoU interval is tight
     :return: wrapper function for data forward pass
     """
     dataloader = get_cityscapes_test_dataloader(args)
+    if early_stopping is not None:
+        dataloader = early_stopping.order(dataloader)
 
     def eval_func(model, use_cuda):
         model.eval()
         confusion_matrix = np.zeros(
             (config.DATASET.NUM_CLASSES, config.DATASET.NUM_CLASSES)
         )
+        if early_stopping is not None:
+            early_stopping.start(len(dataloader.dataset))
+            intervals = MeanIoUInterval(early_stopping.confidence, seed=early_stopping.seed, metric=mean_iou)
         with torch.no_grad():
             for idx, batch in enumerate(tqdm(dataloader)):
                 image, label, _, _ = batch
@@ -75,13 +91,18 @@ def model_eval(args, num_samples=None):
                 pred = F.upsample(
                     input=pred, size=(size[-2], size[-1]), mode="bilinear"
                 )
-                confusion_matrix += get_confusion_matrix(
+                batch_confusion = get_confusion_matrix(
                     label,
                     pred,
                     size,
                     config.DATASET.NUM_CLASSES,
                     config.TRAIN.IGNORE_LABEL,
                 )
+                confusion_matrix += batch_confusion
+                if early_stopping is not None:
+                    intervals.update(batch_confusion)
+                    if early_stopping.should_stop(intervals.interval, idx + 1):
+                        break
                 if num_samples is not None and idx > num_samples:
                     # when number of samples exceeds num_samples
                     print(
@@ -89,10 +110,9 @@ def model_eval(args, num_samples=None):
                     )
                     break
 
-        pos = confusion_matrix.sum(1)
-        res = confusion_matrix.sum(0)
-        tp = np.diag(confusion_matrix)
-        IoU_array = tp / np.maximum(1.0, pos + res - tp)
-        return IoU_array.mean()
+        mIoU = mean_iou(confusion_matrix)
+        if early_stopping is not None:
+            early_stopping.finish(mIoU, intervals.interval(), idx + 1)
+        return mIoU
 
     return eval_func
@@ -15,10 +15,12 @@ import os
 import pathlib
 import argparse
 import torch
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.hrnet_semantic_segmentation.dataloader.dataloaders_and_eval_func import (
     model_eval,
 )
 from aimet_zoo_torch.hrnet_semantic_segmentation import HRNetSemSeg
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping
 
 
 def arguments(raw_args):
@@ -36,6 +38,9 @@ def arguments(raw_args):
         "--use-cuda", help="Use GPU for evaluation", default=True, type=bool
     )
     parser.add_argument("--dataset-path", help="Use GPU for evaluation", type=str)
+    parser.add_argument("--early-stop-tolerance", help="stop evaluating once the 95%% confidence interval of the "
+                        "mIoU is within this tolerance (mIoU as a fraction), the full validation set by default",
+                        default=None, type=float)
     args = parser.parse_args(raw_args)
     return args
 
@@ -69,9 +74,11 @@ class ModelConfig:
 DEFAULT_CONFIG = {"num_samples_cal": 2000, "num_samples_eval": None}
 
 
+@report_phases("hrnet_sem_seg_quanteval")
 def main(raw_args=None):
     """run evaluator"""
     args = arguments(raw_args)
+    record_arguments(args)
     config = ModelConfig(args)
     seed(config.seed, config.use_cuda)
 
@@ -79,12 +86,17 @@ def main(raw_args=None):
     model = HRNetSemSeg(model_config=args.model_config)
     sim = model.get_quantsim(quantized=True)
     eval_func_calibration = model_eval(config, num_samples=DEFAULT_CONFIG['num_samples_cal'])
-    eval_func = model_eval(config,num_samples=DEFAULT_CONFIG['num_samples_eval'])
+    early_stopping = EarlyStopping(args.early_stop_tolerance) if args.early_stop_tolerance else None
+    eval_func = model_eval(config, num_samples=DEFAULT_CONFIG['num_samples_eval'], early_stopping=early_stopping)
     sim.compute_encodings(
         forward_pass_callback=eval_func_calibration, forward_pass_callback_args=config
     )
     mIoU = eval_func(sim.model, config.use_cuda)
     print(f"=======Quantized Model | Quantized mIoU: {mIoU:.4f}")
+    results = {"mIoU": mIoU}
+    if early_stopping is not None:
+        results["early_stopping"] = early_stopping.report(("quant",))
+    return results
 
 
 if __name__ == "__main__":
@@ -11,13 +11,13 @@
 
 """ HRNet Semantic Segmentation """
 
-import json
 import os
 import pathlib
 import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.hrnet_semantic_segmentation.model.models.seg_hrnet import (
     get_seg_model,
 )
@@ -30,18 +30,18 @@ from aimet_zoo_torch.hrnet_semantic_segmentation.model.config import (
 class HRNetSemSeg(Downloader):
     """HRNET-w48 Semantic Segmentation parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
 
-    def __init__(self, model_config=None):
+    def __init__(self, model_config=None, device=None):
         """
         :param model_config:             named model config from which to obtain model artifacts and arguments.
                                          If provided, overwrites the other arguments passed to this object
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
+        self.device = device or torch.device("cuda")
         parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -50,6 +50,7 @@ class HRNetSemSeg(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -65,20 +66,16 @@ class HRNetSemSeg(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
             equalize_model(self.model, self.input_shape)
-            state_dict = torch.load(self.path_post_opt_weights)
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
-            self.model.cuda()
+            self.model.to(self.device)
         else:
-            state_dict = torch.load(self.path_pre_opt_weights)
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
-            self.model.cuda()
+            self.model.to(self.device)
         self.model.eval()
 
     def get_quantsim(self, quantized=False):
@@ -91,8 +88,7 @@ class HRNetSemSeg(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -1,2 +1,9 @@
 """ package for getting hrnetinverseform original model and quantized model"""
-from .model.model_definition import HRNetInverseForm
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import HRNetInverseForm
+
+__all__ = ["HRNetInverseForm"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"HRNetInverseForm": ".model.model_definition"})
@@ -18,6 +18,7 @@ import argparse
 import torch
 
 # InverseForm imports
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.inverseform import HRNetInverseForm
 from aimet_zoo_torch.inverseform.dataloader.helper import get_dataloaders_and_eval_func
 
@@ -72,9 +73,11 @@ def seed(seednum, use_cuda):
         torch.cuda.manual_seed_all(seednum)
 
 
+@report_phases("inverseform_quanteval")
 def main(raw_args=None):
     """main evaluation function"""
     args = arguments(raw_args)
+    record_arguments(args)
     seed(0, args.use_cuda)
 
     # Load model
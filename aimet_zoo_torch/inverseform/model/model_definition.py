@@ -11,12 +11,12 @@
 # pylint:disable = import-error, wrong-import-order
 # adding this due to docker image not setup yet
 
-import json
 import os
 import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.inverseform.model.utils.config import assert_and_infer_cfg, cfg
 from aimet_zoo_torch.inverseform.model.models.lighthrnet import HRNet16
 from aimet_zoo_torch.inverseform.model.models.ocrnet import OCRNet
@@ -24,14 +24,13 @@ from aimet_zoo_torch.inverseform.model.models.ocrnet import OCRNet
 
 class HRNetInverseForm(Downloader):
     """HRNetInverseForm parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
-    def __init__(self, model_config: str = None, num_classes=19):
+    def __init__(self, model_config: str = None, num_classes=19, device=None):
+        self.device = device or torch.device("cuda")
         parent_dir = "/".join(os.path.realpath(__file__).split("/")[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -40,6 +39,7 @@ class HRNetInverseForm(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -71,17 +71,13 @@ class HRNetInverseForm(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
             equalize_model(self.model, self.input_shape)
-            state_dict = torch.load(self.path_post_opt_weights)
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
         else:
-            self.model = torch.load(self.path_pre_opt_weights)
+            self.model = torch.load(self.path_pre_opt_weights, map_location=self.device)
 
     def get_quantsim(self, quantized=False):
         """get quantsim object with pre-loaded encodings or pretrained model"""
@@ -93,8 +89,7 @@ class HRNetInverseForm(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -108,7 +103,7 @@ class HRNetInverseForm(Downloader):
             "config_file": self.path_aimet_config,
             "dummy_input": dummy_input,
         }
-        sim = QuantizationSimModel(self.model.cuda(), **kwargs)
+        sim = QuantizationSimModel(self.model.to(self.device), **kwargs)
         if self.path_aimet_encodings and quantized:
             load_encodings_to_sim(sim, self.path_aimet_encodings)
             print("load_encodings_to_sim finished!")
@@ -1,2 +1,9 @@
 """ package for getting minilm original model and quantized model"""
-from .model.model_definition import Minilm
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import Minilm
+
+__all__ = ["Minilm"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"Minilm": ".model.model_definition"})
@@ -28,6 +28,7 @@
 import argparse
 import logging
 
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.minilm import Minilm
 from aimet_zoo_torch.minilm.dataloader import get_datasets, eval_function
 
@@ -62,9 +63,11 @@ def parse_args(raw_args):
 
 DEFAULT_CONFIG = {"MAX_EVAL_SAMPLES": None}
 
+@report_phases("minilm_quanteval")
 def main(raw_args=None):
     """main function for quantization evaluation"""
     args = parse_args(raw_args)
+    record_arguments(args)
     logging.basicConfig(
         format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
         datefmt="%m/%d/%Y %H:%M:%S",
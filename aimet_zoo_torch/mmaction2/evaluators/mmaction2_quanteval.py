@@ -17,6 +17,7 @@ from mmengine.config import Config
 from mmengine.runner import Runner
 
 from aimet_torch.model_validator.model_validator import ModelValidator
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.mmaction2.model.model_definition import MMAction2
 
 
@@ -31,6 +32,7 @@ def parse_args():
     return args
 
 
+@report_phases("mmaction2_quanteval")
 def bmn_quanteval(raw_args=None):
     """
     quantization evaluation function for BMN model
@@ -39,6 +41,7 @@ def bmn_quanteval(raw_args=None):
     :return: a dictionary of fp32 and quantized model metrics
     """
     args = raw_args if raw_args else parse_args()
+    record_arguments(args)
     device = 'cpu'
     if args.use_cuda:
         if torch.cuda.is_available():
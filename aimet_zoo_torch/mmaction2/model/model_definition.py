@@ -11,7 +11,6 @@
 
 
 import os
-import json
 import pathlib
 
 import torch
@@ -19,37 +18,34 @@ import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 
 
 class MMAction2(Downloader):
     """
     Downloader class for mmaction2 BMN model
     """
-    def __init__(self, model_config=None, **kwargs):
+    def __init__(self, model_config=None, device=None, **kwargs):
         """
         :param model_config:             named model config from which to obtain model artifacts and arguments.
                                          If provided, overwrites the other arguments passed to this object
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
         parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = False
         if model_config:
-            config_filepath = os.path.join(parent_dir, f'model_cards/{model_config}.json')
-            try:
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
-            except FileNotFoundError:
-                print(f"Trying to open a model_config file from a non-existent path {config_filepath}!")
-                raise
+            self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(self,
                                 url_pre_opt_weights = self.cfg['artifacts']['url_pre_opt_weights'],
                                 url_post_opt_weights = self.cfg['artifacts']['url_post_opt_weights'],
                                 url_aimet_encodings = self.cfg['artifacts']['url_aimet_encodings'],
                                 url_aimet_config = self.cfg['artifacts']['url_aimet_config'],
+                                checksums = self.cfg['artifacts'].get('checksums'),
                                 model_dir = parent_dir,
                                 model_config = model_config)
             self.input_shape = tuple(x if x is not None else 1 for x in self.cfg['input_shape'])
-        self.device = kwargs.get('device', 'cuda')
+        self.device = device or torch.device("cuda")
         self.model = None
 
     def from_pretrained(self):
@@ -9,21 +9,20 @@
 #  @@-COPYRIGHT-END-@@
 # =============================================================================
 """Class for downloading and setting up of optmized and original mobilebert model for AIMET model zoo"""
-import json
 import os
 import sys
 import pathlib
 from collections import defaultdict
-import torch
 
 
 from transformers import HfArgumentParser
 from transformers import AutoConfig, AutoTokenizer, TrainingArguments
-# AIMET imports
-from aimet_torch.quantsim import load_checkpoint
+# pickled models and quantsim checkpoints are memory mapped where torch supports it
+from aimet_zoo_torch.common.mmap_checkpoint import load_checkpoint
 # transformers import
 from aimet_zoo_torch.mobilebert.model import baseline_models
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 
 sys.modules["baseline_models"] = baseline_models
 
@@ -47,16 +46,13 @@ class MobileBert(Downloader):
         self.parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = defaultdict(lambda: None)
         if model_config:
-            config_filepath = os.path.join(
-                self.parent_dir, "model_cards", model_config + ".json"
-            )
-            with open(config_filepath) as f_in:
-                self.cfg = json.load(f_in)
+            self.cfg = get_card(model_config)
         Downloader.__init__(
             self,
             url_post_opt_weights=self.cfg["artifacts"]["url_post_opt_weights"],
             url_pre_opt_weights=self.cfg["artifacts"]["url_pre_opt_weights"],
             url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+            checksums=self.cfg["artifacts"].get("checksums"),
             model_dir=self.parent_dir,
         )
         # Parse arguments
@@ -122,7 +118,7 @@ class MobileBert(Downloader):
                 use_auth_token=True if self.model_args.use_auth_token else None,
             )
 
-            self.model = torch.load(self.aux_args.fmodel_path)
+            self.model = load_checkpoint(self.aux_args.fmodel_path)
             return self.model, tokenizer
         # case2. model for glue dataset
         num_labels = 2
@@ -157,7 +153,7 @@ class MobileBert(Downloader):
             use_auth_token=True if self.model_args.use_auth_token else None,
         )
 
-        self.model = torch.load(self.aux_args.fmodel_path)
+        self.model = load_checkpoint(self.aux_args.fmodel_path)
         return self.model, tokenizer
 
     def get_quantsim(self):
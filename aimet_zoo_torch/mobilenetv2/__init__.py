@@ -1,2 +1,9 @@
 """ package for getting mobilenetv2 original model and quantized model"""
-from .model.model_definition import MobileNetV2
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import MobileNetV2
+
+__all__ = ["MobileNetV2"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"MobileNetV2": ".model.model_definition"})
@@ -11,10 +11,10 @@
 
 import random
 import numpy as np
-from tqdm import tqdm
 import torch
 from torch.utils.data import DataLoader
 from torchvision import transforms, datasets
+from aimet_zoo_torch.common.utils import classification_metrics
 
 
 def work_init(work_id):
@@ -60,23 +60,16 @@ def get_dataloaders_and_eval_func(imagenet_path, image_size=224):
     val_loader = make_dataloader(dataset_path=imagenet_path, image_size=image_size)
 
     def eval_func(model, args):
-        num_samples = args[0] if args[0] > 0 else float("inf")
+        """
+        args: [num_samples, device] or [num_samples, device, early_stopping], a non positive num_samples
+        evaluates the full validation set
+        """
+        num_samples = args[0] if args[0] > 0 else None
         device = args[1]
-        top1_acc = 0.0
-        total_num = 0
+        early_stopping = args[2] if len(args) > 2 else None
         model.to(device)
-        for _, (sample, label) in enumerate(tqdm(val_loader)):
-            total_num += sample.size()[0]
-            sample = sample.to(device)
-            label = label.to(device)
-            logits = model(sample)
-            pred = torch.argmax(logits, dim=1)
-            correct = sum(torch.eq(pred, label)).cpu().numpy()
-            top1_acc += correct
-            if total_num >= num_samples:
-                break
-        avg_acc = top1_acc * 100.0 / total_num
-        return avg_acc
+        return classification_metrics.evaluate(model, val_loader, num_samples=num_samples,
+                                               early_stopping=early_stopping)["top1"]
 
     return train_loader, val_loader, eval_func
 
@@ -89,5 +82,4 @@ def unlabeled_dataset(val_loader):
 
 def forward_pass(model, val_loader):
     """forward pass of dataloader"""
-    for X in unlabeled_dataset(val_loader):
-        _ = model(X)
+    classification_metrics.forward_pass(model, unlabeled_dataset(val_loader))
@@ -12,9 +12,11 @@
 
 import argparse
 import torch
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.mobilenetv2 import MobileNetV2
 from aimet_zoo_torch.mobilenetv2.dataloader import get_dataloaders_and_eval_func
 from aimet_zoo_torch.common.utils.utils import get_device
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping
 
 
 def arguments(raw_args):
@@ -50,6 +52,9 @@ def arguments(raw_args):
     parser.add_argument(
         "--use-cuda", help="Run evaluation on GPU", type=bool, default=True
     )
+    parser.add_argument("--early-stop-tolerance", help="stop evaluating once the 95%% confidence interval of the "
+                        "accuracy is within this many percentage points, the full validation set by default",
+                        default=None, type=float)
     args = parser.parse_args(raw_args)
     return args
 
@@ -63,12 +68,15 @@ def seed(seed_num):
     torch.cuda.manual_seed_all(seed_num)
 
 
+@report_phases("mobilenetv2_quanteval")
 def main(raw_args=None):
     """main evaluation function"""
     # pylint:disable = too-many-locals, unused-variable
     seed(0)
     args = arguments(raw_args)
+    record_arguments(args)
     device = get_device(args)
+    early_stopping = EarlyStopping(args.early_stop_tolerance) if args.early_stop_tolerance else None
     eval_samples = -1
     encoding_samples = 2000
 
@@ -88,24 +96,24 @@ def main(raw_args=None):
     dummy_input = torch.randn(input_shape)
 
     print("### Simulating original model performance ###")
-    model_fp32 = MobileNetV2(model_config=args.model_config)
+    model_fp32 = MobileNetV2(model_config=args.model_config, device=device)
     model_fp32.from_pretrained(quantized=False)
     model_fp32.model.eval()
     # sim = QuantizationSimModel(model_fp32, dummy_input=dummy_input, **kwargs)
     sim = model_fp32.get_quantsim(quantized=False)
     sim.compute_encodings(eval_func, [encoding_samples, device])
-    orig_acc_fp32 = eval_func(model_fp32.model.to(device), [eval_samples, device])
-    orig_acc_int8 = eval_func(sim.model.to(device), [eval_samples, device])
+    orig_acc_fp32 = eval_func(model_fp32.model.to(device), [eval_samples, device, early_stopping])
+    orig_acc_int8 = eval_func(sim.model.to(device), [eval_samples, device, early_stopping])
 
     print("### Simulating quantized model performance ###")
-    model_int8 = MobileNetV2(model_config=args.model_config)
+    model_int8 = MobileNetV2(model_config=args.model_config, device=device)
     model_int8.from_pretrained(quantized=True)
     model_int8.model.eval()
     # sim = QuantizationSimModel(model_int8, dummy_input=dummy_input, **kwargs)
     sim = model_fp32.get_quantsim(quantized=True)
     sim.compute_encodings(eval_func, [encoding_samples, device])
-    optim_acc_fp32 = eval_func(model_int8.model.to(device), [eval_samples, device])
-    optim_acc_int8 = eval_func(sim.model.to(device), [eval_samples, device])
+    optim_acc_fp32 = eval_func(model_int8.model.to(device), [eval_samples, device, early_stopping])
+    optim_acc_int8 = eval_func(sim.model.to(device), [eval_samples, device, early_stopping])
 
     print()
     print("Evaluation Summary:")
@@ -117,6 +125,17 @@ def main(raw_args=None):
     print(
         f"Optimized Model | Accuracy on {args.default_param_bw}-bit device: {optim_acc_int8:.4f}"
     )
+    results = {
+        "orig_acc_fp32": orig_acc_fp32,
+        "orig_acc_int8": orig_acc_int8,
+        "optim_acc_fp32": optim_acc_fp32,
+        "optim_acc_int8": optim_acc_int8,
+    }
+    if early_stopping is not None:
+        results["early_stopping"] = early_stopping.report(
+            ("orig_fp32", "orig_int8", "optim_fp32", "optim_int8")
+        )
+    return results
 
 
 if __name__ == "__main__":
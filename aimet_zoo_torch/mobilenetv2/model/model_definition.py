@@ -13,11 +13,11 @@
 # adding this due to docker image not setup yet
 
 import os
-import json
 import torch
 from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 from .MobileNetV2 import MobileNetV2 as Mobile_Net_V2
 
 
@@ -25,13 +25,12 @@ class MobileNetV2(Downloader):
     """MobileNetV2 parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
 
     def __init__(
-            self, model_config=None, num_classes=1000, input_size=224, width_mult=1.0
+            self, model_config=None, num_classes=1000, input_size=224, width_mult=1.0, device=None
     ):
+        self.device = device or torch.device("cuda")
         parent_dir = "/".join(os.path.realpath(__file__).split("/")[:-1])
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            with open(config_filepath) as f_in:
-                self.cfg = json.load(f_in)
+            self.cfg = get_card(model_config)
         if model_config:
             Downloader.__init__(
                 self,
@@ -40,6 +39,7 @@ class MobileNetV2(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -55,14 +55,18 @@ class MobileNetV2(Downloader):
             self.model = Mobile_Net_V2(
                 n_class=num_classes, input_size=input_size, width_mult=width_mult
             )
+        self._loaded_weights = None
 
     def from_pretrained(self, quantized=False):
         """load pretrained weights"""
-        self._download_aimet_config()
-        self._download_post_opt_weights()
+        weights = "post_opt" if quantized else "pre_opt"
+        if self._loaded_weights == weights:
+            # get_quantsim() calls from_pretrained() again, the weights are already in place
+            return
+        self._download_artifacts()
         if quantized:
             equalize_model(self.model, (1, 3, 224, 224))
-            quantized_state_dict = torch.load(self.path_post_opt_weights)
+            quantized_state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
             # need to rename some state dict keys due to differences in aimet naming between when the state dict was generated and now
             quantized_state_dict["state_dict"][
                 "classifier.weight"
@@ -75,16 +79,11 @@ class MobileNetV2(Downloader):
             self.model.load_state_dict(quantized_state_dict["state_dict"])
             del quantized_state_dict
         else:
-            #pylint:disable = import-outside-toplevel
-            try:
-                from torch.hub import load_state_dict_from_url
-            except ImportError:
-                from torch.utils.model_zoo import load_url as load_state_dict_from_url
-            state_dict = load_state_dict_from_url(
-                "https://www.dropbox.com/s/47tyzpofuuyyv1b/mobilenetv2_1.0-f2a8633.pth.tar?dl=1",
-                progress=True,
-            )
+            # the original ImageNet weights, fetched through the artifact cache like every other artifact
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
+            del state_dict
+        self._loaded_weights = weights
 
     def get_quantsim(self, quantized=False):
         """get quantsim object with pre-loaded encodings or pretrained model"""
@@ -92,8 +91,7 @@ class MobileNetV2(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -107,7 +105,7 @@ class MobileNetV2(Downloader):
             "config_file": self.path_aimet_config,
             "dummy_input": dummy_input,
         }
-        sim = QuantizationSimModel(self.model.cuda(), **kwargs)
+        sim = QuantizationSimModel(self.model.to(self.device), **kwargs)
         if self.path_aimet_encodings and quantized:
             load_encodings_to_sim(sim, self.path_aimet_encodings)
         if self.path_adaround_encodings and quantized:
@@ -1,2 +1,9 @@
 """ package for getting mobilevit original model and quantized model"""
-from .model.model_definition import mobilevit
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import mobilevit
+
+__all__ = ["mobilevit"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"mobilevit": ".model.model_definition"})
@@ -18,6 +18,7 @@ import datasets
 from accelerate import Accelerator
 from accelerate.logging import get_logger
 from accelerate.utils import set_seed
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.mobilevit.dataloader import get_dataloaders
 from aimet_zoo_torch.mobilevit import mobilevit
 
@@ -69,9 +70,11 @@ def parse_args(raw_args):
     return args
 
 
+@report_phases("mobilevit_quanteval")
 def main(raw_args=None):
     """Evaluation main function"""
     args = parse_args(raw_args)
+    record_arguments(args)
     # Initialize the accelerator. We will let the accelerator
     # handle device placement for us in this example.
     # If we're using tracking, we also need to initialize it here
@@ -9,7 +9,6 @@
 # =============================================================================
 
 """Class for downloading and setting up of optmized and original mobilevit model for AIMET model zoo"""
-import json
 import os
 import csv
 from collections import defaultdict
@@ -20,6 +19,7 @@ from transformers import AutoFeatureExtractor as FeatureExtractor
 from aimet_common.defs import QuantScheme #pylint:disable = import-error
 from aimet_torch.quantsim import QuantizationSimModel #pylint:disable = import-error
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 from aimet_zoo_torch.mobilevit.model.huggingface.baseline_models.mobilevit.modeling_mobilevit import (
     MobileViTForImageClassification as MobileVitModel,
 )
@@ -39,15 +39,12 @@ class mobilevit(Downloader):
         self.parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = defaultdict(lambda: None)
         if model_config:
-            config_filepath = os.path.join(
-                self.parent_dir, "model_cards", model_config + ".json"
-            )
-            with open(config_filepath) as f_in:
-                self.cfg = json.load(f_in)
+            self.cfg = get_card(model_config)
         Downloader.__init__(
             self,
             tar_url_post_opt_weights=self.cfg["artifacts"]["tar_url_post_opt_weights"],
             url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+            checksums=self.cfg["artifacts"].get("checksums"),
             model_dir=self.parent_dir,
         )
         self.model = None
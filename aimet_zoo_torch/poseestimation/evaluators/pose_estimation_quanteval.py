@@ -40,7 +40,9 @@ from pycocotools.coco import COCO
 from pycocotools.cocoeval import COCOeval
 
 # aimet model zoo import
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.common.utils import utils
+from aimet_zoo_torch.common.utils.pipelined_eval import Pipeline
 
 
 def get_pre_stage_net():
@@ -433,7 +435,8 @@ def preprocess(image, transforms):
     return image
 
 
-def run_model(model, image, fast=False):
+def encode_image(image, fast=False):
+    """model inputs of image at each scale, with the encoded image shape and padding needed for decoding"""
     scale_search = [1.0]
     crop = 368
     stride = 8
@@ -444,8 +447,9 @@ def run_model(model, image, fast=False):
     else:
         scales = [x * crop / image.shape[0] for x in scale_search]
 
-    heatmaps, pafs = [], []
+    encoded = []
     for scale in scales:
+        pad = None
         if fast:
             horiz = image.shape[0] < image.shape[1]
             sz = (496, 384) if horiz else (384, 496)
@@ -456,6 +460,14 @@ def run_model(model, image, fast=False):
             image_encoded, pad = encode_input(image, scale, stride, padValue)
         image_encoded_ = preprocess(image_encoded, ["addchannel", "normalize", "bgr"])
         image_encoded_ = np.transpose(image_encoded_, (0, 3, 1, 2))
+        encoded.append((image_encoded_, image_encoded.shape, pad))
+    return encoded
+
+
+def forward_encoded(model, encoded):
+    """paf and heatmap outputs of the model for each scale of encode_image()"""
+    outputs = []
+    for image_encoded_, _, _ in encoded:
         with torch.no_grad():
             input_image = torch.FloatTensor(torch.from_numpy(image_encoded_).float())
             if next(model.parameters()).is_cuda:
@@ -463,15 +475,24 @@ def run_model(model, image, fast=False):
             output = model(input_image)
         paf = output[2].cpu().data.numpy().transpose((0, 2, 3, 1))
         heatmap = output[3].cpu().data.numpy().transpose((0, 2, 3, 1))
+        outputs.append((paf, heatmap))
+    return outputs
+
+
+def decode_outputs(image_shape, encoded, outputs, fast=False):
+    """heatmap and paf at the resolution of the image, averaged over the scales"""
+    stride = 8
+    heatmaps, pafs = [], []
+    for (_, encoded_shape, pad), (paf, heatmap) in zip(encoded, outputs):
         if fast:
-            paf = cv2.resize(paf[0], (image.shape[1], image.shape[0]))
-            heatmap = cv2.resize(heatmap[0], dsize=(image.shape[1], image.shape[0]))
+            paf = cv2.resize(paf[0], (image_shape[1], image_shape[0]))
+            heatmap = cv2.resize(heatmap[0], dsize=(image_shape[1], image_shape[0]))
         else:
             # paf = paf.transpose((0, 3, 1, 2))
             # heatmap = heatmap.transpose((0, 3, 1, 2))
-            paf = decode_output(paf, stride, pad, image_encoded.shape, image.shape)
+            paf = decode_output(paf, stride, pad, encoded_shape, image_shape)
             heatmap = decode_output(
-                heatmap, stride, pad, image_encoded.shape, image.shape
+                heatmap, stride, pad, encoded_shape, image_shape
             )
 
         pafs.append(paf)
@@ -480,6 +501,11 @@ def run_model(model, image, fast=False):
     return np.asarray(heatmaps).mean(axis=0), np.asarray(pafs).mean(axis=0)
 
 
+def run_model(model, image, fast=False):
+    encoded = encode_image(image, fast)
+    return decode_outputs(image.shape, encoded, forward_encoded(model, encoded), fast)
+
+
 def get_keypoints(heatmap):
     thre1 = 0.1
     keypoints_all = []
@@ -811,17 +837,27 @@ class COCOWrapper:
 def evaluate_model(model, coco_path, num_imgs=None, fast=True):
     coco = COCOWrapper(coco_path, num_imgs)
 
-    results = []
     image_path = os.path.join(coco.coco_path, "images/val2014/")
     imgs = coco.get_images()
-    print("Running extended evaluation on the validation set")
-    for _, img in tqdm(enumerate(imgs)):
+
+    def load(img):
         image = cv2.imread(image_path + img["file_name"])  # B,G,R order
+        return image.shape, encode_image(image, fast)
+
+    def forward(loaded):
+        return forward_encoded(model, loaded[1])
 
-        heatmap, paf = run_model(model, image, fast)
+    def postprocess(loaded, outputs):
+        image_shape, encoded = loaded
+        heatmap, paf = decode_outputs(image_shape, encoded, outputs, fast)
+        skeletons, keypoints = estimate_pose(image_shape, heatmap, paf)
+        return parse_results(skeletons, keypoints)
 
-        skeletons, keypoints = estimate_pose(image.shape, heatmap, paf)
-        results.append(parse_results(skeletons, keypoints))
+    print("Running extended evaluation on the validation set")
+    # images are decoded and poses grouped while the model processes other images
+    pipeline = Pipeline(load, forward, postprocess)
+    results = list(tqdm(pipeline.run(imgs), total=len(imgs)))
+    print("Pipeline: " + pipeline.format_stats())
 
     try:
         ans = coco.evaluate_json(coco.get_results_json(results, imgs))
@@ -876,7 +912,9 @@ def download_weights():
     urllib.request.urlretrieve(url_config, "default_config.json")
 
 
+@report_phases("pose_estimation_quanteval")
 def pose_estimation_quanteval(args):
+    record_arguments(args)
     download_weights()
     # load the model checkpoint from meta
     model_builder = ModelBuilder()
@@ -1,2 +1,9 @@
 """ package for getting quicksrnet original model and quantized model"""
-from .model.model_definition import QuickSRNet
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import QuickSRNet
+
+__all__ = ["QuickSRNet"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"QuickSRNet": ".model.model_definition"})
@@ -11,13 +11,18 @@
 """ AIMET evaluation code for QuickSRNet """
 
 import argparse
+import glob
+import os
+import torch
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.encodings_cache import cached_compute_encodings
+from aimet_zoo_torch.common.utils.multi_model_eval import evaluate_models
 from aimet_zoo_torch.quicksrnet import QuickSRNet
-from aimet_zoo_torch.quicksrnet.model.helpers import evaluate_average_psnr
+from aimet_zoo_torch.quicksrnet.model.helpers import AveragePSNR
 from aimet_zoo_torch.quicksrnet.dataloader.utils import (
     load_dataset,
     pass_calibration_data,
 )
-from aimet_zoo_torch.quicksrnet.model.inference import run_model
 
 
 # add arguments
@@ -52,9 +57,11 @@ def arguments(raw_args):
     return args
 
 
+@report_phases("quicksrnet_quanteval")
 def main(raw_args=None):
     """exeutes evaluation"""
     args = arguments(raw_args)
+    record_arguments(args)
 
     model_fp32 = QuickSRNet(model_config=args.model_config)
     model_fp32.from_pretrained(quantized=False)
@@ -66,30 +73,42 @@ def main(raw_args=None):
 
     IMAGES_LR, IMAGES_HR = load_dataset(args.dataset_path, model_fp32.scaling_factor)
 
-    sim_fp32.compute_encodings(
-        forward_pass_callback=pass_calibration_data,
-        forward_pass_callback_args=(IMAGES_LR, args.use_cuda),
+    # load_dataset() reads the same files, in the same order
+    calibration_files = glob.glob(os.path.join(args.dataset_path, "*"))
+    dummy_input = torch.rand(model_fp32.input_shape)
+    cached_compute_encodings(
+        sim_fp32,
+        args.model_config,
+        calibration_files,
+        pass_calibration_data,
+        (IMAGES_LR, args.use_cuda),
+        dummy_input=dummy_input,
+        scaling_factor=model_fp32.scaling_factor,
     )
-    sim_int8.compute_encodings(
-        forward_pass_callback=pass_calibration_data,
-        forward_pass_callback_args=(IMAGES_LR, args.use_cuda),
+    cached_compute_encodings(
+        sim_int8,
+        args.model_config,
+        calibration_files,
+        pass_calibration_data,
+        (IMAGES_LR, args.use_cuda),
+        dummy_input=dummy_input,
+        scaling_factor=model_int8.scaling_factor,
     )
 
-    # Run model inference on test images and get super-resolved images
-    IMAGES_SR_original_fp32 = run_model(model_fp32, IMAGES_LR, args.use_cuda)
-    IMAGES_SR_original_int8 = run_model(sim_fp32.model, IMAGES_LR, args.use_cuda)
-    IMAGES_SR_optimized_fp32 = run_model(model_int8, IMAGES_LR, args.use_cuda)
-    IMAGES_SR_optimized_int8 = run_model(sim_int8.model, IMAGES_LR, args.use_cuda)
-
-    # Get the average PSNR for all test-images
-    avg_psnr = evaluate_average_psnr(IMAGES_SR_original_fp32, IMAGES_HR)
-    print(f"Original Model | FP32 Environment | Avg. PSNR: {avg_psnr:.3f}")
-    avg_psnr = evaluate_average_psnr(IMAGES_SR_original_int8, IMAGES_HR)
-    print(f"Original Model | Quantized Environment | Avg. PSNR: {avg_psnr:.3f}")
-    avg_psnr = evaluate_average_psnr(IMAGES_SR_optimized_fp32, IMAGES_HR)
-    print(f"Optimized Model | FP32 Environment | Avg. PSNR: {avg_psnr:.3f}")
-    avg_psnr = evaluate_average_psnr(IMAGES_SR_optimized_int8, IMAGES_HR)
-    print(f"Optimized Model | Quantized Environment | Avg. PSNR: {avg_psnr:.3f}")
+    # Super-resolve every test image with all four variants in a single pass and get their average PSNR
+    avg_psnr = evaluate_models(
+        {
+            "Original Model | FP32 Environment": model_fp32,
+            "Original Model | Quantized Environment": sim_fp32.model,
+            "Optimized Model | FP32 Environment": model_int8,
+            "Optimized Model | Quantized Environment": sim_int8.model,
+        },
+        list(zip(IMAGES_LR, IMAGES_HR)),
+        metric_factory=AveragePSNR,
+        forward_fn=lambda model, image_pair: model(image_pair[0].unsqueeze(0)),
+    )
+    for variant, psnr in avg_psnr.items():
+        print(f"{variant} | Avg. PSNR: {psnr:.3f}")
 
 
 if __name__ == "__main__":
@@ -75,6 +75,34 @@ def evaluate_psnr(y_pred, y_true):
     return psnr.item()
 
 
+class AveragePSNR:
+    """
+    Streaming average PSNR over (low-res, high-res) image-pairs, for use with
+    aimet_zoo_torch.common.utils.multi_model_eval.evaluate_models
+    """
+
+    def __init__(self):
+        self.psnr = []
+
+    def update(self, sr_image, image_pair):
+        """
+        Accumulates the PSNR of one super-resolved image.
+
+        :param sr_image:
+            The super-resolved image obtained from the model, with a batch dimension of 1
+        :param image_pair:
+            The low-res input and original high-res image
+        """
+        self.psnr.append(evaluate_psnr(sr_image.squeeze(0), image_pair[1]))
+
+    def compute(self):
+        """
+        :return:
+            Average PSNR metric over all image-pairs seen so far
+        """
+        return np.mean(np.array(self.psnr))
+
+
 def evaluate_average_psnr(sr_images, hr_images):
     """
     Evaluate the avg PSNR metric for all test-set super-res and high-res images.
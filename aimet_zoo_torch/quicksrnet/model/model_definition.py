@@ -12,11 +12,12 @@
 # pylint:disable = import-error, wrong-import-order
 # adding this due to docker image not setup yet
 
-import json
 import os
 import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
+from aimet_zoo_torch.common.quantsim_cache import cached_quantsim
 from aimet_zoo_torch.quicksrnet.model.models import QuickSRNetBase
 
 
@@ -30,6 +31,7 @@ class QuickSRNet(QuickSRNetBase, Downloader):
             num_intermediate_layers=3,
             scaling_factor=2,
             use_ito_connection=False,
+            device=None,
             **kwargs
     ):
         """
@@ -40,14 +42,14 @@ class QuickSRNet(QuickSRNetBase, Downloader):
         :param num_intermediate_layers:  number of intermediate conv layers
         :param use_ito_connection:       whether to use an input-to-output residual connection or not
                                          (using one facilitates quantization)
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
+        self.device = device or torch.device("cuda")
         parent_dir = "/".join(os.path.realpath(__file__).split("/")[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -56,6 +58,7 @@ class QuickSRNet(QuickSRNetBase, Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -85,19 +88,15 @@ class QuickSRNet(QuickSRNetBase, Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
-            state_dict = torch.load(self.path_post_opt_weights)["state_dict"]
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)["state_dict"]
             self.load_state_dict(state_dict)
-            self.cuda()
+            self.to(self.device)
         else:
-            state_dict = torch.load(self.path_pre_opt_weights)["state_dict"]
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)["state_dict"]
             self.load_state_dict(state_dict)
-            self.cuda()
+            self.to(self.device)
         self.eval()
 
     def get_quantsim(self, quantized=False):
@@ -110,8 +109,20 @@ class QuickSRNet(QuickSRNetBase, Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        artifacts = [self.path_aimet_config]
+        if quantized:
+            artifacts += [self.path_post_opt_weights, self.path_aimet_encodings, self.path_adaround_encodings]
+        else:
+            artifacts += [self.path_pre_opt_weights]
+        sim = cached_quantsim(
+            self.model_config, self.cfg, artifacts, lambda: self._build_quantsim(quantized), quantized=quantized
+        )
+        sim.model.eval()
+        return sim
+
+    def _build_quantsim(self, quantized):
+        """builds the quantsim around the loaded weights, called on a quantsim snapshot cache miss"""
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -132,5 +143,4 @@ class QuickSRNet(QuickSRNetBase, Downloader):
         if self.path_adaround_encodings and quantized:
             sim.set_and_freeze_param_encodings(self.path_adaround_encodings)
             print("set_and_freeze_param_encodings finished!")
-        sim.model.eval()
         return sim
@@ -1,2 +1,9 @@
 """ RangeNet++ """
-from .models.model_definition import RangeNet
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .models.model_definition import RangeNet
+
+__all__ = ["RangeNet"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"RangeNet": ".models.model_definition"})
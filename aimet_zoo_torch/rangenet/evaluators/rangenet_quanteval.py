@@ -21,6 +21,7 @@ import yaml
 import torch
 
 # Model Stucture and Model Evaluation imports
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.rangenet.models.train.tasks.semantic.evaluate import evaluate
 from aimet_zoo_torch.rangenet import RangeNet
 
@@ -67,9 +68,11 @@ def arguments(raw_args):
     return args
 
 
+@report_phases("rangenet_quanteval")
 def main(raw_args=None):
     """execute evaluation"""
     args = arguments(raw_args)
+    record_arguments(args)
     seed(1234)
 
     models_dir = os.path.join(
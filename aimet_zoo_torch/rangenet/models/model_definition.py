@@ -11,7 +11,6 @@
 
 """ RangeNet++ """
 
-import json
 import os
 import pathlib
 import yaml
@@ -21,6 +20,7 @@ from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_torch.model_validator.model_validator import ModelValidator
 from aimet_torch.model_preparer import prepare_model
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.rangenet.models.train.tasks.semantic.modules.segmentator import (
     Segmentator,
 )
@@ -29,18 +29,18 @@ from aimet_zoo_torch.rangenet.models.train.tasks.semantic.modules.segmentator im
 class RangeNet(Downloader):
     """HRNET-w48 Semantic Segmentation parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
 
-    def __init__(self, model_config=None):
+    def __init__(self, model_config=None, device=None):
         """
         :param model_config:             named model config from which to obtain model artifacts and arguments.
                                          If provided, overwrites the other arguments passed to this object
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
+        self.device = device or torch.device("cuda")
         self.parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = False
         if model_config:
-            config_filepath = self.parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -49,6 +49,7 @@ class RangeNet(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 url_zipped_checkpoint=self.cfg["artifacts"]["url_zipped_checkpoint"],
                 model_dir=self.parent_dir,
                 model_config=model_config,
@@ -56,7 +57,7 @@ class RangeNet(Downloader):
             self.input_shape = tuple(
                 x if x is not None else 1 for x in self.cfg["input_shape"]
             )
-            self.dummy_input = torch.rand(self.input_shape, device=torch.device("cuda"))
+            self.dummy_input = torch.rand(self.input_shape, device=self.device)
         self.model = None
 
     def from_pretrained(self, quantized=False):
@@ -65,16 +66,12 @@ class RangeNet(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         self._download_compressed_checkpoint()
         if quantized:
             self.from_pretrained(quantized=False)
             equalize_model(self.model, self.input_shape)
-            state_dict = torch.load(self.path_post_opt_weights)
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
         else:
             original_checkpoint_path = os.path.join(
@@ -88,7 +85,7 @@ class RangeNet(Downloader):
                 ARCH=model_orig_ARCH, nclasses=20, path=original_checkpoint_path
             )
             self.model = prepare_model(self.model)
-        self.model.cuda()
+        self.model.to(self.device)
         self.model.eval()
         ModelValidator.validate_model(self.model, self.dummy_input)
 
@@ -102,7 +99,7 @@ class RangeNet(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        dummy_input = torch.rand(self.input_shape, device=torch.device("cuda"))
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -124,6 +121,6 @@ class RangeNet(Downloader):
         if self.path_adaround_encodings and quantized:
             sim.set_and_freeze_param_encodings(self.path_adaround_encodings)
             print("set_and_freeze_param_encodings finished!")
-        sim.model.cuda()
+        sim.model.to(self.device)
         sim.model.eval()
         return sim
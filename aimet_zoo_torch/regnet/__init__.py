@@ -1,2 +1,9 @@
 """ package for getting regnet original model and quantized model"""
-from .model.model_definition import RegNet
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import RegNet
+
+__all__ = ["RegNet"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"RegNet": ".model.model_definition"})
@@ -10,9 +10,18 @@
 """ AIMET Quantsim evaluation code for Regnet_x_3_2gf """
 
 import argparse
+import functools
+import os
+import tempfile
+import torch
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.encodings_cache import export_encodings
+from aimet_zoo_torch.common.utils.sharded_eval import build_replica
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping
 from aimet_zoo_torch.common.utils.image_net_data_loader import ImageNetDataLoader
 from aimet_zoo_torch.regnet.dataloader.dataloaders_and_eval_func import (
     eval_func,
+    eval_func_sharded,
     forward_pass,
 )
 from aimet_zoo_torch.regnet import RegNet
@@ -35,13 +44,23 @@ def arguments(raw_args):
         "--dataset-path", help="path to evaluation dataset", type=str, required=True
     )
     parser.add_argument("--use-cuda", help="Use cuda", default=True, type=bool)
+    parser.add_argument("--early-stop-tolerance", help="stop evaluating once the 95%% confidence interval of the "
+                        "accuracy is within this many percentage points, the full validation set by default",
+                        default=None, type=float)
+    parser.add_argument("--num-shards", help="evaluate on the cpu in this many worker processes, each with its own "
+                        "replica of the models over a disjoint shard of the validation set", default=None, type=int)
     args = parser.parse_args(raw_args)
+    if args.num_shards and args.early_stop_tolerance:
+        parser.error("--num-shards cannot be combined with --early-stop-tolerance")
     return args
 
 
+@report_phases("regnet_quanteval")
 def main(raw_args=None):
     """Run evaluations"""
     args = arguments(raw_args)
+    record_arguments(args)
+    early_stopping = EarlyStopping(args.early_stop_tolerance) if args.early_stop_tolerance else None
 
     # Dataloaders
     encoding_dataloader = ImageNetDataLoader(
@@ -49,19 +68,36 @@ def main(raw_args=None):
     ).data_loader
     eval_dataloader = ImageNetDataLoader(args.dataset_path, image_size=224).data_loader
 
-    # Models
-    model = RegNet(model_config=args.model_config)
+    # Models, on the cpu for the sharded evaluation, which is meant for cpu-only hosts
+    model = RegNet(model_config=args.model_config, device=torch.device("cpu") if args.num_shards else None)
     model.from_pretrained(quantized=False)
     sim = model.get_quantsim(quantized=True)
 
-    # Evaluate original
-    fp32_acc = eval_func(model=model.model, dataloader=eval_dataloader)
-    print(f"FP32 accuracy: {fp32_acc:0.3f}%")
+    if args.num_shards:
+        # each worker builds its own replicas from the artifact and quantsim caches, only the encodings calibrated
+        # here are handed over
+        sim.compute_encodings(forward_pass, forward_pass_callback_args=encoding_dataloader)
+        with tempfile.TemporaryDirectory() as export_dir:
+            encodings_path = export_encodings(sim, os.path.join(export_dir, f"{args.model_config}.encodings"),
+                                              torch.rand(model.input_shape))
+            replica = functools.partial(build_replica, RegNet, args.model_config, quantized=True)
+            fp32_acc = eval_func_sharded(replica, eval_dataloader, args.num_shards)
+            quant_acc = eval_func_sharded(functools.partial(replica, use_sim=True, encodings_path=str(encodings_path)),
+                                          eval_dataloader, args.num_shards)
+    else:
+        # Evaluate original
+        fp32_acc = eval_func(model=model.model, dataloader=eval_dataloader, early_stopping=early_stopping)
 
-    # Evaluate optimized
-    sim.compute_encodings(forward_pass, forward_pass_callback_args=encoding_dataloader)
-    quant_acc = eval_func(model=sim.model.cuda(), dataloader=eval_dataloader)
+        # Evaluate optimized
+        sim.compute_encodings(forward_pass, forward_pass_callback_args=encoding_dataloader)
+        quant_acc = eval_func(model=sim.model.cuda(), dataloader=eval_dataloader,
+                              early_stopping=early_stopping)
+    print(f"FP32 accuracy: {fp32_acc:0.3f}%")
     print(f"Quantized quantized accuracy: {quant_acc:0.3f}%")
+    results = {"fp32_acc": fp32_acc, "quant_acc": quant_acc}
+    if early_stopping is not None:
+        results["early_stopping"] = early_stopping.report(("fp32", "quant"))
+    return results
 
 
 if __name__ == "__main__":
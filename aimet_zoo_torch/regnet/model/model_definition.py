@@ -13,29 +13,30 @@
 # adding this due to docker image not setup yet
 
 import os
-import json
 import torch
 import torchvision
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
+from aimet_zoo_torch.common.quantsim_cache import cached_quantsim
 
 
 class RegNet(Downloader):
     """RegNet parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
     #pylint:disable = unused-argument
-    def __init__(self, model_config=None, **kwargs):
+    def __init__(self, model_config=None, device=None, **kwargs):
         """
         :param model_config:             named model config from which to obtain model artifacts and arguments.
                                          If provided, overwrites the other arguments passed to this object
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
+        self.device = device or torch.device("cuda")
         parent_dir = "/".join(os.path.realpath(__file__).split("/")[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -44,15 +45,19 @@ class RegNet(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
             self.input_shape = tuple(
                 x if x is not None else 1 for x in self.cfg["input_shape"]
             )
-        self.model = getattr(torchvision.models, "regnet_x_3_2gf")(pretrained=True)
-        self.model.cuda()
+        # with a card, architecture only: from_pretrained() loads the weights of the chosen artifact exactly once.
+        # Without one, from_pretrained() is not available and the model keeps the torchvision ImageNet weights
+        self.model = getattr(torchvision.models, "regnet_x_3_2gf")(pretrained=not self.cfg)
+        self.model.to(self.device)
         self.model.eval()
+        self._loaded_weights = None
 
     def from_pretrained(self, quantized=False):
         """load pretrained weights"""
@@ -60,20 +65,24 @@ class RegNet(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        weights = "post_opt" if quantized else "pre_opt"
+        if self._loaded_weights == weights:
+            return
+        self._download_artifacts()
         if quantized:
             equalize_model(self.model, self.input_shape)
-            state_dict = torch.load(self.path_post_opt_weights)
-            self.model.load_state_dict(state_dict)
-            self.model.cuda()
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
         else:
-            self.model = getattr(torchvision.models, "regnet_x_3_2gf")(pretrained=True)
-            self.model.cuda()
+            if self._loaded_weights == "post_opt":
+                # batch norms were folded by equalize_model, start over from the original architecture
+                self.model = getattr(torchvision.models, "regnet_x_3_2gf")(pretrained=False)
+            # the torchvision ImageNet weights, fetched through the artifact cache like every other artifact
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)
+        self.model.load_state_dict(state_dict)
+        del state_dict
+        self.model.to(self.device)
         self.model.eval()
+        self._loaded_weights = weights
 
     def get_quantsim(self, quantized=False):
         """get quantsim object with pre-loaded encodings"""
@@ -85,8 +94,19 @@ class RegNet(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        artifacts = [self.path_aimet_config]
+        if quantized:
+            artifacts += [self.path_post_opt_weights, self.path_aimet_encodings, self.path_adaround_encodings]
+        sim = cached_quantsim(
+            self.model_config, self.cfg, artifacts, lambda: self._build_quantsim(quantized),
+            quantized=quantized, torchvision=torchvision.__version__,
+        )
+        sim.model.eval()
+        return sim
+
+    def _build_quantsim(self, quantized):
+        """builds the quantsim around the loaded weights, called on a quantsim snapshot cache miss"""
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
@@ -107,5 +127,4 @@ class RegNet(Downloader):
         if self.path_adaround_encodings and quantized:
             sim.set_and_freeze_param_encodings(self.path_adaround_encodings)
             print("set_and_freeze_param_encodings finished!")
-        sim.model.eval()
         return sim
@@ -1,2 +1,9 @@
 """ package for getting resnet original model and quantized model"""
-from .model.model_definition import ResNet
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import ResNet
+
+__all__ = ["ResNet"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"ResNet": ".model.model_definition"})
@@ -10,8 +10,16 @@
 ''' AIMET Quantsim evaluation code for quantized classification models - Resnet18, Resnet50 '''
 
 import argparse
+import functools
+import os
+import tempfile
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.encodings_cache import cached_compute_encodings, export_encodings
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping
 from aimet_zoo_torch.common.utils.image_net_data_loader import ImageNetDataLoader
-from aimet_zoo_torch.resnet.dataloader.dataloaders_and_eval_func import eval_func, forward_pass
+from aimet_zoo_torch.common.utils.multi_model_eval import evaluate_models
+from aimet_zoo_torch.common.utils.sharded_eval import build_replica
+from aimet_zoo_torch.resnet.dataloader.dataloaders_and_eval_func import eval_func, eval_func_sharded, forward_pass
 from aimet_zoo_torch.resnet import ResNet
 import torch
 
@@ -24,34 +32,67 @@ def arguments(raw_args):
                         type=str, required=True)
     parser.add_argument('--dataset-path', help='path to evaluation dataset',type=str, required=True)
     parser.add_argument('--use-cuda', help='Use cuda', default=True, type=bool)
+    parser.add_argument("--early-stop-tolerance", help="stop evaluating once the 95%% confidence interval of the "
+                        "accuracy is within this many percentage points, the full validation set by default",
+                        default=None, type=float)
+    parser.add_argument("--num-shards", help="evaluate on the cpu in this many worker processes, each with its own "
+                        "replica of the models over a disjoint shard of the validation set", default=None, type=int)
     args = parser.parse_args(raw_args)
+    if args.num_shards and args.early_stop_tolerance:
+        parser.error("--num-shards cannot be combined with --early-stop-tolerance")
     print(vars(args))
     return args
 
 
+@report_phases("resnet_quanteval")
 def main(raw_args=None):
     """ Run evaluations """
     args = arguments(raw_args)
+    record_arguments(args)
     # Dataloaders
     encoding_dataloader = ImageNetDataLoader(args.dataset_path,image_size=224,num_samples_per_class=2).data_loader
+    calibration_files = [path for path, _ in encoding_dataloader.dataset.samples]
     eval_dataloader = ImageNetDataLoader(args.dataset_path,image_size=224).data_loader
 
-    device = torch.device('cuda' if args.use_cuda else 'cpu')
+    # the sharded evaluation is meant for cpu-only hosts, the models are calibrated on the cpu too
+    device = torch.device('cuda' if args.use_cuda and not args.num_shards else 'cpu')
     # Models
     model = ResNet(model_config = args.model_config, device = device)
     model.from_pretrained(quantized=False)
     sim = model.get_quantsim(quantized=True)
 
-    # Evaluate original
-    fp32_acc = eval_func(model = model.model, dataloader = eval_dataloader)
-    print(f'FP32 accuracy: {fp32_acc:0.3f}%')
+    # Calibrate optimized. get_quantsim(quantized=True) equalized model.model and loaded the post-opt weights into it,
+    # so the FP32 accuracy below is that of the optimized weights without quantization, as it always was
+    cached_compute_encodings(sim, args.model_config, calibration_files, forward_pass, encoding_dataloader,
+                             dummy_input=torch.rand(model.input_shape),
+                             transform=repr(encoding_dataloader.dataset.transform))
 
-    # Evaluate optimized
-    sim.compute_encodings(forward_pass, forward_pass_callback_args=encoding_dataloader)
-    quant_acc = eval_func(model = sim.model.to(device), dataloader = eval_dataloader)
+    if args.num_shards:
+        # each worker builds its own replicas from the artifact and quantsim caches, only the encodings calibrated
+        # here are handed over
+        with tempfile.TemporaryDirectory() as export_dir:
+            encodings_path = export_encodings(sim, os.path.join(export_dir, f'{args.model_config}.encodings'),
+                                              torch.rand(model.input_shape))
+            replica = functools.partial(build_replica, ResNet, args.model_config, quantized=True)
+            fp32_acc = eval_func_sharded(replica, eval_dataloader, args.num_shards)
+            quant_acc = eval_func_sharded(functools.partial(replica, use_sim=True, encodings_path=str(encodings_path)),
+                                          eval_dataloader, args.num_shards)
+    elif args.early_stop_tolerance:
+        # both models see the same seeded random order, each stops once its own interval is tight enough
+        early_stopping = EarlyStopping(args.early_stop_tolerance)
+        fp32_acc = eval_func(model.model, eval_dataloader, early_stopping)
+        quant_acc = eval_func(sim.model.to(device), eval_dataloader, early_stopping)
+    else:
+        # Evaluate original and optimized in a single pass over the validation set
+        accuracies = evaluate_models({'fp32': model.model, 'quant': sim.model.to(device)}, eval_dataloader)
+        fp32_acc, quant_acc = accuracies['fp32'], accuracies['quant']
+    print(f'FP32 accuracy: {fp32_acc:0.3f}%')
     print(f'Quantized quantized accuracy: {quant_acc:0.3f}%')
 
-    return {'fp32_acc':fp32_acc, 'quant_acc':quant_acc}
+    results = {'fp32_acc':fp32_acc, 'quant_acc':quant_acc}
+    if args.early_stop_tolerance:
+        results['early_stopping'] = early_stopping.report(('fp32', 'quant'))
+    return results
 
 if __name__ == '__main__':
     main()
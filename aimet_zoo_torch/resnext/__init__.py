@@ -1,2 +1,9 @@
 """ package for getting resnext original model and quantized model"""
-from .model.model_definition import ResNext
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import ResNext
+
+__all__ = ["ResNext"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"ResNext": ".model.model_definition"})
@@ -9,21 +9,14 @@
 # =============================================================================
 """module for getting evaluation function of dataloader"""
 import torch
+from aimet_zoo_torch.common.utils import classification_metrics
 
 
-def eval_func(model, dataloader, BATCH_SIZE=128, device=torch.device("cuda")):
-    """Evaluates the model on validation dataset and returns the classification accuracy"""
+def eval_func(model, dataloader, BATCH_SIZE=128, device=torch.device("cuda"), early_stopping=None):
+    """
+    Evaluates the model on validation dataset and returns the classification accuracy, with an EarlyStopping
+    only until its interval is tight enough
+    """
     #pylint:disable = unused-argument
-    # Get Dataloader
-    model.eval()
-    correct = 0
-    total_samples = 0
-    with torch.no_grad():
-        for data, label in dataloader:
-            data, label = data.to(device), label.to(device)
-            output = model(data)
-            _, prediction = torch.max(output, 1)
-            correct += (prediction == label).sum()
-            total_samples += len(output)
-    del dataloader
-    return float(100 * correct / total_samples)
+    return classification_metrics.evaluate(model, dataloader, device=device, early_stopping=early_stopping,
+                                           show_progress=False)["top1"]
@@ -10,6 +10,8 @@
 """ AIMET Quantsim evaluation code for ResNeXt  """
 
 import argparse
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping
 from aimet_zoo_torch.common.utils.image_net_data_loader import ImageNetDataLoader
 from aimet_zoo_torch.resnext.dataloader.dataloaders_and_eval_func import (
     eval_func,
@@ -35,13 +37,19 @@ def arguments(raw_args):
         "--dataset-path", help="path to evaluation dataset", type=str, required=True
     )
     parser.add_argument("--use-cuda", help="Use cuda", default=True, type=bool)
+    parser.add_argument("--early-stop-tolerance", help="stop evaluating once the 95%% confidence interval of the "
+                        "accuracy is within this many percentage points, the full validation set by default",
+                        default=None, type=float)
     args = parser.parse_args(raw_args)
     return args
 
 
+@report_phases("resnext_quanteval")
 def main(raw_args=None):
     """Run evaluations"""
     args = arguments(raw_args)
+    record_arguments(args)
+    early_stopping = EarlyStopping(args.early_stop_tolerance) if args.early_stop_tolerance else None
     device = get_device(args)
     # Dataloaders
     eval_dataloader = ImageNetDataLoader(args.dataset_path, image_size=224).data_loader
@@ -50,7 +58,7 @@ def main(raw_args=None):
     model = ResNext(model_config=args.model_config, device=device, quantized=False)
     model.from_pretrained()
     fp32_acc = eval_func(
-        model=model.model.to(device), dataloader=eval_dataloader, device=device
+        model=model.model.to(device), dataloader=eval_dataloader, device=device, early_stopping=early_stopping
     )
     del model
 
@@ -60,12 +68,16 @@ def main(raw_args=None):
 
     sim = model.get_quantsim()
     quant_acc = eval_func(
-        model=sim.model.to(device), dataloader=eval_dataloader, device=device
+        model=sim.model.to(device), dataloader=eval_dataloader, device=device, early_stopping=early_stopping
     )
     del model
 
     print(f"FP32 accuracy: {fp32_acc:0.3f}%")
     print(f"Quantized quantized accuracy: {quant_acc:0.3f}%")
+    results = {"fp32_acc": fp32_acc, "quant_acc": quant_acc}
+    if early_stopping is not None:
+        results["early_stopping"] = early_stopping.report(("fp32", "quant"))
+    return results
 
 
 if __name__ == "__main__":
@@ -10,12 +10,13 @@
 
 """Class for downloading and setting up of optmized and original resnext model for AIMET model zoo"""
 import os
-import json
 import pathlib
 import torch
+import torchvision
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim # pylint:disable = import-error
 from aimet_torch.cross_layer_equalization import equalize_model # pylint:disable = import-error
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 
 
 class ResNext(Downloader):
@@ -30,10 +31,8 @@ class ResNext(Downloader):
         self.device = device
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -42,6 +41,7 @@ class ResNext(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -57,24 +57,17 @@ class ResNext(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
+        self.model = torchvision.models.resnext101_32x8d(pretrained=False)
         if self.quantized:
-            self.model = torch.hub.load(
-                "pytorch/vision:v0.10.0", "resnext101_32x8d", pretrained=True
-            )
             equalize_model(self.model, self.input_shape)
-            state_dict = torch.load(self.path_post_opt_weights)
-            self.model.load_state_dict(state_dict)
-            self.model.to(self.device)
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
         else:
-            self.model = torch.hub.load(
-                "pytorch/vision:v0.10.0", "resnext101_32x8d", pretrained=True
-            )
-            self.model.to(self.device)
+            # the torchvision ImageNet weights, fetched through the artifact cache like every other artifact
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)
+        self.model.load_state_dict(state_dict)
+        del state_dict
+        self.model.to(self.device)
         self.model.eval()
 
     def get_quantsim(self):
@@ -1,2 +1,9 @@
 """ package for getting roberta original model and quantized model"""
-from .model.model_definition import Roberta
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import Roberta
+
+__all__ = ["Roberta"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"Roberta": ".model.model_definition"})
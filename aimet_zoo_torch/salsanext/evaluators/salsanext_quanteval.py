@@ -34,6 +34,7 @@ from aimet_torch.model_validator.model_validator import ModelValidator
 from aimet_torch.model_preparer import prepare_model
 from aimet_torch import batch_norm_fold
 
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.salsanext.models.tasks.semantic.modules.ioueval import iouEval
 from aimet_zoo_torch.salsanext.models.common.laserscan import SemLaserScan
 from aimet_zoo_torch.salsanext.models.tasks.semantic.dataset.kitti import (
@@ -519,10 +520,12 @@ def forward_func(model, cal_dataloader):
         return 0.5
 
 
+@report_phases("salsanext_quanteval")
 def main(FLAGS):
     """
     The main function.
     """
+    record_arguments(FLAGS)
     seed(1234)
     parser = parserModule.Parser(
         root=FLAGS.dataset_path,
@@ -11,7 +11,6 @@
 
 """ SalsaNext """
 
-import json
 import os
 import pathlib
 from collections import OrderedDict
@@ -19,6 +18,7 @@ import yaml
 import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.salsanext.models.tasks.semantic.modules.SalsaNext import (
     SalsaNext as SalsaNextBase,
 )
@@ -27,18 +27,18 @@ from aimet_zoo_torch.salsanext.models.tasks.semantic.modules.SalsaNext import (
 class SalsaNext(Downloader):
     """SalsaNext Semantic Segmentation parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
 
-    def __init__(self, model_config=None):
+    def __init__(self, model_config=None, device=None):
         """
         :param model_config:             named model config from which to obtain model artifacts and arguments.
                                          If provided, overwrites the other arguments passed to this object
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
+        self.device = device or torch.device("cuda")
         self.parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = False
         if model_config:
-            config_filepath = self.parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath, encoding='utf8') as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -46,13 +46,14 @@ class SalsaNext(Downloader):
                 url_post_opt_weights=self.cfg["artifacts"]["url_post_opt_weights"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=self.parent_dir,
                 model_config=model_config,
             )
             self.input_shape = tuple(
                 x if x is not None else 1 for x in self.cfg["input_shape"]
             )
-            self.dummy_input = torch.rand(self.input_shape, device=torch.device("cuda"))
+            self.dummy_input = torch.rand(self.input_shape, device=self.device)
         self.model = SalsaNextBase(nclasses=20)
         self.DATA = yaml.safe_load(
             open(os.path.join(self.parent_dir, "data_cfg.yaml"), "r", encoding='utf8')
@@ -67,20 +68,17 @@ class SalsaNext(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
+        self._download_artifacts()
         if quantized:
-            self.model = torch.load(self.path_post_opt_weights)
+            self.model = torch.load(self.path_post_opt_weights, map_location=self.device)
         else:
-            state_dict = torch.load(self.path_pre_opt_weights)["state_dict"]
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)["state_dict"]
             new_dict = OrderedDict()
             for key, values in state_dict.items():
                 key = key[7:]
                 new_dict[key] = values
             self.model.load_state_dict(new_dict, strict=True)
-        self.model.cuda()
+        self.model.to(self.device)
         self.model.eval()
 
     def get_quantsim(self, quantized=False):
@@ -93,7 +91,7 @@ class SalsaNext(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        dummy_input = torch.rand(self.input_shape, device=torch.device("cuda"))
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         quant_config = self.cfg["optimization_config"]["quantization_configuration"]
         kwargs = {
             "quant_scheme": quant_config["quant_scheme"],
@@ -111,7 +109,7 @@ class SalsaNext(Downloader):
         if self.path_adaround_encodings and quantized:
             sim.set_and_freeze_param_encodings(self.path_adaround_encodings)
             print("set_and_freeze_param_encodings finished!")
-        sim.model.cuda()
+        sim.model.to(self.device)
         sim.model.eval()
         return sim
 
@@ -1,2 +1,9 @@
 """ package for getting segnet original model and quantized model"""
-from .model.model_definition import SegNet
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import SegNet
+
+__all__ = ["SegNet"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"SegNet": ".model.model_definition"})
@@ -16,6 +16,7 @@ import argparse
 import torch
 
 # SegNet imports
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.common.utils.utils import get_device
 from aimet_zoo_torch.segnet import SegNet
 from aimet_zoo_torch.segnet.dataloader.dataloaders_and_eval_func import get_dataloaders_and_eval_func
@@ -53,9 +54,11 @@ def seed(seednum, use_cuda):
         torch.cuda.manual_seed(seednum)
         torch.cuda.manual_seed_all(seednum)
 
+@report_phases("segnet_quanteval")
 def main():
     """Run evaluations"""
     args = arguments()
+    record_arguments(args)
     seed(0, args.use_cuda)
     device = get_device(args)
 
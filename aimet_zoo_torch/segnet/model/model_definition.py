@@ -10,11 +10,11 @@
 
 """Class for downloading and setting up of optmized and original segnet model for AIMET model zoo"""
 import os
-import json
 import pathlib
 import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim#pylint:disable=import-error
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.segnet.model.models.segnet import (
     get_seg_model,
 )
@@ -31,10 +31,8 @@ class SegNet(Downloader):
         self.device = device
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -43,6 +41,7 @@ class SegNet(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -57,11 +56,7 @@ class SegNet(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
             self.model = torch.load(self.path_post_opt_weights)
             self.model.to(self.device)
@@ -1,2 +1,9 @@
 """ package for getting SESR original model and quantized model"""
-from .model.model_definition import SESR
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import SESR
+
+__all__ = ["SESR"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"SESR": ".model.model_definition"})
@@ -12,11 +12,11 @@
 # pylint:disable = import-error, wrong-import-order
 # adding this due to docker image not setup yet
 
-import json
 import os
 import torch
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.common.super_resolution.models import SESRRelease
 
 
@@ -29,6 +29,7 @@ class SESR(SESRRelease, Downloader):
             num_channels=16,
             scaling_factor=2,
             num_lblocks=3,
+            device=None,
             **kwargs
     ):
         """
@@ -36,14 +37,14 @@ class SESR(SESRRelease, Downloader):
                                          If provided, overwrites the other arguments passed to this object
         :param scaling_factor:           scaling factor for LR-to-HR upscaling (2x, 3x, 4x... or 1.5x)
         :param num_channels:             number of feature channels for convolutional layers
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
+        self.device = device or torch.device("cuda")
         parent_dir = "/".join(os.path.realpath(__file__).split("/")[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         self.scaling_factor = (
             self.cfg["model_args"]["scaling_factor"] if self.cfg else scaling_factor
         )
@@ -61,6 +62,7 @@ class SESR(SESRRelease, Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -81,20 +83,16 @@ class SESR(SESRRelease, Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
             self.collapse()
-            state_dict = torch.load(self.path_post_opt_weights)["state_dict"]
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)["state_dict"]
             self.load_state_dict(state_dict)
-            self.cuda()
+            self.to(self.device)
         else:
-            state_dict = torch.load(self.path_pre_opt_weights)["state_dict"]
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)["state_dict"]
             self.load_state_dict(state_dict)
-            self.cuda()
+            self.to(self.device)
         self.eval()
 
     def get_quantsim(self, quantized=False):
@@ -107,8 +105,7 @@ class SESR(SESRRelease, Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             "quant_scheme": self.cfg["optimization_config"][
                 "quantization_configuration"
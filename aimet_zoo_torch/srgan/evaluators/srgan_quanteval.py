@@ -38,6 +38,7 @@ from codes.data import create_dataset, create_dataloader
 from codes.models import create_model
 
 # import common util in AIMET examples folder
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.common.utils import utils
 
 
@@ -317,8 +318,10 @@ class ModelConfig:
             setattr(self, arg, getattr(args, arg))
 
 
+@report_phases("srgan_quanteval")
 def main(args):
     """Evaluation main script"""
+    record_arguments(args)
 
     # Adding hardcoded values to config on top of args
     config = ModelConfig(args)
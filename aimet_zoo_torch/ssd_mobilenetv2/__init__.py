@@ -1,5 +1,15 @@
 """ package for creating and getting ssdmobilenetv2 original model and quantized model"""
-from .model.model_definition import (
-    SSDMobileNetV2,
-    create_mobilenetv2_ssd_lite_predictor,
-)
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import (
+        SSDMobileNetV2,
+        create_mobilenetv2_ssd_lite_predictor,
+    )
+
+__all__ = ["SSDMobileNetV2", "create_mobilenetv2_ssd_lite_predictor"]
+__getattr__, __dir__ = lazy_attributes(__name__, {
+    "SSDMobileNetV2": ".model.model_definition",
+    "create_mobilenetv2_ssd_lite_predictor": ".model.model_definition",
+})
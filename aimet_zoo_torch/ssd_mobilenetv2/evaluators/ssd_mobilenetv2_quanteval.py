@@ -49,11 +49,13 @@ from tqdm import tqdm
 
 import torch
 from torch.utils.data import Dataset, DataLoader
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.ssd_mobilenetv2.dataloader.datasets.voc_dataset import VOCDataset
 from aimet_zoo_torch.ssd_mobilenetv2.model.vision.utils import box_utils, measurements
 
 # AIMET model zoo imports
 from aimet_zoo_torch.common.utils.utils import get_device
+from aimet_zoo_torch.common.utils.pipelined_eval import Pipeline
 from aimet_zoo_torch.ssd_mobilenetv2 import (
     SSDMobileNetV2,
     create_mobilenetv2_ssd_lite_predictor,
@@ -255,24 +257,32 @@ def evaluate_predictor(predictor,dataset,class_names,eval_path,annotation_stats,
     """
     # pylint: disable = too-many-locals, redefined-outer-name
     true_case_stat, all_gb_boxes, all_difficult_cases = annotation_stats
-    results = []
-    for i in tqdm(range(len(dataset))):
-        image = dataset.get_image(i)
-        boxes, labels, probs = predictor.predict(image)
+
+    def load(i):
+        return (i,) + predictor.preprocess(dataset.get_image(i))
+
+    def forward(loaded):
+        return predictor.forward(loaded[1])
+
+    def postprocess(loaded, output):
+        i, _, size = loaded
+        boxes, labels, probs = predictor.postprocess(*output, size)
         indexes = torch.ones(labels.size(0), 1, dtype=torch.float32) * i
-        results.append(
-            torch.cat(
-                [
-                    indexes.reshape(-1, 1),
-                    labels.reshape(-1, 1).float(),
-                    probs.reshape(-1, 1),
-                    boxes + 1.0,  # matlab's indexes start from 1
-                ],
-                dim=1,
-            )
+        return torch.cat(
+            [
+                indexes.reshape(-1, 1),
+                labels.reshape(-1, 1).float(),
+                probs.reshape(-1, 1),
+                boxes + 1.0,  # matlab's indexes start from 1
+            ],
+            dim=1,
         )
-        if num_samples is not None and i > num_samples:
-            break
+
+    # images are read and NMS runs while the model processes other images, results stay in image order
+    num_images = len(dataset) if num_samples is None else min(len(dataset), num_samples + 2)
+    pipeline = Pipeline(load, forward, postprocess)
+    results = list(tqdm(pipeline.run(range(num_images)), total=num_images))
+    print(f"Pipeline: {pipeline.format_stats()}")
 
     results = torch.cat(results)
     for class_index, class_name in enumerate(class_names):
@@ -323,9 +333,11 @@ class ModelConfig:
 DEFAULT_CONFIG = {"num_samples_cal": 500, "num_samples_eval": None}
 
 #pylint:disable = too-many-locals
+@report_phases("ssd_mobilenetv2_quanteval")
 def main(raw_args=None):
     """main evaluation function"""
     args = arguments(raw_args)
+    record_arguments(args)
     config = ModelConfig(args)
     #download_labels()
 
@@ -344,7 +356,7 @@ def main(raw_args=None):
     )
 
     print("Initializing Original Model:")
-    model_fp32 = SSDMobileNetV2(model_config=args.model_config)
+    model_fp32 = SSDMobileNetV2(model_config=args.model_config, device=device)
     model_fp32.from_pretrained(quantized=False)
     predictor_orig_fp32 = create_mobilenetv2_ssd_lite_predictor(
         model_fp32.model, nms_method="hard", device=device
@@ -357,7 +369,7 @@ def main(raw_args=None):
     sim_fp32.compute_encodings(eval_func_fp32, (predictor_sim_fp32, 2000, device))
 
     print("Initializing Optimized Model")
-    model_int8 = SSDMobileNetV2(model_config=args.model_config)
+    model_int8 = SSDMobileNetV2(model_config=args.model_config, device=device)
     model_int8.from_pretrained(quantized=True)
 
     predictor_orig_int8 = create_mobilenetv2_ssd_lite_predictor(
@@ -12,9 +12,9 @@
 # =============================================================================
 
 import torch
-import json
 import os
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_zoo_torch.ssd_mobilenetv2.model.vision.ssd.mobilenet_v2_ssd_lite import create_mobilenetv2_ssd_lite, create_mobilenetv2_ssd_lite_predictor
@@ -22,14 +22,13 @@ from aimet_zoo_torch.ssd_mobilenetv2.model.vision.ssd.mobilenet_v2_ssd_lite impo
 
 class SSDMobileNetV2(Downloader): 
     """SSDMobileNetV2 parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
-    def __init__(self, model_config: str = None, num_classes: int = 21, width_mult = 1, is_test: bool = True):
+    def __init__(self, model_config: str = None, num_classes: int = 21, width_mult = 1, is_test: bool = True, device=None):
+        self.device = device or torch.device("cuda")
         parent_dir = '/'.join(os.path.realpath(__file__).split('/')[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + '/model_cards/' + model_config + '.json'
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(self, 
                                 url_pre_opt_weights = self.cfg['artifacts']['url_pre_opt_weights'],
@@ -37,6 +36,7 @@ class SSDMobileNetV2(Downloader):
                                 url_adaround_encodings = self.cfg['artifacts']['url_adaround_encodings'],
                                 url_aimet_encodings = self.cfg['artifacts']['url_aimet_encodings'],
                                 url_aimet_config = self.cfg['artifacts']['url_aimet_config'],
+                                checksums = self.cfg['artifacts'].get('checksums'),
                                 model_dir = parent_dir,
                                 model_config = model_config)
             self.input_shape = tuple(x if x is not None else 1 for x in self.cfg['input_shape'])
@@ -49,16 +49,12 @@ class SSDMobileNetV2(Downloader):
         """load pretrained weights"""
         if not self.cfg:
             raise NotImplementedError('There are no pretrained weights available for the model_config passed')
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
             equalize_model(self.model, self.input_shape)
-            state_dict = torch.load(self.path_post_opt_weights)
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
         else:
-            state_dict = torch.load(self.path_pre_opt_weights)
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)
         self.model.load_state_dict(state_dict)
         self.model.eval()
 
@@ -70,8 +66,7 @@ class SSDMobileNetV2(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device('cuda')
-        dummy_input = torch.rand(self.input_shape, device = device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             'quant_scheme': self.cfg['optimization_config']['quantization_configuration']['quant_scheme'],
             'default_param_bw': self.cfg['optimization_config']['quantization_configuration']['param_bw'],
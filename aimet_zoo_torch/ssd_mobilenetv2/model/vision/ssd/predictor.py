@@ -54,15 +54,29 @@ class Predictor:
         self.timer = Timer()
 
     def predict(self, image, top_k=-1, prob_threshold=None):
-        cpu_device = torch.device("cpu")
+        images, size = self.preprocess(image)
+        scores, boxes = self.forward(images)
+        return self.postprocess(scores, boxes, size, top_k, prob_threshold)
+
+    def preprocess(self, image):
+        """transformed image batch of one image and the (height, width) of the image"""
         height, width, _ = image.shape
         image = self.transform(image)
-        images = image.unsqueeze(0)
+        return image.unsqueeze(0), (height, width)
+
+    def forward(self, images):
+        """class scores and boxes of a batch of transformed images"""
         images = images.to(self.device)
         with torch.no_grad():
             self.timer.start()
             scores, boxes = self.net.forward(images)
             # print("Inference time: ", self.timer.end())
+        return scores, boxes
+
+    def postprocess(self, scores, boxes, size, top_k=-1, prob_threshold=None):
+        """boxes, labels and probabilities after NMS of the first image of a batch, in pixels of the image"""
+        cpu_device = torch.device("cpu")
+        height, width = size
         boxes = boxes[0]
         scores = scores[0]
         if not prob_threshold:
@@ -45,6 +45,7 @@ from torch.utils.data import DataLoader
 
 from aimet_torch.model_preparer import prepare_model
 from aimet_torch.model_validator.model_validator import ModelValidator
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.ssd_res50.dataloader.dataset import CocoDataset
 from aimet_zoo_torch.ssd_res50.dataloader.dataset import collate_fn
 from aimet_zoo_torch.ssd_res50.model.model_definition import SSD_Res50
@@ -85,12 +86,14 @@ def get_args(raw_args):
     return args
 
 
+@report_phases("ssd_res50_quanteval")
 def main(raw_args=None):
     """
     Evaluation function for SSD Res50 quantized model
     """
     #pylint:disable = redefined-outer-name
     args=get_args(raw_args)
+    record_arguments(args)
     if args.use_cuda:
         if torch.cuda.is_available():
             device = torch.device("cuda")
@@ -35,7 +35,6 @@
 @author: Viet Nguyen <nhviet1009@gmail.com>
 """
 import os
-import json
 
 import torch
 import torch.nn as nn
@@ -44,6 +43,7 @@ from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 
 
 class Base(nn.Module):
@@ -142,27 +142,24 @@ class SSD(Base):
 
 
 class SSD_Res50(Downloader):
-    def __init__(self, model_config=None, **kwargs):
+    def __init__(self, model_config=None, device=None, **kwargs):
         """
         :param model_config:             named model config from which to obtain model artifacts and arguments.
                                          If provided, overwrites the other arguments passed to this object
+        :param device:                   device to load the model and the quantsim on, cuda by default
         """
+        self.device = device or torch.device("cuda")
         parent_dir = '/'.join(os.path.realpath(__file__).split('/')[:-1])
         self.cfg = False
         if model_config:
-            config_filepath = os.path.join(parent_dir, f'model_cards/{model_config}.json')
-            try:
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
-            except FileNotFoundError:
-                print(f"Trying to open a model_config file from a non-existent path {config_filepath}!")
-                raise
+            self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(self,
                                 url_pre_opt_weights = self.cfg['artifacts']['url_pre_opt_weights'],
                                 url_post_opt_weights = self.cfg['artifacts']['url_post_opt_weights'],
                                 url_aimet_encodings = self.cfg['artifacts']['url_aimet_encodings'],
                                 url_aimet_config = self.cfg['artifacts']['url_aimet_config'],
+                                checksums = self.cfg['artifacts'].get('checksums'),
                                 model_dir = parent_dir,
                                 model_config = model_config)
             self.input_shape = tuple(x if x is not None else 1 for x in self.cfg['input_shape'])
@@ -172,16 +169,12 @@ class SSD_Res50(Downloader):
         """load pretrained weights"""
         if not self.cfg:
             raise NotImplementedError('There are no pretrained weights available for the model_config passed')
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
 
         # This model doesn't need QAT. Thus, only original pretrained weights are provided
-        checkpoint = torch.load(self.path_pre_opt_weights)
+        checkpoint = torch.load(self.path_pre_opt_weights, map_location=self.device)
         self.model.load_state_dict(checkpoint['model_state_dict'])
-        self.model.cuda()
+        self.model.to(self.device)
 
         if quantized:
             equalize_model(self.model, self.input_shape)
@@ -197,8 +190,7 @@ class SSD_Res50(Downloader):
         else:
             self.from_pretrained(quantized=False)
 
-        device = torch.device('cuda')
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         kwargs = {
             'quant_scheme': self.cfg['optimization_config']['quantization_configuration']['quant_scheme'],
             'default_param_bw': self.cfg['optimization_config']['quantization_configuration']['param_bw'],
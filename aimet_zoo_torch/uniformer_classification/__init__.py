@@ -1,2 +1,9 @@
 """ loading downloader class """
-from .model.model_definition import UniformerClassification
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import UniformerClassification
+
+__all__ = ["UniformerClassification"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"UniformerClassification": ".model.model_definition"})
@@ -10,7 +10,7 @@
 """ module for getting dataloader and evaluation function for deeplabv3 """
 
 import torch
-from aimet_zoo_torch.uniformer_classification.model.image_classification.engine import  evaluate
+from aimet_zoo_torch.common.utils import classification_metrics
 from aimet_zoo_torch.uniformer_classification.model.image_classification.datasets import build_dataset
 
 
@@ -23,6 +23,15 @@ class Arguments:
         self.data_set = "IMNET"
         self.data_path = dataset_path
 
+def evaluate(data_loader, model, device, early_stopping=None):
+    """
+    top-1 and top-5 accuracy in percent, keyed like the metrics of the original engine.evaluate, with an
+    EarlyStopping only until the top-1 interval is tight enough
+    """
+    result = classification_metrics.evaluate(model, data_loader, device=device, early_stopping=early_stopping)
+    return {"acc1": result["top1"], "acc5": result["top5"]}
+
+
 def get_dataloaders_and_eval_func(dataset_path):
     """getting dataloader and evaluation function"""
     #pylint:disable = unused-variable
@@ -13,8 +13,10 @@
 
 import argparse
 import torch
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.uniformer_classification import UniformerClassification
 from aimet_zoo_torch.common.utils.utils import get_device
+from aimet_zoo_torch.common.utils.early_stopping import EarlyStopping
 from aimet_zoo_torch.uniformer_classification.dataloader.dataloaders_and_eval_func import get_dataloaders_and_eval_func, forward_pass
 
 
@@ -39,6 +41,9 @@ def arguments(raw_args=None):
     parser.add_argument(
         "--use-cuda", help="Run evaluation on GPU.", type=bool, default=True
     )
+    parser.add_argument("--early-stop-tolerance", help="stop evaluating once the 95%% confidence interval of the "
+                        "accuracy is within this many percentage points, the full validation set by default",
+                        default=None, type=float)
     args = parser.parse_args(raw_args)
     return args
 
@@ -52,36 +57,42 @@ def seed(seed_number):
     torch.cuda.manual_seed_all(seed_number)
 
 
+@report_phases("uniformer_classification_quanteval")
 def main(raw_args=None):
     # pylint: disable=too-many-locals
     """ main evaluation function"""
     seed(0)
     args = arguments(raw_args)
+    record_arguments(args)
     device = get_device(args)
+    early_stopping = EarlyStopping(args.early_stop_tolerance) if args.early_stop_tolerance else None
     iterations = 500
     # pylint: disable = unused-variable
     train_loader, val_loader, eval_func = get_dataloaders_and_eval_func(dataset_path=args.dataset_path)
 
     # Original model
-    model_orig = UniformerClassification(model_config=args.model_config)
+    model_orig = UniformerClassification(model_config=args.model_config, device=device)
     sim_orig = model_orig.get_quantsim(quantized=False)
     fp32_orig = model_orig.model
-    acc_fp32 = eval_func(val_loader, fp32_orig, device=device)["acc1"]
+    acc_fp32 = eval_func(val_loader, fp32_orig, device=device, early_stopping=early_stopping)["acc1"]
     fp_kwargs = {'iterations': iterations, 'dataloader': val_loader, 'device': device}
     sim_orig.compute_encodings(forward_pass, forward_pass_callback_args=fp_kwargs)
-    acc_orig = eval_func(val_loader, sim_orig.model, device=device)["acc1"]
+    acc_orig = eval_func(val_loader, sim_orig.model, device=device, early_stopping=early_stopping)["acc1"]
 
     # Optimized model
-    model_optim = UniformerClassification(model_config=args.model_config)
+    model_optim = UniformerClassification(model_config=args.model_config, device=device)
     sim_optim = model_optim.get_quantsim(quantized=True)
-    acc_optim = eval_func(val_loader, sim_optim.model, device=device)["acc1"]
+    acc_optim = eval_func(val_loader, sim_optim.model, device=device, early_stopping=early_stopping)["acc1"]
 
     param_bw = model_orig.cfg["optimization_config"]["quantization_configuration"]["param_bw"]
     output_bw = model_orig.cfg["optimization_config"]["quantization_configuration"]["output_bw"]
     print(f"Original Model | FP32 Environment | Accuracy: {acc_fp32:.4f}")
     print(f"Original Model | W{param_bw}A{output_bw} Environment | Accuracy: {acc_orig:.4f}")
     print(f"Optimized Model | W{param_bw}A{output_bw} Environment | Accuracy: {acc_optim:.4f}")
-    return {"acc_fp32": acc_fp32, "acc_orig": acc_orig, "acc_optim": acc_optim}
+    results = {"acc_fp32": acc_fp32, "acc_orig": acc_orig, "acc_optim": acc_optim}
+    if early_stopping is not None:
+        results["early_stopping"] = early_stopping.report(("fp32", "orig", "optim"))
+    return results
 
 if __name__ == "__main__":
     scores_dict = main()
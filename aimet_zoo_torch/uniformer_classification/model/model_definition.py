@@ -9,7 +9,6 @@
 # =============================================================================
 """Class for downloading and setting up model for AIMET model zoo"""
 # pylint:disable = import-error
-import json
 import os
 import pathlib
 import torch
@@ -17,18 +16,18 @@ from aimet_common.defs import QuantScheme
 from aimet_torch.cross_layer_equalization import equalize_model
 from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card
 from aimet_zoo_torch.uniformer_classification.model.image_classification.models.uniformer import uniformer_small
 
 
 class UniformerClassification(Downloader):
     """Uniformer Classification parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
-    def __init__(self, model_config=None):
+    def __init__(self, model_config=None, device=None):
+        self.device = device or torch.device("cuda")
         parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = False
         if model_config:
-            config_filepath = parent_dir + "/model_cards/" + model_config + ".json"
-            with open(config_filepath) as f_in:
-                self.cfg = json.load(f_in)
+            self.cfg = get_card(model_config)
         if model_config:
             Downloader.__init__(
                 self,
@@ -36,6 +35,7 @@ class UniformerClassification(Downloader):
                 url_post_opt_weights=self.cfg["artifacts"]["url_post_opt_weights"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -49,21 +49,18 @@ class UniformerClassification(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
+        self._download_artifacts()
         if quantized:
             equalize_model(self.model, self.input_shape)
-            state_dict = torch.load(self.path_post_opt_weights)
+            state_dict = torch.load(self.path_post_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
             del state_dict
         else:
-            state_dict = torch.load(self.path_pre_opt_weights)
+            state_dict = torch.load(self.path_pre_opt_weights, map_location=self.device)
             self.model.load_state_dict(state_dict)
             del state_dict
         self.model.eval()
-        self.model.cuda()
+        self.model.to(self.device)
 
     def get_quantsim(self, quantized=False):
         """" to get quantsim object for model from loading/computing proper encodings"""
@@ -71,8 +68,7 @@ class UniformerClassification(Downloader):
             self.from_pretrained(quantized=True)
         else:
             self.from_pretrained(quantized=False)
-        device = torch.device("cuda")
-        dummy_input = torch.rand(self.input_shape, device=device)
+        dummy_input = torch.rand(self.input_shape, device=self.device)
         quant_config = self.cfg["optimization_config"]["quantization_configuration"]
         kwargs = {
             "quant_scheme": QuantScheme.training_range_learning_with_tf_init if quantized else 'tf',
@@ -81,7 +77,7 @@ class UniformerClassification(Downloader):
             "config_file": self.path_aimet_config,
             "dummy_input": dummy_input,
         }
-        sim = QuantizationSimModel(self.model.cuda(), **kwargs)
+        sim = QuantizationSimModel(self.model.to(self.device), **kwargs)
         sim.compute_encodings(lambda m, _: m(dummy_input), None)
         if self.path_aimet_encodings and quantized:
             load_encodings_to_sim(sim, self.path_aimet_encodings)
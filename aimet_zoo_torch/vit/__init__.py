@@ -1,2 +1,9 @@
 """ package for getting vit original model and quantized model"""
-from .model.model_definition import vit
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import vit
+
+__all__ = ["vit"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"vit": ".model.model_definition"})
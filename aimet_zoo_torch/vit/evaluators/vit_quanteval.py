@@ -18,6 +18,7 @@ import datasets
 from accelerate import Accelerator
 from accelerate.logging import get_logger
 from accelerate.utils import set_seed
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.vit.dataloader import get_dataloaders,get_dataset
 from aimet_zoo_torch.vit import vit
 
@@ -71,9 +72,11 @@ def parse_args(raw_args):
     return args
 
 
+@report_phases("vit_quanteval")
 def main(raw_args=None):
     """Evaluation main function"""
     args = parse_args(raw_args)
+    record_arguments(args)
     # Initialize the accelerator. We will let the accelerator handle device placement for us in this example.
     # If we're using tracking, we also need to initialize it here and it will by default pick up all supported trackers
     # in the environment
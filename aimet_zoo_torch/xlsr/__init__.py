@@ -1,2 +1,9 @@
 """ package for getting xlsr original model and quantized model"""
-from .model.model_definition import XLSR
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import XLSR
+
+__all__ = ["XLSR"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"XLSR": ".model.model_definition"})
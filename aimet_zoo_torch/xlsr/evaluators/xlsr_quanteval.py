@@ -11,6 +11,7 @@
 """ AIMET evaluation code for QuickSRNet """
 
 import argparse
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
 from aimet_zoo_torch.xlsr import XLSR
 from aimet_zoo_torch.common.super_resolution.psnr import evaluate_average_psnr
 from aimet_zoo_torch.common.super_resolution.utils import (
@@ -58,9 +59,11 @@ def arguments():
     return args
 
 
+@report_phases("xlsr_quanteval")
 def main():
     """executes evaluation"""
     args = arguments()
+    record_arguments(args)
 
     model_fp32 = XLSR(model_config=args.model_config)
     model_fp32.from_pretrained(quantized=False)
@@ -6,4 +6,11 @@
 #  @@-COPYRIGHT-END-@@
 # =============================================================================
 """ loading yolox model downloader class"""
-from .model.model_definition import YOLOX
+from typing import TYPE_CHECKING
+from aimet_zoo_torch.common.lazy_import import lazy_attributes
+
+if TYPE_CHECKING:
+    from .model.model_definition import YOLOX
+
+__all__ = ["YOLOX"]
+__getattr__, __dir__ = lazy_attributes(__name__, {"YOLOX": ".model.model_definition"})
@@ -10,6 +10,7 @@ import cv2
 import numpy as np
 from pycocotools.coco import COCO
 
+from aimet_zoo_torch.common.utils.packed_files import PackedFiles, is_packed
 from ..dataloading import get_yolox_datadir
 from .datasets_wrapper import Dataset
 
@@ -55,12 +56,16 @@ class COCODataset(Dataset):
             name (str): COCO data name (e.g. 'train2017' or 'val2017')
             img_size (int): target image size after pre-processing
             preproc: data augmentation strategy
+            The image directory data_dir/name may be a packed directory written by
+            aimet_zoo_torch.common.utils.packed_files, images are then read from its shards.
         """
         super().__init__(img_size)
         if data_dir is None:
             data_dir = os.path.join(get_yolox_datadir(), "COCO")
         self.data_dir = data_dir
         self.json_file = json_file
+        img_dir = os.path.join(self.data_dir, name)
+        self.files = PackedFiles(img_dir) if is_packed(img_dir) else None
 
         self.coco = COCO(os.path.join(self.data_dir, "annotations", self.json_file))
         remove_useless_info(self.coco)
@@ -191,7 +196,10 @@ class COCODataset(Dataset):
 
         img_file = os.path.join(self.data_dir, self.name, file_name)
 
-        img = cv2.imread(img_file)
+        if self.files is not None:
+            img = cv2.imdecode(np.frombuffer(self.files.read(img_file), dtype=np.uint8), cv2.IMREAD_COLOR)
+        else:
+            img = cv2.imread(img_file)
         assert img is not None, f"file named {img_file} not found"
 
         return img
@@ -14,6 +14,7 @@
 #pylint: skip-file
 
 import contextlib
+import functools
 import io
 import json
 import tempfile
@@ -24,6 +25,9 @@ from tqdm import tqdm
 import numpy as np
 import torch
 
+from aimet_zoo_torch.common.utils.instrumentation import count_samples, instrumented
+from aimet_zoo_torch.common.utils.pipelined_eval import Pipeline
+from aimet_zoo_torch.common.utils.sharded_eval import evaluate_sharded
 from ..model.yolo_x.utils import postprocess, xyxy2xywh
 
 
@@ -58,6 +62,7 @@ class COCOEvaluator:
         self.num_classes = num_classes
         self.testdev = testdev
 
+    @instrumented("eval")
     def evaluate(self, model, decoder=None, return_outputs=False):
         """
         COCO average precision (AP) Evaluation. Iterate inference on the test dataset
@@ -76,36 +81,38 @@ class COCOEvaluator:
 
         tensor_type = torch.cuda.FloatTensor
         model = model.eval()
-        
-        ids = []
+
         data_list = []
         output_data = defaultdict()
 
-        inference_time = 0
-        nms_time = 0
-        n_samples = max(len(self.dataloader) - 1, 1)
-
-        for cur_iter, (imgs, _, info_imgs, ids) in enumerate(tqdm(self.dataloader)):
-            with torch.no_grad():
-                imgs = imgs.type(tensor_type)
-
-                # skip the last iters since batchsize might be not enough for batch inference
-                is_time_record = cur_iter < len(self.dataloader) - 1
-                if is_time_record:
-                    start = time.time()
+        def load(batch):
+            imgs, _, info_imgs, ids = batch
+            return imgs.type(tensor_type), info_imgs, ids
 
-                outputs = model(imgs)
-                if decoder is not None:
-                    outputs = decoder(outputs, dtype=outputs.type())
+        def forward(loaded):
+            outputs = model(loaded[0])
+            if decoder is not None:
+                outputs = decoder(outputs, dtype=outputs.type())
+            return outputs
 
-                outputs = postprocess(
-                    outputs, self.num_classes, self.confthre, self.nmsthre
-                )
-
-            data_list_elem, image_wise_data = self.convert_to_coco_format(
+        def postprocess_batch(loaded, outputs):
+            _, info_imgs, ids = loaded
+            outputs = postprocess(
+                outputs, self.num_classes, self.confthre, self.nmsthre
+            )
+            return self.convert_to_coco_format(
                 outputs, info_imgs, ids, return_outputs=True)
+
+        # NMS and the conversion to COCO format of a batch overlap with the forward pass of the next batches
+        pipeline = Pipeline(load, forward, postprocess_batch, num_loaders=1)
+        for data_list_elem, image_wise_data in tqdm(pipeline.run(self.dataloader), total=len(self.dataloader)):
             data_list.extend(data_list_elem)
             output_data.update(image_wise_data)
+        print("Pipeline: " + pipeline.format_stats())
+        count_samples(len(output_data))
+        inference_time = pipeline.stats["forward"]["busy_seconds"]
+        nms_time = pipeline.stats["postprocess"]["busy_seconds"]
+        n_samples = len(self.dataloader)
 
         statistics = torch.cuda.FloatTensor([inference_time, nms_time, n_samples])
 
@@ -115,6 +122,30 @@ class COCOEvaluator:
             return eval_results, output_data
         return eval_results
 
+    def evaluate_sharded(self, model, num_shards, threads_per_shard=None, decoder=None):
+        """
+        COCO AP evaluation on the cpu in num_shards processes, each over a disjoint shard of the
+        dataset. The detections of all shards are gathered and evaluated by COCO API in this process.
+
+        Args:
+            model : model to evaluate, or a picklable callable building it in each process.
+            num_shards : number of worker processes.
+            threads_per_shard : intra-op threads of each worker, the cores split evenly by default.
+
+        Returns:
+            ap50_95 (float) : COCO AP of IoU=50:95
+        """
+        shard_fn = functools.partial(_coco_detections, self, decoder)
+        data_list = evaluate_sharded(model, shard_fn, self.dataloader, num_shards, threads_per_shard)
+        statistics = torch.FloatTensor([0, 0, max(len(self.dataloader) - 1, 1)])
+        return self.evaluate_prediction(data_list, statistics)
+
+    def __getstate__(self):
+        # the workers of evaluate_sharded() get the dataset with their shard, but not the data loader
+        state = self.__dict__.copy()
+        state["dataloader"] = _DatasetRef(self.dataloader.dataset, self.dataloader.batch_size)
+        return state
+
     def convert_to_coco_format(self, outputs, info_imgs, ids, return_outputs=False):
         data_list = []
         image_wise_data = defaultdict(dict)
@@ -216,3 +247,24 @@ class COCOEvaluator:
             return cocoEval.stats[0]
         else:
             return 0, 0, info
+
+
+class _DatasetRef:
+    """what convert_to_coco_format() and evaluate_prediction() read of the data loader"""
+
+    def __init__(self, dataset, batch_size):
+        self.dataset = dataset
+        self.batch_size = batch_size
+
+
+def _coco_detections(evaluator, decoder, model, dataloader):
+    """COCO format detections of one shard, in a worker of COCOEvaluator.evaluate_sharded()"""
+    model = model.eval()
+    data_list = []
+    for imgs, _, info_imgs, ids in dataloader:
+        outputs = model(imgs.float())
+        if decoder is not None:
+            outputs = decoder(outputs, dtype=outputs.type())
+        outputs = postprocess(outputs, evaluator.num_classes, evaluator.confthre, evaluator.nmsthre)
+        data_list.extend(evaluator.convert_to_coco_format(outputs, info_imgs, ids))
+    return data_list
@@ -15,10 +15,9 @@
 from __future__ import absolute_import
 from __future__ import division
 import argparse
-from functools import partial
-import json
 import os
-import pathlib
+import tempfile
+from functools import partial
 from tqdm import tqdm
 
 # Torch related imports
@@ -26,6 +25,10 @@ import torch
 
 
 # AIMET model zoo related imports: model construction, dataloader, evaluation
+from aimet_zoo_torch.common.utils.instrumentation import record_arguments, report_phases
+from aimet_zoo_torch.common.encodings_cache import export_encodings
+from aimet_zoo_torch.common.model_registry import get_card, has_card
+from aimet_zoo_torch.common.utils.sharded_eval import build_replica
 from aimet_zoo_torch.yolox import YOLOX
 from aimet_zoo_torch.yolox.dataloader.dataloaders import get_data_loader
 from aimet_zoo_torch.yolox.evaluators.coco_evaluator import COCOEvaluator
@@ -46,15 +49,20 @@ def eval_func(model, dataloader, img_size):
     return evaluator.evaluate(model)
 
 
+def eval_func_sharded(model, dataloader, img_size, num_shards):
+    """evaluate model, or a picklable callable building it, on the cpu in num_shards processes"""
+    evaluator = COCOEvaluator(dataloader, img_size)
+    return evaluator.evaluate_sharded(model, num_shards)
+
+
 def forward_pass(decoder, model, data_loader):
     """forward pass for compute encodings"""
-    #pylint:disable = no-member
-    tensor_type = torch.cuda.FloatTensor
     model = model.eval()
+    device = next(model.parameters()).device
 
     for imgs, _, info_imgs, ids in tqdm(data_loader):
         with torch.no_grad():
-            imgs = imgs.type(tensor_type)
+            imgs = imgs.float().to(device)
             outputs = model(imgs)
             if decoder is not None:
                 outputs = decoder(outputs, dtype=outputs.type())
@@ -62,20 +70,14 @@ def forward_pass(decoder, model, data_loader):
 
 def read_model_configs_from_model_card(model_card):
     """read necessary params from model card"""
-    parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent.parent)
-    config_filepath = os.path.join(
-        parent_dir, "model", "model_cards", f"{model_card}.json"
-    )
-
-    if not os.path.exists(config_filepath):
+    if not has_card(model_card):
         raise NotImplementedError("Model_config file doesn't exist")
 
-    with open(config_filepath) as f_in:
-        cfg = json.load(f_in)
-        input_shape = tuple(x if x is not None else 1 for x in cfg["input_shape"])
-        default_param_bw = cfg["optimization_config"]["quantization_configuration"][
-            "param_bw"
-        ]
+    cfg = get_card(model_card)
+    input_shape = tuple(x if x is not None else 1 for x in cfg["input_shape"])
+    default_param_bw = cfg["optimization_config"]["quantization_configuration"][
+        "param_bw"
+    ]
 
     return input_shape, default_param_bw
 
@@ -101,13 +103,17 @@ def arguments(raw_args):
     parser.add_argument(
         "--batch-size", help="Data batch size for a model", type=int, default=64
     )
+    parser.add_argument("--num-shards", help="evaluate on the cpu in this many worker processes, each with its own "
+                        "replica of the models over a disjoint shard of the dataset", default=None, type=int)
     args = parser.parse_args(raw_args)
     return args
 
 
+@report_phases("yolox_quanteval")
 def main(raw_args=None):
     """main function for quantization evaluation"""
     args = arguments(raw_args)
+    record_arguments(args)
     seed(1234)
 
     input_shape, default_param_bw = read_model_configs_from_model_card(
@@ -123,33 +129,53 @@ def main(raw_args=None):
         num_workers=4,
     )
 
-    # Load original model
-    model = YOLOX(model_config=args.model_config)
-    model.from_pretrained(quantized=False)
-    model_orig = model.model
-
-    print("Evaluating Original FP32 Model")
-    mAP_orig_fp32 = eval_func(model_orig, dataloader, img_size)
-    del model_orig
-    torch.cuda.empty_cache()
-
-    # Get QuantSim of original model
-    sim_orig = model.get_quantsim(quantized=False)
-    forward_func = partial(forward_pass, None)
-    sim_orig.compute_encodings(forward_func, forward_pass_callback_args=dataloader)
-
-    print("Evaluating Original W8A8 Model")
-    mAP_orig_int8 = eval_func(sim_orig.model, dataloader, img_size)
-    del sim_orig
-    torch.cuda.empty_cache()
-
-    # Load optimized model
-    sim_optim = model.get_quantsim(quantized=True)
-
-    print("Evaluating Optimized W8A8 Model")
-    mAP_optim_int8 = eval_func(sim_optim.model, dataloader, img_size)
-    del sim_optim
-    torch.cuda.empty_cache()
+    if args.num_shards:
+        # on the cpu, only the original sim is calibrated here, the optimized one comes with its encodings
+        model = YOLOX(model_config=args.model_config, device=torch.device("cpu"))
+        model.from_pretrained(quantized=False)
+        sim_orig = model.get_quantsim(quantized=False)
+        sim_orig.compute_encodings(partial(forward_pass, None), forward_pass_callback_args=dataloader)
+        # each worker builds its own replicas from the artifact cache, only the encodings calibrated here are
+        # handed over
+        with tempfile.TemporaryDirectory() as export_dir:
+            orig_encodings = export_encodings(sim_orig, os.path.join(export_dir, "orig.encodings"), model.dummy_input)
+            replica = partial(build_replica, YOLOX, args.model_config)
+            print("Evaluating Original FP32 Model")
+            mAP_orig_fp32 = eval_func_sharded(replica, dataloader, img_size, args.num_shards)
+            print("Evaluating Original W8A8 Model")
+            mAP_orig_int8 = eval_func_sharded(partial(replica, use_sim=True, encodings_path=str(orig_encodings)),
+                                              dataloader, img_size, args.num_shards)
+            print("Evaluating Optimized W8A8 Model")
+            mAP_optim_int8 = eval_func_sharded(partial(replica, quantized=True, use_sim=True), dataloader, img_size,
+                                               args.num_shards)
+    else:
+        # Load original model
+        model = YOLOX(model_config=args.model_config)
+        model.from_pretrained(quantized=False)
+        model_orig = model.model
+
+        print("Evaluating Original FP32 Model")
+        mAP_orig_fp32 = eval_func(model_orig, dataloader, img_size)
+        del model_orig
+        torch.cuda.empty_cache()
+
+        # Get QuantSim of original model
+        sim_orig = model.get_quantsim(quantized=False)
+        forward_func = partial(forward_pass, None)
+        sim_orig.compute_encodings(forward_func, forward_pass_callback_args=dataloader)
+
+        print("Evaluating Original W8A8 Model")
+        mAP_orig_int8 = eval_func(sim_orig.model, dataloader, img_size)
+        del sim_orig
+        torch.cuda.empty_cache()
+
+        # Load optimized model
+        sim_optim = model.get_quantsim(quantized=True)
+
+        print("Evaluating Optimized W8A8 Model")
+        mAP_optim_int8 = eval_func(sim_optim.model, dataloader, img_size)
+        del sim_optim
+        torch.cuda.empty_cache()
 
     print(f"Original Model | 32-bit Environment | mAP: {100*mAP_orig_fp32:.2f}%")
     print(
@@ -11,7 +11,6 @@
 # pylint:disable = import-error, wrong-import-order
 # adding this due to docker image not setup yet
 # General Python related imports
-import json
 import os
 import pathlib
 
@@ -26,23 +25,20 @@ from aimet_torch.quantsim import QuantizationSimModel, load_encodings_to_sim
 
 # AIMET model zoo related imports
 from aimet_zoo_torch.common.downloader import Downloader
+from aimet_zoo_torch.common.model_registry import get_card, has_card
 from aimet_zoo_torch.yolox.model.yolox_model import model_entrypoint
 
 
 class YOLOX(Downloader):
     """YOLOX objection detection parent class with automated loading of weights and providing a QuantSim with pre-computed encodings"""
 
-    def __init__(self, model_config: str = None):
+    def __init__(self, model_config: str = None, device=None):
         parent_dir = str(pathlib.Path(os.path.abspath(__file__)).parent)
         self.cfg = False
-        self.device = torch.device("cuda")
+        self.device = device or torch.device("cuda")
         if model_config:
-            config_filepath = os.path.join(
-                parent_dir, "model_cards", f"{model_config}.json"
-            )
-            if os.path.exists(config_filepath):
-                with open(config_filepath) as f_in:
-                    self.cfg = json.load(f_in)
+            if has_card(model_config):
+                self.cfg = get_card(model_config)
         if self.cfg:
             Downloader.__init__(
                 self,
@@ -51,6 +47,7 @@ class YOLOX(Downloader):
                 url_adaround_encodings=self.cfg["artifacts"]["url_adaround_encodings"],
                 url_aimet_encodings=self.cfg["artifacts"]["url_aimet_encodings"],
                 url_aimet_config=self.cfg["artifacts"]["url_aimet_config"],
+                checksums=self.cfg["artifacts"].get("checksums"),
                 model_dir=parent_dir,
                 model_config=model_config,
             )
@@ -67,13 +64,12 @@ class YOLOX(Downloader):
             raise NotImplementedError(
                 "There are no pretrained weights available for the model_config passed"
             )
-        self._download_pre_opt_weights()
-        self._download_post_opt_weights()
-        self._download_aimet_config()
-        self._download_aimet_encodings()
-        self._download_adaround_encodings()
+        self._download_artifacts()
         if quantized:
             self.model = model_entrypoint(self.cfg["name"])
+            if self.prepared_model is None:
+                # the weights are replaced below, only the prepared architecture is needed
+                self.prepared_model = prepare_model(self.model)
             fold_all_batch_norms(self.prepared_model.to(self.device), self.input_shape)
             state_dict = torch.load(
                 self.path_post_opt_weights, map_location=self.device